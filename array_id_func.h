@@ -5,6 +5,7 @@
 #include <type_traits>
 #include <algorithm>
 #include <cassert>
+#include <memory>
 
 template<class T>
 class ArrayIDFunc{
@@ -52,19 +53,28 @@ public:
 		}
 	}
 
+	// The array does not own data. It is kept alive by data_owner, for example a memory mapped file.
+	ArrayIDFunc(int preimage_count, T*data, std::shared_ptr<void>data_owner)
+		:preimage_count_(preimage_count), data_(data), data_owner_(std::move(data_owner)){
+		assert(preimage_count >= 0 && "ids may not be negative");
+		assert((data_owner_ != nullptr || preimage_count == 0) && "the data must have an owner");
+	}
+
 	ArrayIDFunc(ArrayIDFunc&&o)noexcept
-		:preimage_count_(o.preimage_count_), data_(o.data_){
+		:preimage_count_(o.preimage_count_), data_(o.data_), data_owner_(std::move(o.data_owner_)){
 		o.preimage_count_ = 0;
 		o.data_ = nullptr;
 	}
 
 	~ArrayIDFunc(){
-		delete[]data_;
+		if(!data_owner_)
+			delete[]data_;
 	}
 
 	void swap(ArrayIDFunc&o)noexcept{
 		std::swap(preimage_count_, o.preimage_count_);
 		std::swap(data_, o.data_);
+		data_owner_.swap(o.data_owner_);
 	}
 
 	template<class IDFunc>
@@ -82,10 +92,7 @@ public:
 	}
 
 	ArrayIDFunc&operator=(ArrayIDFunc&&o)noexcept{
-		this->~ArrayIDFunc();
-		data_ = nullptr;
-		preimage_count_ = 0;
-		swap(o);
+		ArrayIDFunc(std::move(o)).swap(*this);
 		return *this;
 	}
 
@@ -130,6 +137,7 @@ public:
 
 	int preimage_count_;
 	T*data_;
+	std::shared_ptr<void>data_owner_;
 };
 
 struct ArrayIDIDFunc : public ArrayIDFunc<int>{
@@ -139,6 +147,9 @@ struct ArrayIDIDFunc : public ArrayIDFunc<int>{
 	ArrayIDIDFunc(int preimage_count, int image_count)
 		:ArrayIDFunc<int>(preimage_count), image_count_(image_count){}
 
+	ArrayIDIDFunc(int preimage_count, int image_count, int*data, std::shared_ptr<void>data_owner)
+		:ArrayIDFunc<int>(preimage_count, data, std::move(data_owner)), image_count_(image_count){}
+
 	ArrayIDIDFunc(const ArrayIDIDFunc&o) = default;
 	ArrayIDIDFunc(ArrayIDIDFunc&&) = default;
 	ArrayIDIDFunc&operator=(const ArrayIDIDFunc&) = default;
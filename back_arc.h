@@ -5,6 +5,33 @@
 #include "id_sort.h"
 
 #include <iterator>
+#include <stdexcept>
+#include <string>
+
+// The arcs must be sorted first by tail and then by head and there must be no multi arcs. For every node y, the
+// arcs into y are then visited in increasing tail order and the arcs out of y are stored in increasing head order.
+// Both enumerate the neighbors of y in the same order and thus the back arcs are matched in a single pass.
+template<class Tail, class Head>
+ArrayIDIDFunc compute_back_arc_permutation_of_strictly_sorted_arcs(const Tail&tail, const Head&head){
+	const int arc_count = head.preimage_count();
+	const int node_count = head.image_count();
+
+	ArrayIDFunc<int>next_out_arc(node_count);
+	next_out_arc.fill(arc_count);
+	for(int i=arc_count-1; i>=0; --i)
+		next_out_arc[tail(i)] = i;
+
+	ArrayIDIDFunc back_arc(arc_count, arc_count);
+	for(int xy=0; xy<arc_count; ++xy){
+		int x = tail(xy), y = head(xy);
+		int yx = next_out_arc(y);
+		if(yx >= arc_count || tail(yx) != y || head(yx) != x)
+			throw std::runtime_error("Cannot compute back arc if graph is not symmetric, arc with ID "+std::to_string(xy)+" has no backarc");
+		back_arc[xy] = yx;
+		++next_out_arc[y];
+	}
+	return back_arc;
+}
 
 // Input graph must be symmetric
 template<class Tail, class Head>
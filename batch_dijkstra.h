@@ -0,0 +1,141 @@
+#ifndef BATCH_DIJKSTRA_H
+#define BATCH_DIJKSTRA_H
+
+#include "dijkstra.h"
+#include "tiny_id_func.h"
+#include "array_id_func.h"
+#include "heap.h"
+#include "cancellation.h"
+#include <vector>
+#include <string>
+#include <limits>
+#include <algorithm>
+#include <omp.h>
+
+//! The buffers that a thread reuses for all of its searches. Only one of the queues is allocated, see
+//! is_radix_heap_applicable.
+struct DijkstraThreadData{
+	DijkstraThreadData(int node_count, bool use_radix_heap):
+		visited(node_count), dist(node_count),
+		queue(use_radix_heap ? 0 : node_count), radix_queue(use_radix_heap ? node_count : 0),
+		use_radix_heap(use_radix_heap), stack(node_count){}
+
+	template<class OutArc, class Head, class Weight>
+	void compute_distances(const OutArc&out, const Head&head, const Weight&weight, int source_node, ArrayIDFunc<int>&dist){
+		if(use_radix_heap)
+			::compute_distances(out, head, weight, source_node, visited, dist, radix_queue);
+		else
+			::compute_distances(out, head, weight, source_node, visited, dist, queue);
+	}
+
+	BitIDFunc visited;
+	ArrayIDFunc<int>dist;
+	min_id_heap<int>queue;
+	min_id_radix_heap<int>radix_queue;
+	bool use_radix_heap;
+	ArrayIDFunc<int>stack;
+};
+
+//! Calls compute(thread_data, source, result) for every source in source_list on thread_count threads and
+//! consume(i, source_list[i], result) for i = 0, 1, 2, ... in order from the calling thread. The sources are
+//! processed in batches of two sources per thread. While the threads compute a batch, the calling thread
+//! first consumes the results of the previous batch and then joins the computation. Hence, only the results
+//! of two batches are in memory at any time. The result objects are reused, so compute should reuse their
+//! memory. use_radix_heap selects the queue of the thread data.
+template<class Result, class Compute, class Consume>
+void for_each_source_in_parallel(
+	int node_count, bool use_radix_heap, const std::vector<int>&source_list, int thread_count,
+	const Compute&compute, const Consume&consume
+){
+	if(thread_count < 1)
+		thread_count = 1;
+	const int source_count = source_list.size();
+	const int batch_size = 2*thread_count;
+
+	std::vector<DijkstraThreadData>thread_data(thread_count, DijkstraThreadData(node_count, use_radix_heap));
+	std::vector<Result>result[2] = {std::vector<Result>(batch_size), std::vector<Result>(batch_size)};
+
+	auto consume_batch = [&](int batch_begin, const std::vector<Result>&batch_result){
+		int batch_end = std::min(batch_begin + batch_size, source_count);
+		for(int i=batch_begin; i<batch_end; ++i)
+			consume(i, source_list[i], batch_result[i-batch_begin]);
+	};
+
+	int previous_batch_begin = -1;
+	for(int batch_begin = 0; batch_begin < source_count; batch_begin += batch_size){
+		int batch_end = std::min(batch_begin + batch_size, source_count);
+		auto&current_result = result[(batch_begin/batch_size)%2];
+		auto&previous_result = result[1-(batch_begin/batch_size)%2];
+
+		auto cancellation = current_cancellation();
+		#pragma omp parallel num_threads(thread_count)
+		{
+			CurrentCancellationScope cancellation_scope(cancellation);
+			#pragma omp master
+			{
+				if(previous_batch_begin != -1)
+					consume_batch(previous_batch_begin, previous_result);
+			}
+
+			int thread_id = omp_get_thread_num();
+			#pragma omp for schedule(dynamic)
+			for(int i=batch_begin; i<batch_end; ++i)
+				compute(thread_data[thread_id], source_list[i], current_result[i-batch_begin]);
+		}
+
+		previous_batch_begin = batch_begin;
+	}
+
+	if(previous_batch_begin != -1)
+		consume_batch(previous_batch_begin, result[(previous_batch_begin/batch_size)%2]);
+}
+
+//! Computes the distances from every source in source_list in parallel. on_distances(i, source, dist) is
+//! called in the order of source_list. Unreachable nodes have distance numeric_limits<int>::max().
+template<class OutArc, class Head, class Weight, class OnDistances>
+void compute_distances_from_sources(
+	const OutArc&out, const Head&head, const Weight&weight,
+	const std::vector<int>&source_list, int thread_count,
+	const OnDistances&on_distances
+){
+	const int node_count = head.image_count();
+
+	for_each_source_in_parallel<ArrayIDFunc<int>>(
+		node_count, is_radix_heap_applicable(weight), source_list, thread_count,
+		[&](DijkstraThreadData&data, int source, ArrayIDFunc<int>&dist){
+			if(dist.preimage_count() != node_count)
+				dist = ArrayIDFunc<int>(node_count);
+			dist.fill(std::numeric_limits<int>::max());
+			data.compute_distances(out, head, weight, source, dist);
+		},
+		on_distances
+	);
+}
+
+//! Like depth_first_traverse_shortest_path_tree for every source in source_list but in parallel. The trees are
+//! written as labeled parenthesis lists, i.e., every node is printed when it is first and last visited followed
+//! by a space. on_tree(i, source, tree) is called in the order of source_list.
+template<class OutArc, class Head, class Weight, class OnTree>
+void compute_shortest_path_trees_from_sources(
+	const OutArc&out, const Head&head, const Weight&weight,
+	const std::vector<int>&source_list, int thread_count,
+	const OnTree&on_tree
+){
+	const int node_count = head.image_count();
+
+	for_each_source_in_parallel<std::string>(
+		node_count, is_radix_heap_applicable(weight), source_list, thread_count,
+		[&](DijkstraThreadData&data, int source, std::string&tree){
+			tree.clear();
+			auto print = [&](int x){
+				tree += std::to_string(x);
+				tree += ' ';
+			};
+			data.compute_distances(out, head, weight, source, data.dist);
+			depth_first_traverse_shortest_path_tree(out, head, weight, data.dist, source, print, print, data.visited, data.stack);
+		},
+		on_tree
+	);
+}
+
+#endif
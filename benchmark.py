@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+################################################################################
+## Benchmarks the node orders of the console on generated graphs
+##
+## Every order is computed in its own console process. We record the running
+## time of the reorder command, the peak resident set size of the process once
+## the order is computed and the quality of the order, i.e., the fill-in, the
+## elimination tree height and the maximum bag size of the corresponding tree
+## decomposition.
+##
+## Usage:
+##
+##   ./benchmark.py --output results.json
+##   ./benchmark.py --output new.json --baseline results.json
+##
+## With --baseline the results are compared against an earlier run. The script
+## exits with status 1 if an order got slower, needs more memory or has a
+## different quality.
+##
+
+import sys, os, re, json, time, argparse, platform, subprocess
+
+################################################################################
+## Suite
+##
+
+# name, console command to generate the graph, whether the graph has coordinates, whether the graph is large
+graph_list = [
+	("grid_50", ["make_grid", "50"], True, False),
+	("grid_100", ["make_grid", "100"], True, True),
+	("hypercube_8", ["generate_hypercube", "8"], False, False),
+	("hypercube_10", ["generate_hypercube", "10"], False, True),
+	("random_tree_100000", ["generate_random_tree", "100000"], False, False),
+]
+
+# name, console command to reorder the nodes, whether coordinates are needed, whether the order is too slow for large graphs
+order_list = [
+	("flow_cutter_cch", ["reorder_nodes_in_flow_cutter_cch_order"], False, False),
+	("flow_cutter_nested_dissection", ["reorder_nodes_in_flow_cutter_nested_dissection_order"], False, False),
+	("flow_cutter_small_tree_width", ["reorder_nodes_in_flow_cutter_small_tree_width_order"], False, True),
+	("inertial_flow_cch", ["reorder_nodes_in_inertial_flow_cch_order", "0.2"], True, False),
+	("inertial_flow_nested_dissection", ["reorder_nodes_in_inertial_flow_nested_dissection_order", "0.2"], True, False),
+	("greedy_min_degree", ["reorder_nodes_in_greedy_min_degree_order"], False, False),
+	("greedy_min_shortcut", ["reorder_nodes_in_greedy_min_shortcut_order"], False, True),
+]
+
+################################################################################
+## Running a single benchmark
+##
+
+def parse_value(output, name):
+	m = re.search(r"^\s*"+re.escape(name)+r"\s*:\s*(\S+)\s*$", output, re.M)
+	if m == None:
+		raise RuntimeError("The console did not report "+name+":\n"+output)
+	return m.group(1)
+
+def run_console(console, args):
+	# stderr is merged into stdout so that we can read both without deadlocking
+	p = subprocess.Popen([console] + args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+	output = p.communicate()[0]
+	return output.decode(), p.returncode
+
+def run_benchmark(console, graph_command, order_command, settings):
+	args = list(graph_command)
+	for var, val in settings:
+		args += ["flow_cutter_set", var, val]
+	args += ["stats", "report_time"] + order_command + ["do_not_report_time", "print_peak_memory_usage", "examine_chordal_supergraph"]
+
+	stdout, returncode = run_console(console, args)
+	if returncode != 0 or re.search(r"^Exception", stdout, re.M):
+		raise RuntimeError(" ".join([console] + args) + " failed:\n" + stdout)
+
+	m = re.search(r"^running time : (\d+)musec$", stdout, re.M)
+	if m == None:
+		raise RuntimeError("The console did not report the running time:\n"+stdout)
+
+	edge_count = int(parse_value(stdout, "arc_count")) // 2
+	upward_arc_count = int(parse_value(stdout, "super_graph_upward_arc_count"))
+
+	return {
+		"node_count" : int(parse_value(stdout, "node_count")),
+		"edge_count" : edge_count,
+		"time_musec" : int(m.group(1)),
+		"peak_rss_kib" : int(parse_value(stdout, "peak resident set size")),
+		"fill_in" : upward_arc_count - edge_count,
+		"elimination_tree_height" : int(parse_value(stdout, "elimination tree height")),
+		"max_bag_size" : int(parse_value(stdout, "upper tree width bound")) + 1,
+	}
+
+################################################################################
+## Comparing against a baseline
+##
+
+quality_keys = ["fill_in", "elimination_tree_height", "max_bag_size"]
+
+def compare_to_baseline(results, baseline, time_tolerance, memory_tolerance):
+	old = dict(((r["graph"], r["order"]), r) for r in baseline["results"])
+
+	regression_count = 0
+	for r in results:
+		key = (r["graph"], r["order"])
+		if not key in old:
+			print("new      "+r["graph"]+" "+r["order"])
+			continue
+		o = old[key]
+		problems = []
+		if r["time_musec"] > o["time_musec"] * (1.0 + time_tolerance):
+			problems.append("time %d -> %d musec (%+.1f%%)" % (o["time_musec"], r["time_musec"], 100.0*(r["time_musec"] - o["time_musec"])/max(o["time_musec"], 1)))
+		if r["peak_rss_kib"] > o["peak_rss_kib"] * (1.0 + memory_tolerance):
+			problems.append("peak rss %d -> %d KiB" % (o["peak_rss_kib"], r["peak_rss_kib"]))
+		for q in quality_keys:
+			if r[q] != o[q]:
+				problems.append("%s %d -> %d" % (q, o[q], r[q]))
+
+		if len(problems) == 0:
+			print("ok       "+r["graph"]+" "+r["order"]+" (%d -> %d musec)" % (o["time_musec"], r["time_musec"]))
+		else:
+			regression_count += 1
+			print("CHANGED  "+r["graph"]+" "+r["order"]+" : "+", ".join(problems))
+
+	return regression_count
+
+################################################################################
+## Main
+##
+
+def get_revision():
+	try:
+		return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.STDOUT).decode().strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmarks the node orders of the console.")
+	parser.add_argument("--console", default="./console", help="console binary to benchmark")
+	parser.add_argument("--output", help="JSON file to which the results are written")
+	parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+	parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the minimum time and memory are reported")
+	parser.add_argument("--graph", action="append", help="only run these graphs")
+	parser.add_argument("--order", action="append", help="only run these orders, explicitly selected orders also run on large graphs")
+	parser.add_argument("--set", nargs=2, action="append", default=[], metavar=("VAR", "VAL"), help="flow_cutter_set VAR VAL before ordering")
+	parser.add_argument("--time-tolerance", type=float, default=0.1, help="relative slowdown that is no regression")
+	parser.add_argument("--memory-tolerance", type=float, default=0.1, help="relative memory increase that is no regression")
+	parser.add_argument("--list", action="store_true", help="list the graphs and orders")
+	args = parser.parse_args()
+
+	if args.list:
+		print("graphs: "+" ".join(g[0] for g in graph_list))
+		print("orders: "+" ".join(o[0] for o in order_list))
+		return 0
+
+	for name in (args.graph or []):
+		if not name in [g[0] for g in graph_list]:
+			parser.error("unknown graph "+name)
+	for name in (args.order or []):
+		if not name in [o[0] for o in order_list]:
+			parser.error("unknown order "+name)
+
+	results = []
+	for graph_name, graph_command, has_geo_pos, is_large in graph_list:
+		if args.graph and not graph_name in args.graph:
+			continue
+		for order_name, order_command, needs_geo_pos, is_slow in order_list:
+			if args.order and not order_name in args.order:
+				continue
+			if needs_geo_pos and not has_geo_pos:
+				continue
+			if is_slow and is_large and not args.order:
+				continue
+
+			runs = [run_benchmark(args.console, graph_command, order_command, args.set) for i in range(args.repeat)]
+			r = dict(runs[0])
+			r["time_musec"] = min(x["time_musec"] for x in runs)
+			r["peak_rss_kib"] = min(x["peak_rss_kib"] for x in runs)
+			for q in quality_keys:
+				if any(x[q] != r[q] for x in runs):
+					print("warning: "+order_name+" on "+graph_name+" is not deterministic", file=sys.stderr)
+
+			r["graph"] = graph_name
+			r["order"] = order_name
+			results.append(r)
+			print("%-20s %-32s %10d musec %8d KiB fill-in %10d height %6d bag %6d" % (
+				graph_name, order_name, r["time_musec"], r["peak_rss_kib"],
+				r["fill_in"], r["elimination_tree_height"], r["max_bag_size"]
+			))
+			sys.stdout.flush()
+
+	output = {
+		"revision" : get_revision(),
+		"console" : args.console,
+		"settings" : args.set,
+		"repeat" : args.repeat,
+		"host" : platform.node(),
+		"date" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"results" : results,
+	}
+
+	if args.output:
+		with open(args.output, "w") as f:
+			json.dump(output, f, indent=1, sort_keys=True)
+
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+		if baseline.get("settings") != args.set:
+			print("warning: the baseline was run with different settings", file=sys.stderr)
+		if compare_to_baseline(results, baseline, args.time_tolerance, args.memory_tolerance) != 0:
+			return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
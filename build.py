@@ -27,6 +27,12 @@ ignore_warnings = ("--ignore-warnings" in sys.argv)
 # Get rid of GPL dependencies
 no_gpl = ("--no-gpl" in sys.argv)
 
+# Count and time the phases of the cutters, see cutter_statistics.h. Combine with --clean when toggling.
+cutter_statistics = ("--cutter-statistics" in sys.argv)
+
+# Decompress zstd inputs, needs libzstd. Combine with --clean when toggling.
+use_zstd = ("--zstd" in sys.argv)
+
 # Clean up after being finished?
 show_header_scanning = ("--show-header-scanning" in sys.argv)
 
@@ -42,8 +48,15 @@ else:
 if no_gpl:
 	compiler_settings += ["-DNO_GPL"]
 
+if cutter_statistics:
+	compiler_settings += ["-DFLOW_CUTTER_STATISTICS"]
+
 linker_settings = []
 
+if use_zstd:
+	compiler_settings += ["-DUSE_ZSTD"]
+	linker_settings += ["-lzstd"]
+
 source_extensions = [".cpp", ".cxx"]
 header_extensions = [".h", ".hpp", ".hxx"]
 
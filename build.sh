@@ -1,4 +1,4 @@
 #!/bin/sh
 
-mpicxx -I. -std=c++0x -DUSE_KAHIP -O3 -DNEBUG console.cpp .fancy_input.o .greedy_order.o .permutation.o .list_graph.o .file_utility.o .geo_pos.o -lpthread -lreadline -L. -lkahip -fopenmp -lm -o console_with_kahip
+mpicxx -I. -std=c++0x -DUSE_KAHIP -O3 -DNEBUG console.cpp .fancy_input.o .greedy_order.o .permutation.o .list_graph.o .file_utility.o .geo_pos.o .mapped_file.o .file_cache.o .command_server.o .compressed_file.o .worker_process_pool.o -lpthread -lz -lreadline -L. -lkahip -fopenmp -lm -o console_with_kahip
 
@@ -0,0 +1,51 @@
+#ifndef CANCELLATION_H
+#define CANCELLATION_H
+
+#include <atomic>
+
+//!
+//! An exception must not leave an OpenMP parallel region or task. Code running in one can therefore not simply
+//! fail. It instead cancels the computation by setting the flag of the current Cancellation. The long running
+//! loops poll is_computation_cancelled() and stop early. Their results are then incomplete and must be discarded
+//! by whoever owns the Cancellation.
+//!
+//! Every thread has a current Cancellation, which is nullptr by default. The threads of a parallel region do not
+//! inherit it from the thread that starts the region. Every parallel region therefore hands it on using
+//! CurrentCancellationScope.
+//!
+struct Cancellation{
+	constexpr Cancellation():is_cancelled(false){}
+
+	std::atomic<bool>is_cancelled;
+};
+
+inline
+Cancellation*&current_cancellation(){
+	static thread_local Cancellation*cancellation = nullptr;
+	return cancellation;
+}
+
+inline
+bool is_computation_cancelled(){
+	Cancellation*c = current_cancellation();
+	return c != nullptr && c->is_cancelled.load(std::memory_order_relaxed);
+}
+
+//! Makes c the current Cancellation of the thread until the scope ends
+class CurrentCancellationScope{
+public:
+	explicit CurrentCancellationScope(Cancellation*c):previous(current_cancellation()){
+		current_cancellation() = c;
+	}
+
+	~CurrentCancellationScope(){
+		current_cancellation() = previous;
+	}
+
+	CurrentCancellationScope(const CurrentCancellationScope&) = delete;
+	CurrentCancellationScope&operator=(const CurrentCancellationScope&) = delete;
+private:
+	Cancellation*previous;
+};
+
+#endif
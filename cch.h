@@ -0,0 +1,234 @@
+#ifndef CCH_H
+#define CCH_H
+
+#include "array_id_func.h"
+#include "id_multi_func.h"
+#include <vector>
+#include <algorithm>
+#include <limits>
+#include <iterator>
+#include <cassert>
+
+//!
+//! A Customizable Contraction Hierarchy. The nodes are contracted by increasing ID, i.e., the current node
+//! order is the contraction order. The hierarchy consists of the upward arcs of the chordal supergraph, which
+//! only depend on the graph structure. The customization computes the weights of these arcs for some arc
+//! weights of the graph. Afterwards, queries walk up the elimination tree and do not need a priority queue.
+//!
+//! Every upward arc x->y with x<y has a forward weight for the direction from x to y and a backward weight for
+//! the direction from y to x. Unreachable pairs have the distance cch::inf.
+//!
+
+namespace cch{
+
+	// The sum of two distances does not overflow
+	const int inf = std::numeric_limits<int>::max()/2;
+
+	class CustomizableContractionHierarchy{
+	public:
+		//! The graph must be symmetric.
+		template<class Tail, class Head>
+		CustomizableContractionHierarchy(const Tail&tail, const Head&head){
+			const int node_count = tail.image_count();
+			const int input_arc_count = tail.preimage_count();
+
+			// The upward neighbors of x without its parent are upward neighbors of the parent
+			std::vector<std::vector<int>>up(node_count);
+			for(int xy=0; xy<input_arc_count; ++xy)
+				if(tail(xy) < head(xy))
+					up[tail(xy)].push_back(head(xy));
+
+			parent = ArrayIDFunc<int>(node_count);
+			std::vector<int>merged;
+			for(int x=0; x<node_count; ++x){
+				std::sort(up[x].begin(), up[x].end());
+				up[x].erase(std::unique(up[x].begin(), up[x].end()), up[x].end());
+				if(up[x].empty()){
+					parent[x] = -1;
+				}else{
+					int p = up[x].front();
+					parent[x] = p;
+					merged.clear();
+					std::sort(up[p].begin(), up[p].end());
+					std::set_union(up[x].begin()+1, up[x].end(), up[p].begin(), up[p].end(), std::back_inserter(merged));
+					up[p].swap(merged);
+				}
+			}
+
+			int arc_count = 0;
+			for(auto&n:up)
+				arc_count += n.size();
+
+			first_up_arc = ArrayIDFunc<int>(node_count+1);
+			up_tail = ArrayIDFunc<int>(arc_count);
+			up_head = ArrayIDFunc<int>(arc_count);
+			int a = 0;
+			for(int x=0; x<node_count; ++x){
+				first_up_arc[x] = a;
+				for(auto y:up[x]){
+					up_tail[a] = x;
+					up_head[a] = y;
+					++a;
+				}
+				std::vector<int>().swap(up[x]);
+			}
+			first_up_arc[node_count] = a;
+
+			// The arcs x->y of y ordered by x
+			first_down_arc = ArrayIDFunc<int>(node_count+1);
+			first_down_arc.fill(0);
+			for(int xy=0; xy<arc_count; ++xy)
+				++first_down_arc[up_head(xy)+1];
+			for(int x=0; x<node_count; ++x)
+				first_down_arc[x+1] += first_down_arc(x);
+			down_arc = ArrayIDFunc<int>(arc_count);
+			{
+				ArrayIDFunc<int>next(node_count);
+				for(int x=0; x<node_count; ++x)
+					next[x] = first_down_arc(x);
+				for(int xy=0; xy<arc_count; ++xy)
+					down_arc[next[up_head(xy)]++] = xy;
+			}
+
+			// A node only depends on its descendants in the elimination tree, which all have a smaller height
+			ArrayIDFunc<int>height(node_count);
+			height.fill(0);
+			int max_height = 0;
+			for(int x=0; x<node_count; ++x){
+				if(parent(x) != -1)
+					height[parent(x)] = std::max(height(parent(x)), height(x)+1);
+				max_height = std::max(max_height, height(x));
+			}
+			first_node_of_level = ArrayIDFunc<int>(node_count == 0 ? 1 : max_height+2);
+			first_node_of_level.fill(0);
+			for(int x=0; x<node_count; ++x)
+				++first_node_of_level[height(x)+1];
+			for(int l=0; l+1<first_node_of_level.preimage_count(); ++l)
+				first_node_of_level[l+1] += first_node_of_level(l);
+			node_by_level = ArrayIDFunc<int>(node_count);
+			{
+				ArrayIDFunc<int>next(first_node_of_level.preimage_count());
+				for(int l=0; l<first_node_of_level.preimage_count(); ++l)
+					next[l] = first_node_of_level(l);
+				for(int x=0; x<node_count; ++x)
+					node_by_level[next[height(x)]++] = x;
+			}
+
+			forward_weight = ArrayIDFunc<int>(arc_count);
+			backward_weight = ArrayIDFunc<int>(arc_count);
+			forward_weight.fill(inf);
+			backward_weight.fill(inf);
+		}
+
+		int node_count()const{
+			return parent.preimage_count();
+		}
+
+		int arc_count()const{
+			return up_head.preimage_count();
+		}
+
+		int get_parent(int x)const{
+			return parent(x);
+		}
+
+		//! The graph must be the one that was given to the constructor. Weights must be non-negative and smaller than
+		//! inf. The lower triangles of the nodes of the same elimination tree height are enumerated in parallel.
+		template<class Tail, class Head, class ArcWeight>
+		void customize(const Tail&tail, const Head&head, const ArcWeight&arc_weight, int thread_count = 1){
+			forward_weight.fill(inf);
+			backward_weight.fill(inf);
+
+			for(int xy=0; xy<tail.preimage_count(); ++xy){
+				int x = tail(xy), y = head(xy);
+				if(x < y){
+					int a = find_arc(x, y);
+					forward_weight[a] = std::min(forward_weight(a), arc_weight(xy));
+				}else if(y < x){
+					int a = find_arc(y, x);
+					backward_weight[a] = std::min(backward_weight(a), arc_weight(xy));
+				}
+			}
+
+			for(int l=0; l+1<first_node_of_level.preimage_count(); ++l){
+				const int level_begin = first_node_of_level(l), level_end = first_node_of_level(l+1);
+				#pragma omp parallel for schedule(dynamic, 64) num_threads(thread_count) if(thread_count > 1 && level_end - level_begin > 64)
+				for(int i=level_begin; i<level_end; ++i)
+					customize_node(node_by_level(i));
+			}
+		}
+
+		class Query{
+		public:
+			explicit Query(const CustomizableContractionHierarchy&ch):
+				ch(ch), forward_dist(ch.node_count()), backward_dist(ch.node_count()){
+				forward_dist.fill(inf);
+				backward_dist.fill(inf);
+			}
+
+			//! Returns the distance from s to t or inf if t is not reachable from s.
+			int run(int s, int t){
+				forward_dist[s] = 0;
+				for(int x=s; x!=-1; x=ch.parent(x))
+					for(int xy=ch.first_up_arc(x); xy<ch.first_up_arc(x+1); ++xy)
+						forward_dist[ch.up_head(xy)] = std::min(forward_dist(ch.up_head(xy)), forward_dist(x) + ch.forward_weight(xy));
+
+				backward_dist[t] = 0;
+				for(int x=t; x!=-1; x=ch.parent(x))
+					for(int xy=ch.first_up_arc(x); xy<ch.first_up_arc(x+1); ++xy)
+						backward_dist[ch.up_head(xy)] = std::min(backward_dist(ch.up_head(xy)), backward_dist(x) + ch.backward_weight(xy));
+
+				// Only the common ancestors of s and t have a finite distance in both directions
+				int dist = inf;
+				for(int x=t; x!=-1; x=ch.parent(x))
+					dist = std::min(dist, forward_dist(x) + backward_dist(x));
+
+				for(int x=s; x!=-1; x=ch.parent(x))
+					forward_dist[x] = inf;
+				for(int x=t; x!=-1; x=ch.parent(x))
+					backward_dist[x] = inf;
+
+				return dist;
+			}
+
+		private:
+			const CustomizableContractionHierarchy&ch;
+			ArrayIDFunc<int>forward_dist, backward_dist;
+		};
+
+	private:
+		int find_arc(int x, int y)const{
+			auto begin = up_head.begin() + first_up_arc(x), end = up_head.begin() + first_up_arc(x+1);
+			auto pos = std::lower_bound(begin, end, y);
+			assert(pos != end && *pos == y);
+			return pos - up_head.begin();
+		}
+
+		// Relaxes the arcs y->z of y using all lower triangles x->y, x->z, y->z
+		void customize_node(int y){
+			for(int i=first_down_arc(y); i<first_down_arc(y+1); ++i){
+				int xy = down_arc(i);
+				int x = up_tail(xy);
+				int yz = first_up_arc(y);
+				// The heads of x above y are a subset of the heads of y as the graph is chordal
+				for(int xz=xy+1; xz<first_up_arc(x+1); ++xz){
+					int z = up_head(xz);
+					while(up_head(yz) != z){
+						++yz;
+						assert(yz < first_up_arc(y+1));
+					}
+					forward_weight[yz] = std::min(forward_weight(yz), backward_weight(xy) + forward_weight(xz));
+					backward_weight[yz] = std::min(backward_weight(yz), backward_weight(xz) + forward_weight(xy));
+				}
+			}
+		}
+
+		ArrayIDFunc<int>parent;
+		ArrayIDFunc<int>first_up_arc, up_tail, up_head;
+		ArrayIDFunc<int>first_down_arc, down_arc;
+		ArrayIDFunc<int>first_node_of_level, node_by_level;
+		ArrayIDFunc<int>forward_weight, backward_weight;
+	};
+}
+
+#endif
@@ -0,0 +1,294 @@
+#include "command_server.h"
+
+#include <iostream>
+#include <streambuf>
+#include <stdexcept>
+#include <thread>
+#include <mutex>
+#include <condition_variable>
+#include <atomic>
+#include <cstring>
+#include <iterator>
+#include <algorithm>
+
+#ifndef _WIN32
+#include <errno.h>
+#include <signal.h>
+#include <unistd.h>
+#include <sys/stat.h>
+#include <sys/socket.h>
+#include <sys/un.h>
+#endif
+
+#ifndef _WIN32
+
+namespace{
+	thread_local std::streambuf*thread_output = nullptr;
+
+	// Installed as buffer of std::cout. Forwards to the buffer of the calling thread's session or, if the
+	// thread does not belong to a session, to the original buffer of std::cout. It has no own buffer and
+	// therefore no state shared between threads.
+	class ThreadOutputStreamBuffer : public std::streambuf{
+	public:
+		explicit ThreadOutputStreamBuffer(std::streambuf*fallback):fallback(fallback){}
+
+	protected:
+		int overflow(int c)override{
+			if(traits_type::eq_int_type(c, traits_type::eof()))
+				return traits_type::not_eof(c);
+			return target()->sputc(traits_type::to_char_type(c));
+		}
+
+		std::streamsize xsputn(const char*s, std::streamsize n)override{
+			return target()->sputn(s, n);
+		}
+
+		int sync()override{
+			return target()->pubsync();
+		}
+
+	private:
+		std::streambuf*target(){
+			return thread_output != nullptr ? thread_output : fallback;
+		}
+
+		std::streambuf*fallback;
+	};
+
+	class SocketStreamBuffer : public std::streambuf{
+	public:
+		explicit SocketStreamBuffer(int fd):fd(fd){
+			setg(in_buffer, in_buffer, in_buffer);
+			setp(out_buffer, out_buffer + buffer_size);
+		}
+
+		~SocketStreamBuffer(){
+			flush_output();
+		}
+
+	protected:
+		int underflow()override{
+			ssize_t n;
+			do{
+				n = read(fd, in_buffer, buffer_size);
+			}while(n == -1 && errno == EINTR);
+			if(n <= 0)
+				return traits_type::eof();
+			setg(in_buffer, in_buffer, in_buffer + n);
+			return traits_type::to_int_type(*gptr());
+		}
+
+		int overflow(int c)override{
+			if(flush_output() == -1)
+				return traits_type::eof();
+			if(!traits_type::eq_int_type(c, traits_type::eof())){
+				*pptr() = traits_type::to_char_type(c);
+				pbump(1);
+			}
+			return traits_type::not_eof(c);
+		}
+
+		int sync()override{
+			return flush_output();
+		}
+
+	private:
+		int flush_output(){
+			const char*p = pbase();
+			while(p != pptr()){
+				ssize_t n = write(fd, p, pptr() - p);
+				if(n == -1){
+					if(errno == EINTR)
+						continue;
+					// The client is gone. Drop the output.
+					setp(out_buffer, out_buffer + buffer_size);
+					return -1;
+				}
+				p += n;
+			}
+			setp(out_buffer, out_buffer + buffer_size);
+			return 0;
+		}
+
+		static const int buffer_size = 1<<16;
+
+		int fd;
+		char in_buffer[buffer_size];
+		char out_buffer[buffer_size];
+	};
+
+	sockaddr_un make_socket_address(const std::string&socket_path){
+		sockaddr_un addr;
+		std::memset(&addr, 0, sizeof(addr));
+		addr.sun_family = AF_UNIX;
+		if(socket_path.size() >= sizeof(addr.sun_path))
+			throw std::runtime_error("The socket path "+socket_path+" is too long");
+		std::strcpy(addr.sun_path, socket_path.c_str());
+		return addr;
+	}
+
+	int connect_to_socket(const std::string&socket_path){
+		sockaddr_un addr = make_socket_address(socket_path);
+		int fd = socket(AF_UNIX, SOCK_STREAM, 0);
+		if(fd == -1)
+			throw std::runtime_error(std::string("Could not create socket : ")+strerror(errno));
+		if(connect(fd, reinterpret_cast<sockaddr*>(&addr), sizeof(addr)) == -1){
+			int error_code = errno;
+			close(fd);
+			throw std::runtime_error("Could not connect to "+socket_path+" : "+strerror(error_code));
+		}
+		return fd;
+	}
+
+	std::mutex server_lock;
+	std::condition_variable session_ended;
+	int active_session_count = 0;
+	std::string server_socket_path;
+	std::atomic<bool> stop_requested(false);
+}
+
+void run_command_server(const std::string&socket_path, const std::function<void(std::istream&)>&session){
+	// Writing to a closed client must not kill the server
+	signal(SIGPIPE, SIG_IGN);
+
+	sockaddr_un addr = make_socket_address(socket_path);
+
+	struct stat st;
+	if(lstat(socket_path.c_str(), &st) == 0){
+		if(!S_ISSOCK(st.st_mode))
+			throw std::runtime_error("The file "+socket_path+" exists and is no socket");
+		unlink(socket_path.c_str());
+	}
+
+	int listen_fd = socket(AF_UNIX, SOCK_STREAM, 0);
+	if(listen_fd == -1)
+		throw std::runtime_error(std::string("Could not create socket : ")+strerror(errno));
+	if(bind(listen_fd, reinterpret_cast<sockaddr*>(&addr), sizeof(addr)) == -1 || listen(listen_fd, 64) == -1){
+		int error_code = errno;
+		close(listen_fd);
+		throw std::runtime_error("Could not listen on "+socket_path+" : "+strerror(error_code));
+	}
+
+	{
+		std::lock_guard<std::mutex>guard(server_lock);
+		server_socket_path = socket_path;
+		stop_requested = false;
+	}
+
+	std::streambuf*original_cout_buffer = std::cout.rdbuf();
+	ThreadOutputStreamBuffer cout_buffer(original_cout_buffer);
+	std::cout.flush();
+	std::cout.rdbuf(&cout_buffer);
+
+	for(;;){
+		int client_fd = accept(listen_fd, nullptr, nullptr);
+		if(stop_requested){
+			if(client_fd != -1)
+				close(client_fd);
+			break;
+		}
+		if(client_fd == -1){
+			if(errno == EINTR || errno == ECONNABORTED)
+				continue;
+			int error_code = errno;
+			std::cerr << "Could not accept client : " << strerror(error_code) << std::endl;
+			break;
+		}
+
+		{
+			std::lock_guard<std::mutex>guard(server_lock);
+			++active_session_count;
+		}
+
+		std::thread(
+			[client_fd, &session]{
+				{
+					SocketStreamBuffer buffer(client_fd);
+					std::istream in(&buffer);
+					thread_output = &buffer;
+					try{
+						session(in);
+					}catch(std::exception&err){
+						std::cerr << "Exception in session : " << err.what() << std::endl;
+					}
+					std::cout.flush();
+					thread_output = nullptr;
+				}
+				close(client_fd);
+
+				std::lock_guard<std::mutex>guard(server_lock);
+				--active_session_count;
+				session_ended.notify_all();
+			}
+		).detach();
+	}
+
+	close(listen_fd);
+
+	{
+		std::unique_lock<std::mutex>guard(server_lock);
+		session_ended.wait(guard, []{return active_session_count == 0;});
+		server_socket_path.clear();
+	}
+
+	std::cout.rdbuf(original_cout_buffer);
+	unlink(socket_path.c_str());
+}
+
+void stop_command_server(){
+	std::string socket_path;
+	{
+		std::lock_guard<std::mutex>guard(server_lock);
+		if(server_socket_path.empty())
+			throw std::runtime_error("No command server is running");
+		socket_path = server_socket_path;
+	}
+
+	stop_requested = true;
+	// Wake up the server that waits for a new client
+	try{
+		close(connect_to_socket(socket_path));
+	}catch(std::runtime_error&){}
+}
+
+void connect_to_command_server(const std::string&socket_path, std::istream&in, std::ostream&out){
+	signal(SIGPIPE, SIG_IGN);
+
+	int fd = connect_to_socket(socket_path);
+
+	std::thread receiver(
+		[fd, &out]{
+			SocketStreamBuffer buffer(fd);
+			std::copy(std::istreambuf_iterator<char>(&buffer), std::istreambuf_iterator<char>(), std::ostreambuf_iterator<char>(out));
+			out.flush();
+		}
+	);
+
+	{
+		SocketStreamBuffer buffer(fd);
+		std::ostream socket_out(&buffer);
+		std::string line;
+		while(std::getline(in, line))
+			socket_out << line << std::endl;
+	}
+	shutdown(fd, SHUT_WR);
+
+	receiver.join();
+	close(fd);
+}
+
+#else
+
+void run_command_server(const std::string&, const std::function<void(std::istream&)>&){
+	throw std::runtime_error("The command server is not supported on Windows");
+}
+
+void stop_command_server(){
+	throw std::runtime_error("The command server is not supported on Windows");
+}
+
+void connect_to_command_server(const std::string&, std::istream&, std::ostream&){
+	throw std::runtime_error("The command server is not supported on Windows");
+}
+
+#endif
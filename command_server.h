@@ -0,0 +1,27 @@
+#ifndef COMMAND_SERVER_H
+#define COMMAND_SERVER_H
+
+#include <string>
+#include <istream>
+#include <ostream>
+#include <functional>
+
+//!
+//! A line based command server on a Unix domain socket. Every client that connects gets its own session
+//! that runs in a separate thread. The session reads the commands from the stream it is given. Everything
+//! that the session thread writes to std::cout is sent to its client. A session ends when the client
+//! closes its side of the connection or when the session function returns.
+//!
+//! Not supported on Windows.
+//!
+
+// Blocks until stop_command_server is called and all sessions have ended. An existing socket file is replaced.
+void run_command_server(const std::string&socket_path, const std::function<void(std::istream&)>&session);
+
+// Can be called from a session. No new clients are accepted afterwards.
+void stop_command_server();
+
+// Sends every line of in to the server and copies the output of the server to out until the server closes the connection.
+void connect_to_command_server(const std::string&socket_path, std::istream&in, std::ostream&out);
+
+#endif
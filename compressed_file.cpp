@@ -0,0 +1,254 @@
+#include "compressed_file.h"
+
+// link with -lz
+
+#include <zlib.h>
+#ifdef USE_ZSTD
+#include <zstd.h>
+#endif
+
+#include <cstdio>
+#include <cstring>
+#include <stdexcept>
+#include <algorithm>
+
+CompressionFormat detect_compression_format(const char*begin, const char*end){
+	const unsigned char*p = reinterpret_cast<const unsigned char*>(begin);
+	long long size = end - begin;
+	if(size >= 2 && p[0] == 0x1f && p[1] == 0x8b)
+		return CompressionFormat::gzip;
+	if(size >= 4 && p[0] == 0x28 && p[1] == 0xb5 && p[2] == 0x2f && p[3] == 0xfd)
+		return CompressionFormat::zstd;
+	return CompressionFormat::none;
+}
+
+struct DecompressingReader::Impl{
+	std::string name;
+
+	// The compressed input either comes from a file or from a memory range
+	FILE*file;
+	const char*data_pos, *data_end;
+
+	std::vector<char>in_buffer;
+	int in_begin, in_end;
+
+	CompressionFormat format;
+	bool is_stream_end;
+
+	z_stream gzip_stream;
+	#ifdef USE_ZSTD
+	ZSTD_DStream*zstd_stream;
+	#endif
+
+	Impl(std::string name, FILE*file, const char*data_pos, const char*data_end):
+		name(std::move(name)), file(file), data_pos(data_pos), data_end(data_end),
+		in_buffer(1<<16), in_begin(0), in_end(0), is_stream_end(false){
+
+		// The magic bytes are at most 4 bytes long
+		while(in_end < 4){
+			int n = read_input(in_buffer.data()+in_end, 4-in_end);
+			if(n == 0)
+				break;
+			in_end += n;
+		}
+		format = detect_compression_format(in_buffer.data(), in_buffer.data()+in_end);
+
+		if(format == CompressionFormat::gzip){
+			std::memset(&gzip_stream, 0, sizeof(gzip_stream));
+			// 15+16 accepts only the gzip format
+			if(inflateInit2(&gzip_stream, 15+16) != Z_OK)
+				throw std::runtime_error("Could not initialize the gzip decompression of "+this->name);
+		}else if(format == CompressionFormat::zstd){
+			#ifdef USE_ZSTD
+			zstd_stream = ZSTD_createDStream();
+			if(zstd_stream == nullptr)
+				throw std::runtime_error("Could not initialize the zstd decompression of "+this->name);
+			ZSTD_initDStream(zstd_stream);
+			#else
+			throw std::runtime_error(this->name+" is zstd compressed but zstd support was not compiled in, rebuild with USE_ZSTD defined");
+			#endif
+		}
+	}
+
+	~Impl(){
+		if(format == CompressionFormat::gzip)
+			inflateEnd(&gzip_stream);
+		#ifdef USE_ZSTD
+		if(format == CompressionFormat::zstd)
+			ZSTD_freeDStream(zstd_stream);
+		#endif
+		if(file != nullptr)
+			std::fclose(file);
+	}
+
+	int read_input(char*buffer, int size){
+		int n;
+		if(file != nullptr){
+			n = std::fread(buffer, 1, size, file);
+			if(n == 0 && std::ferror(file))
+				throw std::runtime_error("Could not read "+name);
+		}else{
+			n = std::min((long long)size, (long long)(data_end - data_pos));
+			std::copy(data_pos, data_pos+n, buffer);
+			data_pos += n;
+		}
+		return n;
+	}
+
+	// Returns false if the input is exhausted
+	bool refill_input_if_empty(){
+		if(in_begin == in_end){
+			in_begin = 0;
+			in_end = read_input(in_buffer.data(), in_buffer.size());
+		}
+		return in_begin != in_end;
+	}
+
+	int read_uncompressed(char*buffer, int size){
+		if(!refill_input_if_empty())
+			return 0;
+		int n = std::min(size, in_end - in_begin);
+		std::copy(in_buffer.data()+in_begin, in_buffer.data()+in_begin+n, buffer);
+		in_begin += n;
+		return n;
+	}
+
+	int read_gzip(char*buffer, int size){
+		for(;;){
+			bool has_input = refill_input_if_empty();
+			if(is_stream_end){
+				// Concatenated gzip files are valid gzip files
+				if(!has_input)
+					return 0;
+				inflateReset(&gzip_stream);
+				is_stream_end = false;
+			}else if(!has_input){
+				throw std::runtime_error(name+" is truncated");
+			}
+
+			gzip_stream.next_in = reinterpret_cast<Bytef*>(in_buffer.data()+in_begin);
+			gzip_stream.avail_in = in_end - in_begin;
+			gzip_stream.next_out = reinterpret_cast<Bytef*>(buffer);
+			gzip_stream.avail_out = size;
+
+			int ret = inflate(&gzip_stream, Z_NO_FLUSH);
+			in_begin = in_end - gzip_stream.avail_in;
+
+			if(ret == Z_STREAM_END)
+				is_stream_end = true;
+			else if(ret != Z_OK && ret != Z_BUF_ERROR)
+				throw std::runtime_error(name+" contains invalid gzip data");
+
+			int n = size - gzip_stream.avail_out;
+			if(n != 0)
+				return n;
+		}
+	}
+
+	#ifdef USE_ZSTD
+	int read_zstd(char*buffer, int size){
+		for(;;){
+			bool has_input = refill_input_if_empty();
+			if(!has_input){
+				if(is_stream_end)
+					return 0;
+				throw std::runtime_error(name+" is truncated");
+			}
+
+			ZSTD_inBuffer in = {in_buffer.data()+in_begin, (size_t)(in_end - in_begin), 0};
+			ZSTD_outBuffer out = {buffer, (size_t)size, 0};
+			size_t ret = ZSTD_decompressStream(zstd_stream, &out, &in);
+			if(ZSTD_isError(ret))
+				throw std::runtime_error(name+" contains invalid zstd data : "+ZSTD_getErrorName(ret));
+			in_begin += in.pos;
+
+			// ret is 0 if a frame is complete. Further frames may follow.
+			is_stream_end = (ret == 0);
+
+			if(out.pos != 0)
+				return out.pos;
+		}
+	}
+	#endif
+
+	int read(char*buffer, int size){
+		switch(format){
+		case CompressionFormat::gzip:
+			return read_gzip(buffer, size);
+		#ifdef USE_ZSTD
+		case CompressionFormat::zstd:
+			return read_zstd(buffer, size);
+		#endif
+		default:
+			return read_uncompressed(buffer, size);
+		}
+	}
+};
+
+static FILE*open_file_for_reading(const std::string&file_name){
+	FILE*file = std::fopen(file_name.c_str(), "rb");
+	if(file == nullptr)
+		throw std::runtime_error("Could not load "+file_name+" for text reading");
+	return file;
+}
+
+DecompressingReader::DecompressingReader(const std::string&file_name){
+	FILE*file = open_file_for_reading(file_name);
+	try{
+		impl.reset(new Impl(file_name, file, nullptr, nullptr));
+	}catch(...){
+		std::fclose(file);
+		throw;
+	}
+}
+
+DecompressingReader::DecompressingReader(const std::string&name, const char*begin, const char*end):
+	impl(new Impl(name, nullptr, begin, end)){}
+
+DecompressingReader::~DecompressingReader(){}
+
+CompressionFormat DecompressingReader::format()const{
+	return impl->format;
+}
+
+int DecompressingReader::read(char*buffer, int size){
+	int n = 0;
+	while(n < size){
+		int m = impl->read(buffer+n, size-n);
+		if(m == 0)
+			break;
+		n += m;
+	}
+	return n;
+}
+
+std::vector<char> decompress(const std::string&name, const char*begin, const char*end){
+	DecompressingReader reader(name, begin, end);
+
+	// Compressed text is usually a lot smaller than the text
+	std::vector<char>data(std::max(1LL<<16, 4*(long long)(end-begin)));
+	long long size = 0;
+	for(;;){
+		if(size == (long long)data.size())
+			data.resize(2*data.size());
+		int n = reader.read(data.data()+size, std::min((long long)(1<<30), (long long)data.size() - size));
+		if(n == 0)
+			break;
+		size += n;
+	}
+	data.resize(size);
+	return data; // NVRO
+}
+
+DecompressingStreamBuffer::DecompressingStreamBuffer(const std::string&file_name):
+	reader(file_name), buffer(1<<16){}
+
+DecompressingStreamBuffer::int_type DecompressingStreamBuffer::underflow(){
+	if(gptr() < egptr())
+		return traits_type::to_int_type(*gptr());
+	int n = reader.read(buffer.data(), buffer.size());
+	if(n == 0)
+		return traits_type::eof();
+	setg(buffer.data(), buffer.data(), buffer.data()+n);
+	return traits_type::to_int_type(*gptr());
+}
@@ -0,0 +1,62 @@
+#ifndef COMPRESSED_FILE_H
+#define COMPRESSED_FILE_H
+
+#include <string>
+#include <vector>
+#include <memory>
+#include <streambuf>
+
+//!
+//! Text inputs may be gzip or zstd compressed. The format is detected using the magic bytes at the start of
+//! the data and not using the file extension. Uncompressed data is passed through unchanged.
+//!
+//! gzip support uses zlib. zstd support is only available if the code is compiled with -DUSE_ZSTD and linked
+//! with -lzstd. Otherwise zstd compressed inputs are rejected with an exception.
+//!
+
+enum class CompressionFormat{
+	none,
+	gzip,
+	zstd
+};
+
+CompressionFormat detect_compression_format(const char*begin, const char*end);
+
+//! Reads a file or a memory range and decompresses it on the fly if it is compressed.
+class DecompressingReader{
+public:
+	explicit DecompressingReader(const std::string&file_name);
+	DecompressingReader(const std::string&name, const char*begin, const char*end);
+	~DecompressingReader();
+
+	DecompressingReader(const DecompressingReader&) = delete;
+	DecompressingReader&operator=(const DecompressingReader&) = delete;
+
+	CompressionFormat format()const;
+
+	//! Writes at most size decompressed bytes to buffer and returns their count. Like fread, fewer than size
+	//! bytes are only returned at the end of the data.
+	int read(char*buffer, int size);
+
+private:
+	struct Impl;
+	std::unique_ptr<Impl>impl;
+};
+
+//! Decompresses a whole compressed memory range. name is only used in error messages.
+std::vector<char> decompress(const std::string&name, const char*begin, const char*end);
+
+//! Makes a possibly compressed file readable as std::istream.
+class DecompressingStreamBuffer : public std::streambuf{
+public:
+	explicit DecompressingStreamBuffer(const std::string&file_name);
+
+protected:
+	int_type underflow()override;
+
+private:
+	DecompressingReader reader;
+	std::vector<char>buffer;
+};
+
+#endif
@@ -1,5 +1,7 @@
 #include "geo_pos.h"
+#include "geo_index.h"
 #include "timer.h"
+#include "memory_usage.h"
 
 #include "io_helper.h"
 #include "id_func.h"
@@ -22,9 +24,12 @@
 #include "small_tree_width_order.h"
 
 #include "dijkstra.h"
+#include "batch_dijkstra.h"
 #include "node_flow_cutter.h"
 #include "triangle_count.h"
 #include "contraction_graph.h"
+#include "elimination_tree.h"
+#include "cch.h"
 #include "separator.h"
 
 #include "tree_node_ranking.h"
@@ -32,13 +37,17 @@
 #include "tree.h"
 
 #include "vector_io.h"
+#include "mapped_file.h"
+#include "command_server.h"
 #include "inverse_vector.h"
 
 #include "min_fill_in.h"
+#include "nested_dissection_worker.h"
 
 #include "refine_cut.h"
 
 #include "inertial_flow.h"
+#include "cancellation.h"
 
 #ifdef USE_KAHIP
 #include "my_kahip.h"
@@ -56,16 +65,117 @@
 #include <random>
 #include <functional>
 #include <stack>
+#include <map>
+#include <mutex>
+#include <memory>
+#include <atomic>
+#include <new>
+#include <cstdlib>
 #include <omp.h>
 using namespace std;
 
-ArrayIDIDFunc tail, head;
-ArrayIDFunc<int>node_weight, arc_weight;
+// The state is per thread so that the sessions of the command server can work on different graphs concurrently.
+thread_local ArrayIDIDFunc tail, head;
+thread_local ArrayIDFunc<int>node_weight, arc_weight;
 
-ArrayIDIDFunc node_color, arc_color;
-ArrayIDFunc<GeoPos> node_geo_pos;
+thread_local ArrayIDIDFunc node_color, arc_color;
+thread_local ArrayIDFunc<GeoPos> node_geo_pos;
 
-ArrayIDIDFunc node_original_position;
+// Built on the first geo query and cleared whenever node_geo_pos changes
+thread_local GeoPosIndex node_geo_pos_index;
+
+thread_local ArrayIDIDFunc node_original_position;
+
+// Properties of tail and head that many commands check or derive. They are computed on first use and kept until
+// tail or head change. Code that changes tail or head must call clear(). permutate_nodes only calls 
+// clear_out_arc(), as the other properties do not depend on the node IDs.
+struct GraphStructure{
+	GraphStructure(){
+		clear();
+	}
+
+	void clear(){
+		is_symmetric = -1;
+		has_multi_arcs = -1;
+		is_loop_free = -1;
+		back_arc = ArrayIDIDFunc();
+		has_back_arc = false;
+		clear_out_arc();
+	}
+
+	void clear_out_arc(){
+		out_arc = ArrayIDIDMultiFunc();
+		has_out_arc = false;
+	}
+
+	// -1 if not yet known
+	int is_symmetric, has_multi_arcs, is_loop_free;
+
+	bool has_out_arc;
+	ArrayIDIDMultiFunc out_arc;
+
+	bool has_back_arc;
+	ArrayIDIDFunc back_arc;
+};
+
+thread_local GraphStructure graph_structure;
+
+static
+bool is_graph_symmetric(){
+	if(graph_structure.is_symmetric == -1)
+		graph_structure.is_symmetric = is_symmetric(tail, head);
+	return graph_structure.is_symmetric;
+}
+
+static
+bool graph_has_multi_arcs(){
+	if(graph_structure.has_multi_arcs == -1)
+		graph_structure.has_multi_arcs = has_multi_arcs(tail, head);
+	return graph_structure.has_multi_arcs;
+}
+
+static
+bool is_graph_loop_free(){
+	if(graph_structure.is_loop_free == -1)
+		graph_structure.is_loop_free = is_loop_free(tail, head);
+	return graph_structure.is_loop_free;
+}
+
+static
+const ArrayIDIDMultiFunc&get_out_arc(){
+	if(!graph_structure.has_out_arc){
+		graph_structure.out_arc = invert_id_id_func(tail);
+		graph_structure.has_out_arc = true;
+	}
+	return graph_structure.out_arc;
+}
+
+// Throws if the graph is not symmetric
+static
+const ArrayIDIDFunc&get_back_arc(){
+	if(!graph_structure.has_back_arc){
+		graph_structure.back_arc = compute_back_arc_permutation(tail, head);
+		graph_structure.has_back_arc = true;
+	}
+	return graph_structure.back_arc;
+}
+
+// Lets the CSV readers decompress gzip and zstd files on the fly
+class DecompressingCSVByteSource : public io::ByteSourceBase{
+public:
+	explicit DecompressingCSVByteSource(const string&file_name):reader(file_name){}
+
+	int read(char*buffer, int size)override{
+		return reader.read(buffer, size);
+	}
+
+private:
+	DecompressingReader reader;
+};
+
+static unique_ptr<io::ByteSourceBase> open_csv_file(const string&file_name){
+	return unique_ptr<io::ByteSourceBase>(new DecompressingCSVByteSource(file_name));
+}
 
 void check_graph_consitency(){
 	#ifndef NDEBUG
@@ -89,13 +199,81 @@ void check_graph_consitency(){
 	#endif
 }
 
-stack<ArrayIDIDFunc>node_color_stack;
+thread_local stack<ArrayIDIDFunc>node_color_stack;
 
-flow_cutter::Config flow_cutter_config;
+thread_local flow_cutter::Config flow_cutter_config;
 
-bool show_arc_ids = false;
-bool show_undirected = false;
-bool time_commands = false;
+static
+max_flow::UnitFlowAlgorithm get_inertial_flow_max_flow_algorithm(){
+	switch(flow_cutter_config.max_flow_algorithm){
+	case flow_cutter::Config::MaxFlowAlgorithm::push_relabel:
+		return max_flow::UnitFlowAlgorithm::push_relabel;
+	case flow_cutter::Config::MaxFlowAlgorithm::edmond_karp:
+		return max_flow::UnitFlowAlgorithm::edmond_karp;
+	default:
+		return max_flow::UnitFlowAlgorithm::dinic;
+	}
+}
+
+thread_local bool show_arc_ids = false;
+thread_local bool show_undirected = false;
+thread_local bool time_commands = false;
+thread_local bool report_memory = false;
+
+// A graph that is kept in memory by the command server. Its state is swapped into the thread local
+// variables while a command runs on it.
+struct NamedGraph{
+	mutex lock;
+
+	ArrayIDIDFunc tail, head;
+	ArrayIDFunc<int>node_weight, arc_weight;
+
+	ArrayIDIDFunc node_color, arc_color;
+	ArrayIDFunc<GeoPos> node_geo_pos;
+	GeoPosIndex node_geo_pos_index;
+
+	ArrayIDIDFunc node_original_position;
+
+	stack<ArrayIDIDFunc>node_color_stack;
+
+	GraphStructure graph_structure;
+};
+
+static
+void swap_current_graph(NamedGraph&g){
+	tail.swap(g.tail);
+	head.swap(g.head);
+	node_weight.swap(g.node_weight);
+	arc_weight.swap(g.arc_weight);
+	node_color.swap(g.node_color);
+	arc_color.swap(g.arc_color);
+	node_geo_pos.swap(g.node_geo_pos);
+	std::swap(node_geo_pos_index, g.node_geo_pos_index);
+	node_original_position.swap(g.node_original_position);
+	node_color_stack.swap(g.node_color_stack);
+	std::swap(graph_structure, g.graph_structure);
+}
+
+static mutex named_graph_lock;
+static map<string, shared_ptr<NamedGraph>>named_graphs;
+
+static
+shared_ptr<NamedGraph> get_named_graph(const string&name){
+	lock_guard<mutex>guard(named_graph_lock);
+	auto&g = named_graphs[name];
+	if(!g)
+		g = make_shared<NamedGraph>();
+	return g;
+}
+
+static
+shared_ptr<NamedGraph> find_named_graph(const string&name){
+	lock_guard<mutex>guard(named_graph_lock);
+	auto i = named_graphs.find(name);
+	if(i == named_graphs.end())
+		throw runtime_error("There is no graph named "+name);
+	return i->second;
+}
 
 int select_color(string str){
 	if(str == "most_frequent_node_color")
@@ -127,20 +305,31 @@ void keep_nodes_if(const BitIDFunc&node_keep_flag){
 	auto node_keep_perm = compute_keep_function(node_keep_flag, new_node_count);
 	head = chain(std::move(head), node_keep_perm);
 	tail = chain(std::move(tail), node_keep_perm);
+	graph_structure.clear();
 	node_color = keep_if(node_keep_flag, new_node_count, std::move(node_color));
 	node_geo_pos = keep_if(node_keep_flag, new_node_count, std::move(node_geo_pos));
+	node_geo_pos_index.clear();
 	node_weight = keep_if(node_keep_flag, new_node_count, std::move(node_weight));
 	node_original_position = keep_if(node_keep_flag, new_node_count, std::move(node_original_position));
 }
 
+static
+const GeoPosIndex&get_node_geo_pos_index(){
+	if(!node_geo_pos_index.is_built())
+		node_geo_pos_index.build(node_geo_pos);
+	return node_geo_pos_index;
+}
+
 static
 void permutate_nodes(const ArrayIDIDFunc&p){
 	auto inv_p = inverse_permutation(p);
 	head = chain(std::move(head), inv_p);
 	tail = chain(std::move(tail), inv_p);
+	graph_structure.clear_out_arc();
 
 	node_color = chain(p, std::move(node_color));
 	node_geo_pos = chain(p, std::move(node_geo_pos));
+	node_geo_pos_index.clear();
 	node_weight = chain(p, std::move(node_weight));
 	node_original_position = chain(p, std::move(node_original_position));
 }
@@ -152,7 +341,7 @@ void keep_arcs_if(const BitIDFunc&keep_flag){
 	head = keep_if(keep_flag, new_arc_count, move(head));
 	arc_weight = keep_if(keep_flag, new_arc_count, move(arc_weight));
 	arc_color = keep_if(keep_flag, new_arc_count, move(arc_color));
-
+	graph_structure.clear();
 }
 
 static
@@ -161,7 +350,21 @@ void permutate_arcs(const ArrayIDIDFunc&p){
 	head = chain(p, move(head));
 	arc_weight = chain(p, move(arc_weight));
 	arc_color = chain(p, move(arc_color));
+	graph_structure.clear();
+}
 
+// str is "all" or an id string of nodes, see id_string.h
+static
+vector<int>parse_source_node_list(const string&str){
+	vector<int>source_list;
+	if(str == "all"){
+		source_list.resize(tail.image_count());
+		for(int x=0; x<tail.image_count(); ++x)
+			source_list[x] = x;
+	}else{
+		forall_in_id_string(str, tail.image_count(), [&](int x){ source_list.push_back(x); });
+	}
+	return source_list;
 }
 
 struct Command{
@@ -188,32 +391,158 @@ struct Command{
 
 auto w = setw(30);
 
-int new_lock = 0;
+// The global new and delete are replaced to account for the allocated memory. Every block is prefixed by its
+// size and by the MemoryAccount it is charged to, as delete is told neither.
+//
+// Every session of the command server has its own MemoryAccount with its own budget and peak. The account of a
+// thread is its current Cancellation, which the parallel regions hand on to their threads, see cancellation.h.
+// Threads without one use the account of the main thread. The counters are atomic, as the threads of a session 
+// allocate concurrently. The peak is reset at the start of every command.
+//
+// An exception that leaves an OpenMP parallel region or task terminates the process. Inside of a region an
+// exceeded budget therefore cancels the computation, which makes the cutters and the nested dissection stop
+// early. The first allocation outside of all regions fails, or the command fails once it is done.
+static const size_t allocation_header_size = 16;
+
+struct MemoryAccount : Cancellation{
+	constexpr explicit MemoryAccount(long long budget):budget(budget), allocated_bytes(0), peak_allocated_bytes(0){}
+
+	// 0 means that there is no budget
+	atomic<long long>budget;
+	atomic<long long>allocated_bytes;
+	atomic<long long>peak_allocated_bytes;
+};
+
+static_assert(sizeof(size_t) + sizeof(MemoryAccount*) <= allocation_header_size, "the block header is too small");
+
+static atomic<long long>active_allocation_count(0);
+
+static MemoryAccount main_memory_account(0);
+
+// Every Cancellation of the console is a MemoryAccount
+static
+MemoryAccount*get_memory_account(){
+	Cancellation*c = current_cancellation();
+	if(c == nullptr)
+		return &main_memory_account;
+	else
+		return static_cast<MemoryAccount*>(c);
+}
+
+// The blocks charged to an account can outlive its session, for example as part of a named graph. The account
+// is therefore never freed.
+static
+MemoryAccount*create_memory_account(long long budget){
+	void*p = malloc(sizeof(MemoryAccount));
+	if(p == nullptr)
+		throw bad_alloc();
+	return new(p) MemoryAccount(budget);
+}
+
+struct MemoryBudgetExceeded : bad_alloc{
+	const char*what()const noexcept override{
+		return "memory budget exceeded";
+	}
+};
+
+static
+void*allocate_accounted(size_t size){
+	MemoryAccount*account = get_memory_account();
+	long long new_allocated_bytes = account->allocated_bytes.fetch_add(size, memory_order_relaxed) + size;
+
+	long long budget = account->budget.load(memory_order_relaxed);
+	if(budget != 0){
+		// omp_get_level also counts regions with a single thread, which an exception must not leave either
+		if(omp_get_level() != 0){
+			if(new_allocated_bytes > budget)
+				account->is_cancelled.store(true, memory_order_relaxed);
+		}else if(new_allocated_bytes > budget || account->is_cancelled.exchange(false)){
+			account->allocated_bytes.fetch_sub(size, memory_order_relaxed);
+			throw MemoryBudgetExceeded();
+		}
+	}
+
+	char*block = (char*)malloc(size + allocation_header_size);
+	if(block == nullptr){
+		account->allocated_bytes.fetch_sub(size, memory_order_relaxed);
+		throw bad_alloc();
+	}
+	*(size_t*)block = size;
+	*(MemoryAccount**)(block + sizeof(size_t)) = account;
+	active_allocation_count.fetch_add(1, memory_order_relaxed);
+
+	long long peak = account->peak_allocated_bytes.load(memory_order_relaxed);
+	while(new_allocated_bytes > peak && !account->peak_allocated_bytes.compare_exchange_weak(peak, new_allocated_bytes, memory_order_relaxed))
+		;
+
+	return block + allocation_header_size;
+}
+
+static
+void free_accounted(void*ptr){
+	if(ptr == nullptr)
+		return;
+	char*block = (char*)ptr - allocation_header_size;
+	MemoryAccount*account = *(MemoryAccount**)(block + sizeof(size_t));
+	account->allocated_bytes.fetch_sub(*(size_t*)block, memory_order_relaxed);
+	active_allocation_count.fetch_sub(1, memory_order_relaxed);
+	free(block);
+}
 
 void *operator new(size_t size)
 {
-	++new_lock;
-	return malloc(size);
+	return allocate_accounted(size);
 }
 
 void *operator new [](size_t size)
 {
-	++new_lock;
-	return malloc(size);
+	return allocate_accounted(size);
+}
+
+// Older standard libraries implement the nothrow versions using malloc and not the replaced new
+void *operator new(size_t size, const nothrow_t&)noexcept
+{
+	try{
+		return allocate_accounted(size);
+	}catch(...){
+		return nullptr;
+	}
+}
+
+void *operator new [](size_t size, const nothrow_t&)noexcept
+{
+	try{
+		return allocate_accounted(size);
+	}catch(...){
+		return nullptr;
+	}
+}
+
+void operator delete(void*ptr)noexcept
+{
+	free_accounted(ptr);
+}
+
+void operator delete [](void*ptr)noexcept
+{
+	free_accounted(ptr);
 }
 
-void operator delete(void*ptr)
+void operator delete(void*ptr, const nothrow_t&)noexcept
 {
-	--new_lock;
-	free(ptr);
+	free_accounted(ptr);
 }
 
-void operator delete [](void*ptr)
+void operator delete [](void*ptr, const nothrow_t&)noexcept
 {
-	--new_lock;
-	free(ptr);
+	free_accounted(ptr);
 }
 
+// Returns false if the line is the exit command
+static bool execute_command_line(const string&line);
+
+static void run_command_session(istream&in);
+
 vector<Command>cmd = {
 	{
 		"get_tmp_dir",
@@ -226,7 +555,33 @@ vector<Command>cmd = {
 		"count_active_news",
 		"Counts how often new was called more than delete. Use this to track down memory leaks.",
 		[]{
-			cout << new_lock << endl;
+			cout << active_allocation_count.load() << endl;
+		}
+	},
+	{
+		"print_allocated_memory",
+		"Prints the memory currently allocated using new by the session in KiB.",
+		[]{
+			cout << w << "allocated memory" << " : " << get_memory_account()->allocated_bytes.load()/1024 << endl;
+		}
+	},
+	{
+		"set_memory_budget", 1,
+		"Commands that try to allocate more than arg1 MiB in total fail with an exception. 0 removes the budget. "
+		"Every session of the command server has its own budget, which counts the memory allocated by the session. "
+		"Parallel parts of a command, for example with thread_count larger than 1, stop early once they exceed the budget.",
+		[](vector<string>args){
+			long long budget = stoll(args[0]);
+			if(budget < 0)
+				throw runtime_error("The memory budget must not be negative");
+			get_memory_account()->budget = budget*1024*1024;
+		}
+	},
+	{
+		"print_peak_memory_usage",
+		"Prints the largest resident set size of the process so far in KiB.",
+		[]{
+			cout << w << "peak resident set size" << " : " << get_peak_resident_set_size() << endl;
 		}
 	},
 	{
@@ -281,39 +636,8 @@ vector<Command>cmd = {
 
 			while(get_command_line(line)){
 				try{
-					istringstream line_in(line);
-					string command;
-					line_in >> command;
-
-					if(command == "exit")
+					if(!execute_command_line(line))
 						break;
-
-					int c = -1;
-					for(int i=0; i<(int)cmd.size(); ++i)
-						if(cmd[i].name == command){
-							c = i;
-							break;
-						}
-					if(c == -1)
-						throw runtime_error("Unknown command "+command);
-
-					vector<string>args;
-					string x;
-					while(line_in >> x)
-						args.push_back(x);
-					if((int)args.size() != cmd[c].parameter_count)
-						throw runtime_error("Wrong number of parameters to command "+cmd[c].name+". expected:"+to_string(cmd[c].parameter_count)+", got:"+to_string(args.size()));
-
-					auto prev_time_commands = time_commands;
-					long long time = -get_micro_time();
-					cmd[c].func(move(args));
-					time += get_micro_time();
-
-					if(time_commands && prev_time_commands){
-						cout << "running time : "<<time << "musec" << endl;
-					}
-
-					check_graph_consitency();
 				}catch(std::exception&err){
 					cout << "Exception : " << err.what() << endl;
 				}
@@ -321,6 +645,50 @@ vector<Command>cmd = {
 			cout << endl;
 		}
 	},
+	{
+		"run_command_server", 1,
+		"Keeps graphs in memory and processes commands from clients that connect to the Unix domain socket arg1. "
+		"If arg1 is - then the commands are read from stdin instead. Every client sends one command per line and "
+		"gets the output of its commands. The graphs have names. Every session starts on the graph named default, "
+		"which initially is the current graph. The following commands are available in addition to the usual ones: "
+		"use_graph (1 arg) makes the session work on the given graph and creates it if it does not exist, "
+		"copy_graph (2 args) copies the graph arg1 into a graph named arg2, drop_graph (1 arg) removes a graph, "
+		"list_graphs prints the sizes of all graphs, stop_command_server stops accepting clients, "
+		"and exit ends the session. "
+		"Commands on different graphs run concurrently. Commands on the same graph run one after the other. "
+		"Settings such as flow_cutter_set and set_memory_budget are per session and start with the values set before the server was started. "
+		"Once the server is stopped the graph named default becomes the current graph.",
+		[](vector<string>args){
+			swap_current_graph(*get_named_graph("default"));
+			try{
+				if(args[0] == "-"){
+					run_command_session(cin);
+				}else{
+					auto config = flow_cutter_config;
+					auto budget = get_memory_account()->budget.load();
+					run_command_server(
+						args[0],
+						[=](istream&in){
+							flow_cutter_config = config;
+							CurrentCancellationScope memory_account_scope(create_memory_account(budget));
+							run_command_session(in);
+						}
+					);
+				}
+			}catch(...){
+				swap_current_graph(*get_named_graph("default"));
+				throw;
+			}
+			swap_current_graph(*get_named_graph("default"));
+		}
+	},
+	{
+		"connect_to_command_server", 1,
+		"Sends the commands from stdin to the command server listening on the Unix domain socket arg1 and prints the output.",
+		[](vector<string>args){
+			connect_to_command_server(args[0], cin, cout);
+		}
+	},
 	{
 		"report_time",
 		"Report the running time of every command",
@@ -328,6 +696,20 @@ vector<Command>cmd = {
 			time_commands = true;
 		}
 	},
+	{
+		"report_memory",
+		"Report the peak memory allocated during every command and the memory allocated afterwards",
+		[]{
+			report_memory = true;
+		}
+	},
+	{
+		"do_not_report_memory",
+		"Do not report the memory allocated by every command",
+		[]{
+			report_memory = false;
+		}
+	},
 	{
 		"do_not_report_time",
 		"Do not report the running time of every command",
@@ -339,60 +721,33 @@ vector<Command>cmd = {
 		"examine_chordal_supergraph",
 		"Examines the chordal supergraph produced by contracting the nodes increasing by ID",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
 			const int node_count = tail.image_count();
 
 			if(node_count <= 1)
 				throw runtime_error("Graph must have at least 2 nodes");
 
-			int super_graph_arc_count = 0;
-			int current_tail = -1;
-			int current_tail_up_deg = 0;
+			auto parent = compute_elimination_tree(tail, head);
+			auto out_deg = compute_upward_degrees_in_chordal_supergraph(tail, head, parent, compute_postorder_of_forest(parent));
+
+			long long super_graph_arc_count = 0;
 			int max_up_deg = 0;
-			ArrayIDFunc<int>
-				out_deg(node_count),
-				parent(node_count);
-			out_deg.fill(0);
-			parent.fill(std::numeric_limits<int>::max());
-			compute_chordal_supergraph(
-				tail, head,
-				[&](int x, int y){
-					++out_deg[x];
-					if(current_tail != x){
-						current_tail = x;
-						max_to(max_up_deg, current_tail_up_deg);
-						current_tail_up_deg = 0;
-					}
-					++super_graph_arc_count;
-					++current_tail_up_deg;
-					min_to(parent[x], y);
-				}
-			);
+			for(auto d:out_deg){
+				super_graph_arc_count += d;
+				max_to(max_up_deg, d);
+			}
 
+			// parent(x) > x and thus decreasing IDs visit the parents first
 			ArrayIDFunc<int>ancestor_count(node_count);
-			ancestor_count.fill(-1);
-
-			for(int x=0; x<node_count; ++x){
-				if(ancestor_count(x) == -1){
-					int n = 0;
-					for(int y = x; y != std::numeric_limits<int>::max(); y = parent(y)){
-						if(ancestor_count(y) == -1){
-							++n;
-						}else{
-							n += ancestor_count(y);
-							break;
-						}
-					}
-					for(int y = x; y != std::numeric_limits<int>::max(); y = parent(y)){
-						if(ancestor_count(y) != -1){
-							assert(ancestor_count(y) == n);
-							break;
-						}else{
-							ancestor_count[y] = n;
-							--n;
-						}
-					}
+			ArrayIDFunc<long long>arcs_in_search_space(node_count);
+			for(int x=node_count-1; x>=0; --x){
+				if(parent(x) == -1){
+					ancestor_count[x] = 1;
+					arcs_in_search_space[x] = out_deg(x);
+				}else{
+					ancestor_count[x] = ancestor_count(parent(x)) + 1;
+					arcs_in_search_space[x] = arcs_in_search_space(parent(x)) + out_deg(x);
 				}
 			}
 
@@ -403,15 +758,7 @@ vector<Command>cmd = {
 				ancestor_count_sum += x;
 			}
 
-			ArrayIDFunc<int>arcs_in_search_space = out_deg;
-
-			for(int x=node_count-1; x>=0; --x){
-				if(parent(x) != std::numeric_limits<int>::max()){
-					arcs_in_search_space[x] += arcs_in_search_space(parent(x));
-				}
-			}
-
-			int max_arcs_in_search_space = 0;
+			long long max_arcs_in_search_space = 0;
 			long long arcs_in_search_space_sum = 0;
 			for(auto x:arcs_in_search_space){
 				max_to(max_arcs_in_search_space, x);
@@ -420,7 +767,7 @@ vector<Command>cmd = {
 
 			long long triangle_count = 0;
 			for(int x=0; x<node_count; ++x){
-				triangle_count += (out_deg(x)*(out_deg(x)-1))/2;
+				triangle_count += ((long long)out_deg(x)*(out_deg(x)-1))/2;
 			}
 
 			auto w = setw(35);
@@ -428,6 +775,7 @@ vector<Command>cmd = {
 			cout
 				<< w << "super_graph_upward_arc_count" << " : " << super_graph_arc_count << '\n'
 				<< w << "upper tree width bound" << " : " << max_up_deg << '\n'
+				<< w << "maximum clique size" << " : " << (max_up_deg+1) << '\n'
 				<< w << "elimination tree height" << " : " << max_ancestor_count << '\n'
 				<< w << "average elimination tree depth" << " : " << (static_cast<double>(ancestor_count_sum)/node_count) << '\n'
 				<< w << "maximum arcs in search space" << " : " << max_arcs_in_search_space << '\n'
@@ -435,51 +783,89 @@ vector<Command>cmd = {
 				<< w << "number of triangles in super graph" << " : " << triangle_count << endl;
 		}
 	},
+	{
+		"examine_cch_query_performance", 1,
+		"Builds a Customizable Contraction Hierarchy that contracts the nodes increasing by ID, customizes it with the arc weights and runs arg1 queries between random nodes. "
+		"The customization runs on thread_count threads and the random nodes depend on random_seed, see flow_cutter_set. The queries do not depend on the node order since the last file load.",
+		[](vector<string>args){
+			if(!is_graph_symmetric())
+				throw runtime_error("Graph must be symmetric");
+			const int node_count = tail.image_count();
+			int query_count = stoi(args[0]);
+			if(query_count < 0)
+				throw runtime_error("The query count must not be negative");
+			if(node_count == 0 && query_count > 0)
+				throw runtime_error("Graph must have at least 1 node");
+			for(auto w:arc_weight)
+				if(w < 0 || w >= cch::inf)
+					throw runtime_error("Arc weights must be non-negative and smaller than "+to_string(cch::inf));
+
+			long long build_time = -get_micro_time();
+			cch::CustomizableContractionHierarchy ch(tail, head);
+			build_time += get_micro_time();
+
+			long long customization_time = -get_micro_time();
+			ch.customize(tail, head, arc_weight, flow_cutter_config.thread_count);
+			customization_time += get_micro_time();
+
+			// The random nodes are drawn from the node IDs at the last file load if possible. The queries, and thus
+			// the distance sum, then do not depend on the order.
+			ArrayIDIDFunc current_node_id = identity_permutation(node_count);
+			if(node_original_position.preimage_count() == node_count && node_original_position.image_count() == node_count)
+				current_node_id = inverse_permutation(node_original_position);
+
+			std::mt19937 rng(flow_cutter_config.random_seed);
+			std::uniform_int_distribution<int>random_node(0, max(node_count-1, 0));
+			vector<pair<int, int>>query_list(query_count);
+			for(auto&q:query_list){
+				q.first = current_node_id(random_node(rng));
+				q.second = current_node_id(random_node(rng));
+			}
+
+			cch::CustomizableContractionHierarchy::Query query(ch);
+			int unreachable_count = 0;
+			long long distance_sum = 0;
+			long long query_time = -get_micro_time();
+			for(auto q:query_list){
+				int d = query.run(q.first, q.second);
+				if(d == cch::inf)
+					++unreachable_count;
+				else
+					distance_sum += d;
+			}
+			query_time += get_micro_time();
+
+			auto w = setw(35);
+
+			cout
+				<< w << "cch arc count" << " : " << ch.arc_count() << '\n'
+				<< w << "build running time" << " : " << build_time << "musec\n"
+				<< w << "customization running time" << " : " << customization_time << "musec\n"
+				<< w << "query count" << " : " << query_count << '\n'
+				<< w << "average query running time" << " : " << (query_count == 0 ? 0.0 : static_cast<double>(query_time)/query_count) << "musec\n"
+				<< w << "unreachable query count" << " : " << unreachable_count << '\n'
+				<< w << "reachable distance sum" << " : " << distance_sum << endl;
+		}
+	},
 	{
 		"find_longest_elimination_tree_path",
 		"Find the node IDs of the longest path leaf root path in the elimination tree",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
 			const int node_count = tail.image_count();
 
 			if(node_count <= 1)
 				throw runtime_error("Graph must have at least 2 nodes");
 
-			ArrayIDFunc<int>parent(tail.image_count());
-			parent.fill(std::numeric_limits<int>::max());
-
-			compute_chordal_supergraph(
-				tail, head,
-				[&](int x, int y){
-					min_to(parent[x], y);
-				}
-			);
-
-			ArrayIDFunc<int>ancestor_count(tail.image_count());
-			ancestor_count.fill(-1);
+			auto parent = compute_elimination_tree(tail, head);
 
-			for(int x=0; x<node_count; ++x){
-				if(ancestor_count(x) == -1){
-					int n = 0;
-					for(int y = x; y != std::numeric_limits<int>::max(); y = parent(y)){
-						if(ancestor_count(y) == -1){
-							++n;
-						}else{
-							n += ancestor_count(y);
-							break;
-						}
-					}
-					for(int y = x; y != std::numeric_limits<int>::max(); y = parent(y)){
-						if(ancestor_count(y) != -1){
-							assert(ancestor_count(y) == n);
-							break;
-						}else{
-							ancestor_count[y] = n;
-							--n;
-						}
-					}
-				}
+			ArrayIDFunc<int>ancestor_count(node_count);
+			for(int x=node_count-1; x>=0; --x){
+				if(parent(x) == -1)
+					ancestor_count[x] = 1;
+				else
+					ancestor_count[x] = ancestor_count(parent(x)) + 1;
 			}
 
 			int x = max_preimage_over_id_func(ancestor_count);
@@ -487,7 +873,7 @@ vector<Command>cmd = {
 			BitIDFunc in_tree(node_count);
 			in_tree.fill(false);
 
-			while(parent(x) != std::numeric_limits<int>::max()){
+			while(parent(x) != -1){
 				in_tree.set(x, true);
 				x = parent(x);
 			}
@@ -500,7 +886,7 @@ vector<Command>cmd = {
 		"find_largest_clique_in_chordal_supergraph",
 		"Examines the chordal supergraph produced by contracting the nodes increasing by ID",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
 			const int node_count = tail.image_count();
 
@@ -600,7 +986,7 @@ vector<Command>cmd = {
 		"load_node_color", 1,
 		"Loads all node colors stored in file arg1",
 		[](vector<string>arg){
-			io::CSVReader<2>in(arg[0]);
+			io::CSVReader<2>in(arg[0], open_csv_file(arg[0]));
 			in.read_header(io::ignore_extra_column, "node_id", "color");
 			int node_id, color;
 			while(in.read_row(node_id, color)){
@@ -633,12 +1019,35 @@ vector<Command>cmd = {
 			auto graph = load_binary_graph(args[0]);
 			tail = std::move(graph.tail);
 			head = std::move(graph.head);
+			graph_structure.clear();
 			node_weight = std::move(graph.node_weight);
 			arc_weight = std::move(graph.arc_weight);
 
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
+			node_geo_pos.fill({0.0, 0.0});
+			node_original_position = identity_permutation(tail.image_count());
+			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
+			arc_color.fill(0);
+		}
+	},
+	{
+		"map_binary_graph", 1,
+		"Maps a graph in the binary format into memory. The graph arrays are only copied when they are modified. The file must not be modified while it is mapped.",
+		[](vector<string>args){
+			auto graph = map_binary_graph(args[0]);
+			tail = std::move(graph.tail);
+			head = std::move(graph.head);
+			graph_structure.clear();
+			node_weight = std::move(graph.node_weight);
+			arc_weight = std::move(graph.arc_weight);
+
+			node_color = ArrayIDIDFunc(tail.image_count(), 1);
+			node_color.fill(0);
+			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -655,14 +1064,14 @@ vector<Command>cmd = {
 
 			int stop_count = 0;
 			{
-				io::LineReader in(stop_file);
+				io::LineReader in(stop_file, open_csv_file(stop_file));
 				while(in.next_line())
 					++stop_count;
 			}
 
 			int footpath_count = 0;
 			{
-				io::LineReader in(footpath_file);
+				io::LineReader in(footpath_file, open_csv_file(footpath_file));
 				while(in.next_line())
 					++footpath_count;
 			}
@@ -670,7 +1079,7 @@ vector<Command>cmd = {
 			int conn_count = 0;
 			int trip_count = 0;
 			{
-				io::CSVReader<1>in(conn_file);
+				io::CSVReader<1>in(conn_file, open_csv_file(conn_file));
 				in.read_header(io::ignore_extra_column, "trip_id");
 				int trip_id;
 				while(in.read_row(trip_id)){
@@ -683,6 +1092,7 @@ vector<Command>cmd = {
 
 			tail = ArrayIDIDFunc(conn_count+footpath_count, stop_count);
 			head = ArrayIDIDFunc(conn_count+footpath_count, stop_count);
+			graph_structure.clear();
 			arc_weight = ArrayIDFunc<int>(conn_count+footpath_count);
 
 			node_weight = ArrayIDFunc<int>(stop_count);
@@ -691,6 +1101,7 @@ vector<Command>cmd = {
 			node_color.fill(0);
 
 			node_geo_pos = ArrayIDFunc<GeoPos>(stop_count);
+			node_geo_pos_index.clear();
 
 			arc_color = ArrayIDIDFunc(conn_count+footpath_count, trip_count+1);
 
@@ -700,7 +1111,7 @@ vector<Command>cmd = {
 
 			int arc_id = 0;
 			{
-				io::CSVReader<5>in(conn_file);
+				io::CSVReader<5>in(conn_file, open_csv_file(conn_file));
 				in.read_header(io::ignore_extra_column, "dep_stop", "arr_stop", "dep_time", "arr_time", "trip_id");
 				int dep_stop, arr_stop, dep_time, arr_time, trip_id;
 				while(in.read_row(dep_stop, arr_stop, dep_time, arr_time, trip_id)){
@@ -720,7 +1131,7 @@ vector<Command>cmd = {
 			}
 
 			{
-				io::CSVReader<3>in(footpath_file);
+				io::CSVReader<3>in(footpath_file, open_csv_file(footpath_file));
 				in.read_header(io::ignore_extra_column, "dep_stop", "arr_stop", "duration");
 				int dep_stop, arr_stop, duration;
 				while(in.read_row(dep_stop, arr_stop, duration)){
@@ -738,7 +1149,7 @@ vector<Command>cmd = {
 			}
 
 			{
-				io::CSVReader<4>in(stop_file);
+				io::CSVReader<4>in(stop_file, open_csv_file(stop_file));
 				in.read_header(io::ignore_extra_column, "stop_id", "change_time", "lon", "lat");
 				GeoPos geo_pos;
 				int stop_id, change_time = 0;
@@ -758,12 +1169,14 @@ vector<Command>cmd = {
 			auto graph = load_dimacs_graph(args[0]);
 			tail = std::move(graph.tail);
 			head = std::move(graph.head);
+			graph_structure.clear();
 			node_weight = std::move(graph.node_weight);
 			arc_weight = std::move(graph.arc_weight);
 
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -781,6 +1194,7 @@ vector<Command>cmd = {
 
 			tail = ArrayIDIDFunc(arc_count, node_count);
 			head = ArrayIDIDFunc(arc_count, node_count);
+			graph_structure.clear();
 			node_weight = ArrayIDFunc<int>(node_count);
 			node_weight.fill(1);
 			arc_weight = ArrayIDFunc<int>(arc_count);
@@ -824,6 +1238,7 @@ vector<Command>cmd = {
 			node_color = ArrayIDIDFunc(node_count, 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(node_count);
+			node_geo_pos_index.clear();
 
 			for(int y=0; y<n; ++y)
 				for(int x=0; x<n; ++x)
@@ -861,12 +1276,14 @@ vector<Command>cmd = {
 			auto graph = load_pace_graph(args[0]);
 			tail = std::move(graph.tail);
 			head = std::move(graph.head);
+			graph_structure.clear();
 			node_weight = std::move(graph.node_weight);
 			arc_weight = std::move(graph.arc_weight);
 
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -916,6 +1333,7 @@ vector<Command>cmd = {
 				arc_count += bag.size()*(bag.size()-1);
 			tail = ArrayIDIDFunc(arc_count, node_count);
 			head = ArrayIDIDFunc(arc_count, node_count);
+			graph_structure.clear();
 
 			int next_arc_id = 0;
 			for(auto&bag:bags)
@@ -938,6 +1356,7 @@ vector<Command>cmd = {
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -960,6 +1379,7 @@ vector<Command>cmd = {
 
 			tail = id_id_func(new_tail.size(), tail.image_count(), [&](int x){return new_tail[x];});
 			head = id_id_func(new_head.size(), head.image_count(), [&](int x){return new_head[x];});
+			graph_structure.clear();
 
 			node_weight = id_func(tail.image_count(), [](int){return 1;});
 			arc_weight = id_func(tail.preimage_count(), [](int){return 1;});
@@ -975,12 +1395,14 @@ vector<Command>cmd = {
 			auto graph = load_color_dimacs_graph(args[0]);
 			tail = std::move(graph.tail);
 			head = std::move(graph.head);
+			graph_structure.clear();
 			node_weight = std::move(graph.node_weight);
 			arc_weight = std::move(graph.arc_weight);
 
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -996,6 +1418,7 @@ vector<Command>cmd = {
 				throw runtime_error("node count must not be negative");
 
 			std::tie(tail, head) = generate_random_tree(node_count);
+			graph_structure.clear();
 			node_weight = ArrayIDFunc<int>(tail.image_count());
 			node_weight.fill(1);
 			arc_weight = ArrayIDFunc<int>(tail.preimage_count());
@@ -1003,6 +1426,7 @@ vector<Command>cmd = {
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -1019,6 +1443,7 @@ vector<Command>cmd = {
 
 			tail = ArrayIDIDFunc(arc_count, node_count);
 			head = ArrayIDIDFunc(arc_count, node_count);
+			graph_structure.clear();
 
 			int next_id = 0;
 
@@ -1038,6 +1463,7 @@ vector<Command>cmd = {
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -1051,12 +1477,14 @@ vector<Command>cmd = {
 			auto graph = load_metis_graph(args[0]);
 			tail = std::move(graph.tail);
 			head = std::move(graph.head);
+			graph_structure.clear();
 			node_weight = std::move(graph.node_weight);
 			arc_weight = std::move(graph.arc_weight);
 
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -1075,6 +1503,43 @@ vector<Command>cmd = {
 
 			tail = id_id_func(arc_count, node_count, [&](int i)->int{return v_tail[i];});
 			head = id_id_func(arc_count, node_count, [&](int i)->int{return v_head[i];});
+			graph_structure.clear();
+			node_weight = ArrayIDFunc<int>(node_count);
+			node_weight.fill(0);
+			arc_weight = ArrayIDFunc<int>(arc_count);
+			arc_weight.fill(0);
+
+			node_color = ArrayIDIDFunc(tail.image_count(), 1);
+			node_color.fill(0);
+			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
+			node_geo_pos.fill({0.0, 0.0});
+			node_original_position = identity_permutation(tail.image_count());
+			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
+			arc_color.fill(0);
+		}
+	},
+
+	{
+		"map_routingkit_unweighted_graph", 2,
+		"Maps a graph in the RoutingKit first_out/head format into memory. The heads are only copied when they are modified. The file must not be modified while it is mapped.",
+		[](vector<string>args){
+			auto first_out = map_array_id_func<unsigned>(args[0]);
+			if(first_out.preimage_count() == 0)
+				throw std::runtime_error("first_out vector must not be empty");
+			int node_count = first_out.preimage_count()-1;
+			int arc_count = first_out(node_count);
+
+			auto head_file = map_file(args[1]);
+			if(head_file->size() != static_cast<long long>(sizeof(int))*arc_count)
+				throw std::runtime_error("head vector does not have a length equal to the number of arcs");
+
+			tail = ArrayIDIDFunc(arc_count, node_count);
+			for(int x=0; x<node_count; ++x)
+				for(unsigned xy=first_out(x); xy<first_out(x+1); ++xy)
+					tail[xy] = x;
+			head = ArrayIDIDFunc(arc_count, node_count, reinterpret_cast<int*>(head_file->data()), head_file);
+			graph_structure.clear();
 			node_weight = ArrayIDFunc<int>(node_count);
 			node_weight.fill(0);
 			arc_weight = ArrayIDFunc<int>(arc_count);
@@ -1083,6 +1548,7 @@ vector<Command>cmd = {
 			node_color = ArrayIDIDFunc(tail.image_count(), 1);
 			node_color.fill(0);
 			node_geo_pos = ArrayIDFunc<GeoPos>(tail.image_count());
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0.0, 0.0});
 			node_original_position = identity_permutation(tail.image_count());
 			arc_color = ArrayIDIDFunc(tail.preimage_count(), 1);
@@ -1131,6 +1597,17 @@ vector<Command>cmd = {
 		}
 	},
 
+	{
+		"map_routingkit_arc_weight", 1,
+		"Maps an arc weight in the RoutingKit travel_time/geo_dist format into memory. The weights are only copied when they are modified. The file must not be modified while it is mapped.",
+		[](vector<string>args){
+			auto weight = map_array_id_func<int>(args[0]);
+			if(tail.preimage_count() != weight.preimage_count())
+				throw std::runtime_error("weight vector does not have a length equal to the number of arcs");
+			arc_weight = std::move(weight);
+		}
+	},
+
 	{
 		"save_routingkit_arc_weight", 1,
 		"Save an arc weight in the RoutingKit travel_time/geo_dist format",
@@ -1153,6 +1630,7 @@ vector<Command>cmd = {
 
 			for(int i=0; i<node_count; ++i)
 				node_geo_pos[i].lon = lon[i];
+			node_geo_pos_index.clear();
 		}
 	},
 	{
@@ -1166,6 +1644,7 @@ vector<Command>cmd = {
 
 			for(int i=0; i<node_count; ++i)
 				node_geo_pos[i].lat = lat[i];
+			node_geo_pos_index.clear();
 		}
 	},
 	{
@@ -1216,6 +1695,7 @@ vector<Command>cmd = {
 			if(new_geo_pos.preimage_count() != node_geo_pos.preimage_count())
 				throw runtime_error("The number of nodes in the geo pos file and in the current graph differ");
 			node_geo_pos = std::move(new_geo_pos);
+			node_geo_pos_index.clear();
 		}
 	},
 	{
@@ -1226,6 +1706,7 @@ vector<Command>cmd = {
 			if(new_geo_pos.preimage_count() != node_geo_pos.preimage_count())
 				throw runtime_error("The number of nodes in the geo pos file and in the current graph differ");
 			node_geo_pos = std::move(new_geo_pos);
+			node_geo_pos_index.clear();
 		}
 	},
 	{
@@ -1255,6 +1736,7 @@ vector<Command>cmd = {
 		[]{
 			for(int i=0; i<tail.image_count(); ++i)
 				std::swap(node_geo_pos[i].lon, node_geo_pos[i].lat);
+			node_geo_pos_index.clear();
 		}
 	},
 	{
@@ -1405,7 +1887,7 @@ vector<Command>cmd = {
 		[](vector<string>arg){
 
 
-			io::CSVReader<1>in(arg[0]);
+			io::CSVReader<1>in(arg[0], open_csv_file(arg[0]));
 			in.read_header(io::ignore_extra_column, "cut");
 
 
@@ -1547,6 +2029,7 @@ vector<Command>cmd = {
 		"Reverses all arcs",
 		[]{
 			head.swap(tail);
+			graph_structure.clear();
 		}
 	},
 	{
@@ -1627,6 +2110,7 @@ vector<Command>cmd = {
 
 			tail = move(new_tail);
 			head = move(new_head);
+			graph_structure.clear();
 			arc_weight = move(new_arc_weight);
 			arc_color = move(new_arc_color);
 		}
@@ -1655,12 +2139,14 @@ vector<Command>cmd = {
 
 			node_color = add_preimage_at_end(std::move(node_color), 1, 0);
 			node_geo_pos = add_preimage_at_end(std::move(node_geo_pos), 1, GeoPos{0.0, 0.0});
+			node_geo_pos_index.clear();
 			node_original_position = add_preimage_at_end(std::move(node_original_position), 1, 0);
 			node_weight = add_preimage_at_end(std::move(node_weight), 1, 0);
 
 
 			tail = add_preimage_at_end(std::move(tail), neighbor_count*2);
 			head = add_preimage_at_end(std::move(head), neighbor_count*2);
+			graph_structure.clear();
 
 			int i = old_arc_count;
 			forall_in_id_string(
@@ -1690,7 +2176,7 @@ vector<Command>cmd = {
 		"list_back_arcs", 1,
 		"Lists the back arc of every arc",
 		[](vector<string>args){
-			auto back_arc = compute_back_arc_permutation(tail, head);
+			const auto&back_arc = get_back_arc();
 			save_text_file(
 				args[0],
 				[&](ostream&out){
@@ -1776,8 +2262,61 @@ vector<Command>cmd = {
 
 
 			node_color.set_image_count(2);
-			for(int i=0; i<tail.image_count(); ++i)
-				node_color.set(i, min_lat <= node_geo_pos(i).lat && node_geo_pos(i).lat <= max_lat && min_lon <= node_geo_pos(i).lon && node_geo_pos(i).lon <= max_lon);
+			node_color.fill(0);
+			get_node_geo_pos_index().forall_nodes_in_box(min_lat, max_lat, min_lon, max_lon, [&](int x){node_color.set(x, 1);});
+		}
+	},
+	{
+		"color_node_in_geo_polygon", 1,
+		"Colors all nodes inside a polygon with 1 and all other with 0. Every line of file arg1 contains the latitude and longitude of a polygon corner.",
+		[](vector<string>arg){
+			vector<GeoPos>polygon;
+			load_uncached_text_file(
+				arg[0],
+				[&](istream&in){
+					GeoPos p;
+					while(in >> p.lat >> p.lon)
+						polygon.push_back(p);
+					if(!in.eof())
+						throw runtime_error("Could not parse the polygon in "+arg[0]);
+				}
+			);
+			if(polygon.size() < 3)
+				throw runtime_error("A polygon needs at least 3 corners");
+
+			double
+				min_lat = polygon[0].lat,
+				max_lat = polygon[0].lat,
+				min_lon = polygon[0].lon,
+				max_lon = polygon[0].lon;
+			for(auto p:polygon){
+				min_to(min_lat, p.lat);
+				max_to(max_lat, p.lat);
+				min_to(min_lon, p.lon);
+				max_to(max_lon, p.lon);
+			}
+
+			// Even-odd rule, i.e., count the polygon sides crossed by a ray from p in positive lon direction
+			auto is_inside = [&](GeoPos p){
+				bool inside = false;
+				for(int i=0, j=polygon.size()-1; i<(int)polygon.size(); j=i++){
+					GeoPos a = polygon[i], b = polygon[j];
+					if((a.lat > p.lat) != (b.lat > p.lat))
+						if(p.lon < a.lon + (p.lat - a.lat) * (b.lon - a.lon) / (b.lat - a.lat))
+							inside = !inside;
+				}
+				return inside;
+			};
+
+			node_color.set_image_count(2);
+			node_color.fill(0);
+			get_node_geo_pos_index().forall_nodes_in_box(
+				min_lat, max_lat, min_lon, max_lon,
+				[&](int x){
+					if(is_inside(node_geo_pos(x)))
+						node_color.set(x, 1);
+				}
+			);
 		}
 	},
 	{
@@ -1831,20 +2370,14 @@ vector<Command>cmd = {
 				min_lon = stof(arg[2]),
 				max_lon = stof(arg[3]);
 
-			auto in_region = id_func(
-				tail.image_count(),
-				[&](int i){
-					return
-						min_lat <= node_geo_pos(i).lat &&
-						node_geo_pos(i).lat <= max_lat &&
-						min_lon <= node_geo_pos(i).lon &&
-						node_geo_pos(i).lon <= max_lon;
-				}
-			);
+			BitIDFunc in_region(tail.image_count());
+			in_region.fill(false);
+			get_node_geo_pos_index().forall_nodes_in_box(min_lat, max_lat, min_lon, max_lon, [&](int x){in_region.set(x, true);});
+
 			node_color.set_image_count(2);
 			node_color.fill(0);
 			for(int i=0; i<tail.image_count(); ++i)
-				node_color.set(i, min_lat <= node_geo_pos(i).lat && node_geo_pos(i).lat <= max_lat && min_lon <= node_geo_pos(i).lon && node_geo_pos(i).lon <= max_lon);
+				node_color.set(i, in_region(i));
 			for(int i=0; i<tail.preimage_count(); ++i)
 				if(in_region(head(i))||in_region(tail(i))){
 					node_color.set(tail(i), 1);
@@ -2062,16 +2595,16 @@ vector<Command>cmd = {
 			if(s < 0 || s >= tail.image_count())
 				throw std::runtime_error("s is out of bounds");
 
-			auto out_arc = invert_id_id_func(tail);
+			const auto&out_arc = get_out_arc();
 			auto dist = compute_distances(out_arc, head, arc_weight, s);
 
 
 			save_text_file(
 				arg[1],
 				[&](std::ostream&o){
-					o << "node_id,distance" << endl;
+					o << "node_id,distance\n";
 					for(int i=0; i<dist.preimage_count(); ++i)
-						o << i << ',' << dist(i) << endl;
+						o << i << ',' << dist(i) << '\n';
 
 				}
 			);
@@ -2085,7 +2618,7 @@ vector<Command>cmd = {
 			if(s < 0 || s >= tail.image_count())
 				throw std::runtime_error("s is out of bounds");
 
-			auto out_arc = invert_id_id_func(tail);
+			const auto&out_arc = get_out_arc();
 
 
 			save_text_file(
@@ -2105,26 +2638,64 @@ vector<Command>cmd = {
 			);
 		}
 	},
+	{
+		"compute_distances_from_nodes", 2,
+		"Computes the shortest path distances from every node in the id string arg1 to all nodes and stores them to file arg2. arg1 can be \"all\". "
+		"The i-th line contains the space separated distances from the i-th source. If arg2 ends in \".bin\" then the distances are "
+		"stored as binary 32 bit integers, node_count many per source. Unreachable nodes have distance 2147483647. The searches run "
+		"on thread_count threads, see flow_cutter_set.",
+		[](vector<string>arg){
+			auto source_list = parse_source_node_list(arg[0]);
+			const auto&out_arc = get_out_arc();
+
+			const std::string binary_extension = ".bin";
+			if(arg[1].size() >= binary_extension.size() && arg[1].compare(arg[1].size()-binary_extension.size(), binary_extension.size(), binary_extension) == 0){
+				save_binary_file(
+					arg[1],
+					[&](std::ostream&o){
+						compute_distances_from_sources(
+							out_arc, head, arc_weight, source_list, flow_cutter_config.thread_count,
+							[&](int i, int s, const ArrayIDFunc<int>&dist){
+								o.write(reinterpret_cast<const char*>(dist.begin()), dist.preimage_count()*sizeof(int));
+							}
+						);
+					}
+				);
+			}else{
+				save_text_file(
+					arg[1],
+					[&](std::ostream&o){
+						compute_distances_from_sources(
+							out_arc, head, arc_weight, source_list, flow_cutter_config.thread_count,
+							[&](int i, int s, const ArrayIDFunc<int>&dist){
+								for(int x=0; x<dist.preimage_count(); ++x){
+									if(x != 0)
+										o << ' ';
+									o << dist(x);
+								}
+								o << '\n';
+							}
+						);
+					}
+				);
+			}
+		}
+	},
 	{
 		"compute_all_pair_distance_tree", 1,
-		"Computes the shortest path trees stores them as labeled parenthesis list to file arg2. The i-th line corresponds to source node i.",
+		"Computes the shortest path trees stores them as labeled parenthesis list to file arg1. The i-th line corresponds to source node i. "
+		"The searches run on thread_count threads, see flow_cutter_set.",
 		[](vector<string>arg){
-			auto out_arc = invert_id_id_func(tail);
+			const auto&out_arc = get_out_arc();
 			save_text_file(
 				arg[0],
 				[&](std::ostream&o){
-					auto print = [&](int x){
-						o << x << ' ';
-					};
-
-					for(int s=0; s<tail.image_count(); ++s){
-						depth_first_traverse_shortest_path_tree(
-							out_arc, head, arc_weight,
-							s,
-							print, print
-						);
-						o << '\n';
-					}
+					compute_shortest_path_trees_from_sources(
+						out_arc, head, arc_weight, parse_source_node_list("all"), flow_cutter_config.thread_count,
+						[&](int i, int s, const std::string&tree){
+							o << tree << '\n';
+						}
+					);
 				}
 			);
 		}
@@ -2191,7 +2762,7 @@ vector<Command>cmd = {
 
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw runtime_error("arc tails must be sorted");
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("graph must be symmetric");
 			if(!is_connected(tail, head))
 				throw runtime_error("graph must be connected");
@@ -2206,8 +2777,8 @@ vector<Command>cmd = {
 						throw std::runtime_error("arc weights must be non-negative");
 			}
 
-			auto out_arc = invert_sorted_id_id_func(tail);
-			auto back_arc = compute_back_arc_permutation(tail, head);
+			const auto&out_arc = get_out_arc();
+			const auto&back_arc = get_back_arc();
 
 			auto graph = flow_cutter::make_graph(
 				make_const_ref_id_id_func(tail),
@@ -2302,7 +2873,7 @@ vector<Command>cmd = {
 
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw runtime_error("arc tails must be sorted");
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("graph must be symmetric");
 			if(!is_connected(tail, head))
 				throw runtime_error("graph must be connected");
@@ -2317,8 +2888,8 @@ vector<Command>cmd = {
 						throw std::runtime_error("arc weights must be non-negative");
 			}
 
-			auto out_arc = invert_sorted_id_id_func(tail);
-			auto back_arc = compute_back_arc_permutation(tail, head);
+			const auto&out_arc = get_out_arc();
+			const auto&back_arc = get_back_arc();
 
 			auto expanded_graph = flow_cutter::expanded_graph::make_graph(
 				make_const_ref_id_id_func(tail),
@@ -2411,6 +2982,7 @@ vector<Command>cmd = {
 
 			head.swap(new_head);
 			tail.swap(new_tail);
+			graph_structure.clear();
 			arc_color.swap(new_arc_color);
 			arc_weight.swap(new_arc_weight);
 
@@ -2424,6 +2996,7 @@ vector<Command>cmd = {
 			node_weight.fill(0);
 
 			node_geo_pos = ArrayIDFunc<GeoPos>(node_count);
+			node_geo_pos_index.clear();
 			node_geo_pos.fill({0,0});
 		}
 	},
@@ -2456,7 +3029,7 @@ vector<Command>cmd = {
 		[](vector<string>arg){
 			const int node_count = tail.image_count(), arc_count = tail.preimage_count();
 
-			io::CSVReader<6>in(arg[0]);
+			io::CSVReader<6>in(arg[0], open_csv_file(arg[0]));
 			in.read_header(io::ignore_extra_column, "cut", "source_assimilated", "target_assimilated", "source_reachable", "target_reachable", "flow");
 
 			int step_counter = 0;
@@ -2575,7 +3148,7 @@ vector<Command>cmd = {
 		"is_symmetric",
 		"Checks whether a graph is symmetric",
 		[]{
-			cout << w << "is symmetric?" << " : " << boolalpha << is_symmetric(tail, head) << endl;
+			cout << w << "is symmetric?" << " : " << boolalpha << is_graph_symmetric() << endl;
 		}
 	},
 	{
@@ -2589,14 +3162,14 @@ vector<Command>cmd = {
 		"is_loop_free",
 		"Checks whether a graph has loops",
 		[]{
-			cout << w << "is loop free?" << " : " << boolalpha << is_loop_free(tail, head) << endl;
+			cout << w << "is loop free?" << " : " << boolalpha << is_graph_loop_free() << endl;
 		}
 	},
 	{
 		"has_multi_arcs",
 		"Checks whether a graph has multi arcs",
 		[]{
-			cout << w << "has multi-arcs?" << " : " << boolalpha << has_multi_arcs(tail, head) << endl;
+			cout << w << "has multi-arcs?" << " : " << boolalpha << graph_has_multi_arcs() << endl;
 		}
 	},
 	{
@@ -2810,20 +3383,21 @@ vector<Command>cmd = {
 	},
 	{
 		"inertial_flow_cut", 1,
-		"Runs the inertial cut algorithm. The argument is the minimum size of the smaller side, a value between 0.0 and 0.5",
+		"Runs the inertial cut algorithm. The argument is the minimum size of the smaller side, a value between 0.0 and 0.5. "
+		"The max flows are computed using max_flow_algorithm and the projection directions are evaluated on thread_count threads, see flow_cutter_set.",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			const int node_count = tail.image_count();
 
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
-			auto c = inertial_flow::compute_inertial_flow_cut(tail, head, node_geo_pos, min_balance);
+			auto c = inertial_flow::compute_inertial_flow_cut(tail, head, node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count);
 			node_color.set_image_count(2);
 			for(int i=0; i<node_count; ++i)
 				node_color[i] = c.is_on_smaller_side(i);
@@ -2834,18 +3408,19 @@ vector<Command>cmd = {
 	},
 	{
 		"inertial_flow_separator", 1,
-		"Runs the inertial cut algorithm. The argument is the minimum size of the smaller side, a value between 0.0 and 0.5",
+		"Runs the inertial cut algorithm. The argument is the minimum size of the smaller side, a value between 0.0 and 0.5. "
+		"The max flows are computed using max_flow_algorithm and the projection directions are evaluated on thread_count threads, see flow_cutter_set.",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
-			cout << make_id_string_from_list(inertial_flow::compute_inertial_flow_separator(tail, head, node_geo_pos, min_balance)) << endl;
+			cout << make_id_string_from_list(inertial_flow::compute_inertial_flow_separator(tail, head, node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count)) << endl;
 		}
 	},
 
@@ -2853,11 +3428,11 @@ vector<Command>cmd = {
 		"reorder_chordal_graph_nodes_in_min_elimination_tree_height_order",
 		"Reorders all nodes in nested dissection order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			permutate_nodes(compute_minimum_elimination_tree_height_order_from_chordal_graph(tail, head));
 		}
@@ -2876,11 +3451,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_input_order",
 		"Reorders all nodes in nested dissection order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			const int node_count = head.image_count();
@@ -2901,17 +3476,17 @@ vector<Command>cmd = {
 		"reorder_nodes_in_inertial_flow_nested_dissection_order", 1,
 		"Reorders all nodes in nested dissection order. min_balance is arg1",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
 
-			permutate_nodes(cch_order::compute_nested_dissection_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance)));
+			permutate_nodes(cch_order::compute_nested_dissection_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count)));
 		}
 	},
 #ifdef USE_KAHIP
@@ -2919,11 +3494,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_kahip_nested_dissection_order", 1,
 		"Reorders all nodes in nested dissection order. epsilon is arg1",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -2936,13 +3511,13 @@ vector<Command>cmd = {
 	},
 	{
 		"reorder_nodes_in_kahip_nested_dissection_order_with_separator_stats", 2,
-		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2",
+		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2. The stats are written as JSON lines if arg2 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -2957,7 +3532,7 @@ vector<Command>cmd = {
 					permutate_nodes(
 						cch_order::compute_nested_dissection_graph_order(
 							tail, head, arc_weight,
-							separator::report_separator_statistics(out, my_kahip::ComputeSeparator(epsilon))
+							separator::report_separator_statistics(out, my_kahip::ComputeSeparator(epsilon), separator::get_separator_statistics_format(args[1]))
 						)
 					);
 				}
@@ -2968,11 +3543,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_kahip_cch_order", 1,
 		"Reorders all nodes in nested dissection order.",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -2990,13 +3565,13 @@ vector<Command>cmd = {
 	},
 	{
 		"reorder_nodes_in_kahip_cch_order_with_separator_stats", 2,
-		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2",
+		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2. The stats are written as JSON lines if arg2 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -3009,7 +3584,7 @@ vector<Command>cmd = {
 					permutate_nodes(
 						cch_order::compute_cch_graph_order(
 							tail, head, arc_weight,
-							separator::report_separator_statistics(out, my_kahip::ComputeSeparator(epsilon))
+							separator::report_separator_statistics(out, my_kahip::ComputeSeparator(epsilon), separator::get_separator_statistics_format(args[1]))
 						)
 					);
 				}
@@ -3020,11 +3595,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_kahip2_nested_dissection_order", 1,
 		"Reorders all nodes in nested dissection order. epsilon is arg1",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -3037,13 +3612,13 @@ vector<Command>cmd = {
 	},
 	{
 		"reorder_nodes_in_kahip2_nested_dissection_order_with_separator_stats", 2,
-		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2",
+		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2. The stats are written as JSON lines if arg2 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -3058,7 +3633,7 @@ vector<Command>cmd = {
 					permutate_nodes(
 						cch_order::compute_nested_dissection_graph_order(
 							tail, head, arc_weight,
-							separator::report_separator_statistics(out, my_kahip::ComputeSeparator2(epsilon))
+							separator::report_separator_statistics(out, my_kahip::ComputeSeparator2(epsilon), separator::get_separator_statistics_format(args[1]))
 						)
 					);
 				}
@@ -3069,11 +3644,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_kahip2_cch_order", 1,
 		"Reorders all nodes in nested dissection order.",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -3091,13 +3666,13 @@ vector<Command>cmd = {
 	},
 	{
 		"reorder_nodes_in_kahip2_cch_order_with_separator_stats", 2,
-		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2",
+		"Reorders all nodes in nested dissection order. epsilon is arg1 and the separator stats are in arg2. The stats are written as JSON lines if arg2 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			if(!is_sorted(tail.begin(), tail.end()))
 				throw std::runtime_error("Tails must be sorted");
@@ -3110,7 +3685,7 @@ vector<Command>cmd = {
 					permutate_nodes(
 						cch_order::compute_cch_graph_order(
 							tail, head, arc_weight,
-							separator::report_separator_statistics(out, my_kahip::ComputeSeparator2(epsilon))
+							separator::report_separator_statistics(out, my_kahip::ComputeSeparator2(epsilon), separator::get_separator_statistics_format(args[1]))
 						)
 					);
 				}
@@ -3122,42 +3697,70 @@ vector<Command>cmd = {
 		"reorder_nodes_in_inertial_flow_cch_order", 1,
 		"Reorders all nodes in nested dissection order. min_balance is arg1",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
 
-			permutate_nodes(cch_order::compute_cch_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance)));
+			permutate_nodes(cch_order::compute_cch_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count)));
 		}
 	},
 	{
 		"reorder_nodes_in_greedy_min_degree_order",
 		"Reorders all nodes in greedy minimum degree order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(compute_greedy_min_degree_order(tail, head));
 		}
 	},
+	{
+		"reorder_nodes_in_exact_greedy_min_degree_order",
+		"Reorders all nodes in greedy minimum degree order. Unlike reorder_nodes_in_greedy_min_degree_order the degrees are exact but the running time can be quadratic.",
+		[]{
+			if(!is_graph_symmetric())
+				throw runtime_error("Graph must be symmetric");
+			if(graph_has_multi_arcs())
+				throw runtime_error("Graph must not have multi arcs");
+			if(!is_graph_loop_free())
+				throw runtime_error("Graph must not have loops");
+
+			permutate_nodes(compute_exact_greedy_min_degree_order(tail, head));
+		}
+	},
+	{
+		"reorder_nodes_in_exact_greedy_min_shortcut_order",
+		"Reorders all nodes in greedy shortcut degree order. Unlike reorder_nodes_in_greedy_min_shortcut_order the shortcut counts are exact but the running time can be quadratic.",
+		[]{
+			if(!is_graph_symmetric())
+				throw runtime_error("Graph must be symmetric");
+			if(graph_has_multi_arcs())
+				throw runtime_error("Graph must not have multi arcs");
+			if(!is_graph_loop_free())
+				throw runtime_error("Graph must not have loops");
+
+			permutate_nodes(compute_exact_greedy_min_shortcut_order(tail, head));
+		}
+	},
 	{
 		"reorder_nodes_in_greedy_min_shortcut_and_level_order",
 		"Reorders all nodes in greedy minimum degree order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(compute_greedy_min_shortcut_and_level_order(tail, head));
@@ -3167,11 +3770,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_greedy_min_shortcut_order",
 		"Reorders all nodes in greedy shortcut degree order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(compute_greedy_min_shortcut_order(tail, head));
@@ -3181,11 +3784,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_greedy_min_shortcut_order_with_random", 2,
 		"Reorders all nodes in greedy shortcut degree order.",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(compute_greedy_min_shortcut_order(tail, head, stoi(args[0]), stoi(args[1])));
@@ -3195,11 +3798,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_greedy_random_independent_set_order",
 		"Reorders all nodes in greedy independent set order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(compute_greedy_independent_set_order(tail, head, false));
@@ -3209,11 +3812,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_greedy_degree_guided_independent_set_order",
 		"Reorders all nodes in greedy independent set order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(compute_greedy_independent_set_order(tail, head, true));
@@ -3245,10 +3848,10 @@ vector<Command>cmd = {
 		"test_depth_first_search",
 		"Tests the symmetric depth first search.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("This DFS variant only works on symmetric graphs");
 			symmetric_depth_first_search(
-				invert_id_id_func(tail),
+				get_out_arc(),
 				head,
 				[](int v){
 					cout << "First visit to root " << v << endl;
@@ -3272,9 +3875,9 @@ vector<Command>cmd = {
 		"color_biconnected_components",
 		"Colors the two connected components by coloring the arcs.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Can only color the 2-connected components of a symmetric graph");
-			arc_color = compute_biconnected_components(invert_id_id_func(tail), head, compute_back_arc_permutation(tail, head));
+			arc_color = compute_biconnected_components(get_out_arc(), head, get_back_arc());
 		}
 	},
 	{
@@ -3339,7 +3942,7 @@ vector<Command>cmd = {
 					throw runtime_error("Does not work with negative arc weights");
 
 			min_id_heap<int>heap(node_count);
-			auto out_arc = invert_id_id_func(tail);
+			const auto&out_arc = get_out_arc();
 
 			ArrayIDFunc<int>timestamp(node_count);
 			timestamp.fill(-1);
@@ -3407,6 +4010,7 @@ vector<Command>cmd = {
 
 			head.swap(new_head);
 			tail.swap(new_tail);
+			graph_structure.clear();
 			arc_weight.swap(new_arc_weight);
 			arc_color.swap(new_arc_color);
 
@@ -3496,7 +4100,7 @@ vector<Command>cmd = {
 		"is_tree",
 		"Checks whether the graph is a symmetric tree.",
 		[]{
-			bool sym = is_symmetric(tail, head);
+			bool sym = is_graph_symmetric();
 			cout << w << "is symmetric?" << " : " << boolalpha << sym << endl;
 			bool tree = false;
 			if(sym)
@@ -3508,7 +4112,7 @@ vector<Command>cmd = {
 		"color_nodes_by_tree_node_rank",
 		"Colors all nodes by tree node rank.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
 			auto succ = compute_successor_function(tail, head);
 			if(!is_tree(succ))
@@ -3539,7 +4143,7 @@ vector<Command>cmd = {
 		"reorder_nodes_in_tree_order",
 		"Reorders all nodes of a symmetric tree such that a minimum fill in is produced. Arcs must be sorted.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
 			auto succ = compute_successor_function(tail, head);
 			if(!is_tree(succ))
@@ -3552,35 +4156,35 @@ vector<Command>cmd = {
 		"reorder_nodes_in_inertial_flow_nested_dissection_order", 1,
 		"Reorders all nodes in nested dissection order. min_balance is arg1",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
 
-			permutate_nodes(cch_order::compute_nested_dissection_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance)));
+			permutate_nodes(cch_order::compute_nested_dissection_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count)));
 		}
 	},
 	{
 		"reorder_nodes_in_inertial_flow_nested_dissection_order_with_separator_stats", 2,
-		"Reorders all nodes in nested dissection order. min_balance is arg1",
+		"Reorders all nodes in nested dissection order. min_balance is arg1 and the separator stats are in arg2. The stats are written as JSON lines if arg2 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
 
 
-			save_text_file(args[0],
+			save_text_file(args[1],
 				[&](std::ostream&out){
 					std::mt19937 rng(flow_cutter_config.random_seed);
 					permutate_nodes(
@@ -3588,7 +4192,8 @@ vector<Command>cmd = {
 							tail, head, arc_weight,
 							separator::report_separator_statistics(
 								out,
-								inertial_flow::ComputeSeparator(node_geo_pos, min_balance)
+								inertial_flow::ComputeSeparator(node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count),
+								separator::get_separator_statistics_format(args[1])
 							)
 						)
 					);
@@ -3600,35 +4205,35 @@ vector<Command>cmd = {
 		"reorder_nodes_in_inertial_flow_cch_order", 1,
 		"Reorders all nodes in nested dissection order. min_balance is arg1",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
 
-			permutate_nodes(cch_order::compute_cch_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance)));
+			permutate_nodes(cch_order::compute_cch_graph_order(tail, head, arc_weight, inertial_flow::ComputeSeparator(node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count)));
 		}
 	},
 	{
 		"reorder_nodes_in_inertial_flow_cch_order_with_separator_stats", 2,
-		"Reorders all nodes in nested dissection order. min_balance is arg1",
+		"Reorders all nodes in nested dissection order. min_balance is arg1 and the separator stats are in arg2. The stats are written as JSON lines if arg2 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			double min_balance = stof(args[0]);
 			if(min_balance < 0 || min_balance > 0.5)
 				throw runtime_error("min balance parameter must be between 0.0 and 0.5");
 
 
-			save_text_file(args[0],
+			save_text_file(args[1],
 				[&](std::ostream&out){
 					std::mt19937 rng(flow_cutter_config.random_seed);
 					permutate_nodes(
@@ -3636,7 +4241,8 @@ vector<Command>cmd = {
 							tail, head, arc_weight,
 							separator::report_separator_statistics(
 								out,
-								inertial_flow::ComputeSeparator(node_geo_pos, min_balance)
+								inertial_flow::ComputeSeparator(node_geo_pos, min_balance, get_inertial_flow_max_flow_algorithm(), flow_cutter_config.thread_count),
+								separator::get_separator_statistics_format(args[1])
 							)
 						)
 					);
@@ -3648,11 +4254,11 @@ vector<Command>cmd = {
 		"reorder_nodes_in_flow_cutter_small_tree_width_order",
 		"Reorders all nodes in nested dissection order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(
@@ -3667,30 +4273,32 @@ vector<Command>cmd = {
 		"reorder_nodes_in_flow_cutter_nested_dissection_order",
 		"Reorders all nodes in nested dissection order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			permutate_nodes(
 				cch_order::compute_nested_dissection_graph_order(
 					tail, head, arc_weight,
-					flow_cutter::ComputeSeparator(flow_cutter_config)
+					flow_cutter::ComputeSeparator(flow_cutter_config),
+					flow_cutter_config.thread_count,
+					flow_cutter_config.base_case_node_count
 				)
 			);
 		}
 	},
 	{
 		"reorder_nodes_in_flow_cutter_nested_dissection_order_with_separator_stats", 1,
-		"Reorders all nodes in nested dissection order. Writes log information to arg1",
+		"Reorders all nodes in nested dissection order. Writes log information to arg1. The stats are written as JSON lines if arg1 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			save_text_file(args[0],
@@ -3698,7 +4306,9 @@ vector<Command>cmd = {
 					permutate_nodes(
 						cch_order::compute_nested_dissection_graph_order(
 							tail, head, arc_weight,
-							separator::report_separator_statistics(out, flow_cutter::ComputeSeparator(flow_cutter_config))
+							separator::report_separator_statistics(out, flow_cutter::ComputeSeparator(flow_cutter_config), separator::get_separator_statistics_format(args[0])),
+							flow_cutter_config.thread_count,
+							flow_cutter_config.base_case_node_count
 						)
 					);
 				}
@@ -3709,16 +4319,18 @@ vector<Command>cmd = {
 		"reorder_nodes_in_flow_cutter_cch_order",
 		"Reorders all nodes in nested dissection order.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 			permutate_nodes(
 				cch_order::compute_cch_graph_order(
 					tail, head, arc_weight,
-					flow_cutter::ComputeSeparator(flow_cutter_config)
+					flow_cutter::ComputeSeparator(flow_cutter_config),
+					flow_cutter_config.thread_count,
+					flow_cutter_config.base_case_node_count
 				)
 			);
 		}
@@ -3729,11 +4341,11 @@ vector<Command>cmd = {
 		"Reorders all nodes in nested dissection order.",
 		[](vector<string>args){
 			int node_count = tail.image_count();
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			int up_color = select_color(args[0]);
@@ -3746,20 +4358,22 @@ vector<Command>cmd = {
 			permutate_nodes(
 				cch_order::compute_cch_graph_order_given_top_level_separator(
 					tail, head, arc_weight, std::move(separator),
-					flow_cutter::ComputeSeparator(flow_cutter_config)
+					flow_cutter::ComputeSeparator(flow_cutter_config),
+					flow_cutter_config.thread_count,
+					flow_cutter_config.base_case_node_count
 				)
 			);
 		}
 	},
 	{
 		"reorder_nodes_in_flow_cutter_cch_order_with_separator_stats", 1,
-		"Reorders all nodes in nested dissection order. Writes log information to arg1",
+		"Reorders all nodes in nested dissection order. Writes log information to arg1. The stats are written as JSON lines if arg1 ends in .jsonl and as CSV otherwise",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
-			if(has_multi_arcs(tail, head))
+			if(graph_has_multi_arcs())
 				throw runtime_error("Graph must not have multi arcs");
-			if(!is_loop_free(tail, head))
+			if(!is_graph_loop_free())
 				throw runtime_error("Graph must not have loops");
 
 			save_text_file(args[0],
@@ -3767,18 +4381,85 @@ vector<Command>cmd = {
 					permutate_nodes(
 						cch_order::compute_cch_graph_order(
 							tail, head, arc_weight,
-							separator::report_separator_statistics(out, flow_cutter::ComputeSeparator(flow_cutter_config))
+							separator::report_separator_statistics(out, flow_cutter::ComputeSeparator(flow_cutter_config), separator::get_separator_statistics_format(args[0])),
+							flow_cutter_config.thread_count,
+							flow_cutter_config.base_case_node_count
 						)
 					);
 				}
 			);
 		}
 	},
+	{
+		"reorder_nodes_in_flow_cutter_cch_order_using_worker_processes", 3,
+		"Reorders all nodes in the same order as reorder_nodes_in_flow_cutter_cch_order. Parts with at most arg2 nodes are ordered by separate console processes, of which at most arg1 run at the same time. "
+		"The parts are handed to the processes as files in the directory arg3, for example /dev/shm. The flow cutter configuration is passed to the processes. "
+		"A time budget applies to every process separately.",
+		[](vector<string>args){
+			if(!is_graph_symmetric())
+				throw runtime_error("Graph must be symmetric");
+			if(graph_has_multi_arcs())
+				throw runtime_error("Graph must not have multi arcs");
+			if(!is_graph_loop_free())
+				throw runtime_error("Graph must not have loops");
+			int worker_process_count = stoi(args[0]);
+			int max_part_node_count = stoi(args[1]);
+			if(max_part_node_count < 0)
+				throw runtime_error("The maximum part node count must not be negative");
+
+			vector<string>config_args;
+			{
+				istringstream config_in(flow_cutter_config.get_config());
+				string name, colon, value;
+				while(config_in >> name >> colon >> value){
+					config_args.push_back("flow_cutter_set");
+					config_args.push_back(name);
+					config_args.push_back(value);
+				}
+			}
+
+			WorkerProcessPool worker_pool(worker_process_count);
+			permutate_nodes(
+				cch_order::compute_cch_graph_order_using_worker_processes(
+					tail, head, arc_weight,
+					flow_cutter::ComputeSeparator(flow_cutter_config),
+					max_part_node_count, worker_pool, args[2],
+					[&](const string&job_file, const string&order_file){
+						vector<string>worker_args = config_args;
+						worker_args.push_back("save_flow_cutter_nested_dissection_job_order");
+						worker_args.push_back(job_file);
+						worker_args.push_back(order_file);
+						return worker_args;
+					},
+					flow_cutter_config.thread_count,
+					flow_cutter_config.base_case_node_count
+				)
+			);
+		}
+	},
+	{
+		"save_flow_cutter_nested_dissection_job_order", 2,
+		"Computes the nested dissection order of the graph in the job file arg1 and saves it to the order file arg2. "
+		"This is the command run by the processes of reorder_nodes_in_flow_cutter_cch_order_using_worker_processes. The current graph is not modified.",
+		[](vector<string>args){
+			auto job = cch_order::map_nested_dissection_job(args[0]);
+			int node_count = job.tail.image_count();
+			cch_order::save_nested_dissection_job_order(
+				args[1],
+				cch_order::compute_nested_dissection_graph_order(
+					std::move(job.tail), std::move(job.head), identity_permutation(node_count), std::move(job.arc_weight),
+					flow_cutter::ComputeSeparator(flow_cutter_config),
+					flow_cutter_config.thread_count,
+					flow_cutter_config.base_case_node_count
+				)
+			);
+		}
+	},
 	{
 		"print_pace_tree_decomposition", 1,
 		"Prints a tree decomposition in the PACE 2016 format corresponding the current node order. The outputted node IDs are the input node IDs and not with respect to the current order.",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
 			const int node_count = tail.image_count();
 
@@ -3792,7 +4473,7 @@ vector<Command>cmd = {
 		"cycle_refine_cut", 1,
 		"Tries to reduce the cut size while leaving the balance unchanged",
 		[](vector<string>args){
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be symmetric");
 
 			std::vector<int>cut;
@@ -4032,15 +4713,46 @@ vector<Command>cmd = {
 		"find_closest_node", 2,
 		"Finds the node closest to a geographic position.",
 		[](vector<string>arg){
+			if(tail.image_count() == 0)
+				throw runtime_error("Graph has no nodes");
 			GeoPos p = {stof(arg[0]), stof(arg[1])};
-			cout << min_preimage_over_id_func(id_func(tail.image_count(), [&](int x){return geo_dist(p, node_geo_pos(x));})) << endl;
+			cout << get_node_geo_pos_index().find_closest_node(p) << endl;
+		}
+	},
+	{
+		"find_closest_nodes", 2,
+		"Finds for every position in file arg1 the closest node and writes the node IDs to file arg2. Every line of arg1 contains a latitude and a longitude.",
+		[](vector<string>arg){
+			if(tail.image_count() == 0)
+				throw runtime_error("Graph has no nodes");
+
+			vector<GeoPos>pos_list;
+			load_uncached_text_file(
+				arg[0],
+				[&](istream&in){
+					GeoPos p;
+					while(in >> p.lat >> p.lon)
+						pos_list.push_back(p);
+					if(!in.eof())
+						throw runtime_error("Could not parse the positions in "+arg[0]);
+				}
+			);
+
+			const auto&index = get_node_geo_pos_index();
+			save_text_file(
+				arg[1],
+				[&](ostream&out){
+					for(auto p:pos_list)
+						out << index.find_closest_node(p) << '\n';
+				}
+			);
 		}
 	},
 	{
 		"color_two_core",
 		"Colors nodes in the two core with 1 and the other nodes with 0.",
 		[]{
-			if(!is_symmetric(tail, head))
+			if(!is_graph_symmetric())
 				throw runtime_error("Graph must be undirected");
 
 			const int node_count = tail.image_count();
@@ -4056,7 +4768,7 @@ vector<Command>cmd = {
 			node_color.set_image_count(2);
 			node_color.fill(1);
 
-			auto out_arc = invert_id_id_func(tail);
+			const auto&out_arc = get_out_arc();
 
 			for(int x=0; x<node_count; ++x)
 				if(deg[x] <= 1)
@@ -4215,7 +4927,7 @@ vector<Command>cmd = {
 			auto pdf_file = concat_file_path_and_file_name(get_temp_directory_path(), "graphviz_tmp_file"+now+".pdf");
 
 			if(show_undirected)
-				if(!is_symmetric(tail, head))
+				if(!is_graph_symmetric())
 					throw runtime_error("Can only show symmetric graphs as undirected");
 
 			if(node_color.image_count() >= 12)
@@ -4266,7 +4978,149 @@ vector<Command>cmd = {
 	}
 };
 
+// Runs the command and reports its running time and memory if requested. The command that enables the
+// reporting is not reported itself.
+static void run_command(const Command&c, vector<string>args){
+	auto prev_time_commands = time_commands;
+	auto prev_report_memory = report_memory;
+
+	MemoryAccount*account = get_memory_account();
+	account->peak_allocated_bytes = account->allocated_bytes.load();
+
+	long long time = -get_micro_time();
+	c.func(move(args));
+	time += get_micro_time();
+
+	if(account->is_cancelled.exchange(false))
+		throw MemoryBudgetExceeded();
+
+	if(time_commands && prev_time_commands){
+		cout << "running time : "<<time << "musec" << endl;
+	}
+
+	if(report_memory && prev_report_memory){
+		cout << "peak allocated memory : " << account->peak_allocated_bytes.load()/1024 << "KiB" << endl;
+		cout << "allocated memory : " << account->allocated_bytes.load()/1024 << "KiB" << endl;
+	}
+}
+
+static bool execute_command_line(const string&line){
+	istringstream line_in(line);
+	string command;
+	line_in >> command;
+
+	if(command == "exit")
+		return false;
+
+	int c = -1;
+	for(int i=0; i<(int)cmd.size(); ++i)
+		if(cmd[i].name == command){
+			c = i;
+			break;
+		}
+	if(c == -1)
+		throw runtime_error("Unknown command "+command);
+
+	vector<string>args;
+	string x;
+	while(line_in >> x)
+		args.push_back(x);
+	if((int)args.size() != cmd[c].parameter_count)
+		throw runtime_error("Wrong number of parameters to command "+cmd[c].name+". expected:"+to_string(cmd[c].parameter_count)+", got:"+to_string(args.size()));
+
+	run_command(cmd[c], move(args));
+
+	check_graph_consitency();
+	return true;
+}
+
+static void run_command_session(istream&in){
+	auto graph = get_named_graph("default");
+
+	string line;
+	while(getline(in, line)){
+		try{
+			istringstream line_in(line);
+			string command;
+			if(!(line_in >> command))
+				continue;
+
+			vector<string>args;
+			string x;
+			while(line_in >> x)
+				args.push_back(x);
+
+			auto check_parameter_count = [&](int parameter_count){
+				if((int)args.size() != parameter_count)
+					throw runtime_error("Wrong number of parameters to command "+command+". expected:"+to_string(parameter_count)+", got:"+to_string(args.size()));
+			};
+
+			if(command == "exit"){
+				break;
+			}else if(command == "use_graph"){
+				check_parameter_count(1);
+				graph = get_named_graph(args[0]);
+			}else if(command == "copy_graph"){
+				check_parameter_count(2);
+				auto from = find_named_graph(args[0]);
+				auto to = make_shared<NamedGraph>();
+				{
+					lock_guard<mutex>guard(from->lock);
+					to->tail = from->tail;
+					to->head = from->head;
+					to->node_weight = from->node_weight;
+					to->arc_weight = from->arc_weight;
+					to->node_color = from->node_color;
+					to->arc_color = from->arc_color;
+					to->node_geo_pos = from->node_geo_pos;
+					to->node_original_position = from->node_original_position;
+					to->node_color_stack = from->node_color_stack;
+					to->graph_structure = from->graph_structure;
+				}
+				lock_guard<mutex>guard(named_graph_lock);
+				named_graphs[args[1]] = move(to);
+			}else if(command == "drop_graph"){
+				check_parameter_count(1);
+				lock_guard<mutex>guard(named_graph_lock);
+				if(named_graphs.erase(args[0]) == 0)
+					throw runtime_error("There is no graph named "+args[0]);
+			}else if(command == "list_graphs"){
+				check_parameter_count(0);
+				lock_guard<mutex>guard(named_graph_lock);
+				for(auto&g:named_graphs){
+					cout << g.first << " : ";
+					// Graphs on which a command is running are not waited for
+					if(g.second->lock.try_lock()){
+						cout << g.second->tail.image_count() << " nodes, " << g.second->tail.preimage_count() << " arcs" << endl;
+						g.second->lock.unlock();
+					}else{
+						cout << "busy" << endl;
+					}
+				}
+			}else if(command == "stop_command_server"){
+				check_parameter_count(0);
+				stop_command_server();
+			}else{
+				lock_guard<mutex>guard(graph->lock);
+				swap_current_graph(*graph);
+				try{
+					execute_command_line(line);
+				}catch(...){
+					swap_current_graph(*graph);
+					throw;
+				}
+				swap_current_graph(*graph);
+			}
+		}catch(std::exception&err){
+			cout << "Exception : " << err.what() << endl;
+		}
+		cout << flush;
+	}
+}
+
 int main(int argc, char*argv[]){
+	// Lets the loops of the main thread see that its budget is exceeded
+	CurrentCancellationScope memory_account_scope(&main_memory_account);
 	try{
 		if(argc == 1){
 			cout << "FlowCutter; partition graphs into two parts. For details type:\n\n\t"<<argv[0] << " help\n" << endl;
@@ -4290,14 +5144,7 @@ int main(int argc, char*argv[]){
 					++arg_pos;
 					arg_pos += c.parameter_count;
 
-					auto prev_time_commands = time_commands;
-					long long time = -get_micro_time();
-					c.func(move(args));
-					time += get_micro_time();
-
-					if(time_commands && prev_time_commands){
-						cout << "running time : "<<time << "musec" << endl;
-					}
+					run_command(c, move(args));
 
 					goto while_continue;
 				}
@@ -0,0 +1,102 @@
+#ifndef CUTTER_STATISTICS_H
+#define CUTTER_STATISTICS_H
+
+#include <chrono>
+
+namespace flow_cutter{
+
+	//! The cutters only count and time their phases if compiled with -DFLOW_CUTTER_STATISTICS. Otherwise
+	//! all statistics stay zero and the compiler removes the instrumentation.
+	#ifdef FLOW_CUTTER_STATISTICS
+	const bool collect_cutter_statistics = true;
+	#else
+	const bool collect_cutter_statistics = false;
+	#endif
+
+	// Times are in nanoseconds. The time of a phase includes the times of the phases nested in it:
+	// advance contains pierce_node_selection, grow_reachable_sets and grow_assimilated_sets, and
+	// grow_reachable_sets contains the augmenting path searches. The multi_cutter times are wall
+	// clock times of the OpenMP regions. All other times are summed over the cutters.
+	#define FLOW_CUTTER_FOR_EACH_STATISTIC(X) \
+		X(init_count) \
+		X(init_time_ns) \
+		X(distance_time_ns) \
+		X(advance_count) \
+		X(advance_time_ns) \
+		X(pierce_node_selection_count) \
+		X(pierce_node_candidate_count) \
+		X(pierce_node_selection_time_ns) \
+		X(grow_reachable_sets_count) \
+		X(grow_reachable_sets_node_count) \
+		X(grow_reachable_sets_arc_count) \
+		X(grow_reachable_sets_time_ns) \
+		X(augmenting_path_count) \
+		X(augmenting_path_arc_count) \
+		X(augmenting_path_time_ns) \
+		X(grow_assimilated_sets_count) \
+		X(grow_assimilated_sets_node_count) \
+		X(grow_assimilated_sets_arc_count) \
+		X(grow_assimilated_sets_time_ns) \
+		X(multi_cutter_init_time_ns) \
+		X(multi_cutter_advance_count) \
+		X(multi_cutter_advance_round_count) \
+		X(multi_cutter_advance_time_ns)
+
+	struct CutterStatistics{
+		#define FLOW_CUTTER_DECLARE_STATISTIC(NAME) long long NAME;
+		FLOW_CUTTER_FOR_EACH_STATISTIC(FLOW_CUTTER_DECLARE_STATISTIC)
+		#undef FLOW_CUTTER_DECLARE_STATISTIC
+
+		CutterStatistics(){
+			clear();
+		}
+
+		void clear(){
+			#define FLOW_CUTTER_CLEAR_STATISTIC(NAME) NAME = 0;
+			FLOW_CUTTER_FOR_EACH_STATISTIC(FLOW_CUTTER_CLEAR_STATISTIC)
+			#undef FLOW_CUTTER_CLEAR_STATISTIC
+		}
+
+		CutterStatistics&operator+=(const CutterStatistics&o){
+			#define FLOW_CUTTER_ADD_STATISTIC(NAME) NAME += o.NAME;
+			FLOW_CUTTER_FOR_EACH_STATISTIC(FLOW_CUTTER_ADD_STATISTIC)
+			#undef FLOW_CUTTER_ADD_STATISTIC
+			return *this;
+		}
+
+		//! Calls f(name, value) for every statistic in a fixed order.
+		template<class F>
+		void for_each(const F&f)const{
+			#define FLOW_CUTTER_VISIT_STATISTIC(NAME) f(#NAME, NAME);
+			FLOW_CUTTER_FOR_EACH_STATISTIC(FLOW_CUTTER_VISIT_STATISTIC)
+			#undef FLOW_CUTTER_VISIT_STATISTIC
+		}
+	};
+
+	inline
+	long long get_cutter_statistics_time(){
+		if(collect_cutter_statistics)
+			return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch()).count();
+		else
+			return 0;
+	}
+
+	//! Adds the time until the end of the scope to time.
+	class CutterStatisticsTimer{
+	public:
+		explicit CutterStatisticsTimer(long long&time):
+			time(time), begin(get_cutter_statistics_time()){}
+
+		~CutterStatisticsTimer(){
+			time += get_cutter_statistics_time() - begin;
+		}
+
+		CutterStatisticsTimer(const CutterStatisticsTimer&) = delete;
+		CutterStatisticsTimer&operator=(const CutterStatisticsTimer&) = delete;
+	private:
+		long long&time;
+		long long begin;
+	};
+}
+
+#endif
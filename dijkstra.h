@@ -2,6 +2,7 @@
 #define DIJKSTRA_H
 
 #include "heap.h"
+#include "radix_heap.h"
 #include "tiny_id_func.h"
 #include "array_id_func.h"
 #include "timestamp_id_func.h"
@@ -40,7 +41,18 @@ ForAllSuccessors<OutArc, Head, Weight> make_forall_successors(
 	return {std::move(out_arc), std::move(head), std::move(weight)};
 }
 
-template<class BoolIDFunc, class Dist = int>
+//! The radix heap requires that the popped keys do not decrease, which holds if no arc weight is negative.
+//! Otherwise, the searches fall back to min_id_heap.
+template<class Weight>
+bool is_radix_heap_applicable(const Weight&weight){
+	for(int xy=0; xy<weight.preimage_count(); ++xy)
+		if(weight(xy) < 0)
+			return false;
+	return true;
+}
+
+//! Queue is min_id_heap<Dist> or min_id_radix_heap<Dist>.
+template<class BoolIDFunc, class Dist = int, class Queue = min_id_heap<Dist>>
 class Dijkstra{
 public:
 	Dijkstra(){}
@@ -155,15 +167,16 @@ public:
 
 private:
 	ArrayIDFunc<Dist>distance;
-	min_id_heap<Dist>queue;
+	Queue queue;
 	BoolIDFunc was_pushed;
 };
 
-template<class OutArc, class Head, class Weight>
+//! Queue is min_id_heap<int> or min_id_radix_heap<int>, see is_radix_heap_applicable.
+template<class OutArc, class Head, class Weight, class Queue>
 void compute_distances(
 	const OutArc&out, const Head&head, const Weight&weight,
 	int source_node,
-	BitIDFunc&visited, ArrayIDFunc<int>&dist, min_id_heap<int>&q
+	BitIDFunc&visited, ArrayIDFunc<int>&dist, Queue&q
 ){
 	q.clear();
 	visited.fill(false);
@@ -191,11 +204,16 @@ ArrayIDFunc<int>compute_distances(const OutArc&out, const Head&head, const Weigh
 
 	BitIDFunc visited(node_count);
 	ArrayIDFunc<int>dist(node_count);
-	min_id_heap<int>q(node_count);
 
 	dist.fill(std::numeric_limits<int>::max());
 
-	compute_distances(out, head, weight, source_node, visited, dist, q);
+	if(is_radix_heap_applicable(weight)){
+		min_id_radix_heap<int>q(node_count);
+		compute_distances(out, head, weight, source_node, visited, dist, q);
+	}else{
+		min_id_heap<int>q(node_count);
+		compute_distances(out, head, weight, source_node, visited, dist, q);
+	}
 
 	return dist; // NVRO
 }
@@ -245,7 +263,10 @@ void depth_first_traverse_shortest_path_tree(
 	BitIDFunc visited(node_count);
 	ArrayIDFunc<int>dist(node_count);
 
-	{
+	if(is_radix_heap_applicable(weight)){
+		min_id_radix_heap<int>q(node_count);
+		compute_distances(out, head, weight, source_node, visited, dist, q);
+	}else{
 		min_id_heap<int>q(node_count);
 		compute_distances(out, head, weight, source_node, visited, dist, q);
 	}
@@ -0,0 +1,158 @@
+#ifndef ELIMINATION_TREE_H
+#define ELIMINATION_TREE_H
+
+#include "array_id_func.h"
+#include "id_multi_func.h"
+#include "multi_arc.h"
+#include <cassert>
+
+// The functions in this file compute properties of the chordal supergraph that results from contracting the
+// nodes increasing by ID without computing the supergraph itself. They follow the symbolic Cholesky
+// factorization of Gilbert, Ng and Peyton and need O(n + m) memory and O(m α(m,n)) time.
+
+//! Returns the parent of every node in the elimination tree or -1 for roots. The parent of x is the smallest
+//! upward neighbor of x in the chordal supergraph and thus always larger than x.
+template<class Tail, class Head>
+ArrayIDFunc<int> compute_elimination_tree(const Tail&tail, const Head&head){
+	assert(is_symmetric(tail, head));
+
+	const int node_count = tail.image_count();
+	auto out_arc = invert_id_id_func(tail);
+
+	ArrayIDFunc<int>parent(node_count), ancestor(node_count);
+	for(int x=0; x<node_count; ++x){
+		parent[x] = -1;
+		ancestor[x] = -1;
+		for(auto xy:out_arc(x)){
+			// Walk up from y to the root of its current subtree while compressing the path to x
+			int y = head(xy);
+			while(y != -1 && y < x){
+				int next = ancestor(y);
+				ancestor[y] = x;
+				if(next == -1)
+					parent[y] = x;
+				y = next;
+			}
+		}
+	}
+	return parent;
+}
+
+//! Orders the nodes of a forest given by parent pointers such that every node comes after its descendants.
+inline ArrayIDIDFunc compute_postorder_of_forest(const ArrayIDFunc<int>&parent){
+	const int node_count = parent.preimage_count();
+
+	ArrayIDFunc<int>first_child(node_count), next_sibling(node_count);
+	first_child.fill(-1);
+	for(int x=node_count-1; x>=0; --x){
+		if(parent(x) != -1){
+			next_sibling[x] = first_child(parent(x));
+			first_child[parent(x)] = x;
+		}
+	}
+
+	ArrayIDIDFunc post(node_count, node_count);
+	ArrayIDFunc<int>stack(node_count);
+	int post_end = 0;
+	for(int r=0; r<node_count; ++r){
+		if(parent(r) != -1)
+			continue;
+		int stack_end = 0;
+		stack[stack_end++] = r;
+		while(stack_end != 0){
+			int x = stack(stack_end-1);
+			int c = first_child(x);
+			if(c == -1){
+				--stack_end;
+				post[post_end++] = x;
+			}else{
+				first_child[x] = next_sibling(c);
+				stack[stack_end++] = c;
+			}
+		}
+	}
+	assert(post_end == node_count);
+	return post;
+}
+
+//! Returns for every node x the number of upward neighbors of x in the chordal supergraph, i.e., the number of
+//! arcs that compute_chordal_supergraph would report for x. parent and post must be the elimination tree and a
+//! postorder of it.
+template<class Tail, class Head>
+ArrayIDFunc<int> compute_upward_degrees_in_chordal_supergraph(
+	const Tail&tail, const Head&head,
+	const ArrayIDFunc<int>&parent, const ArrayIDIDFunc&post
+){
+	assert(is_symmetric(tail, head));
+
+	const int node_count = tail.image_count();
+	auto out_arc = invert_id_id_func(tail);
+
+	// first_descendant[x] is the postorder position of the first descendant of x
+	ArrayIDFunc<int>first_descendant(node_count), max_first_descendant(node_count), previous_leaf(node_count), ancestor(node_count);
+	first_descendant.fill(-1);
+	max_first_descendant.fill(-1);
+	previous_leaf.fill(-1);
+
+	// delta is the count of x minus the counts of its children, the counts include the diagonal
+	ArrayIDFunc<int>delta(node_count);
+	for(int i=0; i<node_count; ++i){
+		int x = post(i);
+		delta[x] = first_descendant(x) == -1 ? 1 : 0;
+		for(; x != -1 && first_descendant(x) == -1; x = parent(x))
+			first_descendant[x] = i;
+	}
+
+	for(int x=0; x<node_count; ++x)
+		ancestor[x] = x;
+
+	for(int i=0; i<node_count; ++i){
+		int x = post(i);
+		if(parent(x) != -1)
+			--delta[parent(x)];
+
+		for(auto xy:out_arc(x)){
+			// Checks whether x is a leaf of the row subtree of y and if so corrects the overlap with the
+			// previous leaf at their least common ancestor
+			int y = head(xy);
+			if(y <= x || first_descendant(x) <= max_first_descendant(y))
+				continue;
+			max_first_descendant[y] = first_descendant(x);
+			int previous = previous_leaf(y);
+			previous_leaf[y] = x;
+			++delta[x];
+			if(previous != -1){
+				int lca = previous;
+				while(lca != ancestor(lca))
+					lca = ancestor(lca);
+				for(int z = previous; z != lca; ){
+					int next = ancestor(z);
+					ancestor[z] = lca;
+					z = next;
+				}
+				--delta[lca];
+			}
+		}
+
+		if(parent(x) != -1)
+			ancestor[x] = parent(x);
+	}
+
+	// parent is larger than the child and thus increasing IDs visit all children first
+	for(int x=0; x<node_count; ++x)
+		if(parent(x) != -1)
+			delta[parent(x)] += delta(x);
+
+	for(int x=0; x<node_count; ++x)
+		--delta[x];
+	return delta;
+}
+
+template<class Tail, class Head>
+ArrayIDFunc<int> compute_upward_degrees_in_chordal_supergraph(const Tail&tail, const Head&head){
+	auto parent = compute_elimination_tree(tail, head);
+	auto post = compute_postorder_of_forest(parent);
+	return compute_upward_degrees_in_chordal_supergraph(tail, head, parent, post);
+}
+
+#endif
@@ -0,0 +1,198 @@
+#include "file_cache.h"
+#include "file_utility.h"
+#include "hash.h"
+
+#include <fstream>
+#include <sstream>
+#include <iomanip>
+#include <algorithm>
+#include <vector>
+#include <cstdio>
+#include <cstdlib>
+#include <cstddef>
+#include <cstring>
+#include <ctime>
+#include <stdexcept>
+
+#ifndef _WIN32
+#include <unistd.h>
+#else
+#include <windows.h>
+#endif
+
+namespace{
+	const char file_cache_prefix[] = "flow_cutter_cache_";
+	const std::uint32_t file_cache_version = 1;
+
+	struct FileCacheHeader{
+		char magic[8];
+		std::uint32_t version;
+		std::uint32_t header_size;
+		std::uint64_t key;
+		std::uint64_t payload_size;
+		std::uint64_t checksum;
+	};
+
+	// The payload starts directly after the header. As the header size is a multiple of 8, the payload is aligned.
+	static_assert(sizeof(FileCacheHeader) % 8 == 0, "payload would be misaligned");
+
+	const char file_cache_magic[8] = {'F', 'C', 'C', 'A', 'C', 'H', 'E', '\0'};
+
+	std::uint64_t compute_header_checksum(const FileCacheHeader&h){
+		return hash_bytes(reinterpret_cast<const char*>(&h), offsetof(FileCacheHeader, checksum));
+	}
+
+	FileCacheHeader make_header(std::uint64_t key, std::uint64_t payload_size){
+		FileCacheHeader h;
+		std::memset(&h, 0, sizeof(h));
+		std::copy(file_cache_magic, file_cache_magic+8, h.magic);
+		h.version = file_cache_version;
+		h.header_size = sizeof(h);
+		h.key = key;
+		h.payload_size = payload_size;
+		h.checksum = compute_header_checksum(h);
+		return h;
+	}
+
+	bool is_header_valid(const FileCacheHeader&h, std::uint64_t key, long long file_size){
+		return
+			std::equal(file_cache_magic, file_cache_magic+8, h.magic) &&
+			h.version == file_cache_version &&
+			h.header_size == sizeof(h) &&
+			h.checksum == compute_header_checksum(h) &&
+			h.key == key &&
+			static_cast<long long>(sizeof(h) + h.payload_size) == file_size;
+	}
+
+	int get_process_id(){
+		#ifndef _WIN32
+		return getpid();
+		#else
+		return GetCurrentProcessId();
+		#endif
+	}
+
+	// Deletes the least recently used cache files until the cache size is at most max_size. keep_file is never deleted.
+	void evict_file_cache_entries(long long max_size, const std::string&keep_file){
+		struct CacheFile{
+			std::string name;
+			long long size;
+			std::time_t last_used;
+		};
+
+		std::string dir = get_temp_directory_path();
+
+		std::vector<CacheFile>files;
+		long long total_size = 0;
+		for(auto&name:list_files_in_directory(dir)){
+			if(name.compare(0, sizeof(file_cache_prefix)-1, file_cache_prefix) != 0)
+				continue;
+			// Skip files that are currently written
+			if(name.find(".tmp") != std::string::npos)
+				continue;
+			std::string path = concat_file_path_and_file_name(dir, name);
+			try{
+				CacheFile f = {path, file_size(path), file_last_modified(path)};
+				total_size += f.size;
+				if(path != keep_file)
+					files.push_back(std::move(f));
+			}catch(std::runtime_error&){
+				// The file was deleted concurrently by some other process
+			}
+		}
+
+		std::sort(files.begin(), files.end(), [](const CacheFile&l, const CacheFile&r){return l.last_used < r.last_used;});
+
+		for(auto&f:files){
+			if(total_size <= max_size)
+				break;
+			if(std::remove(f.name.c_str()) == 0)
+				total_size -= f.size;
+		}
+	}
+}
+
+long long get_file_cache_max_size(){
+	const char*max_size = getenv("CACHEMAXSIZE");
+	if(max_size)
+		return std::atoll(max_size);
+	return 16ll << 30;
+}
+
+FileCacheEntry get_file_cache_entry(const std::string&format_name, const std::string&file_name, const MappedFile&content){
+	std::uint64_t key = file_cache_version;
+	key = hash_combine(key, hash_string(format_name));
+	key = hash_combine(key, hash_string(make_absolute_file_name(file_name)));
+	key = hash_combine(key, hash_bytes_in_parallel(content.data(), content.size()));
+
+	std::ostringstream name;
+	name << file_cache_prefix << std::hex << std::setw(16) << std::setfill('0') << key;
+
+	return {concat_file_path_and_file_name(get_temp_directory_path(), name.str()), key};
+}
+
+std::shared_ptr<MappedFile> open_file_cache_entry(const FileCacheEntry&entry, long long&payload_offset, long long&payload_size){
+	if(!file_exists(entry.cache_file_name))
+		return nullptr;
+
+	std::shared_ptr<MappedFile>file;
+	try{
+		file = map_file(entry.cache_file_name);
+	}catch(std::runtime_error&){
+		// The file was evicted by some other process
+		return nullptr;
+	}
+
+	FileCacheHeader h;
+	if(file->size() < static_cast<long long>(sizeof(h)))
+		return nullptr;
+	std::memcpy(&h, file->data(), sizeof(h));
+	if(!is_header_valid(h, entry.key, file->size()))
+		return nullptr;
+
+	// Mark the entry as recently used
+	try{
+		touch_file(entry.cache_file_name);
+	}catch(std::runtime_error&){}
+
+	payload_offset = sizeof(h);
+	payload_size = h.payload_size;
+	return file;
+}
+
+void save_file_cache_entry(const FileCacheEntry&entry, const std::function<void(std::ostream&)>&save){
+	// Mapped cache files of other processes must not be modified. We therefore write a new file and rename it.
+	std::string tmp_file_name = entry.cache_file_name + ".tmp" + std::to_string(get_process_id());
+
+	{
+		std::ofstream out(tmp_file_name, std::ios::binary);
+		if(!out)
+			return;
+
+		FileCacheHeader h = make_header(entry.key, 0);
+		out.write(reinterpret_cast<const char*>(&h), sizeof(h));
+		save(out);
+		long long payload_size = static_cast<long long>(out.tellp()) - sizeof(h);
+		h = make_header(entry.key, payload_size);
+		out.seekp(0);
+		out.write(reinterpret_cast<const char*>(&h), sizeof(h));
+		out.close();
+
+		if(!out){
+			std::remove(tmp_file_name.c_str());
+			return;
+		}
+	}
+
+	#ifdef _WIN32
+	std::remove(entry.cache_file_name.c_str());
+	#endif
+	if(std::rename(tmp_file_name.c_str(), entry.cache_file_name.c_str()) != 0){
+		std::remove(tmp_file_name.c_str());
+		return;
+	}
+
+	try{
+		evict_file_cache_entries(get_file_cache_max_size(), entry.cache_file_name);
+	}catch(std::runtime_error&){}
+}
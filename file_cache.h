@@ -0,0 +1,39 @@
+#ifndef FILE_CACHE_H
+#define FILE_CACHE_H
+
+#include "mapped_file.h"
+
+#include <string>
+#include <memory>
+#include <cstdint>
+#include <iosfwd>
+#include <functional>
+
+//!
+//! Binary caches of text files are stored in the temporary directory.
+//!
+//! A cache entry is keyed on a hash of the cache version, the format name, the absolute path and the
+//! content of the text file. Every cache file starts with a header that stores the key and the payload
+//! size and that is protected by a checksum. Cache files are written to a temporary file that is renamed
+//! once it is complete.
+//!
+//! The cache is limited to CACHEMAXSIZE bytes (environment variable, 16 GiB by default). If it grows
+//! larger, then the least recently used cache files are deleted.
+//!
+
+struct FileCacheEntry{
+	std::string cache_file_name;
+	std::uint64_t key;
+};
+
+FileCacheEntry get_file_cache_entry(const std::string&format_name, const std::string&file_name, const MappedFile&content);
+
+// Returns nullptr if no valid cache file exists. Otherwise the payload starts at payload_offset and is payload_size bytes long.
+std::shared_ptr<MappedFile> open_file_cache_entry(const FileCacheEntry&entry, long long&payload_offset, long long&payload_size);
+
+// Writes the payload using save. The cache is optional and therefore failing to write it is no error.
+void save_file_cache_entry(const FileCacheEntry&entry, const std::function<void(std::ostream&)>&save);
+
+long long get_file_cache_max_size();
+
+#endif
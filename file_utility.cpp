@@ -10,6 +10,8 @@
 #include <errno.h>
 #include <sys/stat.h>
 #include <stdlib.h>
+#include <utime.h>
+#include <dirent.h>
 #else
 #include <windows.h>
 #endif
@@ -104,14 +106,6 @@ std::string get_temp_directory_path(){
 	#endif
 }
 
-std::string uniquely_hash_file_name(const std::string&file_name){
-	std::ostringstream out;
-	for(auto c:file_name)
-		if(std::isalnum(c))
-			out << c;
-	return out.str();
-}
-
 bool file_exists(const std::string&file_name){
 	#ifndef _WIN32
 	struct stat buffer;   
@@ -122,3 +116,73 @@ bool file_exists(const std::string&file_name){
 	#endif
 }
 
+
+long long file_size(const std::string&file_name){
+	#ifndef _WIN32
+	struct stat st;
+	if(stat(file_name.c_str(), &st))
+		throw std::runtime_error("Error while reading the size of "+file_name+" : "+strerror(errno));
+	return st.st_size;
+	#else
+	WIN32_FILE_ATTRIBUTE_DATA data;
+	if(!GetFileAttributesEx(file_name.c_str(), GetFileExInfoStandard, &data))
+		throw std::runtime_error("GetFileAttributesEx failed with error code "+std::to_string(GetLastError()));
+	return (static_cast<long long>(data.nFileSizeHigh) << 32) | data.nFileSizeLow;
+	#endif
+}
+
+// Sets the last modification time to now
+void touch_file(const std::string&file_name){
+	#ifndef _WIN32
+	if(utime(file_name.c_str(), nullptr))
+		throw std::runtime_error("Error while touching "+file_name+" : "+strerror(errno));
+	#else
+	HANDLE file = CreateFile(
+		file_name.c_str(),
+		FILE_WRITE_ATTRIBUTES,
+		FILE_SHARE_READ | FILE_SHARE_WRITE,
+		NULL,
+		OPEN_EXISTING,
+		FILE_ATTRIBUTE_NORMAL,
+		NULL
+	);
+	if(file ==  INVALID_HANDLE_VALUE)
+		throw std::runtime_error("CreateFile failed with error code "+std::to_string(GetLastError()));
+	SYSTEMTIME now;
+	FILETIME filetime;
+	GetSystemTime(&now);
+	SystemTimeToFileTime(&now, &filetime);
+	int ok = SetFileTime(file, NULL, NULL, &filetime);
+	int error_code = GetLastError();
+	CloseHandle(file);
+	if(!ok)
+		throw std::runtime_error("SetFileTime failed with error code "+std::to_string(error_code));
+	#endif
+}
+
+// Returns the names of all files in the directory without the path
+std::vector<std::string>list_files_in_directory(const std::string&path){
+	std::vector<std::string>files;
+	#ifndef _WIN32
+	DIR*dir = opendir(path.c_str());
+	if(dir == nullptr)
+		throw std::runtime_error("Could not open directory "+path+" : "+strerror(errno));
+	while(dirent*entry = readdir(dir)){
+		std::string name = entry->d_name;
+		if(name != "." && name != "..")
+			files.push_back(std::move(name));
+	}
+	closedir(dir);
+	#else
+	WIN32_FIND_DATA data;
+	HANDLE find = FindFirstFile(concat_file_path_and_file_name(path, "*").c_str(), &data);
+	if(find == INVALID_HANDLE_VALUE)
+		throw std::runtime_error("FindFirstFile failed with error code "+std::to_string(GetLastError()));
+	do{
+		if(!(data.dwFileAttributes & FILE_ATTRIBUTE_DIRECTORY))
+			files.push_back(data.cFileName);
+	}while(FindNextFile(find, &data));
+	FindClose(find);
+	#endif
+	return files; // NVRO
+}
@@ -7,6 +7,7 @@
 #include "id_func.h"
 #include "dijkstra.h"
 #include "min_max.h"
+#include "cancellation.h"
 #include <vector>
 #include <algorithm>
 #include <sstream>
@@ -16,6 +17,7 @@
 #include <omp.h>
 
 #include "flow_cutter_config.h"
+#include "cutter_statistics.h"
 
 #include <iostream>
 #include <iomanip>
@@ -63,6 +65,7 @@ namespace flow_cutter{
 		explicit TemporaryData(int node_count):
 			node_space(node_count){}
 		ArrayIDFunc<int>node_space;
+		ArrayIDFunc<int>distance_space; // allocated by compute_packed_distance_from
 	};
 
 	template<class Tail, class Head, class BackArc, class ArcWeight, class Capacity, class OutArc>
@@ -339,7 +342,7 @@ namespace flow_cutter{
 	public:
 		template<class Graph>
 		explicit ReachableNodeSet(const Graph&graph):
-			node_set(graph), predecessor(graph.node_count()){}
+			node_set(graph), predecessor(graph.node_count(), get_bit_count_of(std::max(graph.arc_count()-1, 0))){}
 
 		void reset(const AssimilatedNodeSet&other){
 			node_set = other.node_set;
@@ -368,7 +371,7 @@ namespace flow_cutter{
 			const OnNewArc&on_new_arc // on_new_arc(xy) is called for ever arc xy with x in the set
 		){
 			auto my_should_follow_arc = [&](int xy){
-				predecessor[graph.head(xy)] = xy;
+				predecessor.set(graph.head(xy), xy);
 				return should_follow_arc(xy);
 			};
 	
@@ -391,14 +394,15 @@ namespace flow_cutter{
 		void forall_arcs_in_path_to(const Graph&graph, const IsSource&is_source, int target, const OnNewArc&on_new_arc){
 			int x = target;
 			while(!is_source(x)){
-				on_new_arc(predecessor[x]);
-				x = graph.tail(predecessor[x]);
+				int xy = predecessor(x);
+				on_new_arc(xy);
+				x = graph.tail(xy);
 			}
 		}
 
 	private:
 		BasicNodeSet node_set;
-		ArrayIDFunc<int>predecessor;
+		PackedIntIDFunc predecessor;
 	};
 
 	struct SourceTargetPair{
@@ -421,6 +425,10 @@ namespace flow_cutter{
 
 		template<class Graph, class SearchAlgorithm>
 		void init(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo, SourceTargetPair p){
+			CutterStatisticsTimer timer(statistics.init_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.init_count;
+
 			assimilated[source_side].clear();
 			reachable[source_side].clear();
 			assimilated[target_side].clear();
@@ -481,6 +489,10 @@ namespace flow_cutter{
 		bool advance(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo, const ScorePierceNode&score_pierce_node){
 			assert(cut_available);
 
+			CutterStatisticsTimer timer(statistics.advance_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.advance_count;
+
 			check_invariants(graph);
 			int side = get_current_cut_side();
 			if(assimilated[side].node_count_inside() >= graph.node_count()/2){
@@ -561,15 +573,28 @@ namespace flow_cutter{
 			return assimilated[source_side].node_count_inside() + assimilated[target_side].node_count_inside();
 		}
 
+		int get_node_count()const{
+			return assimilated[source_side].max_node_count_inside();
+		}
+
+		const CutterStatistics&get_statistics()const{
+			return statistics;
+		}
+
 	private:
 		template<class Graph, class ScorePierceNode>
 		int select_pierce_node(const Graph&graph, int side, const ScorePierceNode&score_pierce_node){
+			CutterStatisticsTimer timer(statistics.pierce_node_selection_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.pierce_node_selection_count;
 
 			int pierce_node = -1;
 			int max_score = std::numeric_limits<int>::min();
 			for(auto xy : assimilated[side].get_cut_front()){
 				int y = graph.head(xy);	
 				if(!assimilated[1-side].is_inside(y)){
+					if(collect_cutter_statistics)
+						++statistics.pierce_node_candidate_count;
 					int score = score_pierce_node(y, side, reachable[1-side].is_inside(y), graph.arc_weight(xy));
 
 					if(score > max_score){
@@ -593,6 +618,10 @@ namespace flow_cutter{
 		template<class Graph, class SearchAlgorithm>
 		void grow_reachable_sets(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo, int pierced_side){
 
+			CutterStatisticsTimer timer(statistics.grow_reachable_sets_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.grow_reachable_sets_count;
+
 			int my_source_side = pierced_side;
 			int my_target_side = 1-pierced_side;
 
@@ -615,6 +644,8 @@ namespace flow_cutter{
 			};
 
 			auto increase_flow = [&](int xy){
+				if(collect_cutter_statistics)
+					++statistics.augmenting_path_arc_count;
 				if(pierced_side == source_side)
 					flow.increase(graph, xy);
 				else
@@ -625,8 +656,11 @@ namespace flow_cutter{
 
 			int target_hit;
 			do{
+				long long search_begin = get_cutter_statistics_time();
 				target_hit = -1;
 				auto on_new_node = [&](int x){ 
+					if(collect_cutter_statistics)
+						++statistics.grow_reachable_sets_node_count;
 					if(is_target(x)){
 						target_hit = x; 
 						return false;
@@ -634,7 +668,10 @@ namespace flow_cutter{
 						return true; 
 				};
 				auto should_follow_arc = [&](int xy){ return !is_forward_saturated(xy); }; 
-				auto on_new_arc = [](int xy){};
+				auto on_new_arc = [&](int xy){
+					if(collect_cutter_statistics)
+						++statistics.grow_reachable_sets_arc_count;
+				};
 				reachable[my_source_side].grow(graph, tmp, search_algo, on_new_node, should_follow_arc, on_new_arc);
 
 				if(target_hit != -1){
@@ -645,14 +682,25 @@ namespace flow_cutter{
 						
 					was_flow_augmented = true;
 					check_flow_conservation(graph);
+
+					if(collect_cutter_statistics)
+						++statistics.augmenting_path_count;
+					statistics.augmenting_path_time_ns += get_cutter_statistics_time() - search_begin;
 				}
 			}while(target_hit != -1);
 
 			if(was_flow_augmented){
 				reachable[my_target_side].reset(assimilated[my_target_side]);
-				auto on_new_node = [&](int x){return true;};
+				auto on_new_node = [&](int x){
+					if(collect_cutter_statistics)
+						++statistics.grow_reachable_sets_node_count;
+					return true;
+				};
 				auto should_follow_arc = [&](int xy){ return !is_backward_saturated(xy); };
-				auto on_new_arc = [](int xy){};
+				auto on_new_arc = [&](int xy){
+					if(collect_cutter_statistics)
+						++statistics.grow_reachable_sets_arc_count;
+				};
 				reachable[my_target_side].grow(graph, tmp, search_algo, on_new_node, should_follow_arc, on_new_arc);
 			}
 			
@@ -660,6 +708,20 @@ namespace flow_cutter{
 
 		template<class Graph, class SearchAlgorithm>
 		void grow_assimilated_sets(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo){
+			CutterStatisticsTimer timer(statistics.grow_assimilated_sets_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.grow_assimilated_sets_count;
+
+			auto on_new_node = [&](int x){
+				if(collect_cutter_statistics)
+					++statistics.grow_assimilated_sets_node_count;
+				return true;
+			};
+			auto on_new_arc = [&](int xy){
+				if(collect_cutter_statistics)
+					++statistics.grow_assimilated_sets_arc_count;
+			};
+
 			auto is_forward_saturated = [&,this](int xy){
 				return this->is_saturated(graph, source_side, xy);
 			};
@@ -669,16 +731,12 @@ namespace flow_cutter{
 			};
 
 			if(reachable[source_side].node_count_inside() <= reachable[target_side].node_count_inside()){
-				auto on_new_node = [&](int x){return true;};
 				auto should_follow_arc = [&](int xy){ return !is_forward_saturated(xy); };
-				auto on_new_arc = [](int xy){};
 				auto has_flow = [&](int xy){ return flow(xy) != 0; };
 				assimilated[source_side].grow(graph, tmp, search_algo, on_new_node, should_follow_arc, on_new_arc, has_flow);
 				assimilated[source_side].shrink_cut_front(graph);
 			}else{
-				auto on_new_node = [&](int x){return true;};
 				auto should_follow_arc = [&](int xy){ return !is_backward_saturated(xy); };
-				auto on_new_arc = [](int xy){};
 				auto has_flow = [&](int xy){ return flow(xy) != 0; };
 				assimilated[target_side].grow(graph, tmp, search_algo, on_new_node, should_follow_arc, on_new_arc, has_flow);
 				assimilated[target_side].shrink_cut_front(graph);
@@ -733,6 +791,7 @@ namespace flow_cutter{
 		ReachableNodeSet reachable[2];
 		UnitFlow flow;
 		bool cut_available;
+		CutterStatistics statistics;
 	};
 
 
@@ -743,42 +802,135 @@ namespace flow_cutter{
 		weighted_distance
 	};
 
-	class DistanceAwareCutter{
-	private:
-		template<class Graph>
-		static void compute_hop_distance_from(const Graph&graph, TemporaryData&tmp, int source, ArrayIDFunc<int>&dist){
-			dist.fill(std::numeric_limits<int>::max());
-			dist[source] = 0;
-
-			auto was_node_seen = [&](int x){return false;};
-			auto see_node = [](int x){ return true; };
-			auto should_follow_arc = [&](int xy){ 
-				if(dist(graph.tail(xy)) < dist(graph.head(xy)) - 1){
-					dist[graph.head(xy)] = dist(graph.tail(xy))+1;
-					return true;
-				}else{
-					return false;
-				}
-			};
-			auto on_new_arc = [&](int xy){};
-			BreadthFirstSearch()(graph, tmp, source, was_node_seen, see_node, should_follow_arc, on_new_arc);
-		}
+	template<class Graph>
+	void compute_hop_distance_from(const Graph&graph, TemporaryData&tmp, int source, ArrayIDFunc<int>&dist){
+		dist.fill(std::numeric_limits<int>::max());
+		dist[source] = 0;
+
+		auto was_node_seen = [&](int x){return false;};
+		auto see_node = [](int x){ return true; };
+		auto should_follow_arc = [&](int xy){ 
+			if(dist(graph.tail(xy)) < dist(graph.head(xy)) - 1){
+				dist[graph.head(xy)] = dist(graph.tail(xy))+1;
+				return true;
+			}else{
+				return false;
+			}
+		};
+		auto on_new_arc = [&](int xy){};
+		BreadthFirstSearch()(graph, tmp, source, was_node_seen, see_node, should_follow_arc, on_new_arc);
+	}
 
-		template<class Graph>
-		static void compute_weighted_distance_from(const Graph&graph, TemporaryData&tmp, int source, ArrayIDFunc<int>&dist){
+	template<class Graph>
+	void compute_weighted_distance_from(const Graph&graph, TemporaryData&tmp, int source, ArrayIDFunc<int>&dist){
+		if(is_radix_heap_applicable(graph.arc_weight)){
+			Dijkstra<BitIDFunc, int, min_id_radix_heap<int>>dij(graph.node_count());
+			dij.clear();
+			dij.add_source_node(source);
+			while(!dij.is_finished())
+				dij.settle_next(graph.out_arc, graph.head, graph.arc_weight, [](int,bool,int){});
+			dist = dij.move_distance_array();
+		}else{
 			Dijkstra<BitIDFunc>dij(graph.node_count());
 			dij.clear();
 			dij.add_source_node(source);
 			while(!dij.is_finished())
 				dij.settle_next(graph.out_arc, graph.head, graph.arc_weight, [](int,bool,int){});
 			dist = dij.move_distance_array();
-		}	
+		}
+	}
 
+	//! Stores distances with as few bits per node as the range of the finite distances needs. The largest
+	//! value of the packed array stands for unreachable nodes. After clear all distances are 0.
+	class PackedDistanceArray{
+	public:
+		PackedDistanceArray():offset(0){}
+
+		void assign(const ArrayIDFunc<int>&dist){
+			int min_dist = std::numeric_limits<int>::max();
+			int max_dist = std::numeric_limits<int>::min();
+			for(int x=0; x<dist.preimage_count(); ++x){
+				if(dist(x) != std::numeric_limits<int>::max()){
+					min_to(min_dist, dist(x));
+					max_to(max_dist, dist(x));
+				}
+			}
+			if(min_dist > max_dist)
+				min_dist = max_dist = 0;
+
+			offset = min_dist;
+			std::uint64_t finite_value_count = (std::uint64_t)((long long)max_dist - (long long)min_dist) + 1;
+			int bit_count = get_bit_count_of(finite_value_count);
+			if(data.preimage_count() != dist.preimage_count() || data.bit_count() != bit_count)
+				PackedIntIDFunc(dist.preimage_count(), bit_count).swap(data);
+
+			for(int x=0; x<dist.preimage_count(); ++x){
+				if(dist(x) == std::numeric_limits<int>::max())
+					data.set(x, data.max_value());
+				else
+					data.set(x, (std::uint64_t)((long long)dist(x) - (long long)offset));
+			}
+		}
+
+		void clear(){
+			PackedIntIDFunc().swap(data);
+			offset = 0;
+		}
+
+		int preimage_count()const{
+			return data.preimage_count();
+		}
+
+		int operator()(int x)const{
+			if(data.preimage_count() == 0)
+				return 0;
+			std::uint64_t d = data(x);
+			if(d == data.max_value())
+				return std::numeric_limits<int>::max();
+			else
+				return (int)((long long)d + (long long)offset);
+		}
+
+	private:
+		PackedIntIDFunc data;
+		int offset;
+	};
+
+	//! Computes the distances from source in the buffer of tmp and packs them into dist.
+	template<class Graph>
+	void compute_packed_distance_from(const Graph&graph, TemporaryData&tmp, DistanceType dist_type, int source, PackedDistanceArray&dist){
+		switch(dist_type){
+		case DistanceType::hop_distance:
+			if(tmp.distance_space.preimage_count() != graph.node_count())
+				tmp.distance_space = ArrayIDFunc<int>(graph.node_count());
+			compute_hop_distance_from(graph, tmp, source, tmp.distance_space);
+			dist.assign(tmp.distance_space);
+			break;
+		case DistanceType::weighted_distance:
+			compute_weighted_distance_from(graph, tmp, source, tmp.distance_space);
+			dist.assign(tmp.distance_space);
+			break;
+		case DistanceType::no_distance:
+			dist.clear();
+			break;
+		default:
+			assert(false);
+			break;
+		}
+	}
+
+	class DistanceAwareCutter{
 	public:
 		template<class Graph>
 		DistanceAwareCutter(const Graph&graph):
 			cutter(graph), 
-			node_dist{ArrayIDFunc<int>{graph.node_count()}, ArrayIDFunc<int>{graph.node_count()}}{}
+			distance_time_ns(0){}
+
+		//! The searches need a TemporaryData object with room for every node.
+		template<class Graph>
+		static int get_temporary_node_count(const Graph&graph){
+			return graph.node_count();
+		}
 
 		template<class Graph, class SearchAlgorithm>
 		void init(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo, DistanceType dist_type, SourceTargetPair p, int random_seed){
@@ -786,21 +938,9 @@ namespace flow_cutter{
 
 			rng.seed(random_seed);
 
-			switch(dist_type){
-			case DistanceType::hop_distance:
-				compute_hop_distance_from(graph, tmp, p.source, node_dist[source_side]);
-				compute_hop_distance_from(graph, tmp, p.target, node_dist[target_side]);
-				break;
-			case DistanceType::weighted_distance:
-				compute_weighted_distance_from(graph, tmp, p.source, node_dist[source_side]);
-				compute_weighted_distance_from(graph, tmp, p.target, node_dist[target_side]);
-				break;
-			case DistanceType::no_distance:
-				break;
-			default:
-				assert(false);
-				break;
-			}
+			CutterStatisticsTimer timer(distance_time_ns);
+			compute_packed_distance_from(graph, tmp, dist_type, p.source, node_dist[source_side]);
+			compute_packed_distance_from(graph, tmp, dist_type, p.target, node_dist[target_side]);
 		}
 
 		CutterStateDump dump_state()const{
@@ -851,14 +991,27 @@ namespace flow_cutter{
 		}
 
 		bool is_empty()const{
-			return node_dist[0].preimage_count() == 0;
+			return cutter.get_node_count() == 0;
+		}
+
+		int get_node_count()const{
+			return cutter.get_node_count();
+		}
+
+		CutterStatistics get_statistics()const{
+			CutterStatistics statistics = cutter.get_statistics();
+			statistics.distance_time_ns += distance_time_ns;
+			return statistics;
 		}
 	private:
 		BasicCutter cutter;
-		ArrayIDFunc<int>node_dist[2];
+		PackedDistanceArray node_dist[2];
 		mt19937 rng;
+		long long distance_time_ns;
 	};
 
+	//! Cutter is DistanceAwareCutter or NodeCapacityCutter.
+	template<class Cutter = DistanceAwareCutter>
 	class MultiCutter{
 	public:
 		MultiCutter(){}
@@ -874,8 +1027,11 @@ namespace flow_cutter{
 			while(cutter_list.size() < p.size())
 				cutter_list.emplace_back(graph);
 
+			long long init_begin = get_cutter_statistics_time();
+			auto cancellation = current_cancellation();
 			#pragma omp parallel num_threads(tmp.size())
 			{
+				CurrentCancellationScope cancellation_scope(cancellation);
 				int thread_id = omp_get_thread_num();
 				#pragma omp for schedule(dynamic)
 				for(int i=0; i<(int)p.size(); ++i){
@@ -890,6 +1046,7 @@ namespace flow_cutter{
 							x.advance(graph, tmp[thread_id], search_algo, my_score_pierce_node);
 				}
 			}		
+			statistics.multi_cutter_init_time_ns += get_cutter_statistics_time() - init_begin;
 
 			int best_cutter_id = -1;
 			int best_cut_size = std::numeric_limits<int>::max();
@@ -922,75 +1079,98 @@ namespace flow_cutter{
 
 		template<class Graph, class SearchAlgorithm, class ScorePierceNode>
 		bool advance(const Graph&graph, std::vector<TemporaryData>&tmp, const SearchAlgorithm&search_algo, const ScorePierceNode&score_pierce_node, bool should_skip_non_maximum_sides = true){
-			if(graph.node_count() /2 == get_current_smaller_cut_side_size())
+			if(cutter_list[current_cutter_id].get_node_count() /2 == get_current_smaller_cut_side_size())
 				return false;
 
+			if(collect_cutter_statistics)
+				++statistics.multi_cutter_advance_count;
+
 			int current_cut_size = cutter_list[current_cutter_id].get_current_cut().size();
-			for(;;){
-				
 
-				#pragma omp parallel num_threads(tmp.size())
-				{
-					int thread_id = omp_get_thread_num();
+			// Only the cutters whose cut has the current size are advanced in a round. The others are either
+			// finished or ahead and wait until the current size catches up with them.
+			std::vector<int>frontier;
+			for(int i=0; i<(int)cutter_list.size(); ++i)
+				if(cutter_list[i].is_cut_available() && (int)cutter_list[i].get_current_cut().size() == current_cut_size)
+					frontier.push_back(i);
+
+			bool was_advanced = false;
+			bool is_finished = false;
+
+			// The thread team lives for all rounds. Rounds are separated by barriers instead of starting a new
+			// parallel region per round. Threads without cutter of their own pick up the remaining cutters of
+			// the frontier.
+			long long advance_begin = get_cutter_statistics_time();
+			auto cancellation = current_cancellation();
+			#pragma omp parallel num_threads(std::min(tmp.size(), cutter_list.size()))
+			{
+				CurrentCancellationScope cancellation_scope(cancellation);
+				int thread_id = omp_get_thread_num();
+				while(!is_finished){
 					#pragma omp for schedule(dynamic)
-					for(int i=0; i<(int)cutter_list.size(); ++i){
+					for(int j=0; j<(int)frontier.size(); ++j){
+						int i = frontier[j];
 						auto x = std::move(cutter_list[i]);
 						auto my_score_pierce_node = [&](int x, int side, bool causes_augmenting_path, int arc_weight, int source_dist, int target_dist){
 							return score_pierce_node(x, side, causes_augmenting_path, arc_weight, source_dist, target_dist, i);
 						};
-						if(x.is_cut_available()){
-							if((int)x.get_current_cut().size() == current_cut_size){
-								assert(x.does_next_advance_increase_cut(graph, my_score_pierce_node));
-								if(x.advance(graph, tmp[thread_id], search_algo, my_score_pierce_node)){
-									assert((int)x.get_current_cut().size() > current_cut_size);
-									while(!x.does_next_advance_increase_cut(graph, my_score_pierce_node)){
-										if(!x.advance(graph, tmp[thread_id], search_algo, my_score_pierce_node))
-											break;
-										if(!should_skip_non_maximum_sides)
-											break;
-									}
-								}
+						assert(x.does_next_advance_increase_cut(graph, my_score_pierce_node));
+						if(x.advance(graph, tmp[thread_id], search_algo, my_score_pierce_node)){
+							assert((int)x.get_current_cut().size() > current_cut_size);
+							while(!x.does_next_advance_increase_cut(graph, my_score_pierce_node)){
+								if(!x.advance(graph, tmp[thread_id], search_algo, my_score_pierce_node))
+									break;
+								if(!should_skip_non_maximum_sides)
+									break;
 							}
 						}
 
 						cutter_list[i] = std::move(x);
 					}
-				}
-
-				int next_cut_size = std::numeric_limits<int>::max();
-				for(auto&x:cutter_list)
-					if(x.is_cut_available())
-						min_to(next_cut_size, (int)x.get_current_cut().size());
-
-				if(next_cut_size == std::numeric_limits<int>::max())
-					return false;
-
-
-				int best_cutter_weight = 0;
-				int best_cutter_id = -1;
-				for(int i=0; i<(int)cutter_list.size(); ++i){
-					if(cutter_list[i].is_cut_available()){
-						if(
-							(int)cutter_list[i].get_current_cut().size() == next_cut_size &&
-							cutter_list[i].get_current_smaller_cut_side_size() > best_cutter_weight
-						){
-							best_cutter_id = i;
-							best_cutter_weight = cutter_list[i].get_current_smaller_cut_side_size();
-						}
-					}
-				}
 
-				assert(best_cutter_id != -1);
+					#pragma omp single
+					{
+						if(collect_cutter_statistics)
+							++statistics.multi_cutter_advance_round_count;
+
+						int next_cut_size = std::numeric_limits<int>::max();
+						for(auto&x:cutter_list)
+							if(x.is_cut_available())
+								min_to(next_cut_size, (int)x.get_current_cut().size());
+
+						if(next_cut_size == std::numeric_limits<int>::max()){
+							is_finished = true;
+						}else{
+							int best_cutter_weight = 0;
+							int best_cutter_id = -1;
+							frontier.clear();
+							for(int i=0; i<(int)cutter_list.size(); ++i){
+								if(cutter_list[i].is_cut_available() && (int)cutter_list[i].get_current_cut().size() == next_cut_size){
+									frontier.push_back(i);
+									if(cutter_list[i].get_current_smaller_cut_side_size() > best_cutter_weight){
+										best_cutter_id = i;
+										best_cutter_weight = cutter_list[i].get_current_smaller_cut_side_size();
+									}
+								}
+							}
 
-				current_cut_size = next_cut_size;
+							assert(best_cutter_id != -1);
 
-				if(best_cutter_weight <= current_smaller_side_size)
-					continue;
+							current_cut_size = next_cut_size;
 
-				current_cutter_id = best_cutter_id;
-				current_smaller_side_size = cutter_list[current_cutter_id].get_current_smaller_cut_side_size();
-				return true;
+							if(best_cutter_weight > current_smaller_side_size){
+								current_cutter_id = best_cutter_id;
+								current_smaller_side_size = cutter_list[current_cutter_id].get_current_smaller_cut_side_size();
+								was_advanced = true;
+								is_finished = true;
+							}
+						}
+					}
+				}
 			}
+			statistics.multi_cutter_advance_time_ns += get_cutter_statistics_time() - advance_begin;
+
+			return was_advanced;
 		}
 
 		int get_current_smaller_cut_side_size()const{
@@ -1009,10 +1189,19 @@ namespace flow_cutter{
 			return current_cutter_id;
 		}
 
+		//! Sums the statistics of all cutters.
+		CutterStatistics get_statistics()const{
+			CutterStatistics sum = statistics;
+			for(auto&x:cutter_list)
+				sum += x.get_statistics();
+			return sum;
+		}
+
 	private:
-		std::vector<DistanceAwareCutter>cutter_list;
+		std::vector<Cutter>cutter_list;
 		int current_smaller_side_size;
 		int current_cutter_id;
+		CutterStatistics statistics;
 	};
 
 	struct PierceNodeScore{
@@ -1102,11 +1291,11 @@ namespace flow_cutter{
 		}
 	};
 
-	template<class Graph>
+	template<class Graph, class Cutter = DistanceAwareCutter>
 	class SimpleCutter{
 	public:
 		SimpleCutter(const Graph&graph, Config config):
-			graph(graph), tmp(config.thread_count, TemporaryData(graph.node_count())), config(config){
+			graph(graph), tmp(config.thread_count, TemporaryData(Cutter::get_temporary_node_count(graph))), config(config){
 		}
 
 		void init(const std::vector<SourceTargetPair>&p, int random_seed){
@@ -1183,10 +1372,14 @@ namespace flow_cutter{
 			return cutter.get_current_cutter_id();
 		}
 
+		CutterStatistics get_statistics()const{
+			return cutter.get_statistics();
+		}
+
 	private:
 		const Graph&graph;
 		std::vector<TemporaryData>tmp;
-		MultiCutter cutter;
+		MultiCutter<Cutter> cutter;
 		Config config;
 	};
 
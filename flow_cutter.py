@@ -0,0 +1,191 @@
+"""
+In process access to the orders and separators of FlowCutter and InertialFlow.
+
+Graphs are given as NumPy arrays. Arc i goes from tail[i] to head[i]. The graph must be symmetric.
+Contiguous int32 arrays (float64 for geo_pos) are passed to the library without being copied.
+Orders are returned as int32 arrays, where order[i] is the node at position i.
+
+The shared library is built as described in flow_cutter_library.h. It is searched for in the
+FLOW_CUTTER_LIBRARY environment variable and then next to this file.
+
+Config variables are the ones of the flow_cutter_set console command and are passed as keyword
+arguments, for example cch_order(tail, head, cutter_count=20, thread_count=4).
+"""
+
+import ctypes
+import os
+
+import numpy as np
+
+_int_ptr = ctypes.POINTER(ctypes.c_int)
+_double_ptr = ctypes.POINTER(ctypes.c_double)
+
+
+def _load_library():
+	path = os.environ.get("FLOW_CUTTER_LIBRARY")
+	if path is None:
+		path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "libflow_cutter.so")
+	lib = ctypes.CDLL(path)
+
+	lib.flow_cutter_get_last_error.restype = ctypes.c_char_p
+	lib.flow_cutter_get_last_error.argtypes = []
+	lib.flow_cutter_create_config.restype = ctypes.c_void_p
+	lib.flow_cutter_create_config.argtypes = []
+	lib.flow_cutter_destroy_config.restype = None
+	lib.flow_cutter_destroy_config.argtypes = [ctypes.c_void_p]
+	lib.flow_cutter_set_config.restype = ctypes.c_int
+	lib.flow_cutter_set_config.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+	lib.flow_cutter_get_config.restype = ctypes.c_int
+	lib.flow_cutter_get_config.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+
+	graph = [ctypes.c_int, ctypes.c_int, _int_ptr, _int_ptr, _int_ptr]
+	for name in ["flow_cutter_compute_cch_order", "flow_cutter_compute_nested_dissection_order"]:
+		getattr(lib, name).restype = ctypes.c_int
+		getattr(lib, name).argtypes = [ctypes.c_void_p] + graph + [_int_ptr]
+	lib.flow_cutter_compute_separator.restype = ctypes.c_int
+	lib.flow_cutter_compute_separator.argtypes = [ctypes.c_void_p] + graph + [_int_ptr, _int_ptr]
+
+	for name in ["flow_cutter_compute_inertial_flow_cch_order", "flow_cutter_compute_inertial_flow_nested_dissection_order"]:
+		getattr(lib, name).restype = ctypes.c_int
+		getattr(lib, name).argtypes = graph + [_double_ptr, ctypes.c_double, ctypes.c_int, _int_ptr]
+	lib.flow_cutter_compute_inertial_flow_separator.restype = ctypes.c_int
+	lib.flow_cutter_compute_inertial_flow_separator.argtypes = graph + [_double_ptr, ctypes.c_double, _int_ptr, _int_ptr]
+
+	return lib
+
+_lib = _load_library()
+
+
+def _check(ret):
+	if ret != 0:
+		raise RuntimeError(_lib.flow_cutter_get_last_error().decode())
+
+
+class Config(object):
+	"""Owns a flow_cutter::Config of the library."""
+
+	def __init__(self, **settings):
+		self._handle = _lib.flow_cutter_create_config()
+		if not self._handle:
+			raise MemoryError(_lib.flow_cutter_get_last_error().decode())
+		for var, val in settings.items():
+			self[var] = val
+
+	def __del__(self):
+		if getattr(self, "_handle", None):
+			_lib.flow_cutter_destroy_config(self._handle)
+			self._handle = None
+
+	def __setitem__(self, var, val):
+		_check(_lib.flow_cutter_set_config(self._handle, str(var).encode(), str(val).encode()))
+
+	def __getitem__(self, var):
+		val = ctypes.create_string_buffer(256)
+		_check(_lib.flow_cutter_get_config(self._handle, str(var).encode(), val, len(val)))
+		return val.value.decode()
+
+
+def _int_array(x):
+	return np.ascontiguousarray(x, dtype=np.int32)
+
+
+def _ptr(x, ptr_type):
+	if x is None:
+		return None
+	return x.ctypes.data_as(ptr_type)
+
+
+def _graph(tail, head, arc_weight):
+	tail = _int_array(tail)
+	head = _int_array(head)
+	if tail.ndim != 1 or tail.shape != head.shape:
+		raise ValueError("tail and head must be one dimensional arrays of the same size")
+	if arc_weight is not None:
+		arc_weight = _int_array(arc_weight)
+		if arc_weight.shape != tail.shape:
+			raise ValueError("arc_weight must have one value per arc")
+	node_count = 0
+	if len(tail) != 0:
+		node_count = int(max(tail.max(), head.max())) + 1
+	return node_count, tail, head, arc_weight
+
+
+def _graph_args(node_count, tail, head, arc_weight):
+	return [node_count, len(tail), _ptr(tail, _int_ptr), _ptr(head, _int_ptr), _ptr(arc_weight, _int_ptr)]
+
+
+def _geo_pos(node_count, geo_pos):
+	geo_pos = np.ascontiguousarray(geo_pos, dtype=np.float64)
+	if geo_pos.shape != (node_count, 2):
+		raise ValueError("geo_pos must contain the latitude and longitude of every node")
+	return geo_pos
+
+
+def _config(config, settings):
+	if config is None:
+		return Config(**settings)
+	for var, val in settings.items():
+		config[var] = val
+	return config
+
+
+def _order(name, tail, head, arc_weight, node_count, config, settings):
+	node_count_of_arcs, tail, head, arc_weight = _graph(tail, head, arc_weight)
+	if node_count is None:
+		node_count = node_count_of_arcs
+	config = _config(config, settings)
+	order = np.empty(node_count, dtype=np.int32)
+	_check(getattr(_lib, name)(config._handle, *(_graph_args(node_count, tail, head, arc_weight) + [_ptr(order, _int_ptr)])))
+	return order
+
+
+def cch_order(tail, head, arc_weight=None, node_count=None, config=None, **settings):
+	"""Computes a nested dissection order with FlowCutter that is optimized for CCHs."""
+	return _order("flow_cutter_compute_cch_order", tail, head, arc_weight, node_count, config, settings)
+
+
+def nested_dissection_order(tail, head, arc_weight=None, node_count=None, config=None, **settings):
+	"""Computes a nested dissection order with FlowCutter."""
+	return _order("flow_cutter_compute_nested_dissection_order", tail, head, arc_weight, node_count, config, settings)
+
+
+def separator(tail, head, arc_weight=None, node_count=None, config=None, **settings):
+	"""Computes a node separator with FlowCutter. Returns the separator nodes as int32 array."""
+	node_count_of_arcs, tail, head, arc_weight = _graph(tail, head, arc_weight)
+	if node_count is None:
+		node_count = node_count_of_arcs
+	config = _config(config, settings)
+	sep = np.empty(node_count, dtype=np.int32)
+	sep_size = ctypes.c_int(0)
+	_check(_lib.flow_cutter_compute_separator(config._handle, *(_graph_args(node_count, tail, head, arc_weight) + [_ptr(sep, _int_ptr), ctypes.byref(sep_size)])))
+	return sep[:sep_size.value].copy()
+
+
+def _inertial_flow_order(name, tail, head, geo_pos, min_balance, arc_weight, thread_count):
+	node_count, tail, head, arc_weight = _graph(tail, head, arc_weight)
+	node_count = max(node_count, len(geo_pos))
+	geo_pos = _geo_pos(node_count, geo_pos)
+	order = np.empty(node_count, dtype=np.int32)
+	_check(getattr(_lib, name)(*(_graph_args(node_count, tail, head, arc_weight) + [_ptr(geo_pos, _double_ptr), min_balance, thread_count, _ptr(order, _int_ptr)])))
+	return order
+
+
+def inertial_flow_cch_order(tail, head, geo_pos, min_balance=0.2, arc_weight=None, thread_count=1):
+	"""Computes a nested dissection order with InertialFlow that is optimized for CCHs. geo_pos has shape (node_count, 2)."""
+	return _inertial_flow_order("flow_cutter_compute_inertial_flow_cch_order", tail, head, geo_pos, min_balance, arc_weight, thread_count)
+
+
+def inertial_flow_nested_dissection_order(tail, head, geo_pos, min_balance=0.2, arc_weight=None, thread_count=1):
+	"""Computes a nested dissection order with InertialFlow. geo_pos has shape (node_count, 2)."""
+	return _inertial_flow_order("flow_cutter_compute_inertial_flow_nested_dissection_order", tail, head, geo_pos, min_balance, arc_weight, thread_count)
+
+
+def inertial_flow_separator(tail, head, geo_pos, min_balance=0.2, arc_weight=None):
+	"""Computes a node separator with InertialFlow. geo_pos has shape (node_count, 2)."""
+	node_count, tail, head, arc_weight = _graph(tail, head, arc_weight)
+	node_count = max(node_count, len(geo_pos))
+	geo_pos = _geo_pos(node_count, geo_pos)
+	sep = np.empty(node_count, dtype=np.int32)
+	sep_size = ctypes.c_int(0)
+	_check(_lib.flow_cutter_compute_inertial_flow_separator(*(_graph_args(node_count, tail, head, arc_weight) + [_ptr(geo_pos, _double_ptr), min_balance, _ptr(sep, _int_ptr), ctypes.byref(sep_size)])))
+	return sep[:sep_size.value].copy()
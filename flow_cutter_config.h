@@ -16,6 +16,9 @@ namespace flow_cutter{
 		int max_cut_size;
 		float max_imbalance;
 		int branch_factor;
+		float time_budget;
+		int base_case_node_count;
+		int multilevel_node_count;
 
 		enum class SeparatorSelection{
 			node_min_expansion,
@@ -58,6 +61,13 @@ namespace flow_cutter{
 		};
 		ReportCuts report_cuts;
 
+		enum class MaxFlowAlgorithm{
+			dinic,
+			push_relabel,
+			edmond_karp
+		};
+		MaxFlowAlgorithm max_flow_algorithm;
+
 		enum class PierceRating{
 			max_target_minus_source_hop_dist,
 			min_source_hop_dist,
@@ -83,12 +93,16 @@ namespace flow_cutter{
 			max_cut_size(1000),
 			max_imbalance(0.2),
 			branch_factor(5),
+			time_budget(0.0),
+			base_case_node_count(0),
+			multilevel_node_count(0),
 			separator_selection(SeparatorSelection::node_min_expansion),
 			avoid_augmenting_path(AvoidAugmentingPath::avoid_and_pick_best),
 			skip_non_maximum_sides(SkipNonMaximumSides::skip),
 			graph_search_algorithm(GraphSearchAlgorithm::pseudo_depth_first_search),
 			dump_state(DumpState::no),
 			report_cuts(ReportCuts::yes),
+			max_flow_algorithm(MaxFlowAlgorithm::dinic),
 			pierce_rating(PierceRating::max_target_minus_source_hop_dist){}
 
 		void set(const std::string&var, const std::string&val){
@@ -139,6 +153,14 @@ namespace flow_cutter{
 				else if(val == "no" || val_id == static_cast<int>(ReportCuts::no)) 
 					report_cuts = ReportCuts::no;
 				else throw std::runtime_error("Unknown config value "+val+" for variable ReportCuts; valid are yes, no");
+			}else if(var == "MaxFlowAlgorithm" || var == "max_flow_algorithm"){
+				if(val == "dinic" || val_id == static_cast<int>(MaxFlowAlgorithm::dinic)) 
+					max_flow_algorithm = MaxFlowAlgorithm::dinic;
+				else if(val == "push_relabel" || val_id == static_cast<int>(MaxFlowAlgorithm::push_relabel)) 
+					max_flow_algorithm = MaxFlowAlgorithm::push_relabel;
+				else if(val == "edmond_karp" || val_id == static_cast<int>(MaxFlowAlgorithm::edmond_karp)) 
+					max_flow_algorithm = MaxFlowAlgorithm::edmond_karp;
+				else throw std::runtime_error("Unknown config value "+val+" for variable MaxFlowAlgorithm; valid are dinic, push_relabel, edmond_karp");
 			}else if(var == "PierceRating" || var == "pierce_rating"){
 				if(val == "max_target_minus_source_hop_dist" || val_id == static_cast<int>(PierceRating::max_target_minus_source_hop_dist)) 
 					pierce_rating = PierceRating::max_target_minus_source_hop_dist;
@@ -202,7 +224,22 @@ namespace flow_cutter{
 				if(!(x>=1))
 					throw std::runtime_error("Value for \"branch_factor\" must fullfill \"x>=1\"");
 				branch_factor = x; 
-			}else throw std::runtime_error("Unknown config variable "+var+"; valid are SeparatorSelection, AvoidAugmentingPath, SkipNonMaximumSides, GraphSearchAlgorithm, DumpState, ReportCuts, PierceRating, cutter_count, random_seed, source, target, thread_count, max_cut_size, max_imbalance, branch_factor");
+			}else if(var == "time_budget"){
+				float x = std::stof(val);
+				if(!(x>=0.0))
+					throw std::runtime_error("Value for \"time_budget\" must fullfill \"x>=0.0\"");
+				time_budget = x; 
+			}else if(var == "base_case_node_count"){
+				int x = std::stoi(val);
+				if(!(x>=0&&x<=512))
+					throw std::runtime_error("Value for \"base_case_node_count\" must fullfill \"x>=0&&x<=512\"");
+				base_case_node_count = x; 
+			}else if(var == "multilevel_node_count"){
+				int x = std::stoi(val);
+				if(!(x>=0))
+					throw std::runtime_error("Value for \"multilevel_node_count\" must fullfill \"x>=0\"");
+				multilevel_node_count = x; 
+			}else throw std::runtime_error("Unknown config variable "+var+"; valid are SeparatorSelection, AvoidAugmentingPath, SkipNonMaximumSides, GraphSearchAlgorithm, DumpState, ReportCuts, MaxFlowAlgorithm, PierceRating, cutter_count, random_seed, source, target, thread_count, max_cut_size, max_imbalance, branch_factor, time_budget, base_case_node_count, multilevel_node_count");
 		}
 		std::string get(const std::string&var)const{
 			if(var == "SeparatorSelection" || var == "separator_selection"){
@@ -234,6 +271,11 @@ namespace flow_cutter{
 				if(report_cuts == ReportCuts::yes) return "yes";
 				else if(report_cuts == ReportCuts::no) return "no";
 				else {assert(false); return "";}
+			}else if(var == "MaxFlowAlgorithm" || var == "max_flow_algorithm"){
+				if(max_flow_algorithm == MaxFlowAlgorithm::dinic) return "dinic";
+				else if(max_flow_algorithm == MaxFlowAlgorithm::push_relabel) return "push_relabel";
+				else if(max_flow_algorithm == MaxFlowAlgorithm::edmond_karp) return "edmond_karp";
+				else {assert(false); return "";}
 			}else if(var == "PierceRating" || var == "pierce_rating"){
 				if(pierce_rating == PierceRating::max_target_minus_source_hop_dist) return "max_target_minus_source_hop_dist";
 				else if(pierce_rating == PierceRating::min_source_hop_dist) return "min_source_hop_dist";
@@ -264,7 +306,13 @@ namespace flow_cutter{
 				return std::to_string(max_imbalance);
 			}else if(var == "branch_factor"){
 				return std::to_string(branch_factor);
-			}else throw std::runtime_error("Unknown config variable "+var+"; valid are SeparatorSelection,AvoidAugmentingPath,SkipNonMaximumSides,GraphSearchAlgorithm,DumpState,ReportCuts,PierceRating, cutter_count, random_seed, source, target, thread_count, max_cut_size, max_imbalance, branch_factor");
+			}else if(var == "time_budget"){
+				return std::to_string(time_budget);
+			}else if(var == "base_case_node_count"){
+				return std::to_string(base_case_node_count);
+			}else if(var == "multilevel_node_count"){
+				return std::to_string(multilevel_node_count);
+			}else throw std::runtime_error("Unknown config variable "+var+"; valid are SeparatorSelection,AvoidAugmentingPath,SkipNonMaximumSides,GraphSearchAlgorithm,DumpState,ReportCuts,MaxFlowAlgorithm,PierceRating, cutter_count, random_seed, source, target, thread_count, max_cut_size, max_imbalance, branch_factor, time_budget, base_case_node_count, multilevel_node_count");
 		}
 		std::string get_config()const{
 			std::ostringstream out;
@@ -275,6 +323,7 @@ namespace flow_cutter{
 				<< std::setw(30) << "GraphSearchAlgorithm" << " : " << get("GraphSearchAlgorithm") << '\n'
 				<< std::setw(30) << "DumpState" << " : " << get("DumpState") << '\n'
 				<< std::setw(30) << "ReportCuts" << " : " << get("ReportCuts") << '\n'
+				<< std::setw(30) << "MaxFlowAlgorithm" << " : " << get("MaxFlowAlgorithm") << '\n'
 				<< std::setw(30) << "PierceRating" << " : " << get("PierceRating") << '\n'
 				<< std::setw(30) << "cutter_count" << " : " << get("cutter_count") << '\n'
 				<< std::setw(30) << "random_seed" << " : " << get("random_seed") << '\n'
@@ -283,7 +332,10 @@ namespace flow_cutter{
 				<< std::setw(30) << "thread_count" << " : " << get("thread_count") << '\n'
 				<< std::setw(30) << "max_cut_size" << " : " << get("max_cut_size") << '\n'
 				<< std::setw(30) << "max_imbalance" << " : " << get("max_imbalance") << '\n'
-				<< std::setw(30) << "branch_factor" << " : " << get("branch_factor") << '\n';
+				<< std::setw(30) << "branch_factor" << " : " << get("branch_factor") << '\n'
+				<< std::setw(30) << "time_budget" << " : " << get("time_budget") << '\n'
+				<< std::setw(30) << "base_case_node_count" << " : " << get("base_case_node_count") << '\n'
+				<< std::setw(30) << "multilevel_node_count" << " : " << get("multilevel_node_count") << '\n';
 			return out.str();
 		}
 
@@ -0,0 +1,271 @@
+#include "flow_cutter_library.h"
+
+#include "array_id_func.h"
+#include "multi_arc.h"
+#include "min_fill_in.h"
+#include "separator.h"
+#include "inertial_flow.h"
+#include "flow_cutter_config.h"
+#include "geo_pos.h"
+
+#include <string>
+#include <vector>
+#include <memory>
+#include <stdexcept>
+#include <cstring>
+
+struct FlowCutterConfig{
+	flow_cutter::Config config;
+};
+
+namespace{
+	thread_local std::string last_error;
+
+	static_assert(sizeof(GeoPos) == 2*sizeof(double), "geo_pos can not be passed as array of doubles");
+
+	// Returns an array that points to data without owning it. The orderers take their arguments by value
+	// but only read them. They build new arrays before they modify anything.
+	template<class T>
+	ArrayIDFunc<T>make_array_view(int preimage_count, const T*data){
+		if(preimage_count == 0)
+			return ArrayIDFunc<T>();
+		T*mutable_data = const_cast<T*>(data);
+		return ArrayIDFunc<T>(preimage_count, mutable_data, std::shared_ptr<void>(mutable_data, [](void*){}));
+	}
+
+	ArrayIDIDFunc make_id_id_array_view(int preimage_count, int image_count, const int*data){
+		if(preimage_count == 0)
+			return ArrayIDIDFunc(0, image_count);
+		int*mutable_data = const_cast<int*>(data);
+		return ArrayIDIDFunc(preimage_count, image_count, mutable_data, std::shared_ptr<void>(mutable_data, [](void*){}));
+	}
+
+	struct InputGraph{
+		ArrayIDIDFunc tail, head;
+		ArrayIDFunc<int>arc_weight;
+	};
+
+	InputGraph make_input_graph(int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight){
+		if(node_count < 0 || arc_count < 0)
+			throw std::runtime_error("The node and arc counts must not be negative");
+		if(arc_count != 0 && (tail == nullptr || head == nullptr))
+			throw std::runtime_error("tail and head must not be null");
+
+		for(int i=0; i<arc_count; ++i)
+			if(tail[i] < 0 || tail[i] >= node_count || head[i] < 0 || head[i] >= node_count)
+				throw std::runtime_error("The arc "+std::to_string(i)+" has an endpoint that is no node");
+
+		InputGraph g;
+		g.tail = make_id_id_array_view(arc_count, node_count, tail);
+		g.head = make_id_id_array_view(arc_count, node_count, head);
+		if(arc_weight != nullptr){
+			g.arc_weight = make_array_view(arc_count, arc_weight);
+		}else{
+			g.arc_weight = ArrayIDFunc<int>(arc_count);
+			g.arc_weight.fill(1);
+		}
+
+		if(!is_symmetric(g.tail, g.head))
+			throw std::runtime_error("Graph must be symmetric");
+
+		return g;
+	}
+
+	ArrayIDFunc<GeoPos>make_geo_pos(int node_count, const double*geo_pos){
+		if(node_count != 0 && geo_pos == nullptr)
+			throw std::runtime_error("geo_pos must not be null");
+		return make_array_view(node_count, reinterpret_cast<const GeoPos*>(geo_pos));
+	}
+
+	void check_min_balance(double min_balance){
+		if(min_balance < 0 || min_balance > 0.5)
+			throw std::runtime_error("min balance parameter must be between 0.0 and 0.5");
+	}
+
+	void check_thread_count(int thread_count){
+		if(thread_count < 1)
+			throw std::runtime_error("The thread count must be at least 1");
+	}
+
+	void copy_order(const ArrayIDIDFunc&order, int*out){
+		std::copy(order.begin(), order.end(), out);
+	}
+
+	void copy_separator(const std::vector<int>&separator, int*out, int*out_size){
+		std::copy(separator.begin(), separator.end(), out);
+		*out_size = separator.size();
+	}
+
+	// The separator functions expect simple graphs with sorted arcs. This only copies the arcs.
+	template<class ComputeSeparator>
+	std::vector<int>compute_separator_of_input_graph(InputGraph g, const ComputeSeparator&compute_separator){
+		const int node_count = g.tail.image_count();
+		if(node_count == 0)
+			return {};
+		cch_order::make_graph_simple(g.tail, g.head, g.arc_weight);
+		return compute_separator(g.tail, g.head, identity_permutation(node_count), g.arc_weight);
+	}
+
+	template<class F>
+	int catch_all(const F&f){
+		try{
+			f();
+			return 0;
+		}catch(std::exception&err){
+			last_error = err.what();
+		}catch(...){
+			last_error = "Unknown exception";
+		}
+		return -1;
+	}
+}
+
+extern "C"{
+
+const char*flow_cutter_get_last_error(void){
+	return last_error.c_str();
+}
+
+FlowCutterConfig*flow_cutter_create_config(void){
+	try{
+		return new FlowCutterConfig;
+	}catch(std::exception&err){
+		last_error = err.what();
+		return nullptr;
+	}
+}
+
+void flow_cutter_destroy_config(FlowCutterConfig*config){
+	delete config;
+}
+
+int flow_cutter_set_config(FlowCutterConfig*config, const char*var, const char*val){
+	return catch_all([&]{
+		config->config.set(var, val);
+	});
+}
+
+int flow_cutter_get_config(const FlowCutterConfig*config, const char*var, char*val, int val_size){
+	return catch_all([&]{
+		std::string x = config->config.get(var);
+		if((int)x.size() >= val_size)
+			throw std::runtime_error("The buffer is too small for the value of "+std::string(var));
+		std::memcpy(val, x.c_str(), x.size()+1);
+	});
+}
+
+int flow_cutter_compute_cch_order(
+	const FlowCutterConfig*config,
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	int*order
+){
+	return catch_all([&]{
+		auto g = make_input_graph(node_count, arc_count, tail, head, arc_weight);
+		copy_order(
+			cch_order::compute_cch_graph_order(
+				std::move(g.tail), std::move(g.head), std::move(g.arc_weight),
+				flow_cutter::ComputeSeparator(config->config),
+				config->config.thread_count,
+				config->config.base_case_node_count
+			),
+			order
+		);
+	});
+}
+
+int flow_cutter_compute_nested_dissection_order(
+	const FlowCutterConfig*config,
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	int*order
+){
+	return catch_all([&]{
+		auto g = make_input_graph(node_count, arc_count, tail, head, arc_weight);
+		copy_order(
+			cch_order::compute_nested_dissection_graph_order(
+				std::move(g.tail), std::move(g.head), std::move(g.arc_weight),
+				flow_cutter::ComputeSeparator(config->config),
+				config->config.thread_count,
+				config->config.base_case_node_count
+			),
+			order
+		);
+	});
+}
+
+int flow_cutter_compute_separator(
+	const FlowCutterConfig*config,
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	int*separator, int*separator_size
+){
+	return catch_all([&]{
+		copy_separator(
+			compute_separator_of_input_graph(
+				make_input_graph(node_count, arc_count, tail, head, arc_weight),
+				flow_cutter::ComputeSeparator(config->config)
+			),
+			separator, separator_size
+		);
+	});
+}
+
+int flow_cutter_compute_inertial_flow_cch_order(
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	const double*geo_pos, double min_balance, int thread_count,
+	int*order
+){
+	return catch_all([&]{
+		check_min_balance(min_balance);
+		check_thread_count(thread_count);
+		auto g = make_input_graph(node_count, arc_count, tail, head, arc_weight);
+		auto node_geo_pos = make_geo_pos(node_count, geo_pos);
+		copy_order(
+			cch_order::compute_cch_graph_order(
+				std::move(g.tail), std::move(g.head), std::move(g.arc_weight),
+				inertial_flow::ComputeSeparator(node_geo_pos, min_balance),
+				thread_count
+			),
+			order
+		);
+	});
+}
+
+int flow_cutter_compute_inertial_flow_nested_dissection_order(
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	const double*geo_pos, double min_balance, int thread_count,
+	int*order
+){
+	return catch_all([&]{
+		check_min_balance(min_balance);
+		check_thread_count(thread_count);
+		auto g = make_input_graph(node_count, arc_count, tail, head, arc_weight);
+		auto node_geo_pos = make_geo_pos(node_count, geo_pos);
+		copy_order(
+			cch_order::compute_nested_dissection_graph_order(
+				std::move(g.tail), std::move(g.head), std::move(g.arc_weight),
+				inertial_flow::ComputeSeparator(node_geo_pos, min_balance),
+				thread_count
+			),
+			order
+		);
+	});
+}
+
+int flow_cutter_compute_inertial_flow_separator(
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	const double*geo_pos, double min_balance,
+	int*separator, int*separator_size
+){
+	return catch_all([&]{
+		check_min_balance(min_balance);
+		auto node_geo_pos = make_geo_pos(node_count, geo_pos);
+		copy_separator(
+			compute_separator_of_input_graph(
+				make_input_graph(node_count, arc_count, tail, head, arc_weight),
+				inertial_flow::ComputeSeparator(node_geo_pos, min_balance)
+			),
+			separator, separator_size
+		);
+	});
+}
+
+}
@@ -0,0 +1,80 @@
+#ifndef FLOW_CUTTER_LIBRARY_H
+#define FLOW_CUTTER_LIBRARY_H
+
+/*
+ * C interface to compute nested dissection orders and separators in process. It is used by
+ * flow_cutter.py. Build the shared library with
+ *
+ *   g++ -std=c++0x -O3 -DNDEBUG -fopenmp -fPIC -shared flow_cutter_library.cpp -o libflow_cutter.so
+ *
+ * A graph is given as arc_count arcs. Arc i goes from tail[i] to head[i]. The graph must be
+ * symmetric, i.e., for every arc its reverse must exist as well. Multi arcs and loops are
+ * ignored. arc_weight may be NULL, in which case every arc has weight 1. geo_pos contains
+ * 2*node_count values, the latitude and longitude of every node. The input arrays are read
+ * in place and never modified.
+ *
+ * An order is returned as node_count values. order[i] is the node at position i.
+ *
+ * All functions that return int return 0 on success and -1 on failure. The reason of the last
+ * failure of the calling thread is returned by flow_cutter_get_last_error.
+ */
+
+#ifdef __cplusplus
+extern "C"{
+#endif
+
+typedef struct FlowCutterConfig FlowCutterConfig;
+
+const char*flow_cutter_get_last_error(void);
+
+FlowCutterConfig*flow_cutter_create_config(void);
+void flow_cutter_destroy_config(FlowCutterConfig*config);
+
+/* Accepts the same variables and values as the flow_cutter_set console command. */
+int flow_cutter_set_config(FlowCutterConfig*config, const char*var, const char*val);
+
+/* Writes the value of var including a terminating zero to val. Fails if val_size is too small. */
+int flow_cutter_get_config(const FlowCutterConfig*config, const char*var, char*val, int val_size);
+
+int flow_cutter_compute_cch_order(
+	const FlowCutterConfig*config,
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	int*order
+);
+
+int flow_cutter_compute_nested_dissection_order(
+	const FlowCutterConfig*config,
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	int*order
+);
+
+/* Writes the separator to separator, which must have room for node_count values, and its size to separator_size. */
+int flow_cutter_compute_separator(
+	const FlowCutterConfig*config,
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	int*separator, int*separator_size
+);
+
+int flow_cutter_compute_inertial_flow_cch_order(
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	const double*geo_pos, double min_balance, int thread_count,
+	int*order
+);
+
+int flow_cutter_compute_inertial_flow_nested_dissection_order(
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	const double*geo_pos, double min_balance, int thread_count,
+	int*order
+);
+
+int flow_cutter_compute_inertial_flow_separator(
+	int node_count, int arc_count, const int*tail, const int*head, const int*arc_weight,
+	const double*geo_pos, double min_balance,
+	int*separator, int*separator_size
+);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
@@ -0,0 +1,199 @@
+#ifndef GEO_INDEX_H
+#define GEO_INDEX_H
+
+#include "geo_pos.h"
+#include "array_id_func.h"
+#include <vector>
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <cassert>
+
+//! A k-d tree over the node positions. It answers closest node queries with respect to geo_dist and box
+//! queries. The positions are copied, i.e., the index must be rebuilt whenever the positions change.
+class GeoPosIndex{
+public:
+	GeoPosIndex():is_built_(false){}
+
+	bool is_built()const{
+		return is_built_;
+	}
+
+	void clear(){
+		is_built_ = false;
+		tree.clear();
+		pos.clear();
+		id.clear();
+	}
+
+	void build(const ArrayIDFunc<GeoPos>&geo_pos){
+		const int node_count = geo_pos.preimage_count();
+		id.resize(node_count);
+		for(int i=0; i<node_count; ++i)
+			id[i] = i;
+		tree.clear();
+		if(node_count != 0)
+			build_subtree(geo_pos, 0, node_count);
+
+		pos.resize(node_count);
+		for(int i=0; i<node_count; ++i)
+			pos[i] = geo_pos(id[i]);
+		is_built_ = true;
+	}
+
+	//! Returns the node with the smallest geo_dist to p, ties are broken by smaller node ID. Returns -1 if
+	//! there are no nodes.
+	int find_closest_node(GeoPos p)const{
+		assert(is_built_);
+
+		int best_id = -1;
+		double best_dist = std::numeric_limits<double>::infinity();
+
+		if(tree.empty())
+			return best_id;
+
+		std::vector<int>stack = {0};
+		while(!stack.empty()){
+			const Node&n = tree[stack.back()];
+			stack.pop_back();
+
+			// The bound is slightly decreased to not prune nodes at the same distance due to rounding errors
+			if(get_distance_lower_bound(p, n.box)*(1.0-1e-9) > best_dist)
+				continue;
+
+			if(n.left == -1){
+				for(int i=n.begin; i<n.end; ++i){
+					double d = geo_dist(p, pos[i]);
+					if(d < best_dist || (d == best_dist && id[i] < best_id)){
+						best_dist = d;
+						best_id = id[i];
+					}
+				}
+			}else{
+				// Visit the closer child first
+				if(get_distance_lower_bound(p, tree[n.left].box) < get_distance_lower_bound(p, tree[n.right].box)){
+					stack.push_back(n.right);
+					stack.push_back(n.left);
+				}else{
+					stack.push_back(n.left);
+					stack.push_back(n.right);
+				}
+			}
+		}
+		return best_id;
+	}
+
+	//! Calls on_node(x) for every node x with min_lat <= lat <= max_lat and min_lon <= lon <= max_lon in no
+	//! particular order.
+	template<class OnNode>
+	void forall_nodes_in_box(double min_lat, double max_lat, double min_lon, double max_lon, const OnNode&on_node)const{
+		assert(is_built_);
+
+		if(tree.empty())
+			return;
+
+		std::vector<int>stack = {0};
+		while(!stack.empty()){
+			const Node&n = tree[stack.back()];
+			stack.pop_back();
+
+			if(n.box.max_lat < min_lat || max_lat < n.box.min_lat || n.box.max_lon < min_lon || max_lon < n.box.min_lon)
+				continue;
+
+			bool is_contained =
+				min_lat <= n.box.min_lat && n.box.max_lat <= max_lat &&
+				min_lon <= n.box.min_lon && n.box.max_lon <= max_lon;
+
+			if(is_contained){
+				for(int i=n.begin; i<n.end; ++i)
+					on_node(id[i]);
+			}else if(n.left == -1){
+				for(int i=n.begin; i<n.end; ++i)
+					if(min_lat <= pos[i].lat && pos[i].lat <= max_lat && min_lon <= pos[i].lon && pos[i].lon <= max_lon)
+						on_node(id[i]);
+			}else{
+				stack.push_back(n.left);
+				stack.push_back(n.right);
+			}
+		}
+	}
+
+private:
+	static const int max_leaf_size = 16;
+
+	struct Box{
+		double min_lat, max_lat, min_lon, max_lon;
+	};
+
+	struct Node{
+		Box box;
+		int begin, end;
+		int left, right;
+	};
+
+	int build_subtree(const ArrayIDFunc<GeoPos>&geo_pos, int begin, int end){
+		Box box = {geo_pos(id[begin]).lat, geo_pos(id[begin]).lat, geo_pos(id[begin]).lon, geo_pos(id[begin]).lon};
+		for(int i=begin+1; i<end; ++i){
+			GeoPos p = geo_pos(id[i]);
+			box.min_lat = std::min(box.min_lat, p.lat);
+			box.max_lat = std::max(box.max_lat, p.lat);
+			box.min_lon = std::min(box.min_lon, p.lon);
+			box.max_lon = std::max(box.max_lon, p.lon);
+		}
+
+		int n = tree.size();
+		tree.push_back({box, begin, end, -1, -1});
+
+		if(end - begin > max_leaf_size){
+			// Split at the median of the longer side
+			int mid = begin + (end - begin)/2;
+			if(box.max_lat - box.min_lat > box.max_lon - box.min_lon)
+				std::nth_element(id.begin()+begin, id.begin()+mid, id.begin()+end, [&](int l, int r){return geo_pos(l).lat < geo_pos(r).lat;});
+			else
+				std::nth_element(id.begin()+begin, id.begin()+mid, id.begin()+end, [&](int l, int r){return geo_pos(l).lon < geo_pos(r).lon;});
+
+			int left = build_subtree(geo_pos, begin, mid);
+			int right = build_subtree(geo_pos, mid, end);
+			tree[n].left = left;
+			tree[n].right = right;
+		}
+		return n;
+	}
+
+	//! A lower bound on the geo_dist from p to any point in the box. A path from p into the box must bridge the
+	//! latitude gap and, if p is outside the longitude range, it must cross one of the great circles through
+	//! the bounding meridians.
+	static double get_distance_lower_bound(GeoPos p, const Box&box){
+		const double pi = 3.14159265359;
+		const double R = 6371000.0;
+		const double to_rad = pi/180.0;
+
+		double lat_gap = 0.0;
+		if(p.lat < box.min_lat)
+			lat_gap = box.min_lat - p.lat;
+		else if(p.lat > box.max_lat)
+			lat_gap = p.lat - box.max_lat;
+		double bound = R * lat_gap * to_rad;
+
+		if(box.max_lon - box.min_lon < 360.0){
+			double offset = std::fmod(p.lon - box.min_lon, 360.0);
+			if(offset < 0)
+				offset += 360.0;
+			if(offset > box.max_lon - box.min_lon){
+				double cos_lat = std::abs(std::cos(p.lat * to_rad));
+				auto dist_to_meridian_circle = [&](double lon){
+					return R * std::asin(std::min(1.0, cos_lat * std::abs(std::sin((p.lon - lon) * to_rad))));
+				};
+				bound = std::max(bound, std::min(dist_to_meridian_circle(box.min_lon), dist_to_meridian_circle(box.max_lon)));
+			}
+		}
+		return bound;
+	}
+
+	bool is_built_;
+	std::vector<Node>tree;
+	std::vector<GeoPos>pos;
+	std::vector<int>id;
+};
+
+#endif
@@ -5,6 +5,8 @@
 #include "heap.h"
 #include "min_max.h"
 #include <vector>
+#include <algorithm>
+#include <utility>
 
 ArrayIDFunc<std::vector<int>> build_dyn_array(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
 	const int node_count = tail.image_count();
@@ -130,7 +132,7 @@ int compute_number_of_shortcuts_added_if_contracted(const ArrayIDFunc<std::vecto
 	return added;
 }
 
-ArrayIDIDFunc compute_greedy_min_degree_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
+ArrayIDIDFunc compute_exact_greedy_min_degree_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
 	const int node_count = tail.image_count();
 	
 	auto g = build_dyn_array(tail, head);
@@ -156,7 +158,7 @@ ArrayIDIDFunc compute_greedy_min_degree_order(const ArrayIDIDFunc&tail, const Ar
 	return order; // NVRO
 }
 
-ArrayIDIDFunc compute_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
+ArrayIDIDFunc compute_exact_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
 	const int node_count = tail.image_count();
 
 	auto g = build_dyn_array(tail, head);
@@ -182,73 +184,314 @@ ArrayIDIDFunc compute_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const
 	return order; // NVRO
 }
 
-ArrayIDIDFunc compute_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, int hash_factor, int hash_modulo){
-	const int node_count = tail.image_count();
-
-	auto g = build_dyn_array(tail, head);
+namespace{
+	// Eliminates the nodes in the quotient graph of Amestoy, Davis and Duff, "An Approximate Minimum Degree
+	// Ordering Algorithm". The graph consists of variables, i.e., nodes that are not yet eliminated, and
+	// elements, i.e., eliminated nodes. An element stands for the clique formed by its adjacent variables.
+	// Eliminating a variable p turns p into an element and absorbs the elements adjacent to p. Hence, the
+	// storage never grows beyond the original graph plus the element lists.
+	//
+	// Variables with the same neighborhood are merged into supervariables that are eliminated at once. The
+	// external degree of a variable, i.e., the number of nodes in its neighborhood outside of its
+	// supervariable, is only approximated by the upper bound of AMD. The number of shortcuts, i.e., the fill,
+	// is approximated as d(d-1)/2 - c(c-1)/2, where d is the approximate degree and c is the size of the
+	// largest adjacent element without the variable, as these nodes are already pairwise adjacent.
+	//
+	// The strategy decides the elimination order:
+	// * strategy.get_key(x, degree, fill) is the priority of the variable x. The minimum is eliminated first.
+	// * strategy.on_pivot_neighbor(p, x) is called for every variable x adjacent to the eliminated variable p.
+	// * strategy.on_merge(x, y) is called if y is merged into the supervariable x.
+	template<class Strategy>
+	ArrayIDIDFunc compute_approximate_greedy_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, Strategy strategy){
+		const int node_count = tail.image_count();
+
+		auto var_adj = build_dyn_array(tail, head);
+		ArrayIDFunc<std::vector<int>>element_adj(node_count);
+		ArrayIDFunc<std::vector<int>>element(node_count);
+
+		// The weight of a variable is the number of nodes in its supervariable, 0 for merged variables and elements.
+		// While a pivot is eliminated, the weights of the variables in the pivot element are negated to mark them.
+		ArrayIDFunc<int>weight(node_count);
+		weight.fill(1);
+		ArrayIDFunc<int>element_weight(node_count);
+		ArrayIDFunc<int>degree(node_count);
+		// The number of nodes outside of the supervariable in the largest element adjacent to the variable.
+		ArrayIDFunc<int>largest_clique(node_count);
+		BitIDFunc is_absorbed(node_count);
+		is_absorbed.fill(false);
+
+		ArrayIDFunc<int>next_in_supervariable(node_count), last_in_supervariable(node_count);
+		for(int x=0; x<node_count; ++x){
+			next_in_supervariable[x] = -1;
+			last_in_supervariable[x] = x;
+		}
 
-	min_id_heap<int> q(node_count);
+		// Timestamps: external_weight[e] is the weight of the variables of element e that are not adjacent to
+		// the pivot.
+		ArrayIDFunc<int>external_weight(node_count), external_weight_stamp(node_count), compare_mark(node_count);
+		external_weight_stamp.fill(-1);
+		compare_mark.fill(-1);
+		int compare_stamp = 0;
+
+		auto get_fill = [](long long d, long long c){
+			min_to(c, d);
+			return (d*(d-1) - c*(c-1))/2;
+		};
+
+		min_id_heap<long long>q(node_count);
+		for(int x=0; x<node_count; ++x){
+			degree[x] = var_adj(x).size();
+			q.push(x, strategy.get_key(x, degree(x), get_fill(degree(x), 0)));
+		}
 
-	auto compute_key = [&](int x){
-		int key = 100*compute_number_of_shortcuts_added_if_contracted(g,x) + g(x).size();
-		if(key < 10)
-			return key;
-		else
-			return key + (hash_factor * x) % (2*key/3) - key/3;
-	};
+		auto absorb = [&](int e){
+			is_absorbed.set(e, true);
+			std::vector<int>().swap(element[e]);
+		};
+
+		ArrayIDIDFunc order(node_count, node_count);
+		int next_pos = 0;
+		int remaining_weight = node_count;
+
+		std::vector<int>pivot_element;
+		std::vector<std::pair<long long, int>>hashed_pivot_element;
+
+		for(int stamp = 0; !q.empty(); ++stamp){
+			int p = q.pop();
+			if(weight(p) == 0)
+				continue; // merged into another supervariable
+
+			for(int x=p; x!=-1; x=next_in_supervariable(x))
+				order[next_pos++] = x;
+			remaining_weight -= weight(p);
+			weight[p] = 0;
+
+			// Build the new element p from the variables adjacent to p and absorb the adjacent elements.
+			pivot_element.clear();
+			int pivot_element_weight = 0;
+			auto add_to_pivot_element = [&](int x){
+				if(weight(x) > 0){
+					pivot_element.push_back(x);
+					pivot_element_weight += weight(x);
+					weight[x] = -weight(x);
+				}
+			};
+			for(auto e:element_adj(p)){
+				if(!is_absorbed(e)){
+					for(auto x:element(e))
+						add_to_pivot_element(x);
+					absorb(e);
+				}
+			}
+			for(auto x:var_adj(p))
+				add_to_pivot_element(x);
+			// An element with at most one variable does not connect any variables and is not stored. This is
+			// the case for most pivots of sparse graphs. Otherwise, the element reuses the buffer of var_adj[p].
+			bool is_pivot_element_stored = pivot_element.size() >= 2;
+			if(is_pivot_element_stored){
+				var_adj[p].clear();
+				element[p].swap(var_adj[p]);
+			}else{
+				std::vector<int>().swap(var_adj[p]);
+			}
+			std::vector<int>().swap(element_adj[p]);
+			element_weight[p] = pivot_element_weight;
+
+			for(auto x:pivot_element)
+				strategy.on_pivot_neighbor(p, x);
+
+			// Compute the weight of every element adjacent to the pivot element outside of the pivot element. The
+			// weights of the variables in the pivot element are negated and therefore added.
+			for(auto x:pivot_element){
+				for(auto e:element_adj(x)){
+					if(is_absorbed(e))
+						continue;
+					if(external_weight_stamp(e) != stamp){
+						external_weight_stamp[e] = stamp;
+						external_weight[e] = element_weight(e);
+					}
+					external_weight[e] += weight(x);
+				}
+			}
 
-	for(int x=0; x<node_count; ++x)
-		q.push(x, compute_key(x));
+			// Prune the adjacencies of the variables in the pivot element and approximate their degree.
+			hashed_pivot_element.clear();
+			for(auto x:pivot_element){
+				int x_weight = -weight(x);
+				long long hash = p;
+				int external_element_degree = 0;
+				largest_clique[x] = pivot_element_weight - x_weight;
+
+				auto&x_element_adj = element_adj[x];
+				int new_size = 0;
+				for(auto e:x_element_adj){
+					if(is_absorbed(e))
+						continue;
+					if(external_weight(e) == 0){
+						// e is a subset of the pivot element
+						absorb(e);
+						continue;
+					}
+					external_element_degree += external_weight(e);
+					max_to(largest_clique[x], element_weight(e) - x_weight);
+					hash += e;
+					x_element_adj[new_size++] = e;
+				}
+				x_element_adj.resize(new_size);
+				if(is_pivot_element_stored)
+					x_element_adj.push_back(p);
+
+				auto&x_var_adj = var_adj[x];
+				int external_var_degree = 0;
+				new_size = 0;
+				for(auto y:x_var_adj){
+					if(weight(y) <= 0)
+						continue;
+					external_var_degree += weight(y);
+					hash += y;
+					x_var_adj[new_size++] = y;
+				}
+				x_var_adj.resize(new_size);
 
-	ArrayIDIDFunc order(node_count, node_count);
-	int next_pos = 0;
+				int d = remaining_weight - x_weight;
+				min_to(d, degree(x) + pivot_element_weight - x_weight);
+				min_to(d, pivot_element_weight - x_weight + external_element_degree + external_var_degree);
+				degree[x] = d;
 
-	while(!q.empty()){
-		auto x = q.pop();
+				if(is_pivot_element_stored)
+					hashed_pivot_element.push_back({hash, x});
+			}
+			for(auto x:pivot_element)
+				weight[x] = -weight(x);
+
+			// Merge the variables that are indistinguishable, i.e., have the same adjacent elements and variables.
+			// Only variables of the pivot element can be merged. On sparse graphs, most pivot elements have a
+			// single variable or two with different hashes and there is nothing to sort or compare.
+			if(hashed_pivot_element.size() == 2 && hashed_pivot_element[0].first != hashed_pivot_element[1].first)
+				hashed_pivot_element.clear();
+			std::sort(hashed_pivot_element.begin(), hashed_pivot_element.end());
+			for(int i=0; i<(int)hashed_pivot_element.size(); ++i){
+				int x = hashed_pivot_element[i].second;
+				if(weight(x) == 0)
+					continue;
+				bool is_x_marked = false;
+				for(int j=i+1; j<(int)hashed_pivot_element.size() && hashed_pivot_element[j].first == hashed_pivot_element[i].first; ++j){
+					int y = hashed_pivot_element[j].second;
+					if(weight(y) == 0 || element_adj(x).size() != element_adj(y).size() || var_adj(x).size() != var_adj(y).size())
+						continue;
+					if(!is_x_marked){
+						++compare_stamp;
+						for(auto e:element_adj(x))
+							compare_mark[e] = compare_stamp;
+						for(auto z:var_adj(x))
+							compare_mark[z] = compare_stamp;
+						is_x_marked = true;
+					}
+					bool is_same = true;
+					for(auto e:element_adj(y))
+						if(compare_mark(e) != compare_stamp){
+							is_same = false;
+							break;
+						}
+					if(is_same)
+						for(auto z:var_adj(y))
+							if(compare_mark(z) != compare_stamp){
+								is_same = false;
+								break;
+							}
+					if(!is_same)
+						continue;
+
+					strategy.on_merge(x, y);
+					weight[x] += weight(y);
+					degree[x] -= weight(y);
+					largest_clique[x] -= weight(y);
+					weight[y] = 0;
+					next_in_supervariable[last_in_supervariable(x)] = y;
+					last_in_supervariable[x] = last_in_supervariable(y);
+					std::vector<int>().swap(var_adj[y]);
+					std::vector<int>().swap(element_adj[y]);
+				}
+			}
 
-		order[next_pos++] = x;
+			int new_size = 0;
+			for(auto x:pivot_element){
+				if(weight(x) == 0)
+					continue;
+				pivot_element[new_size++] = x;
+				q.push_or_set_key(x, strategy.get_key(x, degree(x), get_fill(degree(x), largest_clique(x))));
+			}
+			if(is_pivot_element_stored)
+				element[p].assign(pivot_element.begin(), pivot_element.begin() + new_size);
+		}
 
-		for(auto y:contract_node(g, x))
-			q.push_or_set_key(y, compute_key(y));
+		assert(next_pos == node_count);
+		return order; // NVRO
 	}
 
-	return order; // NVRO
-}
-
-ArrayIDIDFunc compute_greedy_min_shortcut_and_level_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
-	const int node_count = tail.image_count();
-
-	auto g = build_dyn_array(tail, head);
+	struct MinDegreeStrategy{
+		long long get_key(int x, long long degree, long long fill)const{
+			return degree;
+		}
+		void on_pivot_neighbor(int p, int x){}
+		void on_merge(int x, int y){}
+	};
 
-	min_id_heap<int> q(node_count);
+	struct MinShortcutStrategy{
+		long long get_key(int x, long long degree, long long fill)const{
+			return 100*fill + degree;
+		}
+		void on_pivot_neighbor(int p, int x){}
+		void on_merge(int x, int y){}
+	};
 
-	ArrayIDFunc<int> level(node_count);
-	level.fill(0);
+	struct MinShortcutWithHashStrategy{
+		int hash_factor;
 
-	auto compute_key = [&](int x){
-		return compute_number_of_shortcuts_added_if_contracted(g,x) + level(x);
+		long long get_key(int x, long long degree, long long fill)const{
+			long long key = 100*fill + degree;
+			if(key < 10)
+				return key;
+			else
+				return key + ((long long)hash_factor * x) % (2*key/3) - key/3;
+		}
+		void on_pivot_neighbor(int p, int x){}
+		void on_merge(int x, int y){}
 	};
 
-	for(int x=0; x<node_count; ++x)
-		q.push(x, compute_key(x));
-
-	ArrayIDIDFunc order(node_count, node_count);
-	int next_pos = 0;
+	struct MinShortcutAndLevelStrategy{
+		ArrayIDFunc<int>level;
 
-	while(!q.empty()){
-		auto x = q.pop();
+		long long get_key(int x, long long degree, long long fill)const{
+			return fill + level(x);
+		}
+		void on_pivot_neighbor(int p, int x){
+			max_to(level[x], level(p)+1);
+		}
+		void on_merge(int x, int y){
+			max_to(level[x], level(y));
+		}
+	};
+}
 
-		order[next_pos++] = x;
+ArrayIDIDFunc compute_greedy_min_degree_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
+	return compute_approximate_greedy_order(tail, head, MinDegreeStrategy());
+}
 
-		for(auto y:contract_node(g, x)){
-			max_to(level[y], level[x]+1);
-			q.push_or_set_key(y, compute_key(y));	
-		}
-	}
+ArrayIDIDFunc compute_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
+	return compute_approximate_greedy_order(tail, head, MinShortcutStrategy());
+}
 
-	return order; // NVRO
+ArrayIDIDFunc compute_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, int hash_factor, int hash_modulo){
+	return compute_approximate_greedy_order(tail, head, MinShortcutWithHashStrategy{hash_factor});
 }
 
+ArrayIDIDFunc compute_greedy_min_shortcut_and_level_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head){
+	MinShortcutAndLevelStrategy strategy;
+	strategy.level = ArrayIDFunc<int>(tail.image_count());
+	strategy.level.fill(0);
+	return compute_approximate_greedy_order(tail, head, std::move(strategy));
+}
 
 ArrayIDIDFunc compute_greedy_independent_set_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, bool degree_guided){
 	const int node_count = tail.image_count();
@@ -5,8 +5,13 @@
 
 #include <stdexcept>
 
+// The greedy min degree and min shortcut orders run on a quotient graph and only approximate the degrees
+// and the shortcut counts, see greedy_order.cpp. The exact variants update explicit neighbor lists and
+// thus need quadratic time on dense graphs.
 ArrayIDIDFunc compute_greedy_min_degree_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head);
 ArrayIDIDFunc compute_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head);
+ArrayIDIDFunc compute_exact_greedy_min_degree_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head);
+ArrayIDIDFunc compute_exact_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head);
 ArrayIDIDFunc compute_greedy_independent_set_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, bool degree_guided);
 ArrayIDIDFunc compute_greedy_min_shortcut_order(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, int hash_factor, int hash_modulo);
 ArrayIDIDFunc compute_minimum_elimination_tree_height_order_from_chordal_graph(const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head);
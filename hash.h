@@ -0,0 +1,94 @@
+#ifndef HASH_H
+#define HASH_H
+
+#include <cstdint>
+#include <cstring>
+#include <algorithm>
+#include <string>
+#include <vector>
+#include <omp.h>
+
+//!
+//! Non-cryptographic 64 bit hash functions. hash_bytes uses the round function of xxHash64
+//! on four independent lanes.
+//!
+
+inline
+std::uint64_t rotate_left(std::uint64_t x, int r){
+	return (x << r) | (x >> (64-r));
+}
+
+// The finalizer of splitmix64
+inline
+std::uint64_t mix_hash(std::uint64_t x){
+	x ^= x >> 30;
+	x *= 0xbf58476d1ce4e5b9ull;
+	x ^= x >> 27;
+	x *= 0x94d049bb133111ebull;
+	x ^= x >> 31;
+	return x;
+}
+
+inline
+std::uint64_t hash_combine(std::uint64_t h, std::uint64_t x){
+	return mix_hash(h ^ (mix_hash(x) + 0x9e3779b97f4a7c15ull + (h << 6) + (h >> 2)));
+}
+
+inline
+std::uint64_t hash_bytes(const char*data, long long size, std::uint64_t seed = 0){
+	const std::uint64_t prime1 = 0x9e3779b185ebca87ull;
+	const std::uint64_t prime2 = 0xc2b2ae3d27d4eb4full;
+
+	std::uint64_t lane[4] = {seed + prime1 + prime2, seed + prime2, seed, seed - prime1};
+
+	long long i = 0;
+	for(; i+32 <= size; i += 32){
+		for(int j=0; j<4; ++j){
+			std::uint64_t w;
+			std::memcpy(&w, data+i+8*j, 8);
+			lane[j] = rotate_left(lane[j] + w*prime2, 31)*prime1;
+		}
+	}
+
+	std::uint64_t h = static_cast<std::uint64_t>(size);
+	for(int j=0; j<4; ++j)
+		h = hash_combine(h, lane[j]);
+
+	for(; i+8 <= size; i += 8){
+		std::uint64_t w;
+		std::memcpy(&w, data+i, 8);
+		h = hash_combine(h, w);
+	}
+
+	std::uint64_t w = 0;
+	std::memcpy(&w, data+i, size-i);
+	return hash_combine(h, w);
+}
+
+inline
+std::uint64_t hash_string(const std::string&str, std::uint64_t seed = 0){
+	return hash_bytes(str.data(), str.size(), seed);
+}
+
+// Hashes fixed size blocks in parallel. The result does not depend on the number of threads.
+inline
+std::uint64_t hash_bytes_in_parallel(const char*data, long long size, std::uint64_t seed = 0){
+	const long long block_size = 1<<22;
+	const long long block_count = (size + block_size - 1) / block_size;
+
+	std::vector<std::uint64_t>block_hash(block_count);
+
+	#pragma omp parallel for schedule(dynamic)
+	for(long long i=0; i<block_count; ++i){
+		long long block_begin = i*block_size;
+		long long block_end = std::min(size, block_begin + block_size);
+		block_hash[i] = hash_bytes(data + block_begin, block_end - block_begin, seed);
+	}
+
+	std::uint64_t h = hash_combine(seed, static_cast<std::uint64_t>(size));
+	for(auto x:block_hash)
+		h = hash_combine(h, x);
+	return h;
+}
+
+#endif
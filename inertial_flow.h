@@ -6,8 +6,8 @@
 #include "tiny_id_func.h"
 #include "back_arc.h"
 #include "geo_pos.h"
-#include "edmond_karp.h"
-#include "dinic.h"
+#include "max_flow.h"
+#include "cancellation.h"
 #include <vector>
 #include <cassert>
 
@@ -79,11 +79,17 @@ namespace inertial_flow{
 
 	}
 
+	//! The cut with the smallest size among the four projection directions is returned. Ties are broken in favor
+	//! of the first direction. Dinic on one thread advances the direction with the smallest current flow
+	//! intensity and stops as soon as one direction is finished. Otherwise the maximum flows of all directions
+	//! are computed on up to thread_count threads. Both give the same cut.
 	template<class InvTail, class Head, class BackArc, class GetGeoPos>
 	Cut compute_inertial_flow_cut(
 		const InvTail&inv_tail, const Head&head, const BackArc&back_arc,
 		const GetGeoPos&geo_pos, 
-		double min_balance
+		double min_balance,
+		max_flow::UnitFlowAlgorithm max_flow_algorithm = max_flow::UnitFlowAlgorithm::dinic,
+		int thread_count = 1
 	){
 		const int node_count = head.image_count();
 		ArrayIDIDFunc 
@@ -111,6 +117,28 @@ namespace inertial_flow{
 			source_list[3], target_list[3]
 		);
 
+		if(max_flow_algorithm != max_flow::UnitFlowAlgorithm::dinic || thread_count > 1){
+			Cut cut[4];
+			auto cancellation = current_cancellation();
+			#pragma omp parallel num_threads(thread_count) if(thread_count > 1)
+			{
+				CurrentCancellationScope cancellation_scope(cancellation);
+				#pragma omp for schedule(dynamic, 1)
+				for(int i=0; i<4; ++i)
+					cut[i] = extract_cut_from_maximum_unit_flow(
+						inv_tail, head, 
+						max_flow::compute_maximum_unit_flow(max_flow_algorithm, inv_tail, head, back_arc, source_list[i], target_list[i]), 
+						source_list[i]
+					);
+			}
+
+			int best_cut = 0;
+			for(int i=1; i<4; ++i)
+				if(cut[i].cut_size < cut[best_cut].cut_size)
+					best_cut = i;
+			return std::move(cut[best_cut]);
+		}
+
 		max_flow::UnitDinicAlgo<InvTail, Head, BackArc, ArrayIDIDFunc, ArrayIDIDFunc> instance [] = { 
 			{inv_tail, head, back_arc, source_list[0], target_list[0]},
 			{inv_tail, head, back_arc, source_list[1], target_list[1]},
@@ -134,16 +162,23 @@ namespace inertial_flow{
 	Cut compute_inertial_flow_cut(
 		const Tail&tail, const Head&head, 
 		const GetGeoPos&geo_pos, 
-		double min_balance
+		double min_balance,
+		max_flow::UnitFlowAlgorithm max_flow_algorithm = max_flow::UnitFlowAlgorithm::dinic,
+		int thread_count = 1
 	){
 		if(std::is_sorted(tail.begin(), tail.end()))
-			return compute_inertial_flow_cut(invert_sorted_id_id_func(tail), head, compute_back_arc_permutation(tail, head), geo_pos, min_balance);
+			return compute_inertial_flow_cut(invert_sorted_id_id_func(tail), head, compute_back_arc_permutation(tail, head), geo_pos, min_balance, max_flow_algorithm, thread_count);
 		else
-			return compute_inertial_flow_cut(invert_id_id_func(tail), head, compute_back_arc_permutation(tail, head), geo_pos, min_balance);
+			return compute_inertial_flow_cut(invert_id_id_func(tail), head, compute_back_arc_permutation(tail, head), geo_pos, min_balance, max_flow_algorithm, thread_count);
 	}
 
-	template<class Tail, class Head, class GetGeoPos>
-	std::vector<int> compute_inertial_flow_separator(const Tail&tail, const Head&head, const GetGeoPos&geo_pos, double min_balance){
+	template<class Tail, class Head, class InvTail, class BackArc, class GetGeoPos>
+	std::vector<int> compute_inertial_flow_separator(
+		const Tail&tail, const Head&head, const InvTail&inv_tail, const BackArc&back_arc,
+		const GetGeoPos&geo_pos, double min_balance,
+		max_flow::UnitFlowAlgorithm max_flow_algorithm,
+		int thread_count
+	){
 		const int arc_count = head.preimage_count();	
 		const int node_count = head.image_count();
 
@@ -151,7 +186,7 @@ namespace inertial_flow{
 		if(node_count == 1){
 			sep = {0};
 		} else {
-			Cut c = compute_inertial_flow_cut(tail, head, geo_pos, min_balance);
+			Cut c = compute_inertial_flow_cut(inv_tail, head, back_arc, geo_pos, min_balance, max_flow_algorithm, thread_count);
 			
 			for(int i=0; i<arc_count; ++i)
 				if(c.is_on_smaller_side(tail(i)) && !c.is_on_smaller_side(head(i)))
@@ -160,10 +195,22 @@ namespace inertial_flow{
 		return sep; // NVRO
 	}
 
+	template<class Tail, class Head, class GetGeoPos>
+	std::vector<int> compute_inertial_flow_separator(
+		const Tail&tail, const Head&head, const GetGeoPos&geo_pos, double min_balance,
+		max_flow::UnitFlowAlgorithm max_flow_algorithm = max_flow::UnitFlowAlgorithm::dinic,
+		int thread_count = 1
+	){
+		if(std::is_sorted(tail.begin(), tail.end()))
+			return compute_inertial_flow_separator(tail, head, invert_sorted_id_id_func(tail), compute_back_arc_permutation(tail, head), geo_pos, min_balance, max_flow_algorithm, thread_count);
+		else
+			return compute_inertial_flow_separator(tail, head, invert_id_id_func(tail), compute_back_arc_permutation(tail, head), geo_pos, min_balance, max_flow_algorithm, thread_count);
+	}
+
 	template<class GetGeoPos>
 	struct InertialFlowSeparator{
-		InertialFlowSeparator(const GetGeoPos&geo_pos, double min_balance):
-			geo_pos(&geo_pos), min_balance(min_balance){}
+		InertialFlowSeparator(const GetGeoPos&geo_pos, double min_balance, max_flow::UnitFlowAlgorithm max_flow_algorithm, int thread_count):
+			geo_pos(&geo_pos), min_balance(min_balance), max_flow_algorithm(max_flow_algorithm), thread_count(thread_count){}
 
 		template<class Tail, class Head, class InputNodeID, class ArcWeight>
 		std::vector<int>operator()(const Tail&tail, const Head&head, const InputNodeID& input_node_id, const ArcWeight&arc_weight)const{
@@ -171,18 +218,35 @@ namespace inertial_flow{
 			return compute_inertial_flow_separator(
 				tail, head, 
 				id_func(node_count, [&](int x){return (*geo_pos)(input_node_id(x));}),
-				min_balance
+				min_balance, max_flow_algorithm, thread_count
+			);
+		}
+
+		//! Uses the given out_arc and back_arc instead of computing them, see separator_call.h.
+		template<class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+		std::vector<int>operator()(const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc, const InputNodeID& input_node_id, const ArcWeight&)const{
+			const int node_count = head.image_count();
+			return compute_inertial_flow_separator(
+				tail, head, out_arc, back_arc,
+				id_func(node_count, [&](int x){return (*geo_pos)(input_node_id(x));}),
+				min_balance, max_flow_algorithm, thread_count
 			);
 		}
 
 		const GetGeoPos*geo_pos;
 		double min_balance;
+		max_flow::UnitFlowAlgorithm max_flow_algorithm;
+		int thread_count;
 	};
 
 	template<class GetGeoPos>
 	InertialFlowSeparator<GetGeoPos>
-		ComputeSeparator(const GetGeoPos&geo_pos, double min_balance){
-		return {geo_pos, min_balance};
+		ComputeSeparator(
+			const GetGeoPos&geo_pos, double min_balance, 
+			max_flow::UnitFlowAlgorithm max_flow_algorithm = max_flow::UnitFlowAlgorithm::dinic, 
+			int thread_count = 1
+		){
+		return {geo_pos, min_balance, max_flow_algorithm, thread_count};
 	}
 }
 
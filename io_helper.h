@@ -6,7 +6,14 @@
 #include <stdexcept>
 #include <string>
 #include <utility>
+#include <memory>
+#include <streambuf>
+#include <sstream>
+#include <vector>
 #include "file_utility.h"
+#include "mapped_file.h"
+#include "file_cache.h"
+#include "compressed_file.h"
 
 template<class SaveFunc, class ...Args>
 void save_binary_file(const std::string&file_name, const SaveFunc&save, Args&&...args){
@@ -48,13 +55,72 @@ auto load_uncached_text_file(const std::string&file_name, const LoadFunc&load)->
 	if(file_name == "-"){
 		return load(std::cin);
 	} else {
-		std::ifstream in(file_name);
-		if(!in)
-			throw std::runtime_error("Could not load "+file_name+" for text reading");
+		DecompressingStreamBuffer buffer(file_name);
+		std::istream in(&buffer);
 		return load(in);
 	}
 }
 
+// Calls load with the character range [begin, end) or with its decompressed content if it is compressed
+template<class LoadFunc>
+auto load_possibly_compressed_text_buffer(const std::string&name, const char*begin, const char*end, const LoadFunc&load)->decltype(load((const char*)nullptr, (const char*)nullptr)){
+	if(detect_compression_format(begin, end) == CompressionFormat::none){
+		return load(begin, end);
+	} else {
+		std::vector<char>text = decompress(name, begin, end);
+		return load(text.data(), text.data() + text.size());
+	}
+}
+
+template<class LoadFunc>
+auto load_uncached_text_buffer(const std::string&file_name, const LoadFunc&load)->decltype(load((const char*)nullptr, (const char*)nullptr)){
+	if(file_name == "-"){
+		std::ostringstream buffer;
+		buffer << std::cin.rdbuf();
+		std::string text = buffer.str();
+		return load_possibly_compressed_text_buffer(file_name, text.data(), text.data() + text.size(), load);
+	} else {
+		auto file = map_file(file_name);
+		return load_possibly_compressed_text_buffer(file_name, file->data(), file->data() + file->size(), load);
+	}
+}
+
+// Makes a character range readable as std::istream
+class MemoryStreamBuffer : public std::streambuf{
+public:
+	MemoryStreamBuffer(const char*begin, const char*end){
+		setg(const_cast<char*>(begin), const_cast<char*>(begin), const_cast<char*>(end));
+	}
+};
+
+// The text file is mapped and hashed to find the cache entry, see file_cache.h. If there is no valid entry,
+// then uncached_load is called with the file content as character range and cache_save writes the new entry.
+// Otherwise cached_load is called with the mapped cache file and the position of the payload. Compressed files
+// are hashed as they are, i.e., they are only decompressed if there is no valid entry.
+template<class UncachedLoadFunc, class CachedLoadFunc, class CacheSaveFunc>
+auto load_cached_file(
+	const std::string&file_name,
+	const std::string&format_name,
+	const UncachedLoadFunc&uncached_load, 
+	const CachedLoadFunc&cached_load, 
+	const CacheSaveFunc&cache_save
+)->decltype(uncached_load((const char*)nullptr, (const char*)nullptr)){
+	auto content = map_file(file_name);
+
+	auto entry = get_file_cache_entry(format_name, file_name, *content);
+
+	long long payload_offset, payload_size;
+	if(auto cache = open_file_cache_entry(entry, payload_offset, payload_size))
+		return cached_load(cache, payload_offset, payload_size);
+
+	auto data = load_possibly_compressed_text_buffer(file_name, content->data(), content->data() + content->size(), uncached_load);
+	content.reset();
+
+	save_file_cache_entry(entry, [&](std::ostream&out){cache_save(out, data);});
+		
+	return std::move(data);
+}
+
 template<class UncachedLoadFunc, class CachedLoadFunc, class CacheSaveFunc>
 auto load_cached_text_file(
 	const std::string&file_name,
@@ -66,35 +132,37 @@ auto load_cached_text_file(
 	if(file_name == "-"){
 		return uncached_load(std::cin);
 	} else {
-		std::string cache_file_name = concat_file_path_and_file_name(
-			get_temp_directory_path(), 
-			"flow_cutter_cached_"+format_name+ "_" + uniquely_hash_file_name(make_absolute_file_name(file_name))
+		return load_cached_file(
+			file_name, format_name, 
+			[&](const char*begin, const char*end){
+				MemoryStreamBuffer buffer(begin, end);
+				std::istream in(&buffer);
+				return uncached_load(in);
+			},
+			[&](const std::shared_ptr<MappedFile>&cache, long long payload_offset, long long payload_size){
+				MemoryStreamBuffer buffer(cache->data() + payload_offset, cache->data() + payload_offset + payload_size);
+				std::istream in(&buffer);
+				return cached_load(in, payload_size);
+			},
+			cache_save
 		);
-	
-		if(file_exists(cache_file_name))
-			if(file_last_modified(file_name) < file_last_modified(cache_file_name)){
-				std::ifstream in(cache_file_name, std::ios::binary);
-				if(!in)
-					throw std::runtime_error("Could not open binary cache file "+cache_file_name+" of "+file_name+" for reading");
-				in.seekg (0, in.end);
-				long long size = in.tellg();
-				in.seekg (0, in.beg);
-				return cached_load(in, size);
-			}
-
-		std::ifstream in(file_name);
-		if(!in)
-			throw std::runtime_error("Could not open text file "+file_name+" for reading");
-					
-		auto data = uncached_load(in);
-		in.close();
-
-		std::ofstream out(cache_file_name, std::ios::binary);
-		
-		if(out)
-			cache_save(out, data);
-			
-		return std::move(data);
+	}
+}
+
+// Like load_cached_text_file but uncached_load is called with the whole file content as a character range
+// and cached_load is called with the mapped cache file, the offset and the size of the payload.
+template<class UncachedLoadFunc, class CachedLoadFunc, class CacheSaveFunc>
+auto load_cached_text_buffer(
+	const std::string&file_name,
+	const std::string&format_name,
+	const UncachedLoadFunc&uncached_load, 
+	const CachedLoadFunc&cached_load, 
+	const CacheSaveFunc&cache_save
+)->decltype(uncached_load((const char*)nullptr, (const char*)nullptr)){
+	if(file_name == "-"){
+		return load_uncached_text_buffer(file_name, uncached_load);
+	} else {
+		return load_cached_file(file_name, format_name, uncached_load, cached_load, cache_save);
 	}
 }
 
@@ -1,12 +1,19 @@
 #include "list_graph.h"
 #include "io_helper.h"
+#include "mapped_file.h"
 #include "multi_arc.h"
 #include "id_multi_func.h"
+#include "cancellation.h"
 
 #include <stdexcept>
 #include <fstream>
 #include <iostream>
 #include <sstream>
+#include <vector>
+#include <limits>
+#include <exception>
+#include <cstring>
+#include <omp.h>
 
 struct BinaryHeader{
 	int node_count, arc_count;
@@ -190,49 +197,286 @@ ListGraph load_binary_graph(const std::string&file_name){
 }
 
 static
-ListGraph load_dimacs_graph_impl(std::istream&in){
+ListGraph map_binary_graph_impl(const std::shared_ptr<MappedFile>&file, long long offset, long long size){
+	if(size < static_cast<long long>(sizeof(BinaryHeader)))
+		throw std::runtime_error("Could not read binary header");
+	BinaryHeader h;
+	std::copy(file->data()+offset, file->data()+offset+sizeof(h), (char*)&h);
+	check_header(h);
+	if(size != static_cast<long long>(sizeof(int)*(3*h.arc_count+h.node_count+2)))
+		throw std::runtime_error("binary header is corrupt; file size is wrong");
+
+	// No in range check for tail and head ids for efficiency reasons
+
+	offset += sizeof(h);
+	auto next_array = [&](int n){
+		int*data = reinterpret_cast<int*>(file->data() + offset);
+		offset += sizeof(int)*n;
+		return data;
+	};
+
+	ListGraph g;
+	g.tail = ArrayIDIDFunc(h.arc_count, h.node_count, next_array(h.arc_count), file);
+	g.head = ArrayIDIDFunc(h.arc_count, h.node_count, next_array(h.arc_count), file);
+	g.node_weight = ArrayIDFunc<int>(h.node_count, next_array(h.node_count), file);
+	g.arc_weight = ArrayIDFunc<int>(h.arc_count, next_array(h.arc_count), file);
+	return g; // NVRO
+}
+
+ListGraph map_binary_graph(const std::string&file_name){
+	auto file = map_file(file_name);
+	return map_binary_graph_impl(file, 0, file->size());
+}
+
+// The text parsers split the text at line boundaries into chunks that are parsed in parallel.
+// A first parallel pass counts the lines of every chunk. Each chunk thereby knows the number
+// of its first line and how many data lines, i.e., lines that are not comments, precede it.
+
+struct TextChunk{
+	const char*begin, *end;
+	int first_line_num;
+	int first_data_line;
+	int data_line_count;
+};
+
+static
+const char*find_line_end(const char*begin, const char*end){
+	const char*line_end = static_cast<const char*>(memchr(begin, '\n', end-begin));
+	if(line_end == nullptr)
+		return end;
+	else
+		return line_end;
+}
+
+// Calls f for every line without the line break. This splits the text in the same way as std::getline.
+template<class F>
+static
+void for_each_line(const char*begin, const char*end, const F&f){
+	while(begin != end){
+		const char*line_end = find_line_end(begin, end);
+		f(begin, line_end);
+		if(line_end == end)
+			begin = end;
+		else
+			begin = line_end+1;
+	}
+}
+
+// Moves begin behind the first data line and stores it in header. Returns false if there is no data line.
+template<class IsDataLine>
+static
+bool read_header_line(const char*&begin, const char*end, int&line_num, std::string&header, const IsDataLine&is_data_line){
+	while(begin != end){
+		const char*line_end = find_line_end(begin, end);
+		++line_num;
+		bool is_header = is_data_line(begin, line_end);
+		if(is_header)
+			header.assign(begin, line_end);
+		if(line_end == end)
+			begin = end;
+		else
+			begin = line_end+1;
+		if(is_header)
+			return true;
+	}
+	return false;
+}
+
+// line_num is the number of lines that precede begin
+template<class IsDataLine>
+static
+std::vector<TextChunk>split_text_into_chunks(const char*begin, const char*end, int line_num, const IsDataLine&is_data_line){
+	const long long min_chunk_size = 1<<20;
+	const long long size = end - begin;
+	const long long max_chunk_count = std::max(1ll, std::min(size/min_chunk_size, 8ll*omp_get_max_threads()));
+
+	std::vector<TextChunk>chunks;
+	const char*chunk_begin = begin;
+	for(long long i=1; chunk_begin != end; ++i){
+		const char*chunk_end = end;
+		if(i < max_chunk_count){
+			chunk_end = std::max(chunk_begin, begin + size*i/max_chunk_count);
+			chunk_end = find_line_end(chunk_end, end);
+			if(chunk_end != end)
+				++chunk_end;
+		}
+		chunks.push_back({chunk_begin, chunk_end, 0, 0, 0});
+		chunk_begin = chunk_end;
+	}
+
+	const int chunk_count = chunks.size();
+	std::vector<int>chunk_line_count(chunk_count);
+
+	#pragma omp parallel for schedule(dynamic)
+	for(int i=0; i<chunk_count; ++i){
+		int line_count = 0, data_line_count = 0;
+		for_each_line(
+			chunks[i].begin, chunks[i].end, 
+			[&](const char*line_begin, const char*line_end){
+				++line_count;
+				if(is_data_line(line_begin, line_end))
+					++data_line_count;
+			}
+		);
+		chunk_line_count[i] = line_count;
+		chunks[i].data_line_count = data_line_count;
+	}
+
+	int data_line = 0;
+	for(int i=0; i<chunk_count; ++i){
+		chunks[i].first_line_num = line_num+1;
+		chunks[i].first_data_line = data_line;
+		line_num += chunk_line_count[i];
+		data_line += chunks[i].data_line_count;
+	}
+
+	return chunks; // NVRO
+}
+
+static
+int count_data_lines(const std::vector<TextChunk>&chunks){
+	if(chunks.empty())
+		return 0;
+	else
+		return chunks.back().first_data_line + chunks.back().data_line_count;
+}
+
+// Calls parse_line(chunk_id, line_begin, line_end, line_num, data_line) for every data line. The chunks are
+// processed in parallel. If parse_line throws for several lines, then the exception of the first line is rethrown.
+template<class IsDataLine, class ParseLine>
+static
+void parse_chunks_in_parallel(const std::vector<TextChunk>&chunks, const IsDataLine&is_data_line, const ParseLine&parse_line){
+	const int chunk_count = chunks.size();
+	std::vector<std::exception_ptr>chunk_error(chunk_count);
+
+	auto cancellation = current_cancellation();
+	#pragma omp parallel
+	{
+		CurrentCancellationScope cancellation_scope(cancellation);
+		#pragma omp for schedule(dynamic)
+		for(int i=0; i<chunk_count; ++i){
+			try{
+				int line_num = chunks[i].first_line_num;
+				int data_line = chunks[i].first_data_line;
+				for_each_line(
+					chunks[i].begin, chunks[i].end, 
+					[&](const char*line_begin, const char*line_end){
+						if(is_data_line(line_begin, line_end)){
+							parse_line(i, line_begin, line_end, line_num, data_line);
+							++data_line;
+						}
+						++line_num;
+					}
+				);
+			}catch(...){
+				chunk_error[i] = std::current_exception();
+			}
+		}
+	}
+
+	for(auto&e:chunk_error)
+		if(e)
+			std::rethrow_exception(e);
+}
+
+static
+bool is_space(char c){
+	return c == ' ' || c == '\t' || c == '\n' || c == '\v' || c == '\f' || c == '\r';
+}
+
+// Reads a whitespace separated word in the same way as operator>> of std::istream
+static
+bool parse_word(const char*&pos, const char*end, std::string&word){
+	while(pos != end && is_space(*pos))
+		++pos;
+	if(pos == end)
+		return false;
+	const char*word_begin = pos;
+	while(pos != end && !is_space(*pos))
+		++pos;
+	word.assign(word_begin, pos);
+	return true;
+}
+
+// Reads an integer in the same way as operator>> of std::istream
+static
+bool parse_int(const char*&pos, const char*end, int&x){
+	while(pos != end && is_space(*pos))
+		++pos;
+	const char*p = pos;
+	bool is_negative = false;
+	if(p != end && (*p == '-' || *p == '+')){
+		is_negative = (*p == '-');
+		++p;
+	}
+	if(p == end || *p < '0' || *p > '9')
+		return false;
+	long long value = 0;
+	bool overflow = false;
+	while(p != end && '0' <= *p && *p <= '9'){
+		if(value <= std::numeric_limits<int>::max())
+			value = 10*value + (*p - '0');
+		else
+			overflow = true;
+		++p;
+	}
+	if(is_negative)
+		value = -value;
+	if(overflow || value < std::numeric_limits<int>::min() || value > std::numeric_limits<int>::max())
+		return false;
+	x = value;
+	pos = p;
+	return true;
+}
+
+static
+bool is_dimacs_data_line(const char*line_begin, const char*line_end){
+	return line_begin != line_end && *line_begin != 'c';
+}
+
+static
+ListGraph load_dimacs_graph_impl(const char*begin, const char*end){
 	ListGraph graph;
-	std::string line;
 	int line_num = 0;
-	int next_arc = 0;
 
-	bool was_header_read = false;
-	while(std::getline(in, line)){
-		++line_num;
-		if(line.empty() || line[0] == 'c')
-			continue;
-
-		std::istringstream lin(line);
-		if(!was_header_read){
-			was_header_read = true;
-			std::string p, sp;
-			int node_count;
-			int arc_count;
-			if(!(lin >> p >> sp >> node_count >> arc_count))
-				throw std::runtime_error("Can not parse header in dimacs file.");
-			if(p != "p" || sp != "sp" || node_count < 0 || arc_count < 0)
-				throw std::runtime_error("Invalid header in dimacs file.");
-			graph = ListGraph(node_count, arc_count);
-		}else{
+	std::string header;
+	if(read_header_line(begin, end, line_num, header, is_dimacs_data_line)){
+		std::istringstream lin(header);
+		std::string p, sp;
+		int node_count;
+		int arc_count;
+		if(!(lin >> p >> sp >> node_count >> arc_count))
+			throw std::runtime_error("Can not parse header in dimacs file.");
+		if(p != "p" || sp != "sp" || node_count < 0 || arc_count < 0)
+			throw std::runtime_error("Invalid header in dimacs file.");
+		graph = ListGraph(node_count, arc_count);
+	}
+
+	auto chunks = split_text_into_chunks(begin, end, line_num, is_dimacs_data_line);
+
+	parse_chunks_in_parallel(
+		chunks, is_dimacs_data_line,
+		[&](int, const char*line_begin, const char*line_end, int line_num, int next_arc){
+			const char*pos = line_begin;
 			std::string a;
 			int h, t, w;
-			if(!(lin >> a >> t >> h >> w))
-				throw std::runtime_error("Can not parse line num "+std::to_string(line_num)+" \""+line+"\" in dimacs file.");
+			if(!(parse_word(pos, line_end, a) && parse_int(pos, line_end, t) && parse_int(pos, line_end, h) && parse_int(pos, line_end, w)))
+				throw std::runtime_error("Can not parse line num "+std::to_string(line_num)+" \""+std::string(line_begin, line_end)+"\" in dimacs file.");
 			--h;
 			--t;
 			if(a != "a" || h < 0 || h >= graph.node_count() || t < 0 || t >= graph.node_count() || w < 0)
-				throw std::runtime_error("Invalid arc in line num "+std::to_string(line_num)+" \""+line+"\" in dimacs file.");
+				throw std::runtime_error("Invalid arc in line num "+std::to_string(line_num)+" \""+std::string(line_begin, line_end)+"\" in dimacs file.");
 			if(next_arc < graph.arc_count()){
 				graph.head[next_arc] = h;
 				graph.tail[next_arc] = t;
 				graph.arc_weight[next_arc] = w;
 			}
-			++next_arc;
 		}
-	}
+	);
 
-	if(next_arc != graph.arc_count())
-		throw std::runtime_error("The arc count in the header ("+std::to_string(graph.arc_count())+") does not correspond with the actual number of arcs ("+std::to_string(next_arc)+").");
+	int arc_count = count_data_lines(chunks);
+	if(arc_count != graph.arc_count())
+		throw std::runtime_error("The arc count in the header ("+std::to_string(graph.arc_count())+") does not correspond with the actual number of arcs ("+std::to_string(arc_count)+").");
 
 	graph.node_weight.fill(0);
 
@@ -241,7 +485,7 @@ ListGraph load_dimacs_graph_impl(std::istream&in){
 
 
 ListGraph load_dimacs_graph(const std::string&file_name){
-	return load_cached_text_file(file_name, "dimacs", load_dimacs_graph_impl, load_binary_graph_impl, 
+	return load_cached_text_buffer(file_name, "dimacs", load_dimacs_graph_impl, map_binary_graph_impl, 
 		[](std::ostream&out, const ListGraph&g){
 			save_binary_graph_impl(out, g.tail, g.head, g.node_weight, g.arc_weight);
 		}
@@ -249,53 +493,52 @@ ListGraph load_dimacs_graph(const std::string&file_name){
 }
 
 ListGraph uncached_load_dimacs_graph(const std::string&file_name){
-	return load_uncached_text_file(file_name, load_dimacs_graph_impl);
+	return load_uncached_text_buffer(file_name, load_dimacs_graph_impl);
 }
 
 static
-ListGraph load_color_dimacs_graph_impl(std::istream&in){
+ListGraph load_color_dimacs_graph_impl(const char*begin, const char*end){
 	ListGraph graph;
-	std::string line;
 	int line_num = 0;
-	int next_arc = 0;
 
-	bool was_header_read = false;
-	while(std::getline(in, line)){
-		++line_num;
-		if(line.empty() || line[0] == 'c')
-			continue;
-
-		std::istringstream lin(line);
-		if(!was_header_read){
-			was_header_read = true;
-			std::string p, sp;
-			int node_count;
-			int arc_count;
-			if(!(lin >> p >> sp >> node_count >> arc_count))
-				throw std::runtime_error("Can not parse header in color-dimacs file.");
-			if(p != "p" || sp != "edge" || node_count < 0 || arc_count < 0)
-				throw std::runtime_error("Invalid header in color-dimacs file.");
-			graph = ListGraph(node_count, arc_count);
-		}else{
+	std::string header;
+	if(read_header_line(begin, end, line_num, header, is_dimacs_data_line)){
+		std::istringstream lin(header);
+		std::string p, sp;
+		int node_count;
+		int arc_count;
+		if(!(lin >> p >> sp >> node_count >> arc_count))
+			throw std::runtime_error("Can not parse header in color-dimacs file.");
+		if(p != "p" || sp != "edge" || node_count < 0 || arc_count < 0)
+			throw std::runtime_error("Invalid header in color-dimacs file.");
+		graph = ListGraph(node_count, arc_count);
+	}
+
+	auto chunks = split_text_into_chunks(begin, end, line_num, is_dimacs_data_line);
+
+	parse_chunks_in_parallel(
+		chunks, is_dimacs_data_line,
+		[&](int, const char*line_begin, const char*line_end, int line_num, int next_arc){
+			const char*pos = line_begin;
 			std::string a;
 			int h, t;
-			if(!(lin >> a >> t >> h))
-				throw std::runtime_error("Can not parse line num "+std::to_string(line_num)+" \""+line+"\" in dimacs file.");
+			if(!(parse_word(pos, line_end, a) && parse_int(pos, line_end, t) && parse_int(pos, line_end, h)))
+				throw std::runtime_error("Can not parse line num "+std::to_string(line_num)+" \""+std::string(line_begin, line_end)+"\" in dimacs file.");
 			--h;
 			--t;
 			if(a != "e" || h < 0 || h >= graph.node_count() || t < 0 || t >= graph.node_count())
-				throw std::runtime_error("Invalid arc in line num "+std::to_string(line_num)+" \""+line+"\" in dimacs file.");
+				throw std::runtime_error("Invalid arc in line num "+std::to_string(line_num)+" \""+std::string(line_begin, line_end)+"\" in dimacs file.");
 			if(next_arc < graph.arc_count()){
 				graph.head[next_arc] = h;
 				graph.tail[next_arc] = t;
 				graph.arc_weight[next_arc] = 0;
 			}
-			++next_arc;
 		}
-	}
+	);
 
-	if(next_arc != graph.arc_count())
-		throw std::runtime_error("The arc count in the header ("+std::to_string(graph.arc_count())+") does not correspond with the actual number of arcs ("+std::to_string(next_arc)+").");
+	int arc_count = count_data_lines(chunks);
+	if(arc_count != graph.arc_count())
+		throw std::runtime_error("The arc count in the header ("+std::to_string(graph.arc_count())+") does not correspond with the actual number of arcs ("+std::to_string(arc_count)+").");
 
 	graph.node_weight.fill(0);
 
@@ -303,7 +546,7 @@ ListGraph load_color_dimacs_graph_impl(std::istream&in){
 }
 
 ListGraph load_color_dimacs_graph(const std::string&file_name){
-	return load_cached_text_file(file_name, "color_dimacs", load_color_dimacs_graph_impl, load_binary_graph_impl, 
+	return load_cached_text_buffer(file_name, "color_dimacs", load_color_dimacs_graph_impl, map_binary_graph_impl, 
 		[](std::ostream&out, const ListGraph&g){
 			save_binary_graph_impl(out, g.tail, g.head, g.node_weight, g.arc_weight);
 		}
@@ -311,105 +554,169 @@ ListGraph load_color_dimacs_graph(const std::string&file_name){
 }
 
 ListGraph uncached_load_color_dimacs_graph(const std::string&file_name){
-	return load_uncached_text_file(file_name, load_dimacs_graph_impl);
+	return load_uncached_text_buffer(file_name, load_dimacs_graph_impl);
 }
 
 
+static
+bool is_metis_data_line(const char*line_begin, const char*line_end){
+	return line_begin == line_end || *line_begin != '%';
+}
 
 static
-ListGraph load_metis_graph_impl(std::istream&in){
+ListGraph load_metis_graph_impl(const char*begin, const char*end){
 
 	ListGraph g;
 
-	std::string line;
 	int line_num = 0;
-	bool header_read = false;
 
-	int next_node_id = 0;
-	int next_arc_id = 0;
-
-	int node_count, arc_count;
+	int node_count = 0, arc_count = 0;
 
 	bool has_arc_weights = false;
 	bool has_node_weights = false;
 
-	try{
-		while(std::getline(in, line)){
-			++line_num;
-			if(!line.empty() && line.front() == '%')
-				continue;
-			std::istringstream line_in(line);
-			if(!header_read){
-				header_read = true;
-			
-				if(!(line_in >> node_count >> arc_count))
-					throw std::runtime_error("Can not read header" );
-				if(node_count < 0)
-					throw std::runtime_error("node_count must be non-negative; it is "+std::to_string(node_count));
-				if(arc_count < 0)
-					throw std::runtime_error("half_arc_count must be non-negative; it is "+std::to_string(arc_count));
-				arc_count *= 2;
-
-				std::string has_weight_num;
-				if(line_in >> has_weight_num){
-					if(has_weight_num == "001" || has_weight_num == "1"){
-						has_arc_weights = true;
-					}else if(has_weight_num == "000" || has_weight_num == "0"){
-						has_arc_weights = false;
-					}else if(has_weight_num == "010"){
-						has_node_weights = true;
-					}else if(has_weight_num == "011"){
-						has_node_weights = true;
-						has_arc_weights = true;
-					}else
-						throw std::runtime_error("The has_weight parameter in the header must be 0 or 1.");
-
-					std::string ignore;
-					if(line_in >> ignore)
-						throw std::runtime_error("Header must only contain a 2 or 3 integers");
-				}
-
-				
-				g = ListGraph(node_count, arc_count);
-			}else{
-				if(next_node_id == node_count)
-					throw std::runtime_error("More nodes than claimed in the header");
-				int x;
+	std::string header;
+	if(read_header_line(begin, end, line_num, header, is_metis_data_line)){
+		try{
+			std::istringstream line_in(header);
+
+			if(!(line_in >> node_count >> arc_count))
+				throw std::runtime_error("Can not read header" );
+			if(node_count < 0)
+				throw std::runtime_error("node_count must be non-negative; it is "+std::to_string(node_count));
+			if(arc_count < 0)
+				throw std::runtime_error("half_arc_count must be non-negative; it is "+std::to_string(arc_count));
+			arc_count *= 2;
+
+			std::string has_weight_num;
+			if(line_in >> has_weight_num){
+				if(has_weight_num == "001" || has_weight_num == "1"){
+					has_arc_weights = true;
+				}else if(has_weight_num == "000" || has_weight_num == "0"){
+					has_arc_weights = false;
+				}else if(has_weight_num == "010"){
+					has_node_weights = true;
+				}else if(has_weight_num == "011"){
+					has_node_weights = true;
+					has_arc_weights = true;
+				}else
+					throw std::runtime_error("The has_weight parameter in the header must be 0 or 1.");
+
+				std::string ignore;
+				if(line_in >> ignore)
+					throw std::runtime_error("Header must only contain a 2 or 3 integers");
+			}
+		}catch(std::runtime_error&err){
+			throw std::runtime_error(std::string(err.what()) + " in line "+std::to_string(line_num));
+		}
 
-				if(has_node_weights){
-					if(!(line_in >> g.node_weight[next_node_id])){
-						throw std::runtime_error("Cannot read node weight");
-					}
-				}
+		g = ListGraph(node_count, arc_count);
+	}
 
-				while(line_in >> x){
-					int weight = 1;
-					if(has_arc_weights){
-						if(!(line_in >> weight))
-							throw std::runtime_error("Missing weight for arc");
+	auto chunks = split_text_into_chunks(begin, end, line_num, is_metis_data_line);
+
+	// The number of arcs per line varies. Every chunk therefore collects its arcs locally.
+	// They are concatenated once all chunks are parsed.
+
+	struct ChunkArcs{
+		std::vector<int>tail, head, weight;
+	};
+
+	const int chunk_count = chunks.size();
+	std::vector<ChunkArcs>chunk_arcs(chunk_count);
+
+	// The chunk may contain at most arc_limit arcs
+	auto parse_chunk = [&](int chunk_id, int arc_limit){
+		auto&arcs = chunk_arcs[chunk_id];
+		arcs = ChunkArcs();
+
+		int line_num = chunks[chunk_id].first_line_num;
+		int node_id = chunks[chunk_id].first_data_line;
+
+		for_each_line(
+			chunks[chunk_id].begin, chunks[chunk_id].end,
+			[&](const char*line_begin, const char*line_end){
+				if(is_metis_data_line(line_begin, line_end)){
+					try{
+						if(node_id >= node_count)
+							throw std::runtime_error("More nodes than claimed in the header");
+
+						const char*pos = line_begin;
+
+						if(has_node_weights){
+							if(!parse_int(pos, line_end, g.node_weight[node_id])){
+								throw std::runtime_error("Cannot read node weight");
+							}
+						}
+
+						int x;
+						while(parse_int(pos, line_end, x)){
+							int weight = 1;
+							if(has_arc_weights){
+								if(!parse_int(pos, line_end, weight))
+									throw std::runtime_error("Missing weight for arc");
+							}
+
+							if((int)arcs.head.size() == arc_limit)
+								throw std::runtime_error("More arcs than claimed in the header");
+
+							--x;
+							arcs.head.push_back(x);
+							arcs.tail.push_back(node_id);
+							arcs.weight.push_back(weight);
+						}
+					}catch(std::runtime_error&err){
+						throw std::runtime_error(std::string(err.what()) + " in line "+std::to_string(line_num));
 					}
-
-					if(next_arc_id == arc_count)
-						throw std::runtime_error("More arcs than claimed in the header");
-					
-					--x;
-					g.head[next_arc_id] = x;
-					g.tail[next_arc_id] = next_node_id;
-					g.arc_weight[next_arc_id] = weight;
-					++next_arc_id;
+					++node_id;
 				}
-				++next_node_id;
+				++line_num;
+			}
+		);
+	};
+
+	std::vector<char>is_chunk_valid(chunk_count);
+
+	auto cancellation = current_cancellation();
+	#pragma omp parallel
+	{
+		CurrentCancellationScope cancellation_scope(cancellation);
+		#pragma omp for schedule(dynamic)
+		for(int i=0; i<chunk_count; ++i){
+			try{
+				parse_chunk(i, arc_count);
+				is_chunk_valid[i] = true;
+			}catch(...){
+				is_chunk_valid[i] = false;
 			}
 		}
+	}
 
-	}catch(std::runtime_error err){
-		throw std::runtime_error(std::string(err.what()) + " in line "+std::to_string(line_num));
+	// Whether there are more arcs than claimed in the header depends on the preceding chunks.
+	// We therefore parse the first chunk that is invalid or exceeds the arc count again with
+	// the correct limit. This throws the same error as a sequential parser.
+
+	std::vector<int>chunk_arc_begin(chunk_count+1);
+	chunk_arc_begin[0] = 0;
+	for(int i=0; i<chunk_count; ++i){
+		if(!is_chunk_valid[i] || chunk_arc_begin[i] + (int)chunk_arcs[i].head.size() > arc_count)
+			parse_chunk(i, arc_count - chunk_arc_begin[i]);
+		chunk_arc_begin[i+1] = chunk_arc_begin[i] + chunk_arcs[i].head.size();
 	}
-	if(next_node_id != node_count)
+
+	if(count_data_lines(chunks) != node_count)
 		throw std::runtime_error("Less nodes than claimed in the header");
-	if(next_arc_id != arc_count)
+	if(chunk_arc_begin.back() != arc_count)
 		throw std::runtime_error("Less arcs than claimed in the header");
 
+	#pragma omp parallel for schedule(dynamic)
+	for(int i=0; i<chunk_count; ++i){
+		std::copy(chunk_arcs[i].tail.begin(), chunk_arcs[i].tail.end(), g.tail.begin() + chunk_arc_begin[i]);
+		std::copy(chunk_arcs[i].head.begin(), chunk_arcs[i].head.end(), g.head.begin() + chunk_arc_begin[i]);
+		std::copy(chunk_arcs[i].weight.begin(), chunk_arcs[i].weight.end(), g.arc_weight.begin() + chunk_arc_begin[i]);
+		chunk_arcs[i] = ChunkArcs();
+	}
+
 	if(!has_node_weights)
 		g.node_weight.fill(1);
 
@@ -420,7 +727,7 @@ ListGraph load_metis_graph_impl(std::istream&in){
 }
 
 ListGraph load_metis_graph(const std::string&file_name){
-	return load_cached_text_file(file_name, "metis", load_metis_graph_impl, load_binary_graph_impl, 
+	return load_cached_text_buffer(file_name, "metis", load_metis_graph_impl, map_binary_graph_impl, 
 		[](std::ostream&out, const ListGraph&g){
 			save_binary_graph_impl(out, g.tail, g.head, g.node_weight, g.arc_weight);
 		}
@@ -428,42 +735,42 @@ ListGraph load_metis_graph(const std::string&file_name){
 }
 
 ListGraph uncached_load_metis_graph(const std::string&file_name){
-	return load_uncached_text_file(file_name, load_metis_graph_impl);
+	return load_uncached_text_buffer(file_name, load_metis_graph_impl);
 }
 
 
 static
-ListGraph load_pace_graph_impl(std::istream&in){
+ListGraph load_pace_graph_impl(const char*begin, const char*end){
 	ListGraph graph;
-	std::string line;
 	int line_num = 0;
-	int next_arc = 0;
 
-	bool was_header_read = false;
-	while(std::getline(in, line)){
-		++line_num;
-		if(line.empty() || line[0] == 'c')
-			continue;
-
-		std::istringstream lin(line);
-		if(!was_header_read){
-			was_header_read = true;
-			std::string p, sp;
-			int node_count;
-			int arc_count;
-			if(!(lin >> p >> sp >> node_count >> arc_count))
-				throw std::runtime_error("Can not parse header in pace file.");
-			if(p != "p" || sp != "tw" || node_count < 0 || arc_count < 0)
-				throw std::runtime_error("Invalid header in pace file.");
-			graph = ListGraph(node_count, 2*arc_count);
-		}else{
+	std::string header;
+	if(read_header_line(begin, end, line_num, header, is_dimacs_data_line)){
+		std::istringstream lin(header);
+		std::string p, sp;
+		int node_count;
+		int arc_count;
+		if(!(lin >> p >> sp >> node_count >> arc_count))
+			throw std::runtime_error("Can not parse header in pace file.");
+		if(p != "p" || sp != "tw" || node_count < 0 || arc_count < 0)
+			throw std::runtime_error("Invalid header in pace file.");
+		graph = ListGraph(node_count, 2*arc_count);
+	}
+
+	auto chunks = split_text_into_chunks(begin, end, line_num, is_dimacs_data_line);
+
+	parse_chunks_in_parallel(
+		chunks, is_dimacs_data_line,
+		[&](int, const char*line_begin, const char*line_end, int line_num, int edge_id){
+			const char*pos = line_begin;
 			int h, t;
-			if(!(lin >> t >> h))
-				throw std::runtime_error("Can not parse line num "+std::to_string(line_num)+" \""+line+"\" in pace file.");
+			if(!(parse_int(pos, line_end, t) && parse_int(pos, line_end, h)))
+				throw std::runtime_error("Can not parse line num "+std::to_string(line_num)+" \""+std::string(line_begin, line_end)+"\" in pace file.");
 			--h;
 			--t;
 			if(h < 0 || h >= graph.node_count() || t < 0 || t >= graph.node_count())
-				throw std::runtime_error("Invalid arc in line num "+std::to_string(line_num)+" \""+line+"\" in pace file.");
+				throw std::runtime_error("Invalid arc in line num "+std::to_string(line_num)+" \""+std::string(line_begin, line_end)+"\" in pace file.");
+			int next_arc = 2*edge_id;
 			if(next_arc < graph.arc_count()){
 				graph.head[next_arc] = h;
 				graph.tail[next_arc] = t;
@@ -475,12 +782,12 @@ ListGraph load_pace_graph_impl(std::istream&in){
 				graph.tail[next_arc] = h;
 				graph.arc_weight[next_arc] = 0;
 			}
-			++next_arc;
 		}
-	}
+	);
 
-	if(next_arc != graph.arc_count())
-		throw std::runtime_error("The arc count in the header ("+std::to_string(graph.arc_count())+") does not correspond with the actual number of arcs ("+std::to_string(next_arc)+").");
+	int arc_count = 2*count_data_lines(chunks);
+	if(arc_count != graph.arc_count())
+		throw std::runtime_error("The arc count in the header ("+std::to_string(graph.arc_count())+") does not correspond with the actual number of arcs ("+std::to_string(arc_count)+").");
 
 	graph.node_weight.fill(0);
 
@@ -488,7 +795,7 @@ ListGraph load_pace_graph_impl(std::istream&in){
 }
 
 ListGraph load_pace_graph(const std::string&file_name){
-	return load_cached_text_file(file_name, "color_dimacs", load_pace_graph_impl, load_binary_graph_impl, 
+	return load_cached_text_buffer(file_name, "pace", load_pace_graph_impl, map_binary_graph_impl, 
 		[](std::ostream&out, const ListGraph&g){
 			save_binary_graph_impl(out, g.tail, g.head, g.node_weight, g.arc_weight);
 		}
@@ -497,7 +804,7 @@ ListGraph load_pace_graph(const std::string&file_name){
 
 
 ListGraph uncached_load_pace_graph(const std::string&file_name){
-	return load_uncached_text_file(file_name, load_pace_graph_impl);
+	return load_uncached_text_buffer(file_name, load_pace_graph_impl);
 }
 
 
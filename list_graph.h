@@ -21,6 +21,10 @@ struct ListGraph{
 void save_binary_graph(const std::string&file_name, const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, const ArrayIDFunc<int>&node_weight, const ArrayIDFunc<int>&arc_weight);
 ListGraph load_binary_graph(const std::string&file_name);
 
+// Like load_binary_graph but the arrays point into a private memory mapping of the file.
+// Pages are only copied when they are written. The file must not be modified while the graph is in use.
+ListGraph map_binary_graph(const std::string&file_name);
+
 void save_csv_graph(const std::string&file_name, const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, const ArrayIDFunc<int>&arc_weight);
 
 void save_dimacs_graph(const std::string&file_name, const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, const ArrayIDFunc<int>&arc_weight);
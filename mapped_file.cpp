@@ -0,0 +1,77 @@
+#include "mapped_file.h"
+
+#ifndef _WIN32
+#include <string.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/stat.h>
+#include <sys/mman.h>
+#else
+#include <fstream>
+#endif
+
+#ifndef _WIN32
+
+MappedFile::MappedFile(const std::string&file_name){
+	int fd = open(file_name.c_str(), O_RDONLY);
+	if(fd == -1)
+		throw std::runtime_error("Could not open "+file_name+" for mapping : "+strerror(errno));
+
+	struct stat st;
+	if(fstat(fd, &st)){
+		int error_code = errno;
+		close(fd);
+		throw std::runtime_error("Could not determine the size of "+file_name+" : "+strerror(error_code));
+	}
+	size_ = st.st_size;
+
+	if(size_ == 0){
+		data_ = nullptr;
+	}else{
+		// A private writable mapping gives us copy-on-write pages
+		void*p = mmap(nullptr, size_, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+		if(p == MAP_FAILED){
+			int error_code = errno;
+			close(fd);
+			throw std::runtime_error("Could not map "+file_name+" : "+strerror(error_code));
+		}
+		data_ = static_cast<char*>(p);
+	}
+
+	// The mapping stays valid after the descriptor is closed
+	close(fd);
+}
+
+MappedFile::~MappedFile(){
+	if(data_ != nullptr)
+		munmap(data_, size_);
+}
+
+#else
+
+// No mapping support, we read the whole file.
+
+MappedFile::MappedFile(const std::string&file_name){
+	std::ifstream in(file_name, std::ios::binary);
+	if(!in)
+		throw std::runtime_error("Could not open "+file_name+" for mapping");
+	in.seekg(0, in.end);
+	size_ = in.tellg();
+	in.seekg(0, in.beg);
+	if(size_ == 0){
+		data_ = nullptr;
+	}else{
+		data_ = new char[size_];
+		if(!in.read(data_, size_)){
+			delete[]data_;
+			throw std::runtime_error("Could not read "+file_name);
+		}
+	}
+}
+
+MappedFile::~MappedFile(){
+	delete[]data_;
+}
+
+#endif
@@ -0,0 +1,59 @@
+#ifndef MAPPED_FILE_H
+#define MAPPED_FILE_H
+
+#include "array_id_func.h"
+
+#include <string>
+#include <memory>
+#include <stdexcept>
+
+//!
+//! A file that is mapped privately into memory. Pages are shared with the page cache and other
+//! processes mapping the same file until they are written. The first write to a page creates a
+//! process local copy. The file itself is never modified.
+//!
+//! The file must not be truncated or overwritten while it is mapped.
+//!
+
+class MappedFile{
+public:
+	explicit MappedFile(const std::string&file_name);
+	~MappedFile();
+
+	MappedFile(const MappedFile&) = delete;
+	MappedFile&operator=(const MappedFile&) = delete;
+
+	long long size()const{ return size_; }
+	char*data(){ return data_; }
+	const char*data()const{ return data_; }
+
+private:
+	long long size_;
+	char*data_;
+};
+
+inline
+std::shared_ptr<MappedFile> map_file(const std::string&file_name){
+	return std::make_shared<MappedFile>(file_name);
+}
+
+// Returns an array whose elements point into the mapped file. The array keeps the mapping alive.
+template<class T>
+ArrayIDFunc<T>map_array_id_func(const std::shared_ptr<MappedFile>&file, long long byte_offset, int preimage_count){
+	static_assert(std::is_trivially_copyable<T>::value, "only trivially copyable types can be mapped");
+	if(byte_offset < 0 || byte_offset + static_cast<long long>(sizeof(T))*preimage_count > file->size())
+		throw std::runtime_error("The mapped array exceeds the file size");
+	if(byte_offset % alignof(T) != 0)
+		throw std::runtime_error("The mapped array is not aligned");
+	return ArrayIDFunc<T>(preimage_count, reinterpret_cast<T*>(file->data() + byte_offset), file);
+}
+
+template<class T>
+ArrayIDFunc<T>map_array_id_func(const std::string&file_name){
+	auto file = map_file(file_name);
+	if(file->size() % sizeof(T) != 0)
+		throw std::runtime_error("File \""+file_name+"\" can not be a vector of the requested type because it's size is no multiple of the element type's size.");
+	return map_array_id_func<T>(file, 0, file->size() / sizeof(T));
+}
+
+#endif
@@ -0,0 +1,40 @@
+#ifndef MAX_FLOW_H
+#define MAX_FLOW_H
+
+#include "tiny_id_func.h"
+#include "edmond_karp.h"
+#include "dinic.h"
+#include "push_relabel.h"
+#include <stdexcept>
+
+namespace max_flow{
+
+	//! All algorithms compute a maximum flow from the sources to the targets where every arc has capacity one.
+	//! The result has a saturated flag per arc. xy has residual capacity iff xy is not saturated. At most one of
+	//! xy and back_arc(xy) is saturated.
+	enum class UnitFlowAlgorithm{
+		edmond_karp,
+		dinic,
+		push_relabel
+	};
+
+	template<class InvTail, class Head, class BackArc, class Source, class Target>
+	BitIDFunc compute_maximum_unit_flow(
+		UnitFlowAlgorithm algorithm,
+		const InvTail&inv_tail, const Head&head, const BackArc&back_arc,
+		const Source&source_list, const Target&target_list
+	){
+		switch(algorithm){
+		case UnitFlowAlgorithm::edmond_karp:
+			return compute_maximum_unit_flow_using_edmond_karp(inv_tail, head, back_arc, source_list, target_list);
+		case UnitFlowAlgorithm::dinic:
+			return compute_maximum_unit_flow_using_dinic(inv_tail, head, back_arc, source_list, target_list);
+		case UnitFlowAlgorithm::push_relabel:
+			return compute_maximum_unit_flow_using_push_relabel(inv_tail, head, back_arc, source_list, target_list);
+		default:
+			throw std::runtime_error("Unknown max flow algorithm");
+		}
+	}
+}
+
+#endif
@@ -0,0 +1,36 @@
+#ifndef MEMORY_USAGE_H
+#define MEMORY_USAGE_H
+
+#include <sys/time.h>
+#include <sys/resource.h>
+
+#ifdef __linux__
+#include <fstream>
+#include <string>
+#endif
+
+//! Returns the largest resident set size of the process so far in KiB.
+inline
+long long get_peak_resident_set_size(){
+	#ifdef __linux__
+	// ru_maxrss is inherited across exec and therefore includes the memory of the parent before the fork.
+	// VmHWM belongs to the current address space.
+	{
+		std::ifstream in("/proc/self/status");
+		std::string line;
+		while(std::getline(in, line))
+			if(line.compare(0, 6, "VmHWM:") == 0)
+				return std::stoll(line.substr(6));
+	}
+	#endif
+
+	rusage usage;
+	getrusage(RUSAGE_SELF, &usage);
+	#ifdef __APPLE__
+	return usage.ru_maxrss / 1024;
+	#else
+	return usage.ru_maxrss;
+	#endif
+}
+
+#endif
@@ -12,7 +12,16 @@
 #include "multi_arc.h"
 #include "id_multi_func.h"
 #include "preorder.h"
+#include "back_arc.h"
+#include "separator_call.h"
+#include "cancellation.h"
+#include "range.h"
 #include <vector>
+#include <algorithm>
+#include <utility>
+#include <memory>
+#include <limits>
+#include <omp.h>
 
 #ifndef NDEBUG
 #include "union_find.h"
@@ -97,6 +106,154 @@ namespace cch_order{
 		);
 	}
 
+	// Graphs with at most this many nodes are ordered exactly by compute_base_case_graph_order
+	const int max_exact_base_case_node_count = 10;
+
+	// Computes an order with the minimum number of shortcuts, i.e., arcs in the chordal supergraph, using a
+	// dynamic program over all node subsets. best[S] is the minimum number of shortcuts if the nodes in S are
+	// contracted first. The upward neighbors of x contracted after S are the nodes outside of S that are
+	// reachable from x through S. The running time is exponential and the graph must be tiny.
+	template<class Tail, class Head, class InputNodeID>
+	ArrayIDIDFunc compute_exact_min_shortcut_graph_order(const Tail&tail, const Head&head, const InputNodeID&input_node_id){
+		const int node_count = tail.image_count();
+		const int arc_count = tail.preimage_count();
+
+		assert(node_count <= 16);
+
+		std::vector<unsigned>neighbors(node_count, 0);
+		for(int xy=0; xy<arc_count; ++xy)
+			neighbors[tail(xy)] |= 1u << head(xy);
+
+		auto count_bits = [](unsigned x){
+			return __builtin_popcount(x);
+		};
+
+		auto get_neighborhood = [&](unsigned set){
+			unsigned n = 0;
+			for(unsigned x = set; x != 0; x &= x-1)
+				n |= neighbors[__builtin_ctz(x)];
+			return n;
+		};
+
+		const unsigned all = (1u << node_count) - 1;
+		std::vector<int>best(all+1, std::numeric_limits<int>::max()), last(all+1, -1);
+		best[0] = 0;
+		for(unsigned set=1; set<=all; ++set){
+			for(int x=0; x<node_count; ++x){
+				if(!(set & (1u << x)))
+					continue;
+				unsigned before = set & ~(1u << x);
+				if(best[before] == std::numeric_limits<int>::max())
+					continue;
+
+				unsigned reached = 1u << x, frontier = reached;
+				while(frontier != 0){
+					frontier = get_neighborhood(frontier) & before & ~reached;
+					reached |= frontier;
+				}
+				int cost = best[before] + count_bits(get_neighborhood(reached) & ~set);
+				if(cost < best[set]){
+					best[set] = cost;
+					last[set] = x;
+				}
+			}
+		}
+
+		ArrayIDIDFunc order(node_count, input_node_id.image_count());
+		unsigned set = all;
+		for(int i=node_count-1; i>=0; --i){
+			int x = last[set];
+			order[i] = input_node_id(x);
+			set &= ~(1u << x);
+		}
+
+		assert(is_valid_partial_order(order));
+		return order; // NVRO
+	}
+
+	// Repeatedly contracts the node that adds the fewest shortcuts, ties are broken by degree and then by ID.
+	// The adjacency is stored as matrix and thus the graph should be small. The config limits base_case_node_count
+	// to 512 nodes for this reason.
+	template<class Tail, class Head, class InputNodeID>
+	ArrayIDIDFunc compute_small_greedy_min_shortcut_graph_order(const Tail&tail, const Head&head, const InputNodeID&input_node_id){
+		const int node_count = tail.image_count();
+		const int arc_count = tail.preimage_count();
+
+		std::vector<bool>is_adjacent((long long)node_count*node_count, false);
+		std::vector<std::vector<int>>neighbors(node_count);
+		for(int xy=0; xy<arc_count; ++xy){
+			is_adjacent[(long long)tail(xy)*node_count + head(xy)] = true;
+			neighbors[tail(xy)].push_back(head(xy));
+		}
+
+		auto get_key = [&](int x){
+			const auto&n = neighbors[x];
+			long long shortcut_count = 0;
+			for(int i=0; i<(int)n.size(); ++i)
+				for(int j=i+1; j<(int)n.size(); ++j)
+					if(!is_adjacent[(long long)n[i]*node_count + n[j]])
+						++shortcut_count;
+			return 100*shortcut_count + n.size();
+		};
+
+		std::vector<long long>key(node_count);
+		std::vector<bool>is_contracted(node_count, false);
+		for(int x=0; x<node_count; ++x)
+			key[x] = get_key(x);
+
+		std::vector<int>touched;
+		ArrayIDIDFunc order(node_count, input_node_id.image_count());
+		for(int i=0; i<node_count; ++i){
+			int x = -1;
+			for(int y=0; y<node_count; ++y)
+				if(!is_contracted[y] && (x == -1 || key[y] < key[x]))
+					x = y;
+			order[i] = input_node_id(x);
+			is_contracted[x] = true;
+
+			auto&n = neighbors[x];
+			for(int y:n){
+				auto&m = neighbors[y];
+				m.erase(std::find(m.begin(), m.end(), x));
+				is_adjacent[(long long)x*node_count + y] = false;
+				is_adjacent[(long long)y*node_count + x] = false;
+			}
+			for(int y:n){
+				for(int z:n){
+					if(y != z && !is_adjacent[(long long)y*node_count + z]){
+						is_adjacent[(long long)y*node_count + z] = true;
+						neighbors[y].push_back(z);
+					}
+				}
+			}
+
+			// Only the shortcut counts of the neighbors and their neighbors can change
+			touched.clear();
+			for(int y:n){
+				touched.push_back(y);
+				for(int z:neighbors[y])
+					touched.push_back(z);
+			}
+			std::sort(touched.begin(), touched.end());
+			touched.erase(std::unique(touched.begin(), touched.end()), touched.end());
+			for(int y:touched)
+				key[y] = get_key(y);
+			n.clear();
+		}
+
+		assert(is_valid_partial_order(order));
+		return order; // NVRO
+	}
+
+	// Orders a graph below the base case size of the nested dissection. Tiny graphs are ordered exactly.
+	template<class Tail, class Head, class InputNodeID>
+	ArrayIDIDFunc compute_base_case_graph_order(const Tail&tail, const Head&head, const InputNodeID&input_node_id){
+		if(tail.image_count() <= max_exact_base_case_node_count)
+			return compute_exact_min_shortcut_graph_order(tail, head, input_node_id);
+		else
+			return compute_small_greedy_min_shortcut_graph_order(tail, head, input_node_id);
+	}
+
 	// Computes an optimal order for a trivial graph. If the input graph is not trivial, then the task is forwarded to the compute_non_trivial_graph_order functor parameter.
 	// A graph is trivial if it is a clique or a tree.
 	//	
@@ -132,19 +289,56 @@ namespace cch_order{
 		return order; // NVRO
 	}
 
+	// Calls on_new_component(i) for every component i. The components are independent of each other and are therefore
+	// processed as OpenMP tasks. If the function is called outside of a parallel region and thread_count is larger than 1,
+	// then a team of thread_count threads is spawned.
+	template<class OnNewComponent>
+	void for_each_component(int component_count, int thread_count, const OnNewComponent&on_new_component){
+		if(component_count == 1){
+			on_new_component(0);
+		} else if(omp_in_parallel()){
+			// Orphaned tasks would otherwise copy on_new_component, which is firstprivate by default
+			for(int i=0; i<component_count; ++i){
+				#pragma omp task shared(on_new_component)
+				on_new_component(i);
+			}
+			#pragma omp taskwait
+		} else if(thread_count > 1){
+			auto cancellation = current_cancellation();
+			#pragma omp parallel num_threads(thread_count)
+			{
+				CurrentCancellationScope cancellation_scope(cancellation);
+				#pragma omp single
+				for(int i=0; i<component_count; ++i){
+					#pragma omp task shared(on_new_component)
+					on_new_component(i);
+				}
+			}
+		} else {
+			for(int i=0; i<component_count; ++i)
+				on_new_component(i);
+		}
+	}
+
 	// This function internally reorders the nodes in preorder, then recurses on each component of the graph.
 	// should_place_node_at_the_end_of_the_order is called with the id of some node of the component and the function should decide
 	// whether this component is placed at the end of the order or at the front.
 	// If the relative component order does not matter, then let should_place_node_at_the_end_of_the_order always return false.
 	//
 	// compute_connected_graph_order should order the nodes in each component. The order should map node IDs in the graph that is given to input node IDs.
+	//
+	// The components are independent of each other and are therefore ordered as OpenMP tasks. If the function is called 
+	// outside of a parallel region and thread_count is larger than 1, then a team of thread_count threads is spawned.
+	// All recursive calls made by compute_connected_graph_order add their tasks to this team. As the position of every
+	// component in the order is determined before the recursion, the resulting order does not depend on the thread count.
 	template<class ComputeConnectedGraphOrder, class ShouldPlaceNodeAtTheEndOfTheOrder>
 	ArrayIDIDFunc reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head, 
 		ArrayIDIDFunc input_node_id,
 		ArrayIDFunc<int> arc_weight,
 		const ComputeConnectedGraphOrder&compute_connected_graph_order,
-		const ShouldPlaceNodeAtTheEndOfTheOrder&should_place_node_at_the_end_of_the_order
+		const ShouldPlaceNodeAtTheEndOfTheOrder&should_place_node_at_the_end_of_the_order,
+		int thread_count = 1
 	){
 		const int node_count = tail.image_count();
 		const int arc_count = tail.preimage_count();
@@ -172,40 +366,101 @@ namespace cch_order{
 		assert(is_symmetric(tail, head));
 
 		ArrayIDIDFunc order(node_count, input_node_id.image_count());
-		int order_begin = 0;
-		int order_end = node_count;
 		
 		// By reordering the nodes in preorder, we can guarentee, that the nodes of every component are from a coninous range.
 		// As we sorted the arcs this is also true for the arcs.
 
+		struct Component{
+			int node_begin, node_end, arc_begin, arc_end, order_begin;
+		};
+
+		std::vector<Component>component_list;
+
+		// We identify components by marking the node in each component with the minimum ID.
+		// We do this using the following observation, if an arc (u,v) exists with u<v then v is not such a node
+
+		{
+			BitIDFunc component_begin(node_count);
+			component_begin.fill(true);
+			for(int i=0; i<arc_count; ++i)
+				if(head(i) < tail(i))
+					component_begin.set(tail(i), false);
+
+			int node_begin = 0;
+			int arc_begin = 0;
+
+			for(int node_end = 1; node_end < node_count; ++node_end){
+				if(component_begin(node_end)){
+					int arc_end = arc_begin;
+					while(arc_end < arc_count && tail(arc_end) < node_end){
+						++arc_end;
+					}
+
+					component_list.push_back({node_begin, node_end, arc_begin, arc_end, -1});
+
+					node_begin = node_end;
+					arc_begin = arc_end;
+				}
+			}
+			component_list.push_back({node_begin, node_count, arc_begin, arc_count, -1});
+		}
+
+		// We then determine where the nodes of each component are placed in the order
+
+		{
+			int order_begin = 0;
+			int order_end = node_count;
+
+			for(auto&c:component_list){
+				#ifndef NDEBUG
+				{
+					bool r = should_place_node_at_the_end_of_the_order(preorder(c.node_begin));
+					for(int x=c.node_begin; x<c.node_end; ++x){
+						assert(r == should_place_node_at_the_end_of_the_order(preorder(x)));
+					}
+				}
+				#endif
+
+				if(should_place_node_at_the_end_of_the_order(preorder(c.node_begin))){
+					order_end -= c.node_end - c.node_begin;
+					c.order_begin = order_end;
+				} else {
+					c.order_begin = order_begin;
+					order_begin += c.node_end - c.node_begin;
+				}
+				assert(order_begin <= order_end);
+			}
+
+			assert(order_begin == order_end);
+		}
 
-		// The following function is called for every component. The components are identified afterwards.
-		auto on_new_component = [&](int node_begin, int node_end, int arc_begin, int arc_end){
-			auto sub_node_count = node_end - node_begin;
-			auto sub_arc_count = arc_end - arc_begin;
+		// The following function is called for every component. Different components write to disjoint parts of the order.
+		auto on_new_component = [&](const Component&c){
+			auto sub_node_count = c.node_end - c.node_begin;
+			auto sub_arc_count = c.arc_end - c.arc_begin;
 
 			auto sub_tail = id_id_func(
 				sub_arc_count, sub_node_count, 
 				[&](int x){
-					return tail(arc_begin + x) - node_begin;
+					return tail(c.arc_begin + x) - c.node_begin;
 				}
 			);
 			auto sub_head = id_id_func(
 				sub_arc_count, sub_node_count, 
 				[&](int x){
-					return head(arc_begin + x) - node_begin;
+					return head(c.arc_begin + x) - c.node_begin;
 				}
 			);
 			auto sub_input_node_id = id_id_func(
 				sub_node_count, input_node_id.image_count(),
 				[&](int x){
-					return input_node_id(node_begin + x);
+					return input_node_id(c.node_begin + x);
 				}
 			);
 			auto sub_arc_weight = id_func(
 				sub_arc_count,
 				[&](int x){
-					return arc_weight(x + arc_begin);
+					return arc_weight(x + c.arc_begin);
 				}
 			);
 
@@ -213,64 +468,20 @@ namespace cch_order{
 			assert(!has_multi_arcs(sub_tail, sub_head)); 
 			assert(is_loop_free(sub_tail, sub_head));
 
-
 			auto sub_order = compute_trivial_graph_order_if_graph_is_trivial(sub_tail, sub_head, sub_input_node_id, sub_arc_weight, compute_connected_graph_order);
-			
-			#ifndef NDEBUG
-			{
-				bool r = should_place_node_at_the_end_of_the_order(preorder(node_begin));
-				for(int x=node_begin; x<node_end; ++x){
-					assert(r == should_place_node_at_the_end_of_the_order(preorder(x)));
-				}
-			}
-			#endif
 
-			if(should_place_node_at_the_end_of_the_order(preorder(node_begin))){
-				order_end -= sub_node_count;
-				assert(order_begin <= order_end);
-				for(int i=0; i<sub_node_count; ++i){
-					order[order_end + i] = sub_order(i);
-				}
-			} else {
-				assert(order_begin + sub_node_count <= order_end);
-				for(int i=0; i<sub_node_count; ++i){
-					order[order_begin + i] = sub_order(i);
-				}
-				order_begin += sub_node_count;
+			for(int i=0; i<sub_node_count; ++i){
+				order[c.order_begin + i] = sub_order(i);
 			}
 		};
 
-		// We identify components by marking the node in each component with the minimum ID.
-		// We do this using the following observation, if an arc (u,v) exists with u<v then v is not such a node
-
-		BitIDFunc component_begin(node_count);
-		component_begin.fill(true);
-		for(int i=0; i<arc_count; ++i)
-			if(head(i) < tail(i))
-				component_begin.set(tail(i), false);
-
-
-		// We then iterate over all components and call on_new_component
-		int node_begin = 0;
-		int arc_begin = 0;
-
-		for(int node_end = 1; node_end < node_count; ++node_end){
-			if(component_begin(node_end)){
-				int arc_end = arc_begin;
-				while(arc_end < arc_count && tail(arc_end) < node_end){
-					++arc_end;
-				}
-
-				on_new_component(node_begin, node_end, arc_begin, arc_end);
-
-				node_begin = node_end;
-				arc_begin = arc_end;
+		for_each_component(
+			component_list.size(), thread_count, 
+			[&](int i){
+				on_new_component(component_list[i]);
 			}
-		}
-		on_new_component(node_begin, node_count, arc_begin, arc_count);
-
+		);
 
-		assert(order_begin == order_end);
 		assert(is_valid_partial_order(order));
 		return order; // NVRO
 	}
@@ -282,11 +493,21 @@ namespace cch_order{
 		ArrayIDIDFunc input_node_id,
 		ArrayIDFunc<int> arc_weight, 
 		const ComputeSeparator&compute_separator,
-		const ComputePartOrder&compute_graph_part_order
+		const ComputePartOrder&compute_graph_part_order,
+		int thread_count = 1,
+		int base_case_node_count = 0
 	){
 		const int node_count = tail.image_count();
 		const int arc_count = tail.preimage_count();
 
+		// Computing a separator of a tiny graph costs more than the order is worth
+		if(node_count <= base_case_node_count)
+			return compute_base_case_graph_order(tail, head, input_node_id);
+
+		// The order is discarded, see cancellation.h
+		if(is_computation_cancelled())
+			return input_node_id;
+
 		auto separator = compute_separator(tail, head, input_node_id, arc_weight);
 		assert(separator.size() > 0);
 
@@ -317,28 +538,371 @@ namespace cch_order{
 		return reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial(
 			std::move(tail), std::move(head), 
 			std::move(input_node_id), std::move(arc_weight), 
-			compute_graph_part_order, std::move(in_separator)
+			compute_graph_part_order, std::move(in_separator), thread_count
+		);
+	}
+
+	// The buffers that are shared by all graphs of one nested dissection, see NestedDissectionGraph
+	struct NestedDissectionBuffers{
+		ArrayIDIDFunc tail[2], head[2], back_arc[2], input_node_id[2];
+		ArrayIDFunc<int>arc_weight[2];
+
+		// Maps the arcs of a graph onto the arcs of its parts while the graph is split
+		ArrayIDFunc<int>new_arc;
+	};
+
+	// A connected graph of the nested dissection recursion. Its nodes are in preorder and its arcs are sorted by tail
+	// and then by head. There are no multi arcs and no loops. 
+	//
+	// The arrays do not own their data. They are the ranges starting at node_begin and arc_begin of the buffers with 
+	// index buffer. The parts of the graph are written to the same ranges of the other buffer. Their parts are then
+	// written back to the first buffer, and so on. As the graphs of one recursion level are disjoint, this works in 
+	// parallel. The arrays are thus never copied into new arrays and out_arc and back_arc are carried over to the 
+	// parts instead of being recomputed on every level.
+	struct NestedDissectionGraph{
+		ArrayIDIDFunc tail, head, back_arc, input_node_id;
+		ArrayIDFunc<int>arc_weight;
+		RangeIDIDMultiFunc out_arc;
+
+		std::shared_ptr<NestedDissectionBuffers>buffers;
+		int buffer, node_begin, arc_begin;
+	};
+
+	inline
+	NestedDissectionGraph make_nested_dissection_graph_in_buffer(
+		std::shared_ptr<NestedDissectionBuffers>buffers, int buffer, 
+		int node_begin, int arc_begin, RangeIDIDMultiFunc out_arc
+	){
+		const int node_count = out_arc.preimage_count();
+		const int arc_count = out_arc.image_count();
+
+		auto&b = *buffers;
+
+		NestedDissectionGraph g;
+		g.tail = ArrayIDIDFunc(arc_count, node_count, b.tail[buffer].begin() + arc_begin, buffers);
+		g.head = ArrayIDIDFunc(arc_count, node_count, b.head[buffer].begin() + arc_begin, buffers);
+		g.back_arc = ArrayIDIDFunc(arc_count, arc_count, b.back_arc[buffer].begin() + arc_begin, buffers);
+		g.input_node_id = ArrayIDIDFunc(node_count, b.input_node_id[buffer].image_count(), b.input_node_id[buffer].begin() + node_begin, buffers);
+		g.arc_weight = ArrayIDFunc<int>(arc_count, b.arc_weight[buffer].begin() + arc_begin, buffers);
+		g.out_arc = std::move(out_arc);
+		g.buffers = std::move(buffers);
+		g.buffer = buffer;
+		g.node_begin = node_begin;
+		g.arc_begin = arc_begin;
+		return g; // NVRO
+	}
+
+	// Takes over the arrays of a connected graph whose nodes are in preorder and whose arcs are sorted by tail and then
+	// by head, such as the components computed by reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial.
+	inline
+	NestedDissectionGraph make_nested_dissection_graph(
+		ArrayIDIDFunc tail, ArrayIDIDFunc head, 
+		ArrayIDIDFunc input_node_id, ArrayIDFunc<int>arc_weight
+	){
+		const int node_count = tail.image_count();
+		const int arc_count = tail.preimage_count();
+
+		assert(!has_multi_arcs(tail, head));
+		assert(is_loop_free(tail, head));
+
+		auto buffers = std::make_shared<NestedDissectionBuffers>();
+		auto&b = *buffers;
+
+		auto out_arc = invert_sorted_id_id_func(tail);
+		b.back_arc[0] = compute_back_arc_permutation_of_strictly_sorted_arcs(tail, head);
+
+		b.tail[1] = ArrayIDIDFunc(arc_count, node_count);
+		b.head[1] = ArrayIDIDFunc(arc_count, node_count);
+		b.back_arc[1] = ArrayIDIDFunc(arc_count, arc_count);
+		b.input_node_id[1] = ArrayIDIDFunc(node_count, input_node_id.image_count());
+		b.arc_weight[1] = ArrayIDFunc<int>(arc_count);
+		b.new_arc = ArrayIDFunc<int>(arc_count);
+
+		b.tail[0] = std::move(tail);
+		b.head[0] = std::move(head);
+		b.input_node_id[0] = std::move(input_node_id);
+		b.arc_weight[0] = std::move(arc_weight);
+
+		return make_nested_dissection_graph_in_buffer(std::move(buffers), 0, 0, 0, std::move(out_arc));
+	}
+
+	struct NestedDissectionPart{
+		NestedDissectionGraph graph;
+		int order_begin;
+	};
+
+	// Splits g into the components of the subgraph with the arcs xy for which keep_arc(xy) is true. The parts are the 
+	// same graphs as the components computed by reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial
+	// and are placed in the order in the same way. 
+	template<class KeepArc, class ShouldPlaceNodeAtTheEndOfTheOrder>
+	std::vector<NestedDissectionPart> split_nested_dissection_graph(
+		const NestedDissectionGraph&g, const KeepArc&keep_arc,
+		const ShouldPlaceNodeAtTheEndOfTheOrder&should_place_node_at_the_end_of_the_order
+	){
+		const int node_count = g.tail.image_count();
+
+		// We first compute the same preorder as compute_preorder. Every root of the depth first search starts a new 
+		// component.
+
+		ArrayIDFunc<int>preorder(node_count);
+		ArrayIDFunc<int>inv_preorder(node_count);
+		std::vector<int>component_node_begin;
+		{
+			inv_preorder.fill(-1);
+
+			ArrayIDFunc<int>next_out_arc(node_count);
+			for(int x=0; x<node_count; ++x)
+				next_out_arc[x] = g.out_arc.range_begin(x);
+
+			ArrayIDFunc<int> stack(node_count);
+			int stack_end = 0;
+
+			int id = 0;
+
+			for(int r=0; r<node_count; ++r){
+				if(inv_preorder(r) == -1){
+					component_node_begin.push_back(id);
+
+					int x = r;
+					inv_preorder[x] = id;
+					preorder[id++] = x;
+
+					for(;;){
+						if(next_out_arc(x) != g.out_arc.range_begin(x+1)){
+							int xy = next_out_arc[x]++;
+							int y = g.head(xy);
+							if(keep_arc(xy) && inv_preorder(y) == -1){
+								inv_preorder[y] = id;
+								preorder[id++] = y;
+								stack[stack_end++] = x;
+								x = y;
+							}
+						}else{
+							if(stack_end == 0)
+								break;
+							x = stack[--stack_end];
+						}
+					}
+				}
+			}
+			component_node_begin.push_back(node_count);
+		}
+
+		const int component_count = component_node_begin.size()-1;
+
+		// We then write the parts into the other buffer. The arcs of every node are sorted by their new heads. 
+		// back_arc temporarily stores the arc in g.
+
+		auto&b = *g.buffers;
+		const int next_buffer = 1 - g.buffer;
+
+		int*new_tail = b.tail[next_buffer].begin() + g.arc_begin;
+		int*new_head = b.head[next_buffer].begin() + g.arc_begin;
+		int*new_back_arc = b.back_arc[next_buffer].begin() + g.arc_begin;
+		int*new_arc_weight = b.arc_weight[next_buffer].begin() + g.arc_begin;
+		int*new_input_node_id = b.input_node_id[next_buffer].begin() + g.node_begin;
+		int*new_arc = b.new_arc.begin() + g.arc_begin;
+
+		std::vector<NestedDissectionPart>part_list(component_count);
+		std::vector<std::pair<int, int>>arc_list;
+
+		int new_arc_count = 0;
+		for(int c=0; c<component_count; ++c){
+			const int node_begin = component_node_begin[c];
+			const int node_end = component_node_begin[c+1];
+			const int arc_begin = new_arc_count;
+
+			RangeIDIDMultiFunc out_arc = {ArrayIDFunc<int>(node_end - node_begin + 1)};
+
+			for(int new_x=node_begin; new_x<node_end; ++new_x){
+				int x = preorder(new_x);
+
+				out_arc.range_begin[new_x - node_begin] = new_arc_count - arc_begin;
+				new_input_node_id[new_x] = g.input_node_id(x);
+
+				arc_list.clear();
+				for(int xy:g.out_arc(x))
+					if(keep_arc(xy))
+						arc_list.push_back({inv_preorder(g.head(xy)), xy});
+				std::sort(arc_list.begin(), arc_list.end());
+
+				for(auto a:arc_list){
+					new_tail[new_arc_count] = new_x - node_begin;
+					new_head[new_arc_count] = a.first - node_begin;
+					new_back_arc[new_arc_count] = a.second;
+					new_arc_weight[new_arc_count] = g.arc_weight(a.second);
+					new_arc[a.second] = new_arc_count - arc_begin;
+					++new_arc_count;
+				}
+			}
+			out_arc.range_begin[node_end - node_begin] = new_arc_count - arc_begin;
+
+			part_list[c].graph = make_nested_dissection_graph_in_buffer(
+				g.buffers, next_buffer, 
+				g.node_begin + node_begin, g.arc_begin + arc_begin, 
+				std::move(out_arc)
+			);
+		}
+
+		for(int xy=0; xy<new_arc_count; ++xy)
+			new_back_arc[xy] = new_arc[g.back_arc(new_back_arc[xy])];
+
+		// We then determine where the nodes of each part are placed in the order
+
+		{
+			int order_begin = 0;
+			int order_end = node_count;
+
+			for(int c=0; c<component_count; ++c){
+				int part_node_count = component_node_begin[c+1] - component_node_begin[c];
+				if(should_place_node_at_the_end_of_the_order(preorder(component_node_begin[c]))){
+					order_end -= part_node_count;
+					part_list[c].order_begin = order_end;
+				} else {
+					part_list[c].order_begin = order_begin;
+					order_begin += part_node_count;
+				}
+				assert(order_begin <= order_end);
+			}
+
+			assert(order_begin == order_end);
+		}
+
+		#ifndef NDEBUG
+		for(auto&p:part_list){
+			assert(is_symmetric(p.graph.tail, p.graph.head));
+			assert(!has_multi_arcs(p.graph.tail, p.graph.head)); 
+			assert(is_loop_free(p.graph.tail, p.graph.head));
+			for(int xy=0; xy<p.graph.tail.preimage_count(); ++xy){
+				assert(p.graph.tail(p.graph.back_arc(xy)) == p.graph.head(xy));
+				assert(p.graph.head(p.graph.back_arc(xy)) == p.graph.tail(xy));
+			}
+		}
+		#endif
+
+		return part_list; // NVRO
+	}
+
+	// Like compute_trivial_graph_order_if_graph_is_trivial but compute_non_trivial_graph_order gets g
+	template<class ComputeNonTrivialGraphOrder>
+	ArrayIDIDFunc compute_trivial_graph_order_if_graph_is_trivial(
+		const NestedDissectionGraph&g, const ComputeNonTrivialGraphOrder&compute_non_trivial_graph_order
+	){
+		const int node_count = g.tail.image_count();
+		const int arc_count = g.tail.preimage_count();
+
+		assert(is_connected(g.tail, g.head));
+
+		bool 
+			is_clique = (static_cast<long long>(node_count)*static_cast<long long>(node_count-1) == static_cast<long long>(arc_count)),
+			has_no_arcs = (arc_count == 0),
+			is_tree = (arc_count == 2*(node_count-1));
+
+		ArrayIDIDFunc order;
+
+		if(is_clique || has_no_arcs){
+			order = id_id_func(node_count, g.input_node_id.image_count(), [&](int x){return g.input_node_id(x);});
+		}else if(is_tree){
+			order = compute_tree_graph_order(g.tail, g.head, g.input_node_id);
+		}else {
+			order = compute_non_trivial_graph_order(g);
+		}
+
+		assert(is_valid_partial_order(order));
+		return order; // NVRO
+	}
+
+	// Computes the same order as compute_nested_dissection_graph_order with compute_graph_part_order(part), where part 
+	// is a NestedDissectionGraph. The separators are computed with the out arcs and back arcs of g, see separator_call.h.
+	template<class ComputeSeparator, class ComputePartOrder>
+	ArrayIDIDFunc compute_in_place_nested_dissection_graph_order(
+		const NestedDissectionGraph&g,
+		const ComputeSeparator&compute_separator,
+		const ComputePartOrder&compute_graph_part_order,
+		int thread_count = 1,
+		int base_case_node_count = 0
+	){
+		const int node_count = g.tail.image_count();
+
+		// Computing a separator of a tiny graph costs more than the order is worth
+		if(node_count <= base_case_node_count)
+			return compute_base_case_graph_order(g.tail, g.head, g.input_node_id);
+
+		// The order is discarded, see cancellation.h
+		if(is_computation_cancelled())
+			return id_id_func(node_count, g.input_node_id.image_count(), [&](int x){return g.input_node_id(x);});
+
+		auto separator = compute_separator_given_out_arc_and_back_arc(compute_separator, g.tail, g.head, g.out_arc, g.back_arc, g.input_node_id, g.arc_weight);
+		assert(separator.size() > 0);
+
+		BitIDFunc in_separator(node_count);
+		in_separator.fill(false);
+		for(auto x:separator)
+			in_separator.set(x, true);
+
+		const bool is_everything_separator = (static_cast<int>(separator.size()) == node_count);
+
+		auto part_list = split_nested_dissection_graph(
+			g, 
+			[&](int xy){
+				return !is_everything_separator && in_separator(g.tail(xy)) == in_separator(g.head(xy));
+			},
+			in_separator
+		);
+
+		ArrayIDIDFunc order(node_count, g.input_node_id.image_count());
+
+		// Different parts write to disjoint parts of the order
+		for_each_component(
+			part_list.size(), thread_count, 
+			[&](int i){
+				const auto&p = part_list[i];
+				auto part_order = compute_trivial_graph_order_if_graph_is_trivial(p.graph, compute_graph_part_order);
+				for(int j=0; j<part_order.preimage_count(); ++j)
+					order[p.order_begin + j] = part_order(j);
+			}
 		);
+
+		assert(is_valid_partial_order(order));
+		return order; // NVRO
 	}
 
+	template<class ComputeSeparator>
+	class ComputeInPlaceNestedDissectionOrder{
+	public:
+		ComputeInPlaceNestedDissectionOrder(const ComputeSeparator&compute_separator, int thread_count, int base_case_node_count):
+			compute_separator(compute_separator), thread_count(thread_count), base_case_node_count(base_case_node_count){}
+
+		ArrayIDIDFunc operator()(const NestedDissectionGraph&g)const{
+			return compute_in_place_nested_dissection_graph_order(g, compute_separator, *this, thread_count, base_case_node_count);
+		}
+	private:
+		const ComputeSeparator&compute_separator;
+		int thread_count;
+		int base_case_node_count;
+	};
+
 	template<class ComputeSeparator>
 	ArrayIDIDFunc compute_nested_dissection_graph_order(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head, 
 		ArrayIDIDFunc input_node_id,
 		ArrayIDFunc<int> arc_weight, 
-		const ComputeSeparator&compute_separator
+		const ComputeSeparator&compute_separator,
+		int thread_count = 1,
+		int base_case_node_count = 0
 	){
+		// The parts below the first separator are dissected in place
+		ComputeInPlaceNestedDissectionOrder<ComputeSeparator> compute_in_place_order(compute_separator, thread_count, base_case_node_count);
 		auto compute_graph_part_order = [&](
 			ArrayIDIDFunc a_tail, ArrayIDIDFunc a_head, 
 			ArrayIDIDFunc a_input_node_id, ArrayIDFunc<int>a_arc_weight
 		){
-			return compute_nested_dissection_graph_order(
+			return compute_in_place_order(make_nested_dissection_graph(
 				std::move(a_tail), std::move(a_head), 
-				std::move(a_input_node_id), std::move(a_arc_weight), 
-				compute_separator
-			);
+				std::move(a_input_node_id), std::move(a_arc_weight)
+			));
 		};
-		return compute_nested_dissection_graph_order(tail, head, input_node_id, arc_weight, compute_separator, compute_graph_part_order);
+		return compute_nested_dissection_graph_order(tail, head, input_node_id, arc_weight, compute_separator, compute_graph_part_order, thread_count, base_case_node_count);
 	}
 
 	template<class ComputeCoreGraphOrder>
@@ -432,7 +996,8 @@ namespace cch_order{
 	ArrayIDIDFunc compute_graph_order_with_degree_two_chain_at_the_begin(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head,
 		ArrayIDIDFunc input_node_id, ArrayIDFunc<int>arc_weight,
-		const ComputeCoreGraphOrder&compute_core_graph_order
+		const ComputeCoreGraphOrder&compute_core_graph_order,
+		int thread_count = 1
 	){
 		const int node_count = tail.image_count();
 		int arc_count = tail.preimage_count();
@@ -579,14 +1144,14 @@ namespace cch_order{
 		return reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial(
 			std::move(tail), std::move(head), 
 			std::move(input_node_id), std::move(arc_weight),
-			compute_core_graph_order, node_in_core
+			compute_core_graph_order, node_in_core, thread_count
 		);
 		#else
 
 		auto order = reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial(
 			tail, head, 
 			input_node_id, arc_weight,
-			compute_core_graph_order, node_in_core
+			compute_core_graph_order, node_in_core, thread_count
 		);
 
 		{
@@ -615,7 +1180,8 @@ namespace cch_order{
 	ArrayIDIDFunc compute_graph_order_with_largest_biconnected_component_at_the_end(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head, 
 		ArrayIDIDFunc input_node_id, ArrayIDFunc<int>arc_weight,
-		const ComputeConnectedGraphOrder&compute_component_graph_order
+		const ComputeConnectedGraphOrder&compute_component_graph_order,
+		int thread_count = 1
 	){
 		int node_count = tail.image_count();
 		int arc_count = tail.preimage_count();
@@ -658,7 +1224,7 @@ namespace cch_order{
 		return reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial(
 			std::move(tail), std::move(head), 
 			std::move(input_node_id), std::move(arc_weight),
-			compute_component_graph_order, std::move(node_in_largest_biconnected_component)
+			compute_component_graph_order, std::move(node_in_largest_biconnected_component), thread_count
 		);
 	}
 
@@ -712,7 +1278,9 @@ namespace cch_order{
 	ArrayIDIDFunc compute_nested_dissection_graph_order(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head,
 		ArrayIDFunc<int> arc_weight, 
-		const ComputeSeparator&compute_separator
+		const ComputeSeparator&compute_separator,
+		int thread_count = 1,
+		int base_case_node_count = 0
 	){
 		const int node_count = tail.image_count();
 
@@ -726,13 +1294,13 @@ namespace cch_order{
 		){
 			return compute_nested_dissection_graph_order(
 				std::move(a_tail), std::move(a_head), std::move(a_input_node_id), std::move(a_arc_weight), 
-				compute_separator
+				compute_separator, thread_count, base_case_node_count
 			);
 		};
 
 		auto order = reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial(
 			std::move(tail), std::move(head), std::move(input_node_id), std::move(arc_weight), 
-			compute_order, [](int){return false;}
+			compute_order, [](int){return false;}, thread_count
 		);
 
 		assert(is_permutation(order));
@@ -740,25 +1308,18 @@ namespace cch_order{
 		return order; // NVRO
 	}
 
-	template<class ComputeSeparator>
-	ArrayIDIDFunc compute_cch_graph_order(
+	// Orders the biconnected components and degree two chains and calls compute_core_order(tail, head, input_node_id, arc_weight)
+	// for the remaining core graphs.
+	template<class ComputeCoreOrder>
+	ArrayIDIDFunc compute_cch_graph_order_given_core_order(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head,
 		ArrayIDIDFunc input_node_id,
 		ArrayIDFunc<int> arc_weight, 
-		const ComputeSeparator&compute_separator
+		const ComputeCoreOrder&orderer4,
+		int thread_count = 1
 	){
 		make_graph_simple(tail, head, arc_weight);
 
-		auto orderer4 = [&](
-			ArrayIDIDFunc a_tail, ArrayIDIDFunc a_head,
-			ArrayIDIDFunc a_input_node_id, ArrayIDFunc<int> a_arc_weight
-		){
-			return compute_nested_dissection_graph_order(
-				std::move(a_tail), std::move(a_head), std::move(a_input_node_id), std::move(a_arc_weight), 
-				compute_separator
-			);
-		};
-
 		/*auto orderer3 = [&](
 			ArrayIDIDFunc a_tail, ArrayIDIDFunc a_head,
 			ArrayIDIDFunc a_input_node_id, ArrayIDFunc<int> a_arc_weight
@@ -776,7 +1337,7 @@ namespace cch_order{
 		){
 			return compute_graph_order_with_degree_two_chain_at_the_begin(
 				std::move(a_tail), std::move(a_head), std::move(a_input_node_id), std::move(a_arc_weight), 
-				orderer4
+				orderer4, thread_count
 			);
 		};
 
@@ -786,13 +1347,13 @@ namespace cch_order{
 		){
 			return compute_graph_order_with_largest_biconnected_component_at_the_end(
 				std::move(a_tail), std::move(a_head), std::move(a_input_node_id), std::move(a_arc_weight), 
-				orderer2
+				orderer2, thread_count
 			);
 		};
 
 		auto order = reorder_nodes_in_preorder_and_compute_unconnected_graph_order_if_component_is_non_trivial(
 			tail, head, input_node_id, arc_weight, 
-			orderer1, [](int){return false;}
+			orderer1, [](int){return false;}, thread_count
 		);
 
 		assert(is_permutation(order));
@@ -800,13 +1361,114 @@ namespace cch_order{
 		return order; // NVRO
 	}
 
+	template<class ComputeSeparator>
+	ArrayIDIDFunc compute_cch_graph_order(
+		ArrayIDIDFunc tail, ArrayIDIDFunc head,
+		ArrayIDIDFunc input_node_id,
+		ArrayIDFunc<int> arc_weight, 
+		const ComputeSeparator&compute_separator,
+		int thread_count = 1,
+		int base_case_node_count = 0
+	){
+		auto orderer4 = [&](
+			ArrayIDIDFunc a_tail, ArrayIDIDFunc a_head,
+			ArrayIDIDFunc a_input_node_id, ArrayIDFunc<int> a_arc_weight
+		){
+			return compute_nested_dissection_graph_order(
+				std::move(a_tail), std::move(a_head), std::move(a_input_node_id), std::move(a_arc_weight), 
+				compute_separator, thread_count, base_case_node_count
+			);
+		};
+
+		return compute_cch_graph_order_given_core_order(
+			std::move(tail), std::move(head), std::move(input_node_id), std::move(arc_weight),
+			orderer4, thread_count
+		);
+	}
+
+	// Like compute_nested_dissection_graph_order but graphs with at most max_part_node_count nodes are not dissected.
+	// Their order is computed by compute_part_order(tail, head, input_node_id, arc_weight) instead.
+	template<class ComputeSeparator, class ComputePartOrder>
+	class ComputeNestedDissectionOrderAboveParts{
+	public:
+		ComputeNestedDissectionOrderAboveParts(
+			const ComputeSeparator&compute_separator, const ComputePartOrder&compute_part_order, 
+			int max_part_node_count, int thread_count, int base_case_node_count
+		):
+			compute_separator(compute_separator), compute_part_order(compute_part_order), 
+			max_part_node_count(max_part_node_count), thread_count(thread_count), base_case_node_count(base_case_node_count){}
+
+		ArrayIDIDFunc operator()(
+			ArrayIDIDFunc tail, ArrayIDIDFunc head,
+			ArrayIDIDFunc input_node_id, ArrayIDFunc<int> arc_weight
+		)const{
+			if(tail.image_count() <= max_part_node_count)
+				return compute_part_order(std::move(tail), std::move(head), std::move(input_node_id), std::move(arc_weight));
+			else
+				return compute_nested_dissection_graph_order(
+					std::move(tail), std::move(head), std::move(input_node_id), std::move(arc_weight),
+					compute_separator, 
+					[&](
+						ArrayIDIDFunc a_tail, ArrayIDIDFunc a_head,
+						ArrayIDIDFunc a_input_node_id, ArrayIDFunc<int> a_arc_weight
+					){
+						return (*this)(make_nested_dissection_graph(
+							std::move(a_tail), std::move(a_head), 
+							std::move(a_input_node_id), std::move(a_arc_weight)
+						));
+					},
+					thread_count, base_case_node_count
+				);
+		}
+
+		// The parts below the first separator are dissected in place. Only the parts that are passed on to
+		// compute_part_order are copied.
+		ArrayIDIDFunc operator()(const NestedDissectionGraph&g)const{
+			if(g.tail.image_count() <= max_part_node_count)
+				return compute_part_order(ArrayIDIDFunc(g.tail), ArrayIDIDFunc(g.head), ArrayIDIDFunc(g.input_node_id), ArrayIDFunc<int>(g.arc_weight));
+			else
+				return compute_in_place_nested_dissection_graph_order(g, compute_separator, *this, thread_count, base_case_node_count);
+		}
+	private:
+		const ComputeSeparator&compute_separator;
+		const ComputePartOrder&compute_part_order;
+		int max_part_node_count;
+		int thread_count;
+		int base_case_node_count;
+	};
+
+	// Computes the same order as compute_cch_graph_order, if compute_part_order computes the nested dissection order of
+	// the parts. The parts are connected, their nodes are in preorder and their arcs are sorted by tail and then by head.
+	template<class ComputeSeparator, class ComputePartOrder>
+	ArrayIDIDFunc compute_cch_graph_order_above_parts(
+		ArrayIDIDFunc tail, ArrayIDIDFunc head,
+		ArrayIDFunc<int> arc_weight, 
+		const ComputeSeparator&compute_separator,
+		const ComputePartOrder&compute_part_order,
+		int max_part_node_count,
+		int thread_count = 1,
+		int base_case_node_count = 0
+	){
+		auto input_node_id = identity_permutation(tail.image_count());
+		return compute_cch_graph_order_given_core_order(
+			std::move(tail), std::move(head), std::move(input_node_id), std::move(arc_weight),
+			ComputeNestedDissectionOrderAboveParts<ComputeSeparator, ComputePartOrder>(
+				compute_separator, compute_part_order, 
+				max_part_node_count, thread_count, base_case_node_count
+			), 
+			thread_count
+		);
+	}
+
 	template<class ComputeSeparator>
 	ArrayIDIDFunc compute_cch_graph_order(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head,
 		ArrayIDFunc<int> arc_weight, 
-		const ComputeSeparator&compute_separator
+		const ComputeSeparator&compute_separator,
+		int thread_count = 1,
+		int base_case_node_count = 0
 	){
-		return compute_cch_graph_order(std::move(tail), std::move(head), identity_permutation(tail.image_count()), std::move(arc_weight), compute_separator);
+		return compute_cch_graph_order(std::move(tail), std::move(head), identity_permutation(tail.image_count()), std::move(arc_weight), compute_separator, thread_count, base_case_node_count);
 	}
 
 	class ComputeConstantSeparator{
@@ -825,7 +1487,9 @@ namespace cch_order{
 	ArrayIDIDFunc compute_cch_graph_order_given_top_level_separator(
 		ArrayIDIDFunc tail, ArrayIDIDFunc head, 
 		ArrayIDFunc<int> arc_weight, std::vector<int>top_level_separator,
-		const ComputeSeparator&compute_separator
+		const ComputeSeparator&compute_separator,
+		int thread_count = 1,
+		int base_case_node_count = 0
 	){
 		const int node_count = tail.image_count();
 
@@ -840,9 +1504,9 @@ namespace cch_order{
 				ArrayIDIDFunc a_tail, ArrayIDIDFunc a_head,
 				ArrayIDIDFunc a_input_node_id, ArrayIDFunc<int> a_arc_weight
 			){
-				return compute_cch_graph_order(std::move(a_tail), std::move(a_head), std::move(a_input_node_id), std::move(a_arc_weight), compute_separator);
-			}
-
+				return compute_cch_graph_order(std::move(a_tail), std::move(a_head), std::move(a_input_node_id), std::move(a_arc_weight), compute_separator, thread_count, base_case_node_count);
+			},
+			thread_count
 		);
 	}
 
@@ -0,0 +1,435 @@
+#ifndef MULTILEVEL_SEPARATOR_H
+#define MULTILEVEL_SEPARATOR_H
+
+#include "array_id_func.h"
+#include "tiny_id_func.h"
+#include "id_func.h"
+#include "id_multi_func.h"
+#include "permutation.h"
+#include "hash.h"
+#include <vector>
+#include <tuple>
+#include <algorithm>
+#include <limits>
+#include <cassert>
+
+//!
+//! The multilevel separator computation contracts a matching until the graph is small, computes a separator of
+//! the coarse graph and then projects the separator back level by level. On every level the projected separator
+//! is refined by a maximum flow in a band around it. The refined separator is never larger than the projected
+//! one.
+//!
+
+namespace multilevel{
+
+	struct CoarseGraph{
+		ArrayIDIDFunc tail, head;
+		ArrayIDFunc<int>arc_weight;
+		ArrayIDFunc<int>arc_multiplicity;
+		ArrayIDFunc<int>node_weight;
+		ArrayIDIDFunc fine_to_coarse;
+	};
+
+	//! Matches every node to the unmatched neighbor it shares the most input arcs with and contracts the matched
+	//! pairs. Ties are broken by smaller node weight and then by a hash of the IDs. The nodes are also visited in
+	//! the order of the hash, as visiting them by ID would match a grid row by row and stretch the coarse graphs.
+	//! node_weight is the number of input nodes represented by every node and arc_multiplicity the number of input
+	//! arcs represented by every arc. The arcs of the coarse graph are sorted, have no loops and no multi arcs.
+	//! Merged arcs get the smaller weight and the sum of the multiplicities.
+	template<class Tail, class Head, class ArcWeight, class ArcMultiplicity, class NodeWeight>
+	CoarseGraph contract_matching(const Tail&tail, const Head&head, const ArcWeight&arc_weight, const ArcMultiplicity&arc_multiplicity, const NodeWeight&node_weight){
+		const int node_count = tail.image_count();
+		const int arc_count = tail.preimage_count();
+
+		auto out_arc = invert_id_id_func(tail);
+
+		ArrayIDFunc<int>mate(node_count);
+		mate.fill(-1);
+
+		auto priority = [](int x){return mix_hash(x);};
+
+		std::vector<int>visit_order(node_count);
+		for(int x=0; x<node_count; ++x)
+			visit_order[x] = x;
+		std::sort(visit_order.begin(), visit_order.end(), [&](int l, int r){return priority(l) < priority(r);});
+
+		ArrayIDFunc<int>fine_to_coarse(node_count);
+		int coarse_node_count = 0;
+		for(auto x:visit_order){
+			if(mate(x) != -1)
+				continue;
+			int best = x, best_multiplicity = 0;
+			for(auto xy:out_arc(x)){
+				int y = head(xy);
+				if(y == x || mate(y) != -1)
+					continue;
+				int m = arc_multiplicity(xy);
+				if(best == x || m > best_multiplicity || (m == best_multiplicity && (node_weight(y) < node_weight(best) || (node_weight(y) == node_weight(best) && priority(y) < priority(best))))){
+					best = y;
+					best_multiplicity = m;
+				}
+			}
+			mate[x] = best;
+			mate[best] = x;
+			fine_to_coarse[x] = coarse_node_count;
+			fine_to_coarse[best] = coarse_node_count;
+			++coarse_node_count;
+		}
+
+		CoarseGraph g;
+		g.fine_to_coarse = ArrayIDIDFunc(node_count, coarse_node_count);
+		for(int x=0; x<node_count; ++x)
+			g.fine_to_coarse[x] = fine_to_coarse(x);
+
+		g.node_weight = ArrayIDFunc<int>(coarse_node_count);
+		g.node_weight.fill(0);
+		for(int x=0; x<node_count; ++x)
+			g.node_weight[fine_to_coarse(x)] += node_weight(x);
+
+		std::vector<std::tuple<int, int, int, int>>arc_list;
+		for(int xy=0; xy<arc_count; ++xy){
+			int x = fine_to_coarse(tail(xy)), y = fine_to_coarse(head(xy));
+			if(x != y)
+				arc_list.push_back(std::make_tuple(x, y, arc_weight(xy), arc_multiplicity(xy)));
+		}
+		std::sort(arc_list.begin(), arc_list.end());
+
+		int coarse_arc_count = 0;
+		for(int i=0; i<(int)arc_list.size(); ++i)
+			if(i == 0 || std::get<0>(arc_list[i-1]) != std::get<0>(arc_list[i]) || std::get<1>(arc_list[i-1]) != std::get<1>(arc_list[i]))
+				++coarse_arc_count;
+
+		g.tail = ArrayIDIDFunc(coarse_arc_count, coarse_node_count);
+		g.head = ArrayIDIDFunc(coarse_arc_count, coarse_node_count);
+		g.arc_weight = ArrayIDFunc<int>(coarse_arc_count);
+		g.arc_multiplicity = ArrayIDFunc<int>(coarse_arc_count);
+		int coarse_arc = -1;
+		for(int i=0; i<(int)arc_list.size(); ++i){
+			// The arcs are sorted by weight within a group of multi arcs and thus the first is kept
+			if(i == 0 || std::get<0>(arc_list[i-1]) != std::get<0>(arc_list[i]) || std::get<1>(arc_list[i-1]) != std::get<1>(arc_list[i])){
+				++coarse_arc;
+				g.tail[coarse_arc] = std::get<0>(arc_list[i]);
+				g.head[coarse_arc] = std::get<1>(arc_list[i]);
+				g.arc_weight[coarse_arc] = std::get<2>(arc_list[i]);
+				g.arc_multiplicity[coarse_arc] = 0;
+			}
+			g.arc_multiplicity[coarse_arc] += std::get<3>(arc_list[i]);
+		}
+
+		return g; // NVRO
+	}
+
+	//! Shrinks a node separator of a connected graph. The components that remain after removing the separator are
+	//! split into two sides of about the same weight. The nodes that are at most radius hops away from the
+	//! separator form the band. Nodes outside of the band can not be in the new separator. The new separator is a
+	//! minimum weight node cut between the two sides within the band, computed using augmenting paths. If a side
+	//! lies completely in the band, its nodes farthest from the separator can not be in the new separator. A cut
+	//! is only used if it does not increase the expansion of the separator.
+	template<class Tail, class Head, class NodeWeight>
+	std::vector<int> refine_separator(const Tail&tail, const Head&head, const NodeWeight&node_weight, std::vector<int>separator, int radius){
+		const int node_count = tail.image_count();
+
+		auto out_arc = invert_id_id_func(tail);
+
+		// Split the components into two sides, the separator nodes get side 2
+		long long side_weight[2] = {0, 0};
+		ArrayIDFunc<int>side(node_count);
+		side.fill(-1);
+		for(auto x:separator)
+			side[x] = 2;
+
+		{
+			ArrayIDFunc<int>component(node_count);
+			component.fill(-1);
+			std::vector<long long>component_weight;
+			ArrayIDFunc<int>stack(node_count);
+			for(int r=0; r<node_count; ++r){
+				if(side(r) == 2 || component(r) != -1)
+					continue;
+				int c = component_weight.size();
+				component_weight.push_back(0);
+				int stack_end = 0;
+				stack[stack_end++] = r;
+				component[r] = c;
+				while(stack_end != 0){
+					int x = stack[--stack_end];
+					component_weight[c] += node_weight(x);
+					for(auto xy:out_arc(x)){
+						int y = head(xy);
+						if(side(y) != 2 && component(y) == -1){
+							component[y] = c;
+							stack[stack_end++] = y;
+						}
+					}
+				}
+			}
+
+			const int component_count = component_weight.size();
+			if(component_count < 2)
+				return separator;
+
+			std::vector<int>component_order(component_count);
+			for(int i=0; i<component_count; ++i)
+				component_order[i] = i;
+			std::stable_sort(component_order.begin(), component_order.end(), [&](int l, int r){return component_weight[l] > component_weight[r];});
+
+			std::vector<int>component_side(component_count);
+			for(auto c:component_order){
+				int s = side_weight[0] <= side_weight[1] ? 0 : 1;
+				component_side[c] = s;
+				side_weight[s] += component_weight[c];
+			}
+
+			for(int x=0; x<node_count; ++x)
+				if(side(x) != 2)
+					side[x] = component_side[component(x)];
+		}
+
+		// Compute the band using a breadth first search from the separator
+		ArrayIDFunc<int>dist(node_count);
+		dist.fill(-1);
+		std::vector<int>band;
+		for(auto x:separator){
+			dist[x] = 0;
+			band.push_back(x);
+		}
+		for(int i=0; i<(int)band.size(); ++i){
+			int x = band[i];
+			if(dist(x) == radius)
+				continue;
+			for(auto xy:out_arc(x)){
+				int y = head(xy);
+				if(dist(y) == -1){
+					dist[y] = dist(x)+1;
+					band.push_back(y);
+				}
+			}
+		}
+
+		const int band_size = band.size();
+		ArrayIDFunc<int>band_id(node_count);
+		band_id.fill(-1);
+		for(int i=0; i<band_size; ++i)
+			band_id[band[i]] = i;
+
+		// If a side has no node outside of the band, then its farthest band nodes are the terminals
+		bool is_side_in_band[2] = {true, true};
+		int max_side_dist[2] = {0, 0};
+		for(int x=0; x<node_count; ++x){
+			if(side(x) != 2){
+				if(dist(x) == -1)
+					is_side_in_band[side(x)] = false;
+				else
+					max_side_dist[side(x)] = std::max(max_side_dist[side(x)], dist(x));
+			}
+		}
+
+		// Every band node x is split into 2*band_id(x) and 2*band_id(x)+1 connected by an arc whose capacity is
+		// the weight of x. All other arcs have infinite capacity. Arc a and a^1 are the back arcs of each other.
+		const int source = 2*band_size, target = 2*band_size+1;
+		const int inf = std::numeric_limits<int>::max()/2;
+		std::vector<int>arc_tail, arc_head, arc_capacity;
+		auto add_arc = [&](int x, int y, int capacity){
+			arc_tail.push_back(x);
+			arc_head.push_back(y);
+			arc_capacity.push_back(capacity);
+			arc_tail.push_back(y);
+			arc_head.push_back(x);
+			arc_capacity.push_back(0);
+		};
+
+		for(int i=0; i<band_size; ++i){
+			int x = band[i];
+			add_arc(2*i, 2*i+1, node_weight(x));
+			if(side(x) != 2 && is_side_in_band[side(x)] && dist(x) == max_side_dist[side(x)]){
+				if(side(x) == 0)
+					add_arc(source, 2*i+1, inf);
+				else
+					add_arc(2*i, target, inf);
+			}
+			bool is_connected_to_source = false, is_connected_to_target = false;
+			for(auto xy:out_arc(x)){
+				int y = head(xy);
+				if(band_id(y) != -1){
+					add_arc(2*i+1, 2*band_id(y), inf);
+				}else if(side(y) == 0){
+					is_connected_to_source = true;
+				}else{
+					is_connected_to_target = true;
+				}
+			}
+			if(is_connected_to_source)
+				add_arc(source, 2*i, inf);
+			if(is_connected_to_target)
+				add_arc(2*i+1, target, inf);
+		}
+
+		const int split_node_count = 2*band_size+2;
+		const int split_arc_count = arc_tail.size();
+		auto split_out_arc = invert_id_id_func(id_id_func(split_arc_count, split_node_count, [&](int a){return arc_tail[a];}));
+
+		std::vector<int>flow(split_arc_count, 0), pred_arc(split_node_count);
+		std::vector<int>queue(split_node_count);
+
+		// If is_forward is false, then the search follows the residual arcs backwards
+		auto search = [&](int root, bool is_forward, std::vector<bool>&was_reached){
+			was_reached.assign(split_node_count, false);
+			int queue_begin = 0, queue_end = 0;
+			queue[queue_end++] = root;
+			was_reached[root] = true;
+			while(queue_begin != queue_end){
+				int x = queue[queue_begin++];
+				for(auto xy:split_out_arc(x)){
+					int residual_arc = is_forward ? xy : (xy^1);
+					int y = arc_head[xy];
+					if(!was_reached[y] && flow[residual_arc] < arc_capacity[residual_arc]){
+						was_reached[y] = true;
+						pred_arc[y] = xy;
+						if(y == target && is_forward)
+							return;
+						queue[queue_end++] = y;
+					}
+				}
+			}
+		};
+
+		std::vector<bool>is_reachable_from_source, can_reach_target;
+		for(;;){
+			search(source, true, is_reachable_from_source);
+			if(!is_reachable_from_source[target])
+				break;
+			int bottleneck = inf;
+			for(int x = target; x != source; x = arc_tail[pred_arc[x]])
+				bottleneck = std::min(bottleneck, arc_capacity[pred_arc[x]] - flow[pred_arc[x]]);
+			for(int x = target; x != source; x = arc_tail[pred_arc[x]]){
+				flow[pred_arc[x]] += bottleneck;
+				flow[pred_arc[x]^1] -= bottleneck;
+			}
+		}
+		search(target, false, can_reach_target);
+
+		// Among the input separator and the minimum cuts closest to the source and to the target, the one with the
+		// smallest expansion, i.e., separator weight divided by smaller side weight, is returned.
+		long long total_weight = 0, separator_weight = 0, outside_weight[2] = {0, 0};
+		for(int x=0; x<node_count; ++x){
+			total_weight += node_weight(x);
+			if(side(x) == 2)
+				separator_weight += node_weight(x);
+			else if(dist(x) == -1)
+				outside_weight[side(x)] += node_weight(x);
+		}
+
+		auto get_expansion = [&](long long cut_weight, long long source_side_weight){
+			long long smaller_side_weight = std::min(source_side_weight, total_weight - cut_weight - source_side_weight);
+			if(smaller_side_weight <= 0)
+				return std::numeric_limits<double>::max();
+			return (double)cut_weight / (double)smaller_side_weight;
+		};
+
+		double best_expansion = get_expansion(separator_weight, side_weight[0]);
+		for(int is_closest_to_source = 0; is_closest_to_source < 2; ++is_closest_to_source){
+			std::vector<int>new_separator;
+			long long new_separator_weight = 0, source_side_weight = outside_weight[0];
+			for(int i=0; i<band_size; ++i){
+				bool is_in_cut, is_on_source_side;
+				if(is_closest_to_source){
+					is_in_cut = is_reachable_from_source[2*i] && !is_reachable_from_source[2*i+1];
+					is_on_source_side = is_reachable_from_source[2*i];
+				}else{
+					is_in_cut = !can_reach_target[2*i] && can_reach_target[2*i+1];
+					is_on_source_side = !can_reach_target[2*i+1];
+				}
+				if(is_in_cut){
+					new_separator.push_back(band[i]);
+					new_separator_weight += node_weight(band[i]);
+				}else if(is_on_source_side){
+					source_side_weight += node_weight(band[i]);
+				}
+			}
+			assert(new_separator_weight <= separator_weight);
+
+			double expansion = get_expansion(new_separator_weight, source_side_weight);
+			if(expansion <= best_expansion){
+				best_expansion = expansion;
+				std::sort(new_separator.begin(), new_separator.end());
+				separator = std::move(new_separator);
+			}
+		}
+		return separator; // NVRO
+	}
+
+	//! Replaces every coarse separator node by the fine nodes contracted into it and refines the result.
+	template<class Tail, class Head, class NodeWeight>
+	std::vector<int> project_and_refine_separator(
+		const Tail&tail, const Head&head, const NodeWeight&node_weight,
+		const ArrayIDIDFunc&fine_to_coarse, const std::vector<int>&coarse_separator, int radius
+	){
+		BitIDFunc in_coarse_separator(fine_to_coarse.image_count());
+		in_coarse_separator.fill(false);
+		for(auto x:coarse_separator)
+			in_coarse_separator.set(x, true);
+
+		std::vector<int>separator;
+		for(int x=0; x<fine_to_coarse.preimage_count(); ++x)
+			if(in_coarse_separator(fine_to_coarse(x)))
+				separator.push_back(x);
+
+		return refine_separator(tail, head, node_weight, std::move(separator), radius);
+	}
+
+	const int refinement_band_radius = 2;
+	const double max_degree_growth = 1.5;
+
+	//! Coarsens the graph until it has at most max_coarse_node_count nodes, until a matching does not shrink it
+	//! noticeably anymore or until a matching increases the average degree by more than max_degree_growth. The
+	//! cuts of graphs that get denser when coarsened, such as hypercubes, are not preserved. compute_coarse_separator(tail, head, arc_weight, node_weight) computes the separator of
+	//! the coarsest graph given as ArrayIDIDFunc and ArrayIDFunc<int>. node_weight(x) is the number of input nodes
+	//! that were contracted into x and should be used to score and balance the cuts. The graph must be connected.
+	template<class Tail, class Head, class ArcWeight, class ComputeCoarseSeparator>
+	std::vector<int> compute_multilevel_separator(
+		const Tail&tail, const Head&head, const ArcWeight&arc_weight,
+		int max_coarse_node_count, const ComputeCoarseSeparator&compute_coarse_separator
+	){
+		const int node_count = tail.image_count();
+
+		ArrayIDFunc<int>node_weight(node_count);
+		node_weight.fill(1);
+
+		std::vector<CoarseGraph>level_list;
+		int current_node_count = node_count;
+		int current_arc_count = tail.preimage_count();
+		while(current_node_count > max_coarse_node_count){
+			CoarseGraph g;
+			if(level_list.empty())
+				g = contract_matching(tail, head, arc_weight, id_func(tail.preimage_count(), [](int){return 1;}), node_weight);
+			else
+				g = contract_matching(level_list.back().tail, level_list.back().head, level_list.back().arc_weight, level_list.back().arc_multiplicity, level_list.back().node_weight);
+
+			int coarse_node_count = g.tail.image_count();
+			int coarse_arc_count = g.tail.preimage_count();
+			if(coarse_node_count > 0.9 * current_node_count)
+				break;
+			if((double)coarse_arc_count / coarse_node_count > max_degree_growth * current_arc_count / current_node_count)
+				break;
+			current_node_count = coarse_node_count;
+			current_arc_count = coarse_arc_count;
+			level_list.push_back(std::move(g));
+		}
+
+		if(level_list.empty())
+			return compute_coarse_separator(ArrayIDIDFunc(tail), ArrayIDIDFunc(head), ArrayIDFunc<int>(arc_weight), node_weight);
+
+		std::vector<int>separator = compute_coarse_separator(level_list.back().tail, level_list.back().head, level_list.back().arc_weight, level_list.back().node_weight);
+
+		for(int i=level_list.size()-1; i>0; --i){
+			separator = project_and_refine_separator(
+				level_list[i-1].tail, level_list[i-1].head, level_list[i-1].node_weight,
+				level_list[i].fine_to_coarse, separator, refinement_band_radius
+			);
+			level_list.pop_back();
+		}
+		return project_and_refine_separator(tail, head, node_weight, level_list[0].fine_to_coarse, separator, refinement_band_radius);
+	}
+}
+
+#endif
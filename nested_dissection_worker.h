@@ -0,0 +1,203 @@
+#ifndef NESTED_DISSECTION_WORKER_H
+#define NESTED_DISSECTION_WORKER_H
+
+#include "min_fill_in.h"
+#include "worker_process_pool.h"
+#include "mapped_file.h"
+#include "io_helper.h"
+#include "permutation.h"
+#include <string>
+#include <vector>
+#include <cstdio>
+#include <functional>
+#include <atomic>
+#include <exception>
+#include <stdexcept>
+#include <cassert>
+#include <unistd.h>
+
+//!
+//! A coordinator process computes the top levels of a CCH order and hands every part with at most
+//! max_part_node_count nodes off to a worker process. Every part is written to its own job file, which the
+//! worker maps into memory. The worker writes the nested dissection order of the part to an order file. The
+//! coordinator waits for all workers and places the part orders at the positions where the nodes of the parts
+//! are in its own order. The result is the same order as if the whole order was computed in one process.
+//!
+//! Job files store the node count and the arc count followed by the tails, the heads and the arc weights as
+//! 32-bit integers. Order files store for every position of the order the node ID in the part as 32-bit integer.
+//!
+
+namespace cch_order{
+
+	struct NestedDissectionJob{
+		ArrayIDIDFunc tail, head;
+		ArrayIDFunc<int>arc_weight;
+	};
+
+	inline
+	void save_nested_dissection_job(const std::string&file_name, const ArrayIDIDFunc&tail, const ArrayIDIDFunc&head, const ArrayIDFunc<int>&arc_weight){
+		save_binary_file(
+			file_name,
+			[&](std::ostream&out){
+				int header[2] = {tail.image_count(), tail.preimage_count()};
+				out
+					.write((const char*)header, sizeof(header))
+					.write((const char*)tail.begin(), sizeof(int)*tail.preimage_count())
+					.write((const char*)head.begin(), sizeof(int)*head.preimage_count())
+					.write((const char*)arc_weight.begin(), sizeof(int)*arc_weight.preimage_count());
+				if(!out)
+					throw std::runtime_error("Could not write "+file_name);
+			}
+		);
+	}
+
+	inline
+	NestedDissectionJob map_nested_dissection_job(const std::string&file_name){
+		auto file = map_file(file_name);
+		if(file->size() < (long long)sizeof(int)*2)
+			throw std::runtime_error(file_name+" is no valid nested dissection job");
+		int*data = reinterpret_cast<int*>(file->data());
+		int node_count = data[0], arc_count = data[1];
+		if(node_count < 0 || arc_count < 0 || file->size() != (long long)sizeof(int)*(2+3*(long long)arc_count))
+			throw std::runtime_error(file_name+" is no valid nested dissection job");
+
+		NestedDissectionJob job;
+		job.tail = ArrayIDIDFunc(arc_count, node_count, data+2, file);
+		job.head = ArrayIDIDFunc(arc_count, node_count, data+2+arc_count, file);
+		job.arc_weight = ArrayIDFunc<int>(arc_count, data+2+2*(long long)arc_count, file);
+		for(int i=0; i<arc_count; ++i)
+			if(job.tail[i] < 0 || job.tail[i] >= node_count || job.head[i] < 0 || job.head[i] >= node_count)
+				throw std::runtime_error(file_name+" contains an invalid node ID");
+		return job; // NVRO
+	}
+
+	inline
+	void save_nested_dissection_job_order(const std::string&file_name, const ArrayIDIDFunc&order){
+		save_binary_file(
+			file_name,
+			[&](std::ostream&out){
+				out.write((const char*)order.begin(), sizeof(int)*order.preimage_count());
+				if(!out)
+					throw std::runtime_error("Could not write "+file_name);
+			}
+		);
+	}
+
+	inline
+	ArrayIDIDFunc load_nested_dissection_job_order(const std::string&file_name, int node_count){
+		auto file = map_file(file_name);
+		if(file->size() != (long long)sizeof(int)*node_count)
+			throw std::runtime_error(file_name+" does not contain the order of a graph with "+std::to_string(node_count)+" nodes");
+		ArrayIDIDFunc order(map_array_id_func<int>(file, 0, node_count), node_count);
+		if(!is_permutation(order))
+			throw std::runtime_error(file_name+" does not contain a permutation");
+		return order; // NVRO
+	}
+
+	// Command server sessions run in the same process and thus every call needs its own file names
+	inline
+	std::string make_nested_dissection_job_file_prefix(const std::string&job_directory){
+		static std::atomic<int>call_count(0);
+		return job_directory + "/nested_dissection_" + std::to_string(getpid()) + "_" + std::to_string(call_count++) + "_";
+	}
+
+	//! get_worker_args(job_file, order_file) returns the console arguments that compute the order of a job.
+	//! Job and order files are created in job_directory and are removed after the order is assembled.
+	template<class ComputeSeparator>
+	ArrayIDIDFunc compute_cch_graph_order_using_worker_processes(
+		ArrayIDIDFunc tail, ArrayIDIDFunc head,
+		ArrayIDFunc<int> arc_weight,
+		const ComputeSeparator&compute_separator,
+		int max_part_node_count,
+		WorkerProcessPool&worker_pool,
+		const std::string&job_directory,
+		const std::function<std::vector<std::string>(const std::string&, const std::string&)>&get_worker_args,
+		int thread_count = 1,
+		int base_case_node_count = 0
+	){
+		struct Job{
+			std::string job_file, order_file;
+			ArrayIDIDFunc input_node_id;
+		};
+		std::vector<Job>job_list;
+
+		const std::string file_prefix = make_nested_dissection_job_file_prefix(job_directory);
+
+		auto remove_job_files = [&]{
+			for(auto&j:job_list){
+				std::remove(j.job_file.c_str());
+				std::remove(j.order_file.c_str());
+			}
+		};
+
+		// Parts are handed off in OpenMP tasks, which an exception must not leave. The first error is rethrown
+		// once the order above the parts is done.
+		std::exception_ptr first_error;
+
+		// A part is replaced by a placeholder order, in which position i contains node i of the part
+		auto hand_off_part = [&](
+			ArrayIDIDFunc a_tail, ArrayIDIDFunc a_head,
+			ArrayIDIDFunc a_input_node_id, ArrayIDFunc<int> a_arc_weight
+		){
+			std::string job_file, order_file;
+			#pragma omp critical (nested_dissection_worker)
+			{
+				std::string name = file_prefix + std::to_string(job_list.size());
+				job_file = name + ".graph";
+				order_file = name + ".order";
+				job_list.push_back({job_file, order_file, a_input_node_id});
+			}
+
+			try{
+				save_nested_dissection_job(job_file, a_tail, a_head, a_arc_weight);
+			}catch(...){
+				#pragma omp critical (nested_dissection_worker)
+				if(first_error == nullptr)
+					first_error = std::current_exception();
+			}
+
+			#pragma omp critical (nested_dissection_worker)
+			if(first_error == nullptr){
+				try{
+					worker_pool.start_process(get_worker_args(job_file, order_file));
+				}catch(...){
+					first_error = std::current_exception();
+				}
+			}
+
+			return a_input_node_id;
+		};
+
+		ArrayIDIDFunc order;
+		try{
+			order = compute_cch_graph_order_above_parts(
+				std::move(tail), std::move(head), std::move(arc_weight),
+				compute_separator, hand_off_part, max_part_node_count,
+				thread_count, base_case_node_count
+			);
+			if(first_error != nullptr)
+				std::rethrow_exception(first_error);
+			worker_pool.wait_for_all_processes();
+
+			auto inv_order = inverse_permutation(order);
+			for(auto&j:job_list){
+				const int part_node_count = j.input_node_id.preimage_count();
+				auto part_order = load_nested_dissection_job_order(j.order_file, part_node_count);
+				for(int i=0; i<part_node_count; ++i)
+					order[inv_order(j.input_node_id(i))] = j.input_node_id(part_order(i));
+			}
+		}catch(...){
+			try{
+				worker_pool.wait_for_all_processes();
+			}catch(...){}
+			remove_job_files();
+			throw;
+		}
+		remove_job_files();
+
+		assert(is_permutation(order));
+		return order; // NVRO
+	}
+}
+
+#endif
@@ -0,0 +1,544 @@
+#ifndef NODE_CAPACITY_CUTTER_H
+#define NODE_CAPACITY_CUTTER_H
+
+#include "flow_cutter.h"
+#include "node_flow_cutter.h"
+#include "cutter_statistics.h"
+#include "tiny_id_func.h"
+#include "array_id_func.h"
+#include "dijkstra.h"
+#include <vector>
+#include <limits>
+#include <algorithm>
+
+namespace flow_cutter{
+
+	//!
+	//! Computes the same cuts as a DistanceAwareCutter on the expanded graph of node_flow_cutter.h but works
+	//! directly on the original graph. Nodes and arcs are identified by their expanded IDs, i.e., x_in, x_out and
+	//! the intra and inter arcs, so that expanded_graph::extract_original_separator works with this cutter.
+	//!
+	//! Every original node and arc carries at most one unit of flow and thus the flow is one bit per original node and
+	//! one bit per original arc. The predecessor of an expanded node is only stored if it does not follow from the flow
+	//! and the distances are only stored for original nodes. Finally, the searches skip the arcs that can neither be
+	//! followed nor carry flow. For example, if the source side reaches an x_in without flow, then the only arc
+	//! that matters is x_in -> x_out. The other arcs of x are only scanned from x_out.
+	//!
+	//! We call an expanded node light with respect to a side if it has this property. For the source side these are
+	//! the in nodes and for the target side these are the out nodes. Flow is conserved outside of the assimilated
+	//! sets and therefore a light node with flow has exactly one inter arc that matters.
+	//!
+	class NodeCapacityCutter{
+	private:
+		struct NodeSet{
+			NodeSet(){}
+			explicit NodeSet(int expanded_node_count):
+				node_count_inside(0), inside_flag(expanded_node_count), extra_node(-1){}
+
+			void clear(){
+				node_count_inside = 0;
+				inside_flag.fill(false);
+			}
+
+			bool can_grow()const{
+				return extra_node != -1;
+			}
+
+			void set_extra_node(int x){
+				assert(!inside_flag(x));
+				assert(extra_node == -1);
+				inside_flag.set(x, true);
+				++node_count_inside;
+				extra_node = x;
+			}
+
+			bool is_inside(int x)const{
+				return inside_flag(x);
+			}
+
+			int node_count_inside;
+			BitIDFunc inside_flag;
+			int extra_node;
+		};
+
+	public:
+		static const int source_side = BasicCutter::source_side;
+		static const int target_side = BasicCutter::target_side;
+
+		template<class Graph>
+		explicit NodeCapacityCutter(const Graph&graph):
+			node_count(graph.node_count()),
+			arc_count(graph.arc_count()),
+			assimilated{NodeSet(expanded_graph::expanded_node_count(node_count)), NodeSet(expanded_graph::expanded_node_count(node_count))},
+			reachable{NodeSet(expanded_graph::expanded_node_count(node_count)), NodeSet(expanded_graph::expanded_node_count(node_count))},
+			predecessor{
+				PackedIntIDFunc(node_count, get_bit_count_of(expanded_graph::expanded_arc_count(node_count, arc_count)-1)),
+				PackedIntIDFunc(node_count, get_bit_count_of(expanded_graph::expanded_arc_count(node_count, arc_count)-1))
+			},
+			node_flow(node_count),
+			arc_flow(arc_count),
+			dist_type(DistanceType::no_distance),
+			cut_available(false){}
+
+		//! The searches need a TemporaryData object with room for every expanded node.
+		template<class Graph>
+		static int get_temporary_node_count(const Graph&graph){
+			return expanded_graph::expanded_node_count(graph.node_count());
+		}
+
+		//! p contains expanded nodes, see expanded_graph::expand_source_target_pair_list.
+		template<class Graph, class SearchAlgorithm>
+		void init(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo, DistanceType dist_type, SourceTargetPair p, int random_seed){
+			(void)random_seed;
+			{
+				CutterStatisticsTimer timer(statistics.init_time_ns);
+				if(collect_cutter_statistics)
+					++statistics.init_count;
+
+				for(int side = 0; side < 2; ++side){
+					assimilated[side].clear();
+					reachable[side].clear();
+					front[side].clear();
+				}
+				node_flow.fill(false);
+				arc_flow.fill(false);
+
+				assimilated[source_side].set_extra_node(p.source);
+				reachable[source_side].set_extra_node(p.source);
+				assimilated[target_side].set_extra_node(p.target);
+				reachable[target_side].set_extra_node(p.target);
+
+				grow_reachable_sets(graph, tmp, search_algo, source_side);
+				grow_assimilated_sets(graph, tmp, search_algo);
+
+				cut_available = true;
+			}
+
+			CutterStatisticsTimer timer(statistics.distance_time_ns);
+			this->dist_type = dist_type;
+			int terminal[2] = {p.source, p.target};
+			for(int side = 0; side < 2; ++side){
+				distance_source_out_flag[side] = expanded_graph::get_expanded_node_out_flag(terminal[side]);
+				int original_terminal = expanded_graph::expanded_node_to_original_node(terminal[side]);
+				compute_packed_distance_from(graph, tmp, dist_type, original_terminal, node_dist[side]);
+			}
+		}
+
+		//! Returns true if a new cut was found. Returns false if no cut was found. False implies that no cut
+		//! will be found in the future.
+		template<class Graph, class SearchAlgorithm, class ScorePierceNode>
+		bool advance(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo, const ScorePierceNode&score_pierce_node){
+			assert(cut_available);
+
+			CutterStatisticsTimer timer(statistics.advance_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.advance_count;
+
+			int side = get_current_cut_side();
+			if(assimilated[side].node_count_inside >= get_node_count()/2){
+				cut_available = false;
+				return false;
+			}
+
+			int pierce_node = select_pierce_node(graph, side, score_pierce_node);
+
+			if(pierce_node == -1){
+				cut_available = false;
+				return false;
+			}
+
+			assert(!assimilated[1-side].is_inside(pierce_node));
+
+			assimilated[side].set_extra_node(pierce_node);
+			reachable[side].set_extra_node(pierce_node);
+
+			grow_reachable_sets(graph, tmp, search_algo, side);
+			grow_assimilated_sets(graph, tmp, search_algo);
+			cut_available = true;
+			return true;
+		}
+
+		bool is_cut_available()const{
+			return cut_available;
+		}
+
+		template<class Graph, class ScorePierceNode>
+		bool does_next_advance_increase_cut(const Graph&graph, const ScorePierceNode&score_pierce_node){
+			int side = get_current_cut_side();
+
+			if(assimilated[side].node_count_inside >= get_node_count()/2)
+				return true;
+
+			int pierce_node = select_pierce_node(graph, side, score_pierce_node);
+
+			if(pierce_node == -1)
+				return true;
+			else if(reachable[1-side].is_inside(pierce_node))
+				return true;
+			else
+				return false;
+		}
+
+		int get_current_cut_side()const{
+			if(
+				reachable[source_side].node_count_inside == assimilated[source_side].node_count_inside && (
+					reachable[target_side].node_count_inside != assimilated[target_side].node_count_inside ||
+					assimilated[source_side].node_count_inside <= assimilated[target_side].node_count_inside
+				)
+			)
+				return source_side;
+			else
+				return target_side;
+		}
+
+		//! In expanded nodes.
+		int get_current_smaller_cut_side_size()const{
+			return assimilated[get_current_cut_side()].node_count_inside;
+		}
+
+		//! In expanded arcs.
+		const std::vector<int>&get_current_cut()const{
+			return front[get_current_cut_side()];
+		}
+
+		int get_assimilated_node_count()const{
+			return assimilated[source_side].node_count_inside + assimilated[target_side].node_count_inside;
+		}
+
+		//! x is an expanded node.
+		bool is_on_smaller_side(int x)const{
+			return assimilated[get_current_cut_side()].is_inside(x);
+		}
+
+		//! In expanded nodes.
+		int get_node_count()const{
+			return expanded_graph::expanded_node_count(node_count);
+		}
+
+		const CutterStatistics&get_statistics()const{
+			return statistics;
+		}
+
+	private:
+		bool is_light(int side, int x)const{
+			return expanded_graph::get_expanded_node_out_flag(x) == (side == target_side);
+		}
+
+		template<class Graph>
+		int get_expanded_tail(const Graph&graph, int xy)const{
+			bool tail_out_flag = expanded_graph::get_expanded_arc_tail_out_flag(xy);
+			if(expanded_graph::is_expanded_intra_arc(xy, arc_count))
+				return expanded_graph::original_node_to_expanded_node(expanded_graph::expanded_intra_arc_to_original_node(xy, arc_count), tail_out_flag);
+			else
+				return expanded_graph::original_node_to_expanded_node(graph.tail(expanded_graph::expanded_inter_arc_to_original_arc(xy, arc_count)), tail_out_flag);
+		}
+
+		template<class Graph>
+		int get_expanded_head(const Graph&graph, int xy)const{
+			bool head_out_flag = !expanded_graph::get_expanded_arc_tail_out_flag(xy);
+			if(expanded_graph::is_expanded_intra_arc(xy, arc_count))
+				return expanded_graph::original_node_to_expanded_node(expanded_graph::expanded_intra_arc_to_original_node(xy, arc_count), head_out_flag);
+			else
+				return expanded_graph::original_node_to_expanded_node(graph.head(expanded_graph::expanded_inter_arc_to_original_arc(xy, arc_count)), head_out_flag);
+		}
+
+		template<class Graph>
+		int get_expanded_arc_weight(const Graph&graph, int xy)const{
+			if(expanded_graph::is_expanded_intra_arc(xy, arc_count))
+				return 0;
+			else
+				return graph.arc_weight(expanded_graph::expanded_inter_arc_to_original_arc(xy, arc_count));
+		}
+
+		//! The flow of the inter arc of a that leaves the in node (tail_out_flag = false) or out node (tail_out_flag = true)
+		//! of tail(a) is nonzero. x_out -> y_in carries the flow of a and x_in -> y_out the negated flow of the back arc.
+		template<class Graph>
+		bool has_inter_arc_flow(const Graph&graph, int a, bool tail_out_flag)const{
+			if(tail_out_flag)
+				return arc_flow(a);
+			else
+				return arc_flow(graph.back_arc(a));
+		}
+
+		int get_expanded_node_distance(int side, int x)const{
+			if(dist_type == DistanceType::no_distance)
+				return 0;
+			int d = node_dist[side](expanded_graph::expanded_node_to_original_node(x));
+			// Every expanded arc toggles the out flag and the intra arcs allow to stay at a node. Hence, the hop
+			// distance is the original distance rounded up to the parity of the out flags.
+			if(dist_type == DistanceType::hop_distance && d != std::numeric_limits<int>::max())
+				d += (d + expanded_graph::get_expanded_node_out_flag(x) + distance_source_out_flag[side]) & 1;
+			return d;
+		}
+
+		static bool is_breadth_first_search(const PseudoDepthFirstSearch&){
+			return false;
+		}
+
+		static bool is_breadth_first_search(const BreadthFirstSearch&){
+			return true;
+		}
+
+		//! Runs search_algo on the residual expanded graph of side starting at the extra node of node_set.
+		//! see_node(y, xy) is called when y is reached over xy. If it returns false, the search stops.
+		//! on_new_arc(xy, has_flow) is called for every scanned arc.
+		template<class Graph, class SearchAlgorithm, class SeeNode, class OnNewArc>
+		void grow(
+			const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo,
+			NodeSet&node_set, int side, const SeeNode&see_node, const OnNewArc&on_new_arc
+		){
+			assert(node_set.can_grow());
+
+			const bool is_queue = is_breadth_first_search(search_algo);
+			auto&space = tmp.node_space;
+			int begin = 0, end = 1;
+			space[0] = node_set.extra_node;
+			node_set.extra_node = -1;
+
+			auto scan_arc = [&](int xy, int y, bool is_residual, bool has_flow){
+				on_new_arc(xy, has_flow);
+				if(is_residual && !node_set.is_inside(y)){
+					node_set.inside_flag.set(y, true);
+					++node_set.node_count_inside;
+					if(!see_node(y, xy))
+						return false;
+					space[end++] = y;
+				}
+				return true;
+			};
+
+			// Flow need not be conserved at the extra node and therefore all its arcs are scanned.
+			bool is_extra_node = true;
+
+			while(begin != end){
+				int x = is_queue ? space[begin++] : space[--end];
+				int v = expanded_graph::expanded_node_to_original_node(x);
+				bool out_flag = expanded_graph::get_expanded_node_out_flag(x);
+				bool light = is_light(side, x);
+				bool v_flow = node_flow(v);
+
+				if(!scan_arc(
+					expanded_graph::original_node_to_expanded_intra_arc(v, out_flag, arc_count),
+					expanded_graph::original_node_to_expanded_node(v, !out_flag),
+					light ? !v_flow : v_flow, v_flow
+				))
+					return;
+
+				if(!light || v_flow || is_extra_node){
+					for(auto a : graph.out_arc(v)){
+						bool a_flow = has_inter_arc_flow(graph, a, out_flag);
+						if(light && !a_flow)
+							continue;
+						if(!scan_arc(
+							expanded_graph::original_arc_to_expanded_inter_arc(a, out_flag, arc_count),
+							expanded_graph::original_node_to_expanded_node(graph.head(a), !out_flag),
+							light ? a_flow : !a_flow, a_flow
+						))
+							return;
+						if(light && !is_extra_node)
+							break;
+					}
+				}
+				is_extra_node = false;
+			}
+		}
+
+		//! Returns the arc over which the search of side reached x. Only the predecessors of light nodes are stored.
+		//! A heavy node without flow was reached from its light twin and a heavy node with flow over the reversed
+		//! inter arc that carries its flow.
+		template<class Graph>
+		int get_predecessor(const Graph&graph, int side, int x)const{
+			int v = expanded_graph::expanded_node_to_original_node(x);
+			if(is_light(side, x))
+				return predecessor[side](v);
+			if(!node_flow(v))
+				return expanded_graph::original_node_to_expanded_intra_arc(v, side == target_side, arc_count);
+			bool out_flag = expanded_graph::get_expanded_node_out_flag(x);
+			for(auto a : graph.out_arc(v))
+				if(has_inter_arc_flow(graph, a, out_flag))
+					return expanded_graph::original_arc_to_expanded_inter_arc(graph.back_arc(a), side == target_side, arc_count);
+			assert(false && "Flow must be conserved outside of the assimilated sides");
+			return -1;
+		}
+
+		template<class Graph>
+		void change_flow(const Graph&graph, int xy, bool increase){
+			bool tail_out_flag = expanded_graph::get_expanded_arc_tail_out_flag(xy);
+			if(expanded_graph::is_expanded_intra_arc(xy, arc_count)){
+				// x_in -> x_out carries the flow of x and x_out -> x_in the negated flow
+				int v = expanded_graph::expanded_intra_arc_to_original_node(xy, arc_count);
+				assert(node_flow(v) == (tail_out_flag == increase) && "Node flow out of bounds");
+				node_flow.set(v, tail_out_flag != increase);
+			}else{
+				int a = expanded_graph::expanded_inter_arc_to_original_arc(xy, arc_count);
+				if(tail_out_flag){
+					assert(arc_flow(a) != increase && "Arc flow out of bounds");
+					arc_flow.set(a, increase);
+				}else{
+					int b = graph.back_arc(a);
+					assert(arc_flow(b) == increase && "Arc flow out of bounds");
+					arc_flow.set(b, !increase);
+				}
+			}
+		}
+
+		template<class Graph, class ScorePierceNode>
+		int select_pierce_node(const Graph&graph, int side, const ScorePierceNode&score_pierce_node){
+			CutterStatisticsTimer timer(statistics.pierce_node_selection_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.pierce_node_selection_count;
+
+			int pierce_node = -1;
+			int max_score = std::numeric_limits<int>::min();
+			for(auto xy : front[side]){
+				int y = get_expanded_head(graph, xy);
+				if(!assimilated[1-side].is_inside(y)){
+					if(collect_cutter_statistics)
+						++statistics.pierce_node_candidate_count;
+					int score = score_pierce_node(
+						y, side, reachable[1-side].is_inside(y), get_expanded_arc_weight(graph, xy),
+						get_expanded_node_distance(side, y), get_expanded_node_distance(1-side, y)
+					);
+
+					if(score > max_score){
+						max_score = score;
+						pierce_node = y;
+					}
+				}
+			}
+
+			return pierce_node;
+		}
+
+		template<class Graph, class SearchAlgorithm>
+		void grow_reachable_sets(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo, int pierced_side){
+			CutterStatisticsTimer timer(statistics.grow_reachable_sets_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.grow_reachable_sets_count;
+
+			int my_source_side = pierced_side;
+			int my_target_side = 1-pierced_side;
+
+			assert(reachable[pierced_side].can_grow());
+
+			auto on_new_arc = [&](int xy, bool has_flow){
+				if(collect_cutter_statistics)
+					++statistics.grow_reachable_sets_arc_count;
+			};
+
+			bool was_flow_augmented = false;
+
+			int target_hit, target_hit_arc;
+			do{
+				long long search_begin = get_cutter_statistics_time();
+				target_hit = -1;
+				auto see_node = [&](int x, int xy){
+					if(collect_cutter_statistics)
+						++statistics.grow_reachable_sets_node_count;
+					if(assimilated[my_target_side].is_inside(x)){
+						target_hit = x;
+						target_hit_arc = xy;
+						return false;
+					}
+					if(is_light(my_source_side, x))
+						predecessor[my_source_side].set(expanded_graph::expanded_node_to_original_node(x), xy);
+					return true;
+				};
+				grow(graph, tmp, search_algo, reachable[my_source_side], my_source_side, see_node, on_new_arc);
+
+				if(target_hit != -1){
+					// The predecessors of heavy nodes follow from the flow and thus the path is collected before the flow is changed.
+					auto&path = tmp.node_space;
+					int path_arc_count = 0;
+					int xy = target_hit_arc;
+					for(;;){
+						path[path_arc_count++] = xy;
+						int x = get_expanded_tail(graph, xy);
+						if(assimilated[my_source_side].is_inside(x))
+							break;
+						xy = get_predecessor(graph, my_source_side, x);
+					}
+					for(int i=0; i<path_arc_count; ++i)
+						change_flow(graph, path[i], pierced_side == source_side);
+
+					reachable[my_source_side] = assimilated[my_source_side];
+					was_flow_augmented = true;
+
+					if(collect_cutter_statistics){
+						++statistics.augmenting_path_count;
+						statistics.augmenting_path_arc_count += path_arc_count;
+					}
+					statistics.augmenting_path_time_ns += get_cutter_statistics_time() - search_begin;
+				}
+			}while(target_hit != -1);
+
+			if(was_flow_augmented){
+				reachable[my_target_side] = assimilated[my_target_side];
+				auto see_node = [&](int x, int xy){
+					if(collect_cutter_statistics)
+						++statistics.grow_reachable_sets_node_count;
+					if(is_light(my_target_side, x))
+						predecessor[my_target_side].set(expanded_graph::expanded_node_to_original_node(x), xy);
+					return true;
+				};
+				grow(graph, tmp, search_algo, reachable[my_target_side], my_target_side, see_node, on_new_arc);
+			}
+		}
+
+		template<class Graph, class SearchAlgorithm>
+		void grow_assimilated_sets(const Graph&graph, TemporaryData&tmp, const SearchAlgorithm&search_algo){
+			CutterStatisticsTimer timer(statistics.grow_assimilated_sets_time_ns);
+			if(collect_cutter_statistics)
+				++statistics.grow_assimilated_sets_count;
+
+			int side;
+			if(reachable[source_side].node_count_inside <= reachable[target_side].node_count_inside)
+				side = source_side;
+			else
+				side = target_side;
+
+			auto see_node = [&](int x, int xy){
+				if(collect_cutter_statistics)
+					++statistics.grow_assimilated_sets_node_count;
+				return true;
+			};
+			auto on_new_arc = [&](int xy, bool has_flow){
+				if(collect_cutter_statistics)
+					++statistics.grow_assimilated_sets_arc_count;
+				if(has_flow)
+					front[side].push_back(xy);
+			};
+			grow(graph, tmp, search_algo, assimilated[side], side, see_node, on_new_arc);
+
+			front[side].erase(
+				std::remove_if(
+					front[side].begin(), front[side].end(),
+					[&](int xy){ return assimilated[side].is_inside(get_expanded_head(graph, xy)); }
+				),
+				front[side].end()
+			);
+		}
+
+		int node_count, arc_count;
+
+		NodeSet assimilated[2], reachable[2];
+		std::vector<int>front[2];
+		PackedIntIDFunc predecessor[2];
+
+		BitIDFunc node_flow, arc_flow;
+
+		DistanceType dist_type;
+		PackedDistanceArray node_dist[2];
+		bool distance_source_out_flag[2];
+
+		bool cut_available;
+		CutterStatistics statistics;
+	};
+
+	template<class Graph>
+	SimpleCutter<Graph, NodeCapacityCutter> make_simple_node_capacity_cutter(const Graph&graph, Config config){
+		return SimpleCutter<Graph, NodeCapacityCutter>(graph, config);
+	}
+}
+
+#endif
@@ -49,7 +49,7 @@ void save_binary_permutation_impl(std::ostream&out, const ArrayIDIDFunc&order){
 }
 
 ArrayIDIDFunc load_permutation(const std::string&file_name){
-	return load_cached_text_file(file_name, "dimacs", load_permutation_impl, load_binary_permutation_impl, save_binary_permutation_impl);
+	return load_cached_text_file(file_name, "permutation", load_permutation_impl, load_binary_permutation_impl, save_binary_permutation_impl);
 }
 
 ArrayIDIDFunc uncached_load_permutation(const std::string&file_name){
@@ -0,0 +1,205 @@
+#ifndef PUSH_RELABEL_H
+#define PUSH_RELABEL_H
+
+#include "tiny_id_func.h"
+#include "array_id_func.h"
+#include <algorithm>
+#include <cassert>
+
+namespace max_flow{
+
+	//!
+	//! FIFO push-relabel with global relabeling for unit capacities. Every arc xy and its back arc yx can carry one
+	//! unit in each direction. The labels are recomputed from scratch using a backward breadth first search from
+	//! the targets whenever the relabels since the last global relabel have scanned about 6n+m arcs.
+	//!
+	//! The first phase computes a maximum preflow. The second phase sends the excess that cannot reach a target
+	//! back to the sources. The result is a maximum flow using the same saturated flags as the augmenting path
+	//! algorithms. As the set of nodes reachable from the sources in the residual graph is the same for every
+	//! maximum flow, the cut extracted from the result is the same as for the other algorithms.
+	//!
+	template<class InvTail, class Head, class BackArc, class Source, class Target>
+	BitIDFunc compute_maximum_unit_flow_using_push_relabel(
+		const InvTail&inv_tail, const Head&head, const BackArc&back_arc,
+		const Source&source_list, const Target&target_list
+	){
+		const int node_count = head.image_count();
+		const int arc_count = head.preimage_count();
+
+		BitIDFunc is_source(node_count);
+		is_source.fill(false);
+		for(int i=0; i<source_list.preimage_count(); ++i)
+			is_source.set(source_list(i), true);
+
+		BitIDFunc is_target(node_count);
+		is_target.fill(false);
+		for(int i=0; i<target_list.preimage_count(); ++i)
+			is_target.set(target_list(i), true);
+
+		// flow(xy) is -1, 0 or 1 and flow(back_arc(xy)) == -flow(xy). xy has residual capacity if flow(xy) < 1.
+		ArrayIDFunc<signed char>flow(arc_count);
+		flow.fill(0);
+
+		ArrayIDFunc<int>excess(node_count);
+		excess.fill(0);
+
+		// Nodes with a label of node_count cannot reach a target in the residual graph
+		ArrayIDFunc<int>label(node_count);
+
+		// Offset of the next arc in inv_tail(x) that is checked for a push
+		ArrayIDFunc<int>current_arc(node_count);
+
+		auto out_deg = [&](int x){
+			return static_cast<int>(std::end(inv_tail(x)) - std::begin(inv_tail(x)));
+		};
+
+		auto arc_at = [&](int x, int i){
+			assert(0 <= i && i < out_deg(x));
+			return *(std::begin(inv_tail(x)) + i);
+		};
+
+		ArrayIDFunc<int>queue(node_count);
+		int queue_begin = 0;
+		int queue_size = 0;
+		BitIDFunc is_in_queue(node_count);
+		is_in_queue.fill(false);
+
+		auto enqueue = [&](int x){
+			assert(!is_in_queue(x));
+			int pos = queue_begin + queue_size;
+			if(pos >= node_count)
+				pos -= node_count;
+			queue[pos] = x;
+			++queue_size;
+			is_in_queue.set(x, true);
+		};
+
+		auto dequeue = [&]{
+			int x = queue(queue_begin);
+			++queue_begin;
+			if(queue_begin == node_count)
+				queue_begin = 0;
+			--queue_size;
+			is_in_queue.set(x, false);
+			return x;
+		};
+
+		auto is_active = [&](int x){
+			return excess(x) > 0 && !is_source(x) && !is_target(x) && label(x) < node_count;
+		};
+
+		ArrayIDFunc<int>bfs_queue(node_count);
+
+		auto global_relabel = [&]{
+			label.fill(node_count);
+			int bfs_queue_begin = 0, bfs_queue_end = 0;
+			for(int i=0; i<target_list.preimage_count(); ++i){
+				auto t = target_list(i);
+				if(!is_source(t) && label(t) != 0){
+					label[t] = 0;
+					bfs_queue[bfs_queue_end++] = t;
+				}
+			}
+			while(bfs_queue_begin != bfs_queue_end){
+				auto y = bfs_queue(bfs_queue_begin++);
+				for(auto yx:inv_tail(y)){
+					auto x = head(yx);
+					if(label(x) == node_count && !is_source(x) && flow(back_arc(yx)) < 1){
+						label[x] = label(y) + 1;
+						bfs_queue[bfs_queue_end++] = x;
+					}
+				}
+			}
+			current_arc.fill(0);
+		};
+
+		for(int i=0; i<source_list.preimage_count(); ++i){
+			auto s = source_list(i);
+			for(auto sy:inv_tail(s)){
+				auto y = head(sy);
+				if(!is_source(y)){
+					flow[sy] = 1;
+					flow[back_arc(sy)] = -1;
+					++excess[y];
+				}
+			}
+		}
+
+		global_relabel();
+		for(int x=0; x<node_count; ++x)
+			if(is_active(x))
+				enqueue(x);
+
+		const long long global_relabel_work = 6*(long long)node_count + arc_count;
+		long long work_since_global_relabel = 0;
+
+		while(queue_size != 0){
+			auto x = dequeue();
+			while(excess(x) > 0 && label(x) < node_count){
+				if(current_arc(x) == out_deg(x)){
+					int new_label = node_count;
+					for(auto xy:inv_tail(x))
+						if(flow(xy) < 1)
+							new_label = std::min(new_label, label(head(xy))+1);
+					assert(new_label > label(x));
+					label[x] = new_label;
+					current_arc[x] = 0;
+					work_since_global_relabel += out_deg(x) + 12;
+				}else{
+					auto xy = arc_at(x, current_arc(x));
+					auto y = head(xy);
+					if(flow(xy) < 1 && label(x) == label(y)+1){
+						++flow[xy];
+						--flow[back_arc(xy)];
+						--excess[x];
+						++excess[y];
+						if(is_active(y) && !is_in_queue(y))
+							enqueue(y);
+					}else{
+						++current_arc[x];
+					}
+				}
+			}
+
+			if(work_since_global_relabel >= global_relabel_work){
+				work_since_global_relabel = 0;
+				global_relabel();
+				// Nodes that can no longer reach a target stay in the queue and are skipped once they are dequeued
+			}
+		}
+
+		// The remaining excess is sent back along arcs that carry flow into the node. As every such step removes
+		// one unit of flow from an arc, this terminates even if the flow contains cycles.
+		current_arc.fill(0);
+		for(int x=0; x<node_count; ++x){
+			if(is_source(x) || is_target(x))
+				continue;
+			while(excess(x) > 0){
+				auto y = x;
+				while(!is_source(y)){
+					while(flow(arc_at(y, current_arc(y))) != -1)
+						++current_arc[y];
+					auto yz = arc_at(y, current_arc(y));
+					auto z = head(yz);
+					flow[yz] = 0;
+					flow[back_arc(yz)] = 0;
+					--excess[y];
+					++excess[z];
+					y = z;
+				}
+			}
+		}
+
+		#ifndef NDEBUG
+		for(int x=0; x<node_count; ++x)
+			assert(is_source(x) || is_target(x) || excess(x) == 0);
+		#endif
+
+		BitIDFunc is_saturated(arc_count);
+		for(int xy=0; xy<arc_count; ++xy)
+			is_saturated.set(xy, flow(xy) == 1);
+		return is_saturated; // NVRO
+	}
+}
+
+#endif
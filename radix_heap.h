@@ -0,0 +1,169 @@
+#ifndef RADIX_HEAP_H
+#define RADIX_HEAP_H
+
+#include <vector>
+#include <cassert>
+#include <limits>
+#include <type_traits>
+
+//! A monotone min priority queue for non-negative integer keys with the interface of min_id_heap. The key of
+//! a pushed element must not be smaller than the key of the last popped element. This holds for Dijkstra if
+//! no arc weight is negative.
+//!
+//! An element is stored in the bucket given by the highest bit in which its key differs from the last popped
+//! key. Bucket 0 contains the elements whose key equals the last popped key. If bucket 0 is empty, pop finds
+//! the first nonempty bucket, makes its minimum the last popped key and distributes the bucket onto the
+//! lower buckets. Every element moves at most once per bit and thus pop takes O(log C) amortized time,
+//! where C is the largest key difference, instead of O(log n).
+template<class keyT>
+class min_id_radix_heap{
+public:
+	typedef keyT key_type;
+
+	static_assert(std::is_integral<key_type>::value, "a radix heap requires integer keys");
+
+	explicit min_id_radix_heap(int id_count = 0):
+		key(id_count), bucket_of(id_count, -1), pos_in_bucket(id_count), element_count(0), last_popped_key(0){}
+
+	void clear(){
+		for(auto&b:bucket){
+			for(auto id:b)
+				bucket_of[id] = -1;
+			b.clear();
+		}
+		element_count = 0;
+		last_popped_key = 0;
+	}
+
+	bool empty()const{
+		return element_count == 0;
+	}
+
+	int size()const{
+		return element_count;
+	}
+
+	bool contains(int id)const{
+		assert(0 <= id && id < (int)bucket_of.size() && "id out of bounds");
+		return bucket_of[id] != -1;
+	}
+
+	const key_type&get_key(int id)const{
+		assert(contains(id) && "id must be in the heap");
+		return key[id];
+	}
+
+	void push(int id, key_type k){
+		assert(!contains(id) && "id is already in the heap");
+		assert(k >= last_popped_key && "key is smaller than the last popped key");
+		key[id] = k;
+		insert(id);
+		++element_count;
+	}
+
+	//! Returns true if the element was pushed or its key was decreased.
+	bool push_or_decrease_key(int id, key_type k){
+		if(!contains(id)){
+			push(id, k);
+			return true;
+		}else if(k < key[id]){
+			assert(k >= last_popped_key && "key is smaller than the last popped key");
+			remove(id);
+			key[id] = k;
+			insert(id);
+			return true;
+		}else{
+			return false;
+		}
+	}
+
+	key_type peek_min_key()const{
+		assert(!empty() && "heap is not empty");
+		for(auto&b:bucket){
+			if(!b.empty()){
+				key_type min_key = key[b[0]];
+				for(auto id:b)
+					if(key[id] < min_key)
+						min_key = key[id];
+				return min_key;
+			}
+		}
+		assert(false);
+		return last_popped_key;
+	}
+
+	int pop(){
+		assert(!empty() && "heap is not empty");
+
+		if(bucket[0].empty()){
+			int i = 1;
+			while(bucket[i].empty())
+				++i;
+
+			key_type min_key = key[bucket[i][0]];
+			for(auto id:bucket[i])
+				if(key[id] < min_key)
+					min_key = key[id];
+			last_popped_key = min_key;
+
+			// swap instead of move to keep the memory of both vectors
+			redistribute_buffer.swap(bucket[i]);
+			for(auto id:redistribute_buffer)
+				insert(id);
+			redistribute_buffer.clear();
+		}
+
+		int id = bucket[0].back();
+		bucket[0].pop_back();
+		bucket_of[id] = -1;
+		--element_count;
+		return id;
+	}
+
+private:
+	typedef typename std::make_unsigned<key_type>::type unsigned_key_type;
+	static constexpr int bucket_count = std::numeric_limits<unsigned_key_type>::digits + 1;
+
+	int get_bucket(key_type k)const{
+		unsigned_key_type diff = static_cast<unsigned_key_type>(k) ^ static_cast<unsigned_key_type>(last_popped_key);
+		if(diff == 0)
+			return 0;
+		#ifdef __GNUC__
+		return std::numeric_limits<unsigned long long>::digits - __builtin_clzll(diff);
+		#else
+		int b = 0;
+		while(diff != 0){
+			++b;
+			diff >>= 1;
+		}
+		return b;
+		#endif
+	}
+
+	void insert(int id){
+		int b = get_bucket(key[id]);
+		bucket_of[id] = b;
+		pos_in_bucket[id] = bucket[b].size();
+		bucket[b].push_back(id);
+	}
+
+	void remove(int id){
+		auto&b = bucket[bucket_of[id]];
+		int pos = pos_in_bucket[id];
+		int last = b.back();
+		b[pos] = last;
+		pos_in_bucket[last] = pos;
+		b.pop_back();
+		bucket_of[id] = -1;
+	}
+
+	std::vector<key_type>key;
+	std::vector<int>bucket_of;
+	std::vector<int>pos_in_bucket;
+	std::vector<int>bucket[bucket_count];
+	std::vector<int>redistribute_buffer;
+	int element_count;
+	key_type last_popped_key;
+};
+
+#endif
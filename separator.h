@@ -2,44 +2,206 @@
 #define SEPARATOR_H
 
 #include "node_flow_cutter.h"
+#include "node_capacity_cutter.h"
 #include "flow_cutter.h"
 #include "flow_cutter_config.h"
+#include "multilevel_separator.h"
+#include "separator_call.h"
+#include "cancellation.h"
 #include "union_find.h"
 #include "tiny_id_func.h"
 #include "min_max.h"
 #include "timer.h"
 
+#include <string>
+#include <memory>
+#include <atomic>
+#include <cmath>
+#include <limits>
+
 namespace flow_cutter{
 
+	//! Spreads Config::time_budget over the separator computations of one nested dissection. The budget starts
+	//! when the ComputeSeparator is created and the first graph passed to it is the top level graph.
+	//!
+	//! The schedule assumes that computing a separator of a graph with n nodes costs about n^1.5, i.e., that a
+	//! graph with n of the N top level nodes is reached with a fraction sqrt(n/N) of the budget remaining and
+	//! that the separator itself needs a fraction 1-1/sqrt(2) of the work below it. Computations behind this
+	//! schedule use proportionally fewer cutters. Every computation may enumerate cuts for its share of the
+	//! remaining budget and afterwards stops at the first cut that is balanced enough. The budget only limits
+	//! the effort, an order is always computed, even if the budget is too small for that.
+	class SeparatorTimeBudget{
+	public:
+		explicit SeparatorTimeBudget(double seconds):
+			begin(get_micro_time()), budget((long long)(seconds*1000000.0)), top_level_node_count(0){}
+
+		//! Returns the number of cutters for a graph with node_count nodes and sets deadline to the time after
+		//! which no further cuts should be enumerated.
+		int get_allowance(int node_count, int cutter_count, long long&deadline){
+			int expected = 0;
+			top_level_node_count.compare_exchange_strong(expected, node_count);
+			int top = std::max(top_level_node_count.load(), node_count);
+
+			long long now = get_micro_time();
+			long long remaining = budget - (now - begin);
+			if(remaining <= 0){
+				deadline = now;
+				return 1;
+			}
+
+			double part = (double)node_count / top;
+			double planned_remaining = budget * std::sqrt(part);
+
+			deadline = now + (long long)(remaining * part * (1.0 - std::sqrt(0.5)));
+
+			if(remaining < planned_remaining)
+				cutter_count = std::max(1, (int)(cutter_count * (remaining / planned_remaining)));
+			return cutter_count;
+		}
+
+	private:
+		long long begin, budget;
+		std::atomic<int>top_level_node_count;
+	};
+
 	class ComputeSeparator{
 	public:
-		explicit ComputeSeparator(Config config):config(config){}
+		explicit ComputeSeparator(Config config):config(config){
+			if(config.time_budget > 0)
+				time_budget = std::make_shared<SeparatorTimeBudget>(config.time_budget);
+		}
 
 		template<class Tail, class Head, class InputNodeID, class ArcWeight>
-		std::vector<int> operator()(const Tail&tail, const Head&head, const InputNodeID&, const ArcWeight&arc_weight)const{
+		std::vector<int> operator()(const Tail&tail, const Head&head, const InputNodeID&input_node_id, const ArcWeight&arc_weight)const{
+			CutterStatistics statistics;
+			return (*this)(tail, head, input_node_id, arc_weight, statistics);
+		}
+
+		//! Also returns the statistics of the cutter, see cutter_statistics.h.
+		template<class Tail, class Head, class InputNodeID, class ArcWeight>
+		std::vector<int> operator()(const Tail&tail, const Head&head, const InputNodeID&input_node_id, const ArcWeight&arc_weight, CutterStatistics&statistics)const{
+			auto out_arc = invert_sorted_id_id_func(tail);
+			auto back_arc = compute_back_arc_permutation(tail, head);
+			return (*this)(tail, head, out_arc, back_arc, input_node_id, arc_weight, statistics);
+		}
+
+		//! Uses the given out_arc and back_arc instead of computing them, see separator_call.h.
+		template<class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+		std::vector<int> operator()(const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc, const InputNodeID&input_node_id, const ArcWeight&arc_weight)const{
+			CutterStatistics statistics;
+			return (*this)(tail, head, out_arc, back_arc, input_node_id, arc_weight, statistics);
+		}
+
+		template<class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+		std::vector<int> operator()(const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc, const InputNodeID&, const ArcWeight&arc_weight, CutterStatistics&statistics)const{
+			const int node_count = tail.image_count();
+
+			int cutter_count = config.cutter_count;
+			long long deadline = std::numeric_limits<long long>::max();
+			if(time_budget)
+				cutter_count = time_budget->get_allowance(node_count, config.cutter_count, deadline);
+
+			if(config.multilevel_node_count != 0 && node_count > config.multilevel_node_count){
+				return multilevel::compute_multilevel_separator(
+					tail, head, arc_weight, config.multilevel_node_count,
+					[&](const ArrayIDIDFunc&coarse_tail, const ArrayIDIDFunc&coarse_head, const ArrayIDFunc<int>&coarse_arc_weight, const ArrayIDFunc<int>&coarse_node_weight){
+						// The arcs of the coarse graph are sorted and there are no multi arcs
+						auto coarse_out_arc = invert_sorted_id_id_func(coarse_tail);
+						auto coarse_back_arc = compute_back_arc_permutation_of_strictly_sorted_arcs(coarse_tail, coarse_head);
+						return compute_separator_directly(coarse_tail, coarse_head, coarse_out_arc, coarse_back_arc, coarse_arc_weight, &coarse_node_weight, cutter_count, deadline, statistics);
+					}
+				);
+			}else{
+				return compute_separator_directly(tail, head, out_arc, back_arc, arc_weight, nullptr, cutter_count, deadline, statistics);
+			}
+		}
+	private:
+		struct WeightedCut{
+			long long separator_weight;
+			long long smaller_side_weight;
+		};
+
+		// The heads of the cut arcs
+		template<class Head>
+		static std::vector<int> get_edge_cut_separator(const Head&head, const std::vector<int>&cut){
+			std::vector<int>separator;
+			for(auto x:cut)
+				separator.push_back(head(x));
+			std::sort(separator.begin(), separator.end());
+			separator.erase(std::unique(separator.begin(), separator.end()), separator.end());
+			return separator; // NVRO
+		}
+
+		// The weight of the separator and of the lighter of the two sides without the separator. is_left(x) tells
+		// on which side of the cut a node x is.
+		template<class IsLeft>
+		static WeightedCut compute_weighted_cut(const ArrayIDFunc<int>&node_weight, long long total_node_weight, const std::vector<int>&separator, const IsLeft&is_left){
+			const int node_count = node_weight.preimage_count();
+
+			BitIDFunc is_in_separator(node_count);
+			is_in_separator.fill(false);
+			long long separator_weight = 0;
+			for(auto x:separator){
+				is_in_separator.set(x, true);
+				separator_weight += node_weight(x);
+			}
+
+			long long left_weight = 0;
+			for(int x=0; x<node_count; ++x)
+				if(!is_in_separator(x) && is_left(x))
+					left_weight += node_weight(x);
+			long long right_weight = total_node_weight - separator_weight - left_weight;
+
+			return {separator_weight, std::min(left_weight, right_weight)};
+		}
+
+		// A coarse node of the multilevel mode stands for node_weight(x) input nodes. The cuts are then scored
+		// and tested for balance by the summed weights instead of the node counts of the cutter.
+		template<class Tail, class Head, class OutArc, class BackArc, class ArcWeight>
+		std::vector<int> compute_separator_directly(
+			const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc,
+			const ArcWeight&arc_weight, const ArrayIDFunc<int>*node_weight,
+			int cutter_count, long long deadline, CutterStatistics&statistics
+		)const{
 
 			const int node_count = tail.image_count();
 			const int arc_count = tail.preimage_count();
 
-			auto out_arc = invert_sorted_id_id_func(tail);
-			auto back_arc = compute_back_arc_permutation(tail, head);
+			long long total_node_weight = 0;
+			if(node_weight != nullptr)
+				for(int x=0; x<node_count; ++x)
+					total_node_weight += (*node_weight)(x);
+
+			auto get_weighted_score = [&](const WeightedCut&c)->double{
+				double score = (double)c.separator_weight / (double)std::max(c.smaller_side_weight, 1ll);
+				if(c.smaller_side_weight < config.max_imbalance * total_node_weight)
+					score += 1000000;
+				return score;
+			};
 
 			std::vector<int>separator;
 
+			// The share of the time budget is used up and a balanced enough cut is known. A cancelled computation
+			// also stops at the current cut, see cancellation.h.
+			auto is_out_of_time = [&](double best_score){
+				return time_budget && best_score < 1000000 && get_micro_time() >= deadline;
+			};
+
 			switch(config.separator_selection){
 				case Config::SeparatorSelection::node_min_expansion:
 				{
 					
-					auto expanded_graph = expanded_graph::make_graph(
+					auto graph = flow_cutter::make_graph(
 						make_const_ref_id_id_func(tail), 
 						make_const_ref_id_id_func(head), 
 						make_const_ref_id_id_func(back_arc), 
-						make_const_ref_id_id_func(arc_weight), 
+						make_const_ref_id_func(arc_weight),
+						ConstIntIDFunc<1>(arc_count),
 						make_const_ref_id_func(out_arc)
 					);
 
-					auto cutter = make_simple_cutter(expanded_graph, config);
-					auto pairs = select_random_source_target_pairs(node_count, config.cutter_count, config.random_seed);
+					auto cutter = make_simple_node_capacity_cutter(graph, config);
+					auto pairs = select_random_source_target_pairs(node_count, cutter_count, config.random_seed);
 
 					double best_score = std::numeric_limits<double>::max();
 
@@ -47,27 +209,49 @@ namespace flow_cutter{
 					for(;;){
 
 						double cut_size = cutter.get_current_cut().size();
-						double small_side_size = cutter.get_current_smaller_cut_side_size();
+						double potential_best_next_score;
 
-						double score = cut_size / small_side_size;
+						if(node_weight == nullptr){
+							double small_side_size = cutter.get_current_smaller_cut_side_size();
 
-						if(cutter.get_current_smaller_cut_side_size() < config.max_imbalance * expanded_graph::expanded_node_count(node_count))
-							score += 1000000;
-						
+							double score = cut_size / small_side_size;
 
-						if(score < best_score){
-							best_score = score;
-							separator = expanded_graph::extract_original_separator(tail, head, cutter).sep;
-						}
+							if(cutter.get_current_smaller_cut_side_size() < config.max_imbalance * expanded_graph::expanded_node_count(node_count))
+								score += 1000000;
+							
 
-						double potential_best_next_score = (double)(cut_size+1)/(double)(expanded_graph::expanded_node_count(node_count)/2);
+							if(score < best_score){
+								best_score = score;
+								separator = expanded_graph::extract_original_separator(tail, head, cutter).sep;
+							}
+
+							potential_best_next_score = (double)(cut_size+1)/(double)(expanded_graph::expanded_node_count(node_count)/2);
+						}else{
+							auto sep = expanded_graph::extract_original_separator(tail, head, cutter).sep;
+							double score = get_weighted_score(compute_weighted_cut(
+								*node_weight, total_node_weight, sep, 
+								[&](int x){return cutter.is_on_smaller_side(expanded_graph::original_node_to_expanded_node(x, true));}
+							));
+
+							if(score < best_score){
+								best_score = score;
+								separator = std::move(sep);
+							}
+
+							// Every separator node weighs at least 1 
+							potential_best_next_score = (cut_size+1)/(total_node_weight/2.0);
+						}
 						if(potential_best_next_score >= best_score)
 							break;
+
+						if(is_out_of_time(best_score) || is_computation_cancelled())
+							break;
 						
 						if(!cutter.advance())
 							break;
 						
 					}
+					statistics = cutter.get_statistics();
 				}
 				break;
 				case Config::SeparatorSelection::edge_min_expansion:
@@ -86,32 +270,52 @@ namespace flow_cutter{
 					std::vector<int>best_cut;
 					double best_score = std::numeric_limits<double>::max();
 
-					cutter.init(select_random_source_target_pairs(node_count, config.cutter_count, config.random_seed), config.random_seed);
+					cutter.init(select_random_source_target_pairs(node_count, cutter_count, config.random_seed), config.random_seed);
 
 					for(;;){
 
 						double cut_size = cutter.get_current_cut().size();
-						double small_side_size = cutter.get_current_smaller_cut_side_size();
+						double potential_best_next_score;
 
-						double score = cut_size / small_side_size;
+						if(node_weight == nullptr){
+							double small_side_size = cutter.get_current_smaller_cut_side_size();
 
-						if(cutter.get_current_smaller_cut_side_size() < config.max_imbalance * node_count)
-							score += 1000000;
-						
+							double score = cut_size / small_side_size;
 
-						if(score < best_score){
-							best_score = score;
-							best_cut = cutter.get_current_cut();
-						}
+							if(cutter.get_current_smaller_cut_side_size() < config.max_imbalance * node_count)
+								score += 1000000;
+							
+
+							if(score < best_score){
+								best_score = score;
+								best_cut = cutter.get_current_cut();
+							}
+
+							potential_best_next_score = (double)(cut_size+1)/(double)(expanded_graph::expanded_node_count(node_count)/2);
+						}else{
+							double score = get_weighted_score(compute_weighted_cut(
+								*node_weight, total_node_weight, get_edge_cut_separator(head, cutter.get_current_cut()), 
+								[&](int x){return cutter.is_on_smaller_side(x);}
+							));
+
+							if(score < best_score){
+								best_score = score;
+								best_cut = cutter.get_current_cut();
+							}
 
-						double potential_best_next_score = (double)(cut_size+1)/(double)(expanded_graph::expanded_node_count(node_count)/2);
+							potential_best_next_score = (cut_size+1)/(total_node_weight/2.0);
+						}
 						if(potential_best_next_score >= best_score)
 							break;
+
+						if(is_out_of_time(best_score) || is_computation_cancelled())
+							break;
 						
 						if(!cutter.advance())
 							break;
 						
 					}
+					statistics = cutter.get_statistics();
 
 					for(auto x:best_cut)
 						separator.push_back(head(x));
@@ -132,10 +336,20 @@ namespace flow_cutter{
 					);
 
 					auto cutter = make_simple_cutter(graph, config);
-					cutter.init(select_random_source_target_pairs(node_count, config.cutter_count, config.random_seed), config.random_seed);
-					while(cutter.get_current_smaller_cut_side_size() < config.max_imbalance * node_count)
+					cutter.init(select_random_source_target_pairs(node_count, cutter_count, config.random_seed), config.random_seed);
+					auto is_balanced = [&]{
+						if(node_weight == nullptr)
+							return cutter.get_current_smaller_cut_side_size() >= config.max_imbalance * node_count;
+						auto c = compute_weighted_cut(
+							*node_weight, total_node_weight, get_edge_cut_separator(head, cutter.get_current_cut()), 
+							[&](int x){return cutter.is_on_smaller_side(x);}
+						);
+						return c.smaller_side_weight >= config.max_imbalance * total_node_weight;
+					};
+					while(!is_balanced() && !is_computation_cancelled())
 						if(!cutter.advance())
 							break;
+					statistics = cutter.get_statistics();
 
 					for(auto x:cutter.get_current_cut())
 						separator.push_back(head(x));
@@ -146,21 +360,32 @@ namespace flow_cutter{
 				break;
 				case Config::SeparatorSelection::node_first:
 				{
-					auto expanded_graph = expanded_graph::make_graph(
+					auto graph = flow_cutter::make_graph(
 						make_const_ref_id_id_func(tail), 
 						make_const_ref_id_id_func(head), 
 						make_const_ref_id_id_func(back_arc), 
-						make_const_ref_id_id_func(arc_weight), 
+						make_const_ref_id_func(arc_weight),
+						ConstIntIDFunc<1>(arc_count),
 						make_const_ref_id_func(out_arc)
 					);
 
-					auto cutter = make_simple_cutter(expanded_graph, config);
-					auto pairs = select_random_source_target_pairs(node_count, config.cutter_count, config.random_seed);
+					auto cutter = make_simple_node_capacity_cutter(graph, config);
+					auto pairs = select_random_source_target_pairs(node_count, cutter_count, config.random_seed);
 
 					cutter.init(expanded_graph::expand_source_target_pair_list(pairs), config.random_seed);
-					while(cutter.get_current_smaller_cut_side_size() < config.max_imbalance * expanded_graph::expanded_node_count(node_count))
+					auto is_balanced = [&]{
+						if(node_weight == nullptr)
+							return cutter.get_current_smaller_cut_side_size() >= config.max_imbalance * expanded_graph::expanded_node_count(node_count);
+						auto c = compute_weighted_cut(
+							*node_weight, total_node_weight, expanded_graph::extract_original_separator(tail, head, cutter).sep, 
+							[&](int x){return cutter.is_on_smaller_side(expanded_graph::original_node_to_expanded_node(x, true));}
+						);
+						return c.smaller_side_weight >= config.max_imbalance * total_node_weight;
+					};
+					while(!is_balanced() && !is_computation_cancelled())
 						if(!cutter.advance())
 							break;
+					statistics = cutter.get_statistics();
 
 					separator = expanded_graph::extract_original_separator(tail, head, cutter).sep;
 				}
@@ -173,8 +398,9 @@ namespace flow_cutter{
 			return std::move(separator);
 
 		}
-	private:
+
 		Config config;
+		std::shared_ptr<SeparatorTimeBudget>time_budget;
 	};
 
 
@@ -242,40 +468,133 @@ namespace separator{
 		return max_comp_size;
 	}
 
+	enum class SeparatorStatisticsFormat{
+		csv,
+		json_lines
+	};
+
+	//! Writes JSON lines if the file name ends in ".jsonl" and CSV otherwise.
+	inline
+	SeparatorStatisticsFormat get_separator_statistics_format(const std::string&file_name){
+		const std::string json_lines_extension = ".jsonl";
+		if(file_name.size() >= json_lines_extension.size() && file_name.compare(file_name.size() - json_lines_extension.size(), json_lines_extension.size(), json_lines_extension) == 0)
+			return SeparatorStatisticsFormat::json_lines;
+		else
+			return SeparatorStatisticsFormat::csv;
+	}
+
+	// Only FlowCutter reports statistics of its cutters. The other separator algorithms report zeros.
+	template<class ComputeSeparator, class Tail, class Head, class InputNodeID, class ArcWeight>
+	std::vector<int> compute_separator_with_statistics(
+		const ComputeSeparator&compute_separator, 
+		const Tail&tail, const Head&head, const InputNodeID&input_node_id, const ArcWeight&arc_weight,
+		flow_cutter::CutterStatistics&
+	){
+		return compute_separator(tail, head, input_node_id, arc_weight);
+	}
+
+	template<class Tail, class Head, class InputNodeID, class ArcWeight>
+	std::vector<int> compute_separator_with_statistics(
+		const flow_cutter::ComputeSeparator&compute_separator, 
+		const Tail&tail, const Head&head, const InputNodeID&input_node_id, const ArcWeight&arc_weight,
+		flow_cutter::CutterStatistics&statistics
+	){
+		return compute_separator(tail, head, input_node_id, arc_weight, statistics);
+	}
+
+	template<class ComputeSeparator, class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+	std::vector<int> compute_separator_with_statistics(
+		const ComputeSeparator&compute_separator, 
+		const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc, const InputNodeID&input_node_id, const ArcWeight&arc_weight,
+		flow_cutter::CutterStatistics&
+	){
+		return compute_separator_given_out_arc_and_back_arc(compute_separator, tail, head, out_arc, back_arc, input_node_id, arc_weight);
+	}
+
+	template<class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+	std::vector<int> compute_separator_with_statistics(
+		const flow_cutter::ComputeSeparator&compute_separator, 
+		const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc, const InputNodeID&input_node_id, const ArcWeight&arc_weight,
+		flow_cutter::CutterStatistics&statistics
+	){
+		return compute_separator(tail, head, out_arc, back_arc, input_node_id, arc_weight, statistics);
+	}
+
+	//! Writes one line per separator. The statistics of the cutters are only part of the output if the code
+	//! is compiled with -DFLOW_CUTTER_STATISTICS.
 	template<class ComputeSeparator>
 	class ReportSeparatorStatistics{
 	public:
-		ReportSeparatorStatistics(std::ostream&out, ComputeSeparator compute_separator):
-			out(out), compute_separator(std::move(compute_separator)){
-			out << "node_count,arc_count,sep_node_count,large_node_count,running_time,reporting_running_time\n";
+		ReportSeparatorStatistics(std::ostream&out, ComputeSeparator compute_separator, SeparatorStatisticsFormat format = SeparatorStatisticsFormat::csv):
+			out(out), compute_separator(std::move(compute_separator)), format(format){
+			if(format == SeparatorStatisticsFormat::csv){
+				out << "node_count,arc_count,sep_node_count,large_node_count,running_time,reporting_running_time";
+				if(flow_cutter::collect_cutter_statistics)
+					flow_cutter::CutterStatistics().for_each([&](const char*name, long long){ out << ',' << name; });
+				out << '\n';
+			}
 		}
 
 		template<class Tail, class Head, class InputNodeID, class ArcWeight>
 		std::vector<int> operator()(const Tail&tail, const Head&head, const InputNodeID&input_node_id, const ArcWeight&arc_weight)const{
+			return report(tail, head, [&](flow_cutter::CutterStatistics&statistics){
+				return compute_separator_with_statistics(compute_separator, tail, head, input_node_id, arc_weight, statistics);
+			});
+		}
+
+		//! Passes out_arc and back_arc on to the separator algorithm if it takes them, see separator_call.h.
+		template<class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+		std::vector<int> operator()(const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc, const InputNodeID&input_node_id, const ArcWeight&arc_weight)const{
+			return report(tail, head, [&](flow_cutter::CutterStatistics&statistics){
+				return compute_separator_with_statistics(compute_separator, tail, head, out_arc, back_arc, input_node_id, arc_weight, statistics);
+			});
+		}
+	
+	private:
+		template<class Tail, class Head, class Compute>
+		std::vector<int> report(const Tail&tail, const Head&head, const Compute&compute)const{
 		
 			const int node_count = tail.image_count();
 			const int arc_count = tail.preimage_count();
 
+			flow_cutter::CutterStatistics statistics;
+
 			long long running_time = -get_micro_time();
-			auto sep = compute_separator(tail, head, input_node_id, arc_weight);
+			auto sep = compute(statistics);
 			running_time += get_micro_time();
 
 			long long reporting_running_time = -get_micro_time();
 			auto large_node_count = determine_largest_part_size(tail, head, sep);
 			reporting_running_time += get_micro_time();
 
-			out << node_count << ',' << arc_count << ',' << sep.size() << ',' << large_node_count << ',' << running_time << ',' << reporting_running_time << '\n';
+			// Separators of independent components may be computed concurrently
+			#pragma omp critical
+			{
+				if(format == SeparatorStatisticsFormat::csv){
+					out << node_count << ',' << arc_count << ',' << sep.size() << ',' << large_node_count << ',' << running_time << ',' << reporting_running_time;
+					if(flow_cutter::collect_cutter_statistics)
+						statistics.for_each([&](const char*, long long value){ out << ',' << value; });
+					out << '\n';
+				}else{
+					out 
+						<< "{\"node_count\":" << node_count << ",\"arc_count\":" << arc_count << ",\"sep_node_count\":" << sep.size() 
+						<< ",\"large_node_count\":" << large_node_count << ",\"running_time\":" << running_time << ",\"reporting_running_time\":" << reporting_running_time;
+					if(flow_cutter::collect_cutter_statistics)
+						statistics.for_each([&](const char*name, long long value){ out << ",\"" << name << "\":" << value; });
+					out << "}\n";
+				}
+			}
 			return std::move(sep);
 		}
-	
-	private:
+
 		std::ostream&out;
 		ComputeSeparator compute_separator;
+		SeparatorStatisticsFormat format;
 	};
 
 	template<class ComputeSeparator>
-	ReportSeparatorStatistics<ComputeSeparator> report_separator_statistics(std::ostream&out, ComputeSeparator compute_separator){
-		return {out, std::move(compute_separator)};
+	ReportSeparatorStatistics<ComputeSeparator> report_separator_statistics(std::ostream&out, ComputeSeparator compute_separator, SeparatorStatisticsFormat format = SeparatorStatisticsFormat::csv){
+		return {out, std::move(compute_separator), format};
 	}
 }
 
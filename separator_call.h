@@ -0,0 +1,40 @@
+#ifndef SEPARATOR_CALL_H
+#define SEPARATOR_CALL_H
+
+#include <vector>
+
+//!
+//! A separator algorithm is called as compute_separator(tail, head, input_node_id, arc_weight). Algorithms that
+//! need the out arcs and the back arcs can also be called as
+//! compute_separator(tail, head, out_arc, back_arc, input_node_id, arc_weight) and then do not compute them.
+//! compute_separator_given_out_arc_and_back_arc uses the second form if the algorithm supports it.
+//!
+
+template<class ComputeSeparator, class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+auto compute_separator_given_out_arc_and_back_arc_impl(
+	const ComputeSeparator&compute_separator,
+	const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc,
+	const InputNodeID&input_node_id, const ArcWeight&arc_weight, int
+)->decltype(compute_separator(tail, head, out_arc, back_arc, input_node_id, arc_weight)){
+	return compute_separator(tail, head, out_arc, back_arc, input_node_id, arc_weight);
+}
+
+template<class ComputeSeparator, class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+std::vector<int> compute_separator_given_out_arc_and_back_arc_impl(
+	const ComputeSeparator&compute_separator,
+	const Tail&tail, const Head&head, const OutArc&, const BackArc&,
+	const InputNodeID&input_node_id, const ArcWeight&arc_weight, long
+){
+	return compute_separator(tail, head, input_node_id, arc_weight);
+}
+
+template<class ComputeSeparator, class Tail, class Head, class OutArc, class BackArc, class InputNodeID, class ArcWeight>
+std::vector<int> compute_separator_given_out_arc_and_back_arc(
+	const ComputeSeparator&compute_separator,
+	const Tail&tail, const Head&head, const OutArc&out_arc, const BackArc&back_arc,
+	const InputNodeID&input_node_id, const ArcWeight&arc_weight
+){
+	return compute_separator_given_out_arc_and_back_arc_impl(compute_separator, tail, head, out_arc, back_arc, input_node_id, arc_weight, 0);
+}
+
+#endif
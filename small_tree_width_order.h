@@ -4,6 +4,7 @@
 #include "min_fill_in.h"
 #include "contraction_graph.h"
 #include "node_flow_cutter.h"
+#include "node_capacity_cutter.h"
 #include "flow_cutter.h"
 
 namespace small_tree_width{
@@ -329,7 +330,7 @@ namespace small_tree_width{
 			if(recurse_level < 3)
 				order = compute_order(std::move(a_tail), std::move(a_head), std::move(a_input_node_id));
 			else
-				order = chain(compute_greedy_min_shortcut_order(a_tail, a_head), a_input_node_id);
+				order = chain(compute_exact_greedy_min_shortcut_order(a_tail, a_head), a_input_node_id);
 			--recurse_level;
 			return order;
 		};
@@ -382,15 +383,16 @@ namespace small_tree_width{
 
 			auto arc_weight = id_func(arc_count, [](int){ return 0; });
 
-			auto expanded_graph = flow_cutter::expanded_graph::make_graph(
+			auto graph = flow_cutter::make_graph(
 				make_const_ref_id_id_func(tail), 
 				make_const_ref_id_id_func(head), 
 				make_const_ref_id_id_func(back_arc), 
-				make_const_ref_id_id_func(arc_weight), 
+				make_const_ref_id_func(arc_weight),
+				ConstIntIDFunc<1>(arc_count),
 				make_const_ref_id_func(out_arc)
 			);		
 
-			auto cutter = flow_cutter::make_simple_cutter(expanded_graph, config);
+			auto cutter = flow_cutter::make_simple_node_capacity_cutter(graph, config);
 			auto pairs = flow_cutter::select_random_source_target_pairs(node_count, config.cutter_count, config.random_seed);
 			cutter.init(flow_cutter::expanded_graph::expand_source_target_pair_list(pairs), config.random_seed);
 
@@ -498,7 +500,7 @@ namespace small_tree_width{
 
 		auto separator_set = compute_separator_set(tail, head);
 		if(separator_set.empty())
-			return chain(compute_greedy_min_shortcut_order(tail, head), input_node_id);
+			return chain(compute_exact_greedy_min_shortcut_order(tail, head), input_node_id);
 	
 static int recurse_level = 0;
 ++recurse_level;
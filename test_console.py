@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+################################################################################
+## Runs the console on small generated graphs and checks its output
+##
+## Build the console first, then run:
+##
+##   python3 -m pytest test_console.py
+##
+## The console is ./console unless the environment variable CONSOLE names
+## another executable.
+##
+
+import os, subprocess, time, pytest
+
+console = os.environ.get("CONSOLE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "console"))
+
+pytestmark = pytest.mark.skipif(not os.path.exists(console), reason="the console is not built")
+
+def run_console(args, thread_count=4):
+	env = dict(os.environ, OMP_NUM_THREADS=str(thread_count))
+	return subprocess.run([console] + args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, env=env, timeout=600)
+
+# The cutters run in parallel regions, which an exception must not leave
+@pytest.mark.parametrize("thread_count", ["1", "4"])
+def test_order_over_memory_budget_fails_with_error(thread_count):
+	r = run_console([
+		"make_grid", "100",
+		"flow_cutter_set", "cutter_count", "8",
+		"flow_cutter_set", "thread_count", thread_count,
+		"set_memory_budget", "5",
+		"reorder_nodes_in_flow_cutter_cch_order"
+	])
+	assert r.returncode == 0, r.stdout
+	assert "Exception : memory budget exceeded" in r.stdout
+
+# The parts are handed off to the workers in OpenMP tasks, which an exception must not leave
+@pytest.mark.parametrize("thread_count", ["1", "4"])
+def test_worker_order_with_missing_job_directory_fails_with_error(tmp_path, thread_count):
+	r = run_console([
+		"make_grid", "60",
+		"flow_cutter_set", "thread_count", thread_count,
+		"reorder_nodes_in_flow_cutter_cch_order_using_worker_processes", "2", "200", str(tmp_path / "missing")
+	])
+	assert r.returncode == 0, r.stdout
+	assert "Exception : Could not open" in r.stdout
+
+# Every session of the command server has its own budget
+def test_memory_budget_is_per_session(tmp_path):
+	socket_path = str(tmp_path / "socket")
+	server = subprocess.Popen([console, "make_grid", "60", "run_command_server", socket_path], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+	try:
+		def connect(commands):
+			for i in range(100):
+				if os.path.exists(socket_path):
+					break
+				time.sleep(0.1)
+			return subprocess.run([console, "connect_to_command_server", socket_path], input="\n".join(commands)+"\n", stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, timeout=600)
+
+		r = connect(["copy_graph default small", "use_graph small", "set_memory_budget 1", "reorder_nodes_in_flow_cutter_cch_order", "exit"])
+		assert "Exception : memory budget exceeded" in r.stdout
+
+		r = connect(["reorder_nodes_in_flow_cutter_cch_order", "stop_command_server", "exit"])
+		assert "Exception" not in r.stdout
+		assert server.wait(timeout=600) == 0
+	finally:
+		server.kill()
@@ -152,4 +152,85 @@ inline BitIDFunc and_not(BitIDFunc l, const BitIDFunc&r){
 	return std::move(l);
 }
 
+//! Returns the number of bits needed to store all values from 0 to max_value.
+inline int get_bit_count_of(std::uint64_t max_value){
+	int bit_count = 1;
+	while(bit_count < 64 && (max_value >> bit_count) != 0)
+		++bit_count;
+	return bit_count;
+}
+
+//! Like TinyIntIDFunc but the number of bits per entry is only known at runtime. The entries are
+//! packed without gaps and thus an entry can span two words.
+struct PackedIntIDFunc{
+	PackedIntIDFunc():preimage_(0), bit_count_(1), entry_mask_(1){}
+
+	PackedIntIDFunc(int preimage, int bit_count):
+		preimage_(preimage),
+		bit_count_(bit_count),
+		entry_mask_(bit_count == 64 ? (std::uint64_t)-1 : (std::uint64_t(1)<<bit_count) - std::uint64_t(1)),
+		data_((int)(((std::uint64_t)preimage*bit_count + 63) / 64)){
+		assert(1<=bit_count && bit_count <= 64);
+	}
+
+	int preimage_count()const{
+		return preimage_;
+	}
+
+	int bit_count()const{
+		return bit_count_;
+	}
+
+	std::uint64_t max_value()const{
+		return entry_mask_;
+	}
+
+	std::uint64_t operator()(int id)const{
+		assert(0 <= id && id < preimage_ && "id out of bounds");
+
+		std::uint64_t pos = (std::uint64_t)id * bit_count_;
+		int index = pos / 64;
+		int offset = pos % 64;
+		std::uint64_t value = data_[index] >> offset;
+		if(offset + bit_count_ > 64)
+			value |= data_[index+1] << (64 - offset);
+		return value & entry_mask_;
+	}
+
+	void set(int id, std::uint64_t value){
+		assert(0 <= id && id < preimage_ && "id out of bounds");
+		assert(value <= entry_mask_ && "value out of bounds");
+
+		std::uint64_t pos = (std::uint64_t)id * bit_count_;
+		int index = pos / 64;
+		int offset = pos % 64;
+		data_[index] = (data_[index] & ~(entry_mask_ << offset)) | (value << offset);
+		if(offset + bit_count_ > 64){
+			int shift = 64 - offset;
+			data_[index+1] = (data_[index+1] & ~(entry_mask_ >> shift)) | (value >> shift);
+		}
+	}
+
+	void fill(std::uint64_t value){
+		assert(value <= entry_mask_ && "value out of bounds");
+		if(value == 0)
+			data_.fill(0);
+		else
+			for(int i=0; i<preimage_; ++i)
+				set(i, value);
+	}
+
+	void swap(PackedIntIDFunc&other)noexcept{
+		std::swap(preimage_, other.preimage_);
+		std::swap(bit_count_, other.bit_count_);
+		std::swap(entry_mask_, other.entry_mask_);
+		data_.swap(other.data_);
+	}
+
+	int preimage_;
+	int bit_count_;
+	std::uint64_t entry_mask_;
+	ArrayIDFunc<std::uint64_t> data_;
+};
+
 #endif
@@ -0,0 +1,107 @@
+#include "worker_process_pool.h"
+
+#include <stdexcept>
+#include <algorithm>
+#include <string.h>
+#include <errno.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+
+WorkerProcessPool::WorkerProcessPool(int max_process_count):
+	max_process_count(max_process_count){
+	if(max_process_count < 1)
+		throw std::runtime_error("There must be at least one worker process");
+
+	std::vector<char>buffer(4096);
+	ssize_t size = readlink("/proc/self/exe", buffer.data(), buffer.size());
+	if(size == -1 || size == (ssize_t)buffer.size())
+		throw std::runtime_error(std::string("Could not determine the path of the executable : ")+strerror(errno));
+	executable.assign(buffer.data(), size);
+}
+
+WorkerProcessPool::~WorkerProcessPool(){
+	while(!running_process.empty())
+		wait_for_one_process();
+}
+
+// Returns true if the i-th running child has exited and removes it
+bool WorkerProcessPool::try_to_reap_process(int i, bool block){
+	pid_t pid = running_process[i];
+	int status;
+	pid_t result;
+	do{
+		result = waitpid(pid, &status, block ? 0 : WNOHANG);
+	}while(result == -1 && errno == EINTR);
+
+	if(result == 0)
+		return false;
+
+	running_process.erase(running_process.begin() + i);
+
+	if(error.empty()){
+		if(result == -1)
+			error = "Could not wait for worker process "+std::to_string(pid)+" : "+strerror(errno);
+		else if(WIFSIGNALED(status))
+			error = "Worker process "+std::to_string(pid)+" was killed by signal "+std::to_string(WTERMSIG(status));
+		else if(WIFEXITED(status) && WEXITSTATUS(status) != 0)
+			error = "Worker process "+std::to_string(pid)+" exited with status "+std::to_string(WEXITSTATUS(status));
+	}
+	return true;
+}
+
+void WorkerProcessPool::wait_for_one_process(){
+	if(running_process.size() == 1){
+		try_to_reap_process(0, true);
+		return;
+	}
+
+	// There is no blocking wait for one of several given children. They are polled with a growing pause instead.
+	long pause = 100000;
+	for(;;){
+		for(int i=0; i<(int)running_process.size(); ++i)
+			if(try_to_reap_process(i, false))
+				return;
+
+		timespec t = {0, pause};
+		nanosleep(&t, nullptr);
+		pause = std::min(pause*2, 10000000l);
+	}
+}
+
+void WorkerProcessPool::start_process(const std::vector<std::string>&args){
+	while((int)running_process.size() >= max_process_count)
+		wait_for_one_process();
+
+	// The argument list is built before the fork as the child should only call async-signal-safe functions
+	std::vector<char*>argv;
+	argv.push_back(const_cast<char*>(executable.c_str()));
+	for(auto&a:args)
+		argv.push_back(const_cast<char*>(a.c_str()));
+	argv.push_back(nullptr);
+
+	running_process.reserve(running_process.size()+1);
+
+	pid_t pid = fork();
+	if(pid == -1){
+		if(error.empty())
+			error = std::string("Could not start a worker process : ")+strerror(errno);
+		return;
+	}
+	if(pid == 0){
+		execv(executable.c_str(), argv.data());
+		_exit(127);
+	}
+	running_process.push_back(pid);
+}
+
+void WorkerProcessPool::wait_for_all_processes(){
+	while(!running_process.empty())
+		wait_for_one_process();
+	if(!error.empty()){
+		std::string e = std::move(error);
+		error.clear();
+		throw std::runtime_error(e);
+	}
+}
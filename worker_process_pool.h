@@ -0,0 +1,46 @@
+#ifndef WORKER_PROCESS_POOL_H
+#define WORKER_PROCESS_POOL_H
+
+#include <string>
+#include <vector>
+#include <sys/types.h>
+
+//!
+//! Runs the console executable in child processes. At most max_process_count children run at the same time.
+//! Starting a child blocks while all slots are busy. The children share no state with the parent except for
+//! the files they are told to read and write.
+//!
+//! Not supported on Windows. The executable is found through /proc/self/exe, i.e., only Linux is supported.
+//!
+
+class WorkerProcessPool{
+public:
+	explicit WorkerProcessPool(int max_process_count);
+
+	// Waits for the running children but does not report their failures
+	~WorkerProcessPool();
+
+	WorkerProcessPool(const WorkerProcessPool&) = delete;
+	WorkerProcessPool&operator=(const WorkerProcessPool&) = delete;
+
+	// Starts the console executable with the arguments args. Failures of children are only reported by
+	// wait_for_all_processes.
+	void start_process(const std::vector<std::string>&args);
+
+	// Blocks until all children have exited. Throws if a child could not be started, was killed or exited with
+	// a non-zero status.
+	void wait_for_all_processes();
+
+private:
+	// Only the children of this pool are waited for, as other pools or system() may run children of the same
+	// process at the same time.
+	void wait_for_one_process();
+	bool try_to_reap_process(int i, bool block);
+
+	int max_process_count;
+	std::vector<pid_t>running_process;
+	std::string executable;
+	std::string error;
+};
+
+#endif